@@ -9,18 +9,9 @@ echo. | python scripts\build_fighter_recent_fights.py
 echo. | python scripts\fetch_betvictor_fight_urls.py
 echo. | python scripts\fetch_coral_fight_urls.py
 echo. | python scripts\fetch_paddypower_fight_urls.py
-echo. | python scripts\fetch_888sport_props.py
-echo. | python scripts\fetch_betfred_props.py
-echo. | python scripts\fetch_betvictor_props.py
-echo. | python scripts\fetch_boylesports_props.py
+echo. | python scripts\fetch_ufc_props_all.py
 echo. | python scripts\fetch_boylesports_moneylines.py
-echo. | python scripts\fetch_bwin_props.py
-echo. | python scripts\fetch_coral_props.py
 echo. | python scripts\fetch_livescorebet_ufc_moneylines.py
-echo. | python scripts\fetch_tote_props.py
-echo. | python scripts\fetch_ufc_props_paddypower.py
-echo. | python scripts\fetch_unibet_props.py
-echo. | python scripts\fetch_williamhill_props.py
 echo. | python scripts\filter_betvictor_props.py
 echo. | python scripts\filter_boylesports_props.py
 echo. | python scripts\filter_coral_props.py
@@ -1,13 +1,31 @@
 #!/usr/bin/env python3
 # FOOTBALL_ARB_SAFE_V4_OVER_ONLY_STATS
+import argparse
+import hashlib
 import json
 import os
 import re
+import sys
 from datetime import datetime, timezone
 from itertools import product
 
+import numpy as np
+
+from fixture_ids import FixtureResolver, kickoff_date
+from odds_store import OddsStore, module_digest
+
 ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
 
+if os.path.join(ROOT, "scripts") not in sys.path:
+    sys.path.insert(0, os.path.join(ROOT, "scripts"))
+
+import odds_common  # noqa: E402
+from odds_common import (  # noqa: E402
+    fixture_key,
+    fractional_to_decimal,
+    normalize_team,
+)
+
 BOOK_FILES = {
     "PaddyPower": os.path.join(ROOT, "football", "data", "paddypower_worldcup_moneylines.json"),
     "BoyleSports": os.path.join(ROOT, "football", "data", "boylesports_worldcup_moneylines.json"),
@@ -21,6 +39,10 @@ BOOK_FILES = {
 
 OUT_PATH = os.path.join(ROOT, "football", "data", "arbitrage.json")
 
+# Per-fixture scan results from the last run, so fixtures whose offers have not
+# changed are not rescanned. See ArbState.
+ARB_STATE_PATH = os.path.join(ROOT, "data", "football_arb_state.json")
+
 # Cross-book arbitrage is only trusted after each source bookmaker's own
 # market is internally coherent.
 MIN_SOURCE_TWO_WAY_SUM = 0.94
@@ -63,67 +85,12 @@ OVER_ONLY_STATS_CANONICAL_PREFIXES = {
 }
 
 
-def fractional_to_decimal(value):
-    value = str(value or "").strip().upper()
-
-    if value in {"EVS", "EVENS", "EVEN"}:
-        return 2.0
-
-    if "/" in value:
-        try:
-            num, den = value.split("/", 1)
-            return round((float(num) / float(den)) + 1, 6)
-        except Exception:
-            return None
-
-    try:
-        decimal = float(value)
-        if decimal > 1:
-            return decimal
-    except Exception:
-        pass
-
-    return None
-
-
 def implied_probability(decimal_odds):
     if not decimal_odds or decimal_odds <= 1:
         return None
     return 1 / decimal_odds
 
 
-def normalize_team(name):
-    name = str(name or "").lower().strip()
-
-    replacements = {
-        "türkiye": "turkiye",
-        "turkey": "turkiye",
-        "czech republic": "czechia",
-        "bosnia & herzegovina": "bosnia",
-        "bosnia and herzegovina": "bosnia",
-        "cape verde islands": "cape verde",
-        "congo dr": "dr congo",
-        "curaçao": "curacao",
-    }
-
-    for old, new in replacements.items():
-        name = name.replace(old, new)
-
-    name = re.sub(r"[^a-z0-9]+", " ", name)
-    name = re.sub(r"\s+", " ", name).strip()
-
-    return name
-
-
-def fixture_key(home, away):
-    return f"{normalize_team(home)}__{normalize_team(away)}"
-
-
-def loose_fixture_key(home, away):
-    teams = sorted([normalize_team(home), normalize_team(away)])
-    return "__".join(teams)
-
-
 def load_json(path):
     try:
         with open(path, "r", encoding="utf-8") as f:
@@ -148,6 +115,75 @@ def add_offer(fixtures, key, side, bookmaker, raw_odds, row):
 
 
 
+# ── Incremental scans ──────────────────────────────────────────────────────────
+
+def input_digest(fixture):
+    payload = json.dumps(fixture, sort_keys=True, default=sorted, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ArbState:
+    """
+    Scan results per fixture, keyed by a digest of that fixture's offers.
+
+    Every safety filter and arb check looks at one fixture at a time, so a
+    fixture whose offers are unchanged since the last run gets the same rows.
+    Those rows are reused and only changed fixtures are rescanned. Editing
+    this module or odds_common discards the saved state.
+    """
+
+    def __init__(self, full=False):
+        self.code = module_digest(__file__, odds_common.__file__)
+        self.previous = {}
+        self.results = {}
+        self.rescanned = self.reused = 0
+        if not full and os.path.exists(ARB_STATE_PATH):
+            try:
+                with open(ARB_STATE_PATH, "r", encoding="utf-8") as f:
+                    state = json.load(f)
+                if state.get("code") == self.code:
+                    self.previous = state.get("scans") or {}
+            except Exception as e:
+                print(f"Arbitrage state unreadable, rescanning everything: {e}")
+
+    def scan(self, name, data, evaluate):
+        """
+        evaluate({fixture id: fixture}) for every fixture in data, in order.
+
+        Fixtures whose input digest matches the last run return the stored
+        result instead. evaluate may modify the fixture; it is digested first.
+        """
+        previous = self.previous.get(name) or {}
+        current = self.results.setdefault(name, {})
+        results = []
+
+        for fid, fixture in data.items():
+            digest = input_digest(fixture)
+            stored = previous.get(fid)
+            if stored and stored.get("digest") == digest:
+                result = stored["result"]
+                self.reused += 1
+            else:
+                result = evaluate({fid: fixture})
+                self.rescanned += 1
+            current[fid] = {"digest": digest, "result": result}
+            results.append(result)
+
+        return results
+
+    def save(self):
+        os.makedirs(os.path.dirname(ARB_STATE_PATH), exist_ok=True)
+        tmp = f"{ARB_STATE_PATH}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(
+                {"version": 1, "code": self.code, "scans": self.results},
+                f,
+                ensure_ascii=False,
+                separators=(",", ":"),
+            )
+        os.replace(tmp, ARB_STATE_PATH)
+
+
 # ── Props arbitrage ────────────────────────────────────────────────────────────
 
 PROPS_SOURCES = [
@@ -169,6 +205,14 @@ PROPS_SOURCES = [
 
 
 
+# Outcome keys as seen from a book that lists the fixture the other way round.
+REVERSED_OUTCOMES = {
+    "home": "away",
+    "away": "home",
+    "home_draw": "away_draw",
+    "away_draw": "home_draw",
+}
+
 NAMED_PROPS_FILES = {
     # Existing scope-verified props sources
     "PaddyPower":   "paddypower_worldcup_props.json",
@@ -831,245 +875,205 @@ def validate_named_source_books(data, audit):
         )
 
 
-def scan_props_arbitrage(root):
-    """Scan strictly matched O/U prop markets across bookmakers."""
-    data = {}
-    rejected = {}
+def iter_ou_entries(bk, raw):
+    """
+    Normalise one props source into O/U entries for the odds store.
 
-    def reject(reason):
-        rejected[reason] = rejected.get(reason, 0) + 1
+    Yields (fixture, canonical_market, line, side, offer) for every usable
+    Over/Under offer, or (None, None, None, None, reason) for every offer or
+    market that a safety filter rejected.
+    """
+    if isinstance(raw, list):
+        matches = raw
+    else:
+        matches = raw.get("matches") or []
 
-    for bk, fname, fmt in PROPS_SOURCES:
-        path = os.path.join(root, "football", "data", fname)
-        raw = load_json(path)
-        if not raw:
+    for m in matches:
+        home, away = get_prop_match_teams(m)
+        if not home or not away:
             continue
 
-        matches = raw.get("matches") or []
-        if isinstance(raw, list):
-            matches = raw
+        fk = fixture_key(home, away)
+        for mkt_name, mkt_data in iter_market_items(
+            m,
+            bk,
+        ):
+            if not isinstance(mkt_data, dict):
+                continue
 
-        for m in matches:
-            home, away = get_prop_match_teams(m)
-            if not home or not away:
+            if is_disabled_card_market(mkt_name):
+                yield (
+                    None, None, None, None,
+                    "football card markets disabled from arbitrage",
+                )
                 continue
 
-            fk = fixture_key(home, away)
-            for mkt_name, mkt_data in iter_market_items(
-                m,
-                bk,
+            if bk == "Unibet" and not unibet_ou_market_is_safe(
+                mkt_name,
+                mkt_data,
+                home,
+                away,
             ):
-                if not isinstance(mkt_data, dict):
+                yield (
+                    None, None, None, None,
+                    "Unibet unsupported/player O/U market",
+                )
+                continue
+            sels = mkt_data.get("selections") or []
+
+            for sel in sels:
+                if not isinstance(sel, dict):
                     continue
 
-                if is_disabled_card_market(mkt_name):
-                    reject("football card markets disabled from arbitrage")
+                sn = sel.get("selection", "")
+                odds_raw = sel.get("odds") or sel.get("price", "")
+                side = str(sel.get("side") or "").lower().strip()
+                line = str(sel.get("line") or "").strip()
+
+                if not side or not line:
+                    m2 = re.search(
+                        r"\b(over|under)\s+([\d.]+)\b",
+                        str(sn),
+                        re.I,
+                    )
+                    if m2:
+                        side = m2.group(1).lower()
+                        line = m2.group(2)
+
+                if side not in {"over", "under"} or not line or not odds_raw:
                     continue
 
-                if bk == "Unibet" and not unibet_ou_market_is_safe(
+                identity = resolve_prop_identity(
                     mkt_name,
-                    mkt_data,
+                    sel,
+                    sn,
                     home,
                     away,
-                ):
-                    reject("Unibet unsupported/player O/U market")
-                    continue
-                sels = mkt_data.get("selections") or []
-
-                for sel in sels:
-                    if not isinstance(sel, dict):
-                        continue
+                )
 
-                    sn = sel.get("selection", "")
-                    odds_raw = sel.get("odds") or sel.get("price", "")
-                    side = str(sel.get("side") or "").lower().strip()
-                    line = str(sel.get("line") or "").strip()
+                if not identity or identity[0] is None:
+                    reason = (
+                        identity[1]
+                        if identity and len(identity) > 1
+                        else "unresolved market identity"
+                    )
+                    yield None, None, None, None, reason
+                    continue
 
-                    if not side or not line:
-                        m2 = re.search(
-                            r"\b(over|under)\s+([\d.]+)\b",
-                            str(sn),
-                            re.I,
+                (
+                    canonical_mk,
+                    display_name,
+                    scope,
+                    scope_team,
+                    metric,
+                ) = identity
+
+                # Ladbrokes currently emits an impossible number of
+                # aggregate Shots/SOT Over rows, including prices such as
+                # 25/1 for Over 1.5 team SOT. Keep its separately captured
+                # Unders available, but quarantine aggregate Over rows until
+                # the source scraper's threshold/price mapping is repaired.
+                if (
+                    bk == "Ladbrokes"
+                    and side == "over"
+                    and (
+                        canonical_mk == "match_shots"
+                        or canonical_mk == "match_shots_on_target"
+                        or canonical_mk.startswith("team_shots::")
+                        or canonical_mk.startswith(
+                            "team_shots_on_target::"
                         )
-                        if m2:
-                            side = m2.group(1).lower()
-                            line = m2.group(2)
-
-                    if side not in {"over", "under"} or not line or not odds_raw:
-                        continue
-
-                    identity = resolve_prop_identity(
-                        mkt_name,
-                        sel,
-                        sn,
-                        home,
-                        away,
                     )
+                ):
+                    yield (
+                        None, None, None, None,
+                        "Ladbrokes aggregate Shots/SOT Over parser quarantine",
+                    )
+                    continue
 
-                    if not identity or identity[0] is None:
-                        reason = (
-                            identity[1]
-                            if identity and len(identity) > 1
-                            else "unresolved market identity"
-                        )
-                        reject(reason)
-                        continue
+                quarantine_reason = should_quarantine_offer(
+                    bk,
+                    canonical_mk,
+                    line,
+                )
+                if quarantine_reason:
+                    yield None, None, None, None, quarantine_reason
+                    continue
 
-                    (
-                        canonical_mk,
-                        display_name,
-                        scope,
-                        scope_team,
-                        metric,
-                    ) = identity
-
-                    # Ladbrokes currently emits an impossible number of
-                    # aggregate Shots/SOT Over rows, including prices such as
-                    # 25/1 for Over 1.5 team SOT. Keep its separately captured
-                    # Unders available, but quarantine aggregate Over rows until
-                    # the source scraper's threshold/price mapping is repaired.
-                    if (
-                        bk == "Ladbrokes"
-                        and side == "over"
-                        and (
-                            canonical_mk == "match_shots"
-                            or canonical_mk == "match_shots_on_target"
-                            or canonical_mk.startswith("team_shots::")
-                            or canonical_mk.startswith(
-                                "team_shots_on_target::"
-                            )
-                        )
-                    ):
-                        reject(
-                            "Ladbrokes aggregate Shots/SOT Over parser quarantine"
-                        )
-                        continue
+                dec = fractional_to_decimal(odds_raw)
+                if not dec or dec <= 1:
+                    continue
 
-                    quarantine_reason = should_quarantine_offer(
-                        bk,
-                        canonical_mk,
-                        line,
-                    )
-                    if quarantine_reason:
-                        reject(quarantine_reason)
-                        continue
+                offer = {
+                    "bookmaker": bk,
+                    "odds": odds_raw,
+                    "decimal": dec,
+                    "match": f"{home} v {away}",
+                    "market": display_name,
+                    "source_market": mkt_name,
+                    "scope": scope,
+                    "scope_team": scope_team,
+                    "metric": metric,
+                    "source_url": (
+                        m.get("source_url")
+                        or m.get("url")
+                        or ""
+                    ),
+                }
 
-                    dec = fractional_to_decimal(odds_raw)
-                    if not dec or dec <= 1:
-                        continue
+                yield fk, canonical_mk, line, side, offer
 
-                    offer = {
-                        "bookmaker": bk,
-                        "odds": odds_raw,
-                        "decimal": dec,
-                        "match": f"{home} v {away}",
-                        "market": display_name,
-                        "source_market": mkt_name,
-                        "scope": scope,
-                        "scope_team": scope_team,
-                        "metric": metric,
-                        "source_url": (
-                            m.get("source_url")
-                            or m.get("url")
-                            or ""
-                        ),
-                    }
-
-                    data.setdefault(fk, {}).setdefault(
-                        canonical_mk, {}
-                    ).setdefault(line, {}).setdefault(side, []).append(offer)
 
-    validate_ou_source_books(data, rejected)
-    remove_duplicate_match_team_ladders(data, rejected)
+def load_props_ou_offers(root, rejected):
+    """
+    Return O/U offers for every props source, in source order.
 
-    arbs = []
-    near_misses = []
+    Offers come from the odds store, which only re-normalises a props file
+    when it (or this module, or odds_common) has changed since the last run.
+    Rejection counts are added to rejected.
+    """
+    sources = [
+        (bk, os.path.join(root, "football", "data", fname))
+        for bk, fname, _ in PROPS_SOURCES
+    ]
+    paths = [path for _, path in sources]
 
-    for fk, markets in data.items():
-        for canonical_mk, lines in markets.items():
-            for line, sides in lines.items():
-                overs = sides.get("over") or []
-                unders = sides.get("under") or []
-                if not overs or not unders:
-                    continue
+    with OddsStore(os.path.join(root, "data", "football_odds.sqlite")) as store:
+        store.refresh(
+            sources,
+            iter_ou_entries,
+            module_digest(__file__, odds_common.__file__),
+        )
+        counts = store.reject_counts(paths)
+        offers = list(store.offers(paths))
 
-                pairs = [
-                    (over, under)
-                    for over in overs
-                    for under in unders
-                    if over["bookmaker"] != under["bookmaker"]
-                ]
-                if not pairs:
-                    continue
+    for reason, count in counts.items():
+        rejected[reason] = rejected.get(reason, 0) + count
+    return offers
 
-                best_over, best_under = min(
-                    pairs,
-                    key=lambda pair: (
-                        (1 / pair[0]["decimal"])
-                        + (1 / pair[1]["decimal"])
-                    ),
-                )
 
-                arb_sum = (
-                    (1 / best_over["decimal"])
-                    + (1 / best_under["decimal"])
-                )
+def scan_props_arbitrage(root, resolver=None, state=None):
+    """Scan strictly matched O/U prop markets across bookmakers."""
+    resolver = resolver or FixtureResolver()
+    state = state or ArbState(full=True)
+    data = {}
+    rejected = {}
 
-                row = {
-                    "sport": "Football",
-                    "competition": "FIFA World Cup",
-                    "type": "props_ou",
-                    "match": best_over["match"],
-                    "market": best_over["market"],
-                    "canonical_market": canonical_mk,
-                    "scope": best_over["scope"],
-                    "scope_team": best_over["scope_team"],
-                    "line": line,
-                    "arb_sum": round(arb_sum, 6),
-                    "arb_percent": round(arb_sum * 100, 3),
-                    "profit_margin_percent": round(
-                        ((1 / arb_sum) - 1) * 100,
-                        3,
-                    ),
-                    "bookmaker_count": 2,
-                    "selections": {
-                        "over": {
-                            "bookmaker": best_over["bookmaker"],
-                            "odds": best_over["odds"],
-                            "decimal_odds": best_over["decimal"],
-                            "source_market": best_over["source_market"],
-                            "source_url": best_over.get("source_url", ""),
-                        },
-                        "under": {
-                            "bookmaker": best_under["bookmaker"],
-                            "odds": best_under["odds"],
-                            "decimal_odds": best_under["decimal"],
-                            "source_market": best_under["source_market"],
-                            "source_url": best_under.get("source_url", ""),
-                        },
-                    },
-                    "all_prices": {
-                        "over": sorted(
-                            overs,
-                            key=lambda x: x["decimal"],
-                            reverse=True,
-                        ),
-                        "under": sorted(
-                            unders,
-                            key=lambda x: x["decimal"],
-                            reverse=True,
-                        ),
-                    },
-                }
+    for fk, canonical_mk, line, side, offer in load_props_ou_offers(root, rejected):
+        # O/U markets carry no home/away side, so orientation does not matter.
+        fid, _ = resolver.resolve(*fk.split("__", 1))
+        data.setdefault(fid, {}).setdefault(
+            canonical_mk, {}
+        ).setdefault(line, {}).setdefault(side, []).append(offer)
 
-                if _arb_sum_is_publishable(arb_sum):
-                    arbs.append(row)
-                elif arb_sum < MIN_PUBLISHED_ARB_SUM:
-                    reject(
-                        "arb above maximum safe profit margin"
-                    )
-                elif arb_sum < 1.04:
-                    near_misses.append(row)
+    arbs = []
+    near_misses = []
+
+    for result in state.scan("props_ou", data, evaluate_ou_props):
+        arbs.extend(result["arbs"])
+        near_misses.extend(result["near_misses"])
+        for reason, count in result["rejected"].items():
+            rejected[reason] = rejected.get(reason, 0) + count
 
     arbs.sort(
         key=lambda x: x["profit_margin_percent"],
@@ -1085,6 +1089,100 @@ def scan_props_arbitrage(root):
     return arbs, near_misses
 
 
+def evaluate_ou_props(data):
+    """O/U arbs, near misses and safety rejections for the fixtures in data."""
+    rejected = {}
+
+    def reject(reason):
+        rejected[reason] = rejected.get(reason, 0) + 1
+
+    validate_ou_source_books(data, rejected)
+    remove_duplicate_match_team_ladders(data, rejected)
+
+    arbs = []
+    near_misses = []
+
+    groups = [
+        (canonical_mk, line, sides.get("over"), sides.get("under"))
+        for markets in data.values()
+        for canonical_mk, lines in markets.items()
+        for line, sides in lines.items()
+        if sides.get("over") and sides.get("under")
+    ]
+    best_pairs = _best_two_way_pairs(
+        [(overs, unders) for _, _, overs, unders in groups]
+    )
+
+    for (canonical_mk, line, overs, unders), pair in zip(groups, best_pairs):
+        if pair is None:
+            continue
+
+        best_over, best_under = pair
+
+        arb_sum = (
+            (1 / best_over["decimal"])
+            + (1 / best_under["decimal"])
+        )
+
+        row = {
+            "sport": "Football",
+            "competition": "FIFA World Cup",
+            "type": "props_ou",
+            "match": best_over["match"],
+            "market": best_over["market"],
+            "canonical_market": canonical_mk,
+            "scope": best_over["scope"],
+            "scope_team": best_over["scope_team"],
+            "line": line,
+            "arb_sum": round(arb_sum, 6),
+            "arb_percent": round(arb_sum * 100, 3),
+            "profit_margin_percent": round(
+                ((1 / arb_sum) - 1) * 100,
+                3,
+            ),
+            "bookmaker_count": 2,
+            "selections": {
+                "over": {
+                    "bookmaker": best_over["bookmaker"],
+                    "odds": best_over["odds"],
+                    "decimal_odds": best_over["decimal"],
+                    "source_market": best_over["source_market"],
+                    "source_url": best_over.get("source_url", ""),
+                },
+                "under": {
+                    "bookmaker": best_under["bookmaker"],
+                    "odds": best_under["odds"],
+                    "decimal_odds": best_under["decimal"],
+                    "source_market": best_under["source_market"],
+                    "source_url": best_under.get("source_url", ""),
+                },
+            },
+            "all_prices": {
+                "over": sorted(
+                    overs,
+                    key=lambda x: x["decimal"],
+                    reverse=True,
+                ),
+                "under": sorted(
+                    unders,
+                    key=lambda x: x["decimal"],
+                    reverse=True,
+                ),
+            },
+        }
+
+        if _arb_sum_is_publishable(arb_sum):
+            arbs.append(row)
+        elif arb_sum < MIN_PUBLISHED_ARB_SUM:
+            reject(
+                "arb above maximum safe profit margin"
+            )
+        elif arb_sum < 1.04:
+            near_misses.append(row)
+
+    return {"arbs": arbs, "near_misses": near_misses, "rejected": rejected}
+
+
 
 def get_prop_match_teams(match):
     """Support both the common props schema and Midnite's home/away schema."""
@@ -1611,13 +1709,132 @@ def _best_two_way_pair(first, second):
     )
 
 
+def _best_two_way_pairs(groups):
+    """
+    _best_two_way_pair for many (first, second) offer lists at once.
+
+    The whole offer book is held as flat NumPy arrays, so the cost is
+    linear in the number of offers rather than in over x under pairs. For
+    each group only the best price per bookmaker on the second side and the
+    best two different bookmakers are needed to find the minimum sum; ties are
+    then resolved exactly as the pairwise scan would, by first position in
+    the input lists.
+    """
+    if not groups:
+        return []
+
+    book_ids = {}
+
+    def flatten(side):
+        sizes = [len(group[side]) for group in groups]
+        offers = [offer for group in groups for offer in group[side]]
+        group_of = np.repeat(np.arange(len(groups)), sizes)
+        books = np.fromiter(
+            (
+                book_ids.setdefault(offer["bookmaker"], len(book_ids))
+                for offer in offers
+            ),
+            dtype=np.int64,
+            count=len(offers),
+        )
+        inverse = 1 / np.fromiter(
+            (offer["decimal"] for offer in offers),
+            dtype=np.float64,
+            count=len(offers),
+        )
+        starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+        return group_of, books, inverse, starts
+
+    g1, b1, inv1, starts1 = flatten(0)
+    g2, b2, inv2, starts2 = flatten(1)
+    n_groups = len(groups)
+    n_books = max(len(book_ids), 1)
+
+    # Best second-side price per (group, bookmaker).
+    keys = g2 * n_books + b2
+    order = np.lexsort((inv2, keys))
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = keys[order][1:] != keys[order][:-1]
+    book_best = inv2[order][first]
+    book_group = keys[order][first] // n_books
+    book_book = keys[order][first] % n_books
+
+    # Best two bookmakers per group on the second side.
+    order = np.lexsort((book_best, book_group))
+    book_best = book_best[order]
+    book_group = book_group[order]
+    book_book = book_book[order]
+    lead = np.ones(len(order), dtype=bool)
+    lead[1:] = book_group[1:] != book_group[:-1]
+
+    top1 = np.full(n_groups, np.inf)
+    top1_book = np.full(n_groups, -1, dtype=np.int64)
+    top2 = np.full(n_groups, np.inf)
+    top1[book_group[lead]] = book_best[lead]
+    top1_book[book_group[lead]] = book_book[lead]
+    runner_up = np.zeros(len(order), dtype=bool)
+    runner_up[1:] = lead[:-1] & ~lead[1:]
+    top2[book_group[runner_up]] = book_best[runner_up]
+
+    # Cheapest cross-book partner for every first-side offer.
+    partner = np.where(b1 == top1_book[g1], top2[g1], top1[g1])
+    sums = inv1 + partner
+    best = np.full(n_groups, np.inf)
+    np.minimum.at(best, g1, sums)
+
+    hits = np.flatnonzero(np.isfinite(sums) & (sums == best[g1]))
+    hit_groups, at = np.unique(g1[hits], return_index=True)
+    chosen1 = hits[at]
+
+    chosen_inv = np.full(n_groups, np.nan)
+    chosen_book = np.full(n_groups, -1, dtype=np.int64)
+    chosen_inv[hit_groups] = inv1[chosen1]
+    chosen_book[hit_groups] = b1[chosen1]
+
+    matches = np.flatnonzero(
+        (b2 != chosen_book[g2]) & (chosen_inv[g2] + inv2 == best[g2])
+    )
+    match_groups, at = np.unique(g2[matches], return_index=True)
+    chosen2 = dict(zip(match_groups.tolist(), matches[at].tolist()))
+
+    pairs = [None] * n_groups
+    for group, index1 in zip(hit_groups.tolist(), chosen1.tolist()):
+        index2 = chosen2[group]
+        pairs[group] = (
+            groups[group][0][index1 - starts1[group]],
+            groups[group][1][index2 - starts2[group]],
+        )
+    return pairs
+
+
+def _top_two_bookmaker_offers(offers):
+    """Best offer of each of the two best bookmakers, in original order."""
+    best = {}
+    for index, offer in enumerate(offers):
+        inverse = 1 / offer["decimal"]
+        current = best.get(offer["bookmaker"])
+        if current is None or inverse < current[0]:
+            best[offer["bookmaker"]] = (inverse, index)
+
+    keep = sorted(best.values())[:2]
+    return [offers[index] for index in sorted(index for _, index in keep)]
+
+
 def _best_multiway_combo(outcome_lists):
     """
     Pick one offer per outcome, requiring at least two different bookmakers.
+
+    An optimal combo only ever needs each outcome's best offer from its best
+    or second-best bookmaker: any other choice can be swapped for one of
+    those two without raising the sum or collapsing to a single bookmaker.
+    So the product runs over at most two offers per outcome.
     """
     combos = [
         combo
-        for combo in product(*outcome_lists)
+        for combo in product(*[
+            _top_two_bookmaker_offers(offers)
+            for offers in outcome_lists
+        ])
         if len({offer["bookmaker"] for offer in combo}) >= 2
     ]
     if not combos:
@@ -1719,7 +1936,107 @@ def validate_double_chance_source_triplets(data, audit):
                 )
 
 
-def scan_named_prop_arbitrage(root):
+def iter_named_entries(bk, raw):
+    """
+    Odds store normaliser for BTTS, Double Chance and Half Time Result.
+
+    Each match yields a "fixture" entry carrying its match name and teams,
+    followed by its offers keyed by outcome as this book lists the fixture.
+    Outcomes are swapped for reversed books when the entries are read back.
+    """
+    matches = raw if isinstance(raw, list) else raw.get("matches") or []
+
+    for match in matches:
+        if not isinstance(match, dict):
+            continue
+
+        home, away = get_prop_match_teams(match)
+        if not home or not away:
+            continue
+
+        fk = fixture_key(home, away)
+        match_name = match.get("match") or f"{home} v {away}"
+        yield fk, "fixture", "", "", {
+            "match": match_name,
+            "home": home,
+            "away": away,
+        }
+
+        for market_name, market in iter_market_items(match, bk):
+            if _is_standard_btts_market(market_name):
+                market_key = "btts"
+                labels = {"yes": "Yes", "no": "No"}
+            elif normalize_key(market_name) == "double_chance":
+                market_key = "double_chance"
+                labels = {
+                    "home_draw": f"{home} or Draw",
+                    "away_draw": f"{away} or Draw",
+                    "home_away": f"{home} or {away}",
+                }
+            elif _is_half_time_result_market(market_name):
+                market_key = "half_time_result"
+                labels = {
+                    "home": home,
+                    "draw": "Draw",
+                    "away": away,
+                }
+            else:
+                continue
+
+            for selection in market.get("selections") or []:
+                if not isinstance(selection, dict):
+                    continue
+
+                if market_key == "btts":
+                    outcome = resolve_btts_outcome(selection)
+                elif market_key == "double_chance":
+                    outcome = resolve_double_chance_outcome(
+                        selection, home, away
+                    )
+                else:
+                    outcome = resolve_three_way_outcome(
+                        selection, home, away
+                    )
+                if not outcome:
+                    continue
+
+                offer = _selection_offer(
+                    bk,
+                    selection.get("odds") or selection.get("price"),
+                    match_name,
+                    market_name,
+                    labels[outcome],
+                )
+                if offer:
+                    yield fk, market_key, "", outcome, offer
+
+
+def load_named_prop_entries(root):
+    """
+    Return [(bookmaker, entries)] for every named props source, in source order.
+
+    As with load_props_ou_offers, a props file is only re-normalised when it
+    has changed since the last run.
+    """
+    sources = [
+        (bk, os.path.join(root, "football", "data", fname))
+        for bk, fname in NAMED_PROPS_FILES.items()
+    ]
+
+    with OddsStore(os.path.join(root, "data", "football_odds.sqlite")) as store:
+        store.refresh(
+            sources,
+            iter_named_entries,
+            module_digest(__file__, odds_common.__file__),
+            kind="named",
+        )
+        return [
+            (bk, list(store.offers([path], kind="named")))
+            for bk, path in sources
+        ]
+
+
+def scan_named_prop_arbitrage(root, resolver=None, state=None):
     """
     Scan:
       - Both Teams To Score (Yes / No)
@@ -1730,130 +2047,76 @@ def scan_named_prop_arbitrage(root):
         total stake for £1 guaranteed return
         = 0.5 * (1/d_1X + 1/d_X2 + 1/d_12)
     """
+    resolver = resolver or FixtureResolver()
+    state = state or ArbState(full=True)
     data = {}
     audit = {}
 
-    for bookmaker, filename in NAMED_PROPS_FILES.items():
-        path = os.path.join(root, "football", "data", filename)
-        raw = load_json(path)
-        if not raw:
-            audit[bookmaker] = {"matches": 0, "offers": 0}
-            continue
-
-        matches = raw.get("matches") or []
-        if isinstance(raw, list):
-            matches = raw
-
+    for bookmaker, entries in load_named_prop_entries(root):
         offers_added = 0
         matches_seen = 0
-
-        for match in matches:
-            if not isinstance(match, dict):
-                continue
-
-            home, away = get_prop_match_teams(match)
-            if not home or not away:
+        book_fixtures = {}
+
+        for fk, market_key, _, outcome, offer in entries:
+            if market_key == "fixture":
+                matches_seen += 1
+                home, away = offer["home"], offer["away"]
+                fid, reversed_teams = resolver.resolve(home, away)
+                book_fixtures[fk] = (fid, reversed_teams)
+
+                data.setdefault(fid, {
+                    "match": f"{away} v {home}" if reversed_teams else offer["match"],
+                    "home": away if reversed_teams else home,
+                    "away": home if reversed_teams else away,
+                    "btts": {"yes": [], "no": []},
+                    "double_chance": {
+                        "home_draw": [],
+                        "away_draw": [],
+                        "home_away": [],
+                    },
+                    "half_time_result": {
+                        "home": [],
+                        "draw": [],
+                        "away": [],
+                    },
+                })
                 continue
 
-            matches_seen += 1
-            fk = fixture_key(home, away)
-            match_name = match.get("match") or f"{home} v {away}"
-
-            fixture = data.setdefault(fk, {
-                "match": match_name,
-                "home": home,
-                "away": away,
-                "btts": {"yes": [], "no": []},
-                "double_chance": {
-                    "home_draw": [],
-                    "away_draw": [],
-                    "home_away": [],
-                },
-                "half_time_result": {
-                    "home": [],
-                    "draw": [],
-                    "away": [],
-                },
-            })
-
-            for market_name, market in iter_market_items(match, bookmaker):
-                selections = market.get("selections") or []
-
-                if _is_standard_btts_market(market_name):
-                    for selection in selections:
-                        if not isinstance(selection, dict):
-                            continue
-                        outcome = resolve_btts_outcome(selection)
-                        if not outcome:
-                            continue
-                        offer = _selection_offer(
-                            bookmaker,
-                            selection.get("odds") or selection.get("price"),
-                            match_name,
-                            market_name,
-                            "Yes" if outcome == "yes" else "No",
-                        )
-                        if offer:
-                            fixture["btts"][outcome].append(offer)
-                            offers_added += 1
-                    continue
-
-                if normalize_key(market_name) == "double_chance":
-                    labels = {
-                        "home_draw": f"{home} or Draw",
-                        "away_draw": f"{away} or Draw",
-                        "home_away": f"{home} or {away}",
-                    }
-                    for selection in selections:
-                        if not isinstance(selection, dict):
-                            continue
-                        outcome = resolve_double_chance_outcome(
-                            selection, home, away
-                        )
-                        if not outcome:
-                            continue
-                        offer = _selection_offer(
-                            bookmaker,
-                            selection.get("odds") or selection.get("price"),
-                            match_name,
-                            market_name,
-                            labels[outcome],
-                        )
-                        if offer:
-                            fixture["double_chance"][outcome].append(offer)
-                            offers_added += 1
-                    continue
-
-                if _is_half_time_result_market(market_name):
-                    labels = {
-                        "home": home,
-                        "draw": "Draw",
-                        "away": away,
-                    }
-                    for selection in selections:
-                        if not isinstance(selection, dict):
-                            continue
-                        outcome = resolve_three_way_outcome(
-                            selection, home, away
-                        )
-                        if not outcome:
-                            continue
-                        offer = _selection_offer(
-                            bookmaker,
-                            selection.get("odds") or selection.get("price"),
-                            match_name,
-                            market_name,
-                            labels[outcome],
-                        )
-                        if offer:
-                            fixture["half_time_result"][outcome].append(offer)
-                            offers_added += 1
+            fid, reversed_teams = book_fixtures[fk]
+            if reversed_teams:
+                outcome = REVERSED_OUTCOMES.get(outcome, outcome)
+            data[fid][market_key][outcome].append(offer)
+            offers_added += 1
 
         audit[bookmaker] = {
             "matches": matches_seen,
             "offers": offers_added,
         }
 
+    arbs = []
+    near_misses = []
+
+    for result in state.scan("props_named", data, evaluate_named_props):
+        arbs.extend(result["arbs"])
+        near_misses.extend(result["near_misses"])
+
+    arbs.sort(key=lambda row: row["profit_margin_percent"], reverse=True)
+    near_misses.sort(key=lambda row: row["arb_sum"])
+
+    print("Named props coverage:")
+    for bookmaker, counts in audit.items():
+        print(
+            f"  - {bookmaker}: "
+            f"{counts['matches']} matches, {counts['offers']} offers"
+        )
+
+    return arbs, near_misses
+
+
+def evaluate_named_props(data):
+    """Named-market arbs and near misses for the fixtures in data."""
+    audit = {}
+
     validate_double_chance_source_triplets(data, audit)
     validate_named_source_books(data, audit)
 
@@ -2014,22 +2277,95 @@ def scan_named_prop_arbitrage(root):
             elif arb_sum < 1.04:
                 near_misses.append(row)
 
-    arbs.sort(key=lambda row: row["profit_margin_percent"], reverse=True)
-    near_misses.sort(key=lambda row: row["arb_sum"])
+    return {"arbs": arbs, "near_misses": near_misses}
 
-    print("Named props coverage:")
-    for bookmaker, counts in audit.items():
-        print(
-            f"  - {bookmaker}: "
-            f"{counts['matches']} matches, {counts['offers']} offers"
+def evaluate_moneyline(fixtures):
+    """1X2 arbs and near misses for the fixtures given."""
+    arbs = []
+    near_misses = []
+
+    compared_fixtures = 0
+    skipped_fixtures = 0
+
+    for fixture in fixtures.values():
+        selections = fixture["selections"]
+
+        if not selections["home"] or not selections["draw"] or not selections["away"]:
+            skipped_fixtures += 1
+            continue
+
+        compared_fixtures += 1
+
+        best_home = max(selections["home"], key=lambda x: x["decimal_odds"])
+        best_draw = max(selections["draw"], key=lambda x: x["decimal_odds"])
+        best_away = max(selections["away"], key=lambda x: x["decimal_odds"])
+
+        arb_sum = (
+            (1 / best_home["decimal_odds"])
+            + (1 / best_draw["decimal_odds"])
+            + (1 / best_away["decimal_odds"])
         )
 
-    return arbs, near_misses
+        arb_percent = arb_sum * 100
+        profit_margin_percent = ((1 / arb_sum) - 1) * 100
+
+        row = {
+            "sport": "Football",
+            "competition": fixture["competition"],
+            "type": "moneyline_1x2",
+            "match": fixture["match"],
+            "home_team": fixture["home_team"],
+            "away_team": fixture["away_team"],
+            "date_label": fixture["date_label"],
+            "time": fixture["time"],
+            "market": "Match Odds",
+            "bookmaker_count": len(fixture["bookmakers_seen"]),
+            "arb_sum": round(arb_sum, 6),
+            "arb_percent": round(arb_percent, 3),
+            "profit_margin_percent": round(profit_margin_percent, 3),
+            "selections": {
+                "home": best_home,
+                "draw": best_draw,
+                "away": best_away,
+            },
+            "all_prices": {
+                "home": sorted(selections["home"], key=lambda x: x["decimal_odds"], reverse=True),
+                "draw": sorted(selections["draw"], key=lambda x: x["decimal_odds"], reverse=True),
+                "away": sorted(selections["away"], key=lambda x: x["decimal_odds"], reverse=True),
+            },
+        }
+
+        if _arb_sum_is_publishable(arb_sum):
+            arbs.append(row)
+        elif arb_sum < MIN_PUBLISHED_ARB_SUM:
+            print(
+                "Moneyline arb safety: rejected "
+                f"{fixture['match']} | "
+                f"profit {profit_margin_percent:.3f}%"
+            )
+        else:
+            near_misses.append(row)
+
+    return {
+        "compared": compared_fixtures,
+        "skipped": skipped_fixtures,
+        "arbs": arbs,
+        "near_misses": near_misses,
+    }
+
 
 def main():
+    parser = argparse.ArgumentParser(description="Scan football odds for arbitrage")
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="rescan every fixture, ignoring the saved per-fixture results",
+    )
+    args = parser.parse_args()
+
     fixtures = {}
-    strict_index = {}
-    loose_index = {}
+    resolver = FixtureResolver()
+    state = ArbState(full=args.full)
 
     bookmaker_summary = {}
 
@@ -2056,29 +2392,28 @@ def main():
             if not home or not away or not odds:
                 continue
 
-            strict_key = fixture_key(home, away)
-            loose_key = loose_fixture_key(home, away)
-
-            target_key = None
-
-            if strict_key in strict_index:
-                target_key = strict_index[strict_key]
-            elif loose_key in loose_index:
-                target_key = loose_index[loose_key]
-
-            if not target_key:
-                target_key = strict_key
-
+            target_key, reversed_teams = resolver.resolve(
+                home,
+                away,
+                kickoff_date(row.get("date_label"), row.get("time")),
+            )
+            match_name = row.get("match") or f"{home} v {away}"
+            if reversed_teams:
+                # This book lists the fixture the other way round.
+                home, away = away, home
+                match_name = f"{home} v {away}"
+                odds = {**odds, "home": odds.get("away"), "away": odds.get("home")}
+
+            if target_key not in fixtures:
                 fixtures[target_key] = {
                     "sport": "Football",
                     "competition": row.get("competition") or "FIFA World Cup",
-                    "match": row.get("match") or f"{home} v {away}",
+                    "match": match_name,
                     "home_team": home,
                     "away_team": away,
                     "date_label": row.get("date_label") or "",
                     "time": row.get("time") or "",
-                    "strict_key": strict_key,
-                    "loose_key": loose_key,
+                    "fixture_id": target_key,
                     "selections": {
                         "home": [],
                         "draw": [],
@@ -2087,9 +2422,6 @@ def main():
                     "bookmakers_seen": set(),
                 }
 
-                strict_index[strict_key] = target_key
-                loose_index[loose_key] = target_key
-
             fixtures[target_key]["bookmakers_seen"].add(bookmaker)
 
             add_offer(fixtures, target_key, "home", bookmaker, odds.get("home"), row)
@@ -2112,64 +2444,11 @@ def main():
     compared_fixtures = 0
     skipped_fixtures = 0
 
-    for key, fixture in fixtures.items():
-        selections = fixture["selections"]
-
-        if not selections["home"] or not selections["draw"] or not selections["away"]:
-            skipped_fixtures += 1
-            continue
-
-        compared_fixtures += 1
-
-        best_home = max(selections["home"], key=lambda x: x["decimal_odds"])
-        best_draw = max(selections["draw"], key=lambda x: x["decimal_odds"])
-        best_away = max(selections["away"], key=lambda x: x["decimal_odds"])
-
-        arb_sum = (
-            (1 / best_home["decimal_odds"])
-            + (1 / best_draw["decimal_odds"])
-            + (1 / best_away["decimal_odds"])
-        )
-
-        arb_percent = arb_sum * 100
-        profit_margin_percent = ((1 / arb_sum) - 1) * 100
-
-        row = {
-            "sport": "Football",
-            "competition": fixture["competition"],
-            "type": "moneyline_1x2",
-            "match": fixture["match"],
-            "home_team": fixture["home_team"],
-            "away_team": fixture["away_team"],
-            "date_label": fixture["date_label"],
-            "time": fixture["time"],
-            "market": "Match Odds",
-            "bookmaker_count": len(fixture["bookmakers_seen"]),
-            "arb_sum": round(arb_sum, 6),
-            "arb_percent": round(arb_percent, 3),
-            "profit_margin_percent": round(profit_margin_percent, 3),
-            "selections": {
-                "home": best_home,
-                "draw": best_draw,
-                "away": best_away,
-            },
-            "all_prices": {
-                "home": sorted(selections["home"], key=lambda x: x["decimal_odds"], reverse=True),
-                "draw": sorted(selections["draw"], key=lambda x: x["decimal_odds"], reverse=True),
-                "away": sorted(selections["away"], key=lambda x: x["decimal_odds"], reverse=True),
-            },
-        }
-
-        if _arb_sum_is_publishable(arb_sum):
-            arbitrage.append(row)
-        elif arb_sum < MIN_PUBLISHED_ARB_SUM:
-            print(
-                "Moneyline arb safety: rejected "
-                f"{fixture['match']} | "
-                f"profit {profit_margin_percent:.3f}%"
-            )
-        else:
-            near_misses.append(row)
+    for result in state.scan("moneyline", fixtures, evaluate_moneyline):
+        compared_fixtures += result["compared"]
+        skipped_fixtures += result["skipped"]
+        arbitrage.extend(result["arbs"])
+        near_misses.extend(result["near_misses"])
 
     arbitrage.sort(key=lambda x: x["profit_margin_percent"], reverse=True)
     near_misses.sort(key=lambda x: x["arb_sum"])
@@ -2216,8 +2495,10 @@ def main():
     os.makedirs(os.path.dirname(OUT_PATH), exist_ok=True)
 
     # Props arbitrage
-    ou_props_arbs, ou_props_near_misses = scan_props_arbitrage(ROOT)
-    named_props_arbs, named_props_near_misses = scan_named_prop_arbitrage(ROOT)
+    ou_props_arbs, ou_props_near_misses = scan_props_arbitrage(ROOT, resolver, state)
+    named_props_arbs, named_props_near_misses = scan_named_prop_arbitrage(ROOT, resolver, state)
+    resolver.save()
+    state.save()
 
     props_arbs = ou_props_arbs + named_props_arbs
     props_near_misses = (
@@ -2259,6 +2540,7 @@ def main():
     print(f"Fixtures found: {len(fixtures)}")
     print(f"Fixtures compared: {compared_fixtures}")
     print(f"Fixtures skipped: {skipped_fixtures}")
+    print(f"Fixture scans: {state.rescanned} rescanned, {state.reused} unchanged")
     print(f"Arbitrage opportunities: {len(arbitrage)}")
     print(f"Near misses saved: {min(len(near_misses), 25)}")
     print(f"Saved to: {OUT_PATH}")
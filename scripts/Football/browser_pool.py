@@ -0,0 +1,458 @@
+#!/usr/bin/env python3
+"""
+browser_pool.py
+
+Shared Playwright browser pool for the World Cup props scrapers.
+
+Every props scraper used to launch its own Chromium, open one page and walk
+its fixtures strictly one after another. This module owns the launch, context,
+resource-blocking and cookie logic once, and hands warmed pages to N fixture
+workers per bookmaker.
+
+The existing scrapers are written against the sync Playwright API, so each
+worker runs in its own thread with its own sync_playwright instance. The
+orchestration itself is asyncio based: several bookmakers can be awaited
+together, and each bookmaker is held to its own concurrency cap.
+
+Usage from a scraper:
+
+    from browser_pool import scrape_fixtures
+
+    results, errors = scrape_fixtures(
+        "Bwin",
+        fixtures,
+        scrape_one,
+        headless=HEADLESS,
+    )
+
+scrape_match(page, fixture) functions plug in unchanged. Results come back in
+fixture order; a fixture whose scraper returns None is dropped, and a fixture
+whose scraper raises is reported in errors rather than stopping the run. Each
+error carries the fixture's "position" in the input list, so a scraper that
+writes error rows can put them back in fixture order.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import queue
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+ROOT = Path(__file__).resolve().parents[2]
+
+if str(ROOT / "scripts") not in sys.path:
+    sys.path.insert(0, str(ROOT / "scripts"))
+
+import telemetry  # noqa: E402
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/149.0.0.0 Safari/537.36"
+)
+
+VIEWPORT = {"width": 1700, "height": 1000}
+
+LAUNCH_ARGS = [
+    "--disable-background-networking",
+    "--disable-background-timer-throttling",
+    "--disable-backgrounding-occluded-windows",
+    "--disable-breakpad",
+    "--disable-extensions",
+    "--disable-renderer-backgrounding",
+    "--mute-audio",
+    "--no-first-run",
+]
+
+# Bookmakers rate-limit and occasionally challenge parallel sessions. These
+# caps are the most concurrent fixture pages each book has tolerated in
+# testing; anything not listed gets DEFAULT_MAX_WORKERS.
+BOOK_MAX_WORKERS = {
+    "PaddyPower": 3,
+    "BoyleSports": 3,
+    "BetVictor": 2,
+    "Unibet": 3,
+    "LiveScoreBet": 3,
+    "WilliamHill": 3,
+    "888Sport": 2,
+    "Ladbrokes": 3,
+    "Midnite": 3,
+    "Bwin": 3,
+}
+DEFAULT_MAX_WORKERS = 2
+
+# One semaphore per bookmaker, shared by every pool in this process, so that
+# two scrapers for the same book running together still respect its cap.
+_BOOK_SEMAPHORES: dict[str, threading.BoundedSemaphore] = {}
+_BOOK_SEMAPHORES_LOCK = threading.Lock()
+
+_PRINT_LOCK = threading.Lock()
+
+COOKIE_BUTTON_JS = r"""
+() => {
+    const wanted = new Set([
+        "accept all",
+        "accept all cookies",
+        "accept",
+        "i accept",
+        "agree",
+        "allow all",
+        "continue",
+        "got it",
+        "ok",
+    ]);
+
+    const clean = value =>
+        (value || "")
+            .replace(/\s+/g, " ")
+            .trim()
+            .toLowerCase();
+
+    for (const element of document.querySelectorAll(
+        "button, [role='button'], a"
+    )) {
+        const text = clean(element.innerText);
+        const rect = element.getBoundingClientRect();
+        const style = getComputedStyle(element);
+
+        if (
+            wanted.has(text)
+            && rect.width > 0
+            && rect.height > 0
+            && style.display !== "none"
+            && style.visibility !== "hidden"
+        ) {
+            element.click();
+            return true;
+        }
+    }
+
+    return false;
+}
+"""
+
+
+def log(message: str) -> None:
+    """Print one line without interleaving output from other workers."""
+    with _PRINT_LOCK:
+        print(message, flush=True)
+
+
+def max_workers_for(bookmaker: str) -> int:
+    env_value = os.environ.get(
+        f"PROPS_WORKERS_{bookmaker.upper()}"
+    ) or os.environ.get("PROPS_WORKERS")
+
+    if env_value:
+        try:
+            return max(1, int(env_value))
+        except ValueError:
+            pass
+
+    return BOOK_MAX_WORKERS.get(bookmaker, DEFAULT_MAX_WORKERS)
+
+
+def book_semaphore(bookmaker: str) -> threading.BoundedSemaphore:
+    with _BOOK_SEMAPHORES_LOCK:
+        semaphore = _BOOK_SEMAPHORES.get(bookmaker)
+        if semaphore is None:
+            semaphore = threading.BoundedSemaphore(
+                max_workers_for(bookmaker)
+            )
+            _BOOK_SEMAPHORES[bookmaker] = semaphore
+        return semaphore
+
+
+def block_heavy_resources(route) -> None:
+    if route.request.resource_type in {"image", "media", "font"}:
+        route.abort()
+    else:
+        route.continue_()
+
+
+def accept_cookies(page) -> bool:
+    try:
+        clicked = bool(page.evaluate(COOKIE_BUTTON_JS))
+    except Exception:
+        return False
+
+    if clicked:
+        try:
+            page.wait_for_timeout(250)
+        except Exception:
+            pass
+
+    return clicked
+
+
+class PoolWorker:
+    """One thread-owned Playwright browser, context and warmed page."""
+
+    def __init__(
+        self,
+        bookmaker: str,
+        index: int,
+        headless: bool,
+        warm_url: str,
+        context_options: dict | None,
+        route_handler: Callable | None,
+    ) -> None:
+        self.bookmaker = bookmaker
+        self.index = index
+        self.headless = headless
+        self.warm_url = warm_url
+        self.context_options = context_options or {}
+        self.route_handler = route_handler
+
+        self.playwright = None
+        self.browser = None
+        self.context = None
+        self.page = None
+
+    @property
+    def label(self) -> str:
+        return f"{self.bookmaker}#{self.index}"
+
+    def start(self) -> None:
+        from playwright.sync_api import sync_playwright
+
+        self.playwright = sync_playwright().start()
+        self.browser = self.playwright.chromium.launch(
+            headless=self.headless,
+            args=LAUNCH_ARGS,
+        )
+
+        options = {
+            "viewport": VIEWPORT,
+            "user_agent": USER_AGENT,
+            "locale": "en-GB",
+        }
+        options.update(self.context_options)
+
+        self.context = self.browser.new_context(**options)
+        telemetry.watch_context(self.context)
+        if self.route_handler is not None:
+            self.context.route("**/*", self.route_handler)
+
+        self.page = self.new_page()
+
+    def new_page(self):
+        page = self.context.new_page()
+
+        if self.warm_url:
+            try:
+                page.goto(
+                    self.warm_url,
+                    wait_until="domcontentloaded",
+                    timeout=60000,
+                )
+                accept_cookies(page)
+            except Exception as error:
+                log(f"  [{self.label}] warm-up failed: {error}")
+
+        return page
+
+    def reset_page(self) -> None:
+        """Replace the working page after a fixture error.
+
+        Cookies and storage live on the context, so the fresh page stays
+        warmed. Any extra pages the failed scraper left open are closed.
+        """
+        for page in list(self.context.pages):
+            try:
+                page.close()
+            except Exception:
+                pass
+
+        self.page = self.new_page()
+
+    def stop(self) -> None:
+        for resource in (self.context, self.browser):
+            if resource is None:
+                continue
+            try:
+                resource.close()
+            except Exception:
+                pass
+
+        if self.playwright is not None:
+            try:
+                self.playwright.stop()
+            except Exception:
+                pass
+
+
+def _run_worker(
+    worker: PoolWorker,
+    jobs: queue.Queue,
+    results: dict[int, Any],
+    errors: list[dict],
+    scrape_match: Callable,
+    semaphore: threading.BoundedSemaphore,
+) -> None:
+    with semaphore:
+        try:
+            worker.start()
+        except Exception as error:
+            log(f"  [{worker.label}] browser launch failed: {error}")
+            worker.stop()
+            # Leave remaining jobs for the workers that did start.
+            return
+
+        try:
+            while True:
+                try:
+                    position, fixture = jobs.get_nowait()
+                except queue.Empty:
+                    break
+
+                started = time.perf_counter()
+                name = fixture_name(fixture)
+
+                try:
+                    result = scrape_match(worker.page, fixture)
+                except KeyboardInterrupt:
+                    raise
+                except Exception as error:
+                    errors.append(
+                        {
+                            "position": position,
+                            "match": name,
+                            "url": fixture.get("url", "")
+                            if isinstance(fixture, dict)
+                            else "",
+                            "error": f"{type(error).__name__}: {error}",
+                            "worker": worker.label,
+                        }
+                    )
+                    log(
+                        f"  [{worker.label}] ERROR {name}: "
+                        f"{type(error).__name__}: {error}"
+                    )
+                    try:
+                        worker.reset_page()
+                    except Exception:
+                        pass
+                    continue
+
+                if result is not None:
+                    results[position] = result
+
+                log(
+                    f"  [{worker.label}] done {name} "
+                    f"in {time.perf_counter() - started:.1f}s"
+                )
+        finally:
+            worker.stop()
+
+
+def fixture_name(fixture: Any) -> str:
+    if not isinstance(fixture, dict):
+        return str(fixture)
+
+    return str(
+        fixture.get("match")
+        or fixture.get("name")
+        or fixture.get("url")
+        or ""
+    )
+
+
+async def scrape_fixtures_async(
+    bookmaker: str,
+    fixtures: list,
+    scrape_match: Callable,
+    *,
+    workers: int | None = None,
+    headless: bool = True,
+    warm_url: str = "",
+    context_options: dict | None = None,
+    route_handler: Callable | None = block_heavy_resources,
+) -> tuple[list, list[dict]]:
+    """Scrape fixtures concurrently with warmed pages for one bookmaker.
+
+    Returns (results, errors). results keeps the input fixture order.
+    """
+    if not fixtures:
+        return [], []
+
+    cap = max_workers_for(bookmaker)
+    worker_count = min(workers or cap, cap, len(fixtures))
+
+    jobs: queue.Queue = queue.Queue()
+    for position, fixture in enumerate(fixtures):
+        jobs.put((position, fixture))
+
+    results: dict[int, Any] = {}
+    errors: list[dict] = []
+    semaphore = book_semaphore(bookmaker)
+
+    log(
+        f"{bookmaker}: {len(fixtures)} fixture(s) across "
+        f"{worker_count} worker(s) (cap {cap})"
+    )
+
+    pool = [
+        PoolWorker(
+            bookmaker,
+            index,
+            headless,
+            warm_url,
+            context_options,
+            route_handler,
+        )
+        for index in range(1, worker_count + 1)
+    ]
+
+    await asyncio.gather(
+        *(
+            asyncio.to_thread(
+                _run_worker,
+                worker,
+                jobs,
+                results,
+                errors,
+                scrape_match,
+                semaphore,
+            )
+            for worker in pool
+        )
+    )
+
+    # Fixtures never picked up (every browser failed to launch).
+    while True:
+        try:
+            position, fixture = jobs.get_nowait()
+        except queue.Empty:
+            break
+        errors.append(
+            {
+                "position": position,
+                "match": fixture_name(fixture),
+                "error": "no browser worker available",
+            }
+        )
+
+    return [results[key] for key in sorted(results)], errors
+
+
+def scrape_fixtures(
+    bookmaker: str,
+    fixtures: list,
+    scrape_match: Callable,
+    **options,
+) -> tuple[list, list[dict]]:
+    """Blocking wrapper around scrape_fixtures_async for plain scripts."""
+    return asyncio.run(
+        scrape_fixtures_async(
+            bookmaker,
+            fixtures,
+            scrape_match,
+            **options,
+        )
+    )
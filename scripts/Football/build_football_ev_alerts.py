@@ -1,12 +1,28 @@
 #!/usr/bin/env python3
 # FOOTBALL_EV_BALANCED_PROPS_V4
+import argparse
 import json
 import os
-import re
+import sys
 from datetime import datetime, timezone
 
+import numpy as np
+
 ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
 
+if os.path.join(ROOT, "scripts") not in sys.path:
+    sys.path.insert(0, os.path.join(ROOT, "scripts"))
+
+from fair_prices import (  # noqa: E402
+    METHODS as DEVIG_METHODS,
+    consensus,
+    devig,
+    ev_percent,
+    implied_probabilities,
+)
+from fixture_ids import FixtureResolver, kickoff_date  # noqa: E402
+from odds_common import fractional_to_decimal, nearest_fractional  # noqa: E402
+
 BOOK_FILES = {
     "PaddyPower": os.path.join(ROOT, "football", "data", "paddypower_worldcup_moneylines.json"),
     "BoyleSports": os.path.join(ROOT, "football", "data", "boylesports_worldcup_moneylines.json"),
@@ -24,88 +40,6 @@ MIN_EV_PERCENT = 20.0
 MIN_BOOKMAKERS_FOR_FAIR_PRICE = 3
 
 
-def fractional_to_decimal(value):
-    value = str(value or "").strip().upper()
-
-    if value in {"EVS", "EVENS", "EVEN"}:
-        return 2.0
-
-    if "/" in value:
-        try:
-            num, den = value.split("/", 1)
-            return round((float(num) / float(den)) + 1, 6)
-        except Exception:
-            return None
-
-    try:
-        decimal = float(value)
-        if decimal > 1:
-            return decimal
-    except Exception:
-        pass
-
-    return None
-
-
-def decimal_to_fractional(decimal_odds):
-    if not decimal_odds or decimal_odds <= 1:
-        return ""
-
-    frac = decimal_odds - 1
-
-    # Simple readable approximation.
-    common = [
-        (1, 20), (1, 16), (1, 14), (1, 12), (1, 10), (1, 8), (1, 7),
-        (1, 6), (1, 5), (2, 9), (1, 4), (2, 7), (3, 10), (1, 3),
-        (4, 11), (2, 5), (4, 9), (1, 2), (8, 15), (4, 7), (8, 13),
-        (4, 6), (8, 11), (4, 5), (5, 6), (10, 11), (1, 1), (11, 10),
-        (6, 5), (5, 4), (11, 8), (6, 4), (13, 8), (7, 4), (15, 8),
-        (2, 1), (21, 10), (11, 5), (9, 4), (12, 5), (5, 2), (13, 5),
-        (11, 4), (3, 1), (10, 3), (7, 2), (4, 1), (9, 2), (5, 1),
-        (11, 2), (6, 1), (7, 1), (8, 1), (9, 1), (10, 1), (11, 1),
-        (12, 1), (14, 1), (16, 1), (20, 1), (25, 1), (28, 1), (33, 1),
-        (40, 1), (50, 1), (60, 1),
-    ]
-
-    best = min(common, key=lambda x: abs((x[0] / x[1]) - frac))
-    if best == (1, 1):
-        return "EVS"
-
-    return f"{best[0]}/{best[1]}"
-
-
-def normalize_team(name):
-    name = str(name or "").lower().strip()
-
-    replacements = {
-        "türkiye": "turkiye",
-        "turkey": "turkiye",
-        "czech republic": "czechia",
-        "bosnia & herzegovina": "bosnia",
-        "bosnia and herzegovina": "bosnia",
-        "cape verde islands": "cape verde",
-        "congo dr": "dr congo",
-        "curaçao": "curacao",
-    }
-
-    for old, new in replacements.items():
-        name = name.replace(old, new)
-
-    name = re.sub(r"[^a-z0-9]+", " ", name)
-    name = re.sub(r"\s+", " ", name).strip()
-
-    return name
-
-
-def fixture_key(home, away):
-    return f"{normalize_team(home)}__{normalize_team(away)}"
-
-
-def loose_fixture_key(home, away):
-    teams = sorted([normalize_team(home), normalize_team(away)])
-    return "__".join(teams)
-
-
 def load_json(path):
     try:
         with open(path, "r", encoding="utf-8") as f:
@@ -128,58 +62,72 @@ def add_offer(fixtures, key, side, bookmaker, raw_odds, row):
     })
 
 
-def remove_bookmaker_vig(selection_prices):
+SIDES = ("home", "draw", "away")
+
+
+def moneyline_fair_probabilities(fixtures, method="multiplicative", leave_one_out=False):
     """
-    Uses all available prices for one fixture to estimate fair probability.
+    Fair probability for every 1X2 offer of every fixture, in one batched pass.
 
     For each bookmaker with full home/draw/away prices:
     - Convert their 1X2 book to implied probabilities.
-    - Remove margin by normalising probabilities to 100%.
+    - Remove the margin (see fair_prices.devig for the methods).
     - Average the fair probabilities across bookmakers.
 
     This is better than just averaging odds, because it handles overround.
+    With leave_one_out, an offer from a book in the average is compared with
+    the average of the other books only.
+
+    Returns, per fixture, {side: [fair probability per offer]}, or None when
+    no bookmaker had a full book.
     """
-    books = {}
+    rows = []
+    groups = []
+    book_rows = []
 
-    for side in ["home", "draw", "away"]:
-        for offer in selection_prices[side]:
-            book = offer["bookmaker"]
-            books.setdefault(book, {})[side] = offer["decimal_odds"]
+    for index, fixture in enumerate(fixtures):
+        books = {}
 
-    fair_probs = {
-        "home": [],
-        "draw": [],
-        "away": [],
-    }
+        for side in SIDES:
+            for offer in fixture["selections"][side]:
+                books.setdefault(offer["bookmaker"], {})[side] = offer["decimal_odds"]
 
-    for book, sides in books.items():
-        if not all(side in sides for side in ["home", "draw", "away"]):
-            continue
+        complete = {}
+        for book, sides in books.items():
+            if all(side in sides for side in SIDES):
+                complete[book] = len(rows)
+                rows.append([sides[side] for side in SIDES])
+                groups.append(index)
 
-        raw_probs = {
-            "home": 1 / sides["home"],
-            "draw": 1 / sides["draw"],
-            "away": 1 / sides["away"],
-        }
+        book_rows.append(complete)
 
-        total = sum(raw_probs.values())
+    if not rows:
+        return [None] * len(fixtures)
 
-        if total <= 0:
-            continue
+    fair = devig(implied_probabilities(rows), method)
+    mean, loo = consensus(fair, groups, len(fixtures))
 
-        for side in ["home", "draw", "away"]:
-            fair_probs[side].append(raw_probs[side] / total)
+    results = []
 
-    averaged = {}
+    for index, fixture in enumerate(fixtures):
+        if not book_rows[index]:
+            results.append(None)
+            continue
 
-    for side in ["home", "draw", "away"]:
-        if fair_probs[side]:
-            averaged[side] = sum(fair_probs[side]) / len(fair_probs[side])
-        else:
-            averaged[side] = None
+        per_side = {}
+        for column, side in enumerate(SIDES):
+            per_side[side] = []
+            for offer in fixture["selections"][side]:
+                row = book_rows[index].get(offer["bookmaker"])
+                if leave_one_out and row is not None:
+                    probability = loo[row][column]
+                else:
+                    probability = mean[index][column]
+                per_side[side].append(float(probability))
 
-    return averaged
+        results.append(per_side)
 
+    return results
 
 
 # ── Props EV alerts ────────────────────────────────────────────────────────────
@@ -224,27 +172,6 @@ SAFE_THRESHOLD_EV_MARKETS = {
 }
 
 
-def _median(values):
-    values = sorted(float(value) for value in values)
-
-    if not values:
-        return None
-
-    middle = len(values) // 2
-
-    if len(values) % 2:
-        return values[middle]
-
-    return (values[middle - 1] + values[middle]) / 2
-
-
-def _line_number(value):
-    try:
-        return float(str(value).strip())
-    except Exception:
-        return None
-
-
 def _book_ladder_prices(
     market_data,
     bookmaker,
@@ -271,266 +198,24 @@ def _book_ladder_prices(
     return prices
 
 
-def _prices_are_monotonic(prices):
-    if not prices:
-        return False
-
-    # Higher thresholds must never be shorter than lower thresholds.
-    return all(
-        higher + 1e-9 >= lower
-        for lower, higher in zip(prices, prices[1:])
-    )
-
-
-def _book_full_core_ladder_is_safe(
-    market_data,
-    bookmaker,
-):
-    """
-    Require an explicit, monotonic 1+/2+/3+ ladder.
-
-    This is the key defence against sparse Unibet rows being shifted left:
-    a player with only later threshold prices cannot enter EV.
-    """
-    prices = _book_ladder_prices(
-        market_data,
-        bookmaker,
-        ("0.5", "1.5", "2.5"),
-    )
-
-    return bool(
-        prices
-        and _prices_are_monotonic(prices)
-    )
-
-
-def _book_ladder_is_safe(
-    market_data,
-    bookmaker,
-    current_line,
-):
-    """
-    Require every lower threshold through the candidate line.
-
-    Example:
-      2+ needs valid 1+ and 2+ prices.
-      3+ needs valid 1+, 2+ and 3+ prices.
-    """
-    current = _line_number(current_line)
-
-    if current is None:
-        return False
-
-    required_lines = [
-        line
-        for line in ("0.5", "1.5", "2.5")
-        if float(line) <= current
-    ]
-
-    prices = _book_ladder_prices(
-        market_data,
-        bookmaker,
-        required_lines,
-    )
-
-    return bool(
-        prices
-        and _prices_are_monotonic(prices)
-    )
-
-
-def _safe_props_offer(
-    market_key,
-    market_data,
-    line,
-    bookmaker,
-    offer,
-):
-    if market_key not in SAFE_THRESHOLD_EV_MARKETS:
-        return False
-
-    if (
-        bookmaker,
-        market_key,
-    ) in STRICT_FULL_LADDER_BOOK_MARKETS:
-        if not _book_full_core_ladder_is_safe(
-            market_data,
-            bookmaker,
-        ):
-            return False
-    elif not _book_ladder_is_safe(
-        market_data,
-        bookmaker,
-        line,
-    ):
-        return False
-
-    try:
-        decimal = float(offer.get("decimal"))
-    except Exception:
-        return False
-
-    return 1.01 <= decimal <= 51.0
-
-
-def _verified_high_edge_structure(
-    market_data,
-    candidate_bookmaker,
-    comparison_bookmakers,
-):
-    """
-    Extreme alerts need stronger structural evidence than ordinary alerts.
-
-    The standout bookmaker must have a complete 1+/2+/3+ ladder, and at least
-    two other bookmakers must independently have complete monotonic ladders.
-    """
-    if not _book_full_core_ladder_is_safe(
-        market_data,
-        candidate_bookmaker,
-    ):
-        return False
-
-    full_comparison_count = sum(
-        1
-        for bookmaker in comparison_bookmakers
-        if _book_full_core_ladder_is_safe(
-            market_data,
-            bookmaker,
-        )
-    )
-
-    return (
-        full_comparison_count
-        >= MIN_FULL_COMPARISON_LADDERS
-    )
-
-
-def _build_safe_threshold_alert(
+def _threshold_alert(
     gen,
     fixture,
     player_name,
     market_key,
-    market_data,
     line,
+    best_bookmaker,
+    best_offer,
+    fair_decimal,
+    bookmaker_count,
+    verified_high_edge,
 ):
-    """
-    Build one exact player/market/line candidate.
-
-    Normal prices use the conservative V3 consensus rules. Very large standout
-    prices enter only through the verified full-ladder route.
-    """
-    raw_line_data = market_data.get(line) or {}
-
-    safe_offers = {
-        bookmaker: offer
-        for bookmaker, offer in raw_line_data.items()
-        if _safe_props_offer(
-            market_key,
-            market_data,
-            line,
-            bookmaker,
-            offer,
-        )
-    }
-
-    if len(safe_offers) < MIN_BOOKS_PROPS:
-        return None, "not_enough_safe_books"
-
-    ranked = sorted(
-        safe_offers.items(),
-        key=lambda item: item[1]["decimal"],
-        reverse=True,
-    )
-
-    best_bookmaker, best_offer = ranked[0]
-    second_decimal = ranked[1][1]["decimal"]
-
-    if second_decimal <= 1:
-        return None, "invalid_second_price"
-
-    best_second_ratio = (
-        best_offer["decimal"] / second_decimal
-    )
-
-    comparison = {
-        bookmaker: offer
-        for bookmaker, offer in safe_offers.items()
-        if bookmaker != best_bookmaker
-    }
-
-    if len(comparison) < MIN_COMPARISON_BOOKS_PROPS:
-        return None, "not_enough_comparison_books"
-
-    comparison_decimals = sorted(
-        (
-            offer["decimal"]
-            for offer in comparison.values()
-        ),
-        reverse=True,
-    )
-
-    top_consensus = comparison_decimals[
-        :TOP_CONSENSUS_BOOKS
-    ]
-
-    if len(top_consensus) < TOP_CONSENSUS_BOOKS:
-        return None, "not_enough_top_consensus_books"
-
-    top_consensus_ratio = (
-        top_consensus[0] / top_consensus[-1]
-    )
-
-    verified_high_edge = _verified_high_edge_structure(
-        market_data,
-        best_bookmaker,
-        comparison.keys(),
-    )
-
-    normal_structure = (
-        best_second_ratio
-            <= MAX_BEST_TO_SECOND_PRICE_RATIO
-        and top_consensus_ratio
-            <= MAX_CONSENSUS_PRICE_RATIO
-    )
-
-    high_edge_structure = (
-        verified_high_edge
-        and best_second_ratio
-            <= HIGH_EDGE_MAX_BEST_SECOND_RATIO
-        and top_consensus_ratio
-            <= HIGH_EDGE_MAX_CONSENSUS_RATIO
-    )
-
-    if not normal_structure and not high_edge_structure:
-        if best_second_ratio > HIGH_EDGE_MAX_BEST_SECOND_RATIO:
-            return None, "isolated_best_price"
-        return None, "consensus_disagreement"
-
-    fair_decimal = _median(top_consensus)
-
-    if not fair_decimal or fair_decimal <= 1:
-        return None, "invalid_fair_decimal"
-
-    if fair_decimal > 27:
-        return None, "fair_price_too_large"
-
+    """Alert row for a best offer that passed every safety check."""
     fair_probability = 1.0 / fair_decimal
     ev_percent = (
         best_offer["decimal"] * fair_probability - 1
     ) * 100
 
-    if ev_percent < MIN_EV_PROPS:
-        return None, "below_minimum_ev"
-
-    if normal_structure:
-        if ev_percent > MAX_EV_PROPS:
-            # A result too large for the normal route must satisfy the stronger
-            # verified ladder checks.
-            if not high_edge_structure:
-                return None, "implausible_ev"
-    elif ev_percent > MAX_VERIFIED_HIGH_EV_PROPS:
-        return None, "implausible_verified_high_ev"
-
     threshold = gen.LINE_LABELS.get(
         line,
         f"{line}+",
@@ -543,10 +228,7 @@ def _build_safe_threshold_alert(
 
     safety_model = (
         "verified_full_ladder_high_edge_v4"
-        if (
-            high_edge_structure
-            and ev_percent > MAX_EV_PROPS
-        )
+        if verified_high_edge
         else "top_three_consensus_v4"
     )
 
@@ -569,7 +251,7 @@ def _build_safe_threshold_alert(
             fair_decimal,
             6,
         ),
-        "fair_fractional_odds": decimal_to_fractional(
+        "fair_fractional_odds": nearest_fractional(
             fair_decimal
         ),
         "fair_probability": round(
@@ -577,10 +259,8 @@ def _build_safe_threshold_alert(
             6,
         ),
         "ev_percent": round(ev_percent, 3),
-        "bookmaker_count": len(safe_offers),
-        "comparison_bookmaker_count": len(
-            comparison
-        ),
+        "bookmaker_count": bookmaker_count,
+        "comparison_bookmaker_count": bookmaker_count - 1,
         "source_url": props_payload.get(
             "source_url",
             "",
@@ -590,7 +270,202 @@ def _build_safe_threshold_alert(
             safety_model
             == "verified_full_ladder_high_edge_v4"
         ),
-    }, ""
+    }
+
+
+LADDER_LINES = ("0.5", "1.5", "2.5")
+
+
+def _threshold_candidates(gen, fixture, player_index, reject):
+    """
+    Safe threshold alerts for every player, market and line of one fixture.
+
+    A bookmaker's price is safe when its 1+/2+/3+ ladder is valid and rising
+    up to the line (the whole ladder for STRICT_FULL_LADDER_BOOK_MARKETS) and
+    the price is between 1.01 and 51. Each ladder is checked once, not once
+    per line and comparison book. Every exact prop becomes one row of a
+    (props x bookmakers) price matrix with unsafe prices masked out. One
+    row-wise sort then gives the best price, the runner-up and the top three
+    comparison prices for every prop together. The first rule that fails in
+    the np.select below is the prop's reject reason.
+    """
+    props = []
+    ladders = []
+    entries = []
+
+    for player_data in player_index.values():
+        player_name = player_data.get("name", "")
+
+        if not player_name:
+            continue
+
+        for market_key, market_data in (
+            player_data.get("markets", {}).items()
+        ):
+            if market_key not in SAFE_THRESHOLD_EV_MARKETS:
+                continue
+
+            ladder_rows = {}
+
+            for line_index, line in enumerate(LADDER_LINES):
+                if line not in market_data:
+                    continue
+
+                prop = len(props)
+                props.append((player_name, market_key, line))
+
+                for column, (bookmaker, offer) in enumerate(
+                    (market_data.get(line) or {}).items()
+                ):
+                    if bookmaker not in ladder_rows:
+                        ladder_rows[bookmaker] = len(ladders)
+                        ladders.append([
+                            (
+                                _book_ladder_prices(
+                                    market_data,
+                                    bookmaker,
+                                    (ladder_line,),
+                                )
+                                or [np.nan]
+                            )[0]
+                            for ladder_line in LADDER_LINES
+                        ])
+
+                    try:
+                        decimal = float(offer.get("decimal"))
+                    except Exception:
+                        decimal = np.nan
+
+                    entries.append((
+                        prop,
+                        column,
+                        ladder_rows[bookmaker],
+                        line_index,
+                        (bookmaker, market_key) in STRICT_FULL_LADDER_BOOK_MARKETS,
+                        decimal,
+                        bookmaker,
+                        offer,
+                    ))
+
+    if not props:
+        return []
+
+    # Ladder safety per (player market, bookmaker): safe_through[:, i] means
+    # valid, monotonic prices from 1+ up to threshold i.
+    prices = np.array(ladders, dtype=np.float64).reshape(-1, len(LADDER_LINES))
+    with np.errstate(invalid="ignore"):
+        valid = prices > 1
+        rising = prices[:, 1:] + 1e-9 >= prices[:, :-1]
+    safe_through = valid.copy()
+    for i in range(1, len(LADDER_LINES)):
+        safe_through[:, i] &= safe_through[:, i - 1] & rising[:, i - 1]
+    full_core = safe_through[:, -1]
+
+    prop_of, column, ladder, line_index, strict, decimal = (
+        np.array([entry[i] for entry in entries]) for i in range(6)
+    )
+    decimal = decimal.astype(np.float64)
+    with np.errstate(invalid="ignore"):
+        safe = (
+            np.where(strict, full_core[ladder], safe_through[ladder, line_index])
+            & (decimal >= 1.01)
+            & (decimal <= 51.0)
+        )
+
+    width = max(int(column.max()) + 1, TOP_CONSENSUS_BOOKS + 1)
+    matrix = np.full((len(props), width), -np.inf)
+    matrix[prop_of[safe], column[safe]] = decimal[safe]
+    full = np.zeros((len(props), width), dtype=bool)
+    full[prop_of[safe], column[safe]] = full_core[ladder[safe]]
+
+    rows = np.arange(len(props))
+    safe_count = np.isfinite(matrix).sum(axis=1)
+    # argmax keeps the first of equal best prices, as the stable sort does.
+    best_column = matrix.argmax(axis=1)
+    ranked = -np.sort(-matrix, axis=1)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        best = ranked[:, 0]
+        second = ranked[:, 1]
+        best_second_ratio = best / second
+        top_consensus_ratio = ranked[:, 1] / ranked[:, TOP_CONSENSUS_BOOKS]
+        # Median of the top three comparison prices.
+        fair_decimal = ranked[:, 2]
+        ev = (best * (1.0 / fair_decimal) - 1) * 100
+
+        best_full = full[rows, best_column]
+        verified_high_edge = best_full & (
+            full.sum(axis=1) - best_full >= MIN_FULL_COMPARISON_LADDERS
+        )
+        normal_structure = (
+            (best_second_ratio <= MAX_BEST_TO_SECOND_PRICE_RATIO)
+            & (top_consensus_ratio <= MAX_CONSENSUS_PRICE_RATIO)
+        )
+        high_edge_structure = (
+            verified_high_edge
+            & (best_second_ratio <= HIGH_EDGE_MAX_BEST_SECOND_RATIO)
+            & (top_consensus_ratio <= HIGH_EDGE_MAX_CONSENSUS_RATIO)
+        )
+
+        reasons = np.select(
+            [
+                safe_count < MIN_BOOKS_PROPS,
+                second <= 1,
+                safe_count - 1 < MIN_COMPARISON_BOOKS_PROPS,
+                safe_count - 1 < TOP_CONSENSUS_BOOKS,
+                ~normal_structure & ~high_edge_structure
+                & (best_second_ratio > HIGH_EDGE_MAX_BEST_SECOND_RATIO),
+                ~normal_structure & ~high_edge_structure,
+                fair_decimal <= 1,
+                fair_decimal > 27,
+                ev < MIN_EV_PROPS,
+                normal_structure & (ev > MAX_EV_PROPS) & ~high_edge_structure,
+                ~normal_structure & (ev > MAX_VERIFIED_HIGH_EV_PROPS),
+            ],
+            [
+                "not_enough_safe_books",
+                "invalid_second_price",
+                "not_enough_comparison_books",
+                "not_enough_top_consensus_books",
+                "isolated_best_price",
+                "consensus_disagreement",
+                "invalid_fair_decimal",
+                "fair_price_too_large",
+                "below_minimum_ev",
+                "implausible_ev",
+                "implausible_verified_high_ev",
+            ],
+            default="",
+        )
+
+    offers = {
+        (entry[0], entry[1]): (entry[6], entry[7])
+        for entry in entries
+    }
+    candidates = []
+
+    for prop, reason in enumerate(reasons.tolist()):
+        if reason:
+            reject(reason)
+            continue
+
+        player_name, market_key, line = props[prop]
+        best_bookmaker, best_offer = offers[(prop, int(best_column[prop]))]
+        candidates.append(_threshold_alert(
+            gen,
+            fixture,
+            player_name,
+            market_key,
+            line,
+            best_bookmaker,
+            best_offer,
+            float(fair_decimal[prop]),
+            int(safe_count[prop]),
+            bool(high_edge_structure[prop] and ev[prop] > MAX_EV_PROPS),
+        ))
+
+    return candidates
+
 
 def scan_props_ev_from_index(root):
     """
@@ -606,8 +481,6 @@ def scan_props_ev_from_index(root):
       - only one threshold alert per player/market is published;
       - each fixture is capped at its strongest alerts.
     """
-    import sys
-
     scripts_path = os.path.join(
         root,
         "scripts",
@@ -625,11 +498,21 @@ def scan_props_ev_from_index(root):
         )
         return []
 
-    try:
-        fixtures, _, _ = gen.load_all()
-    except Exception as error:
-        print(f"load_all() failed: {error}")
-        return []
+    # The page build publishes its merged fixtures and player indexes; reuse
+    # them while the bookmaker files are unchanged instead of parsing again.
+    snapshot = gen.load_fixtures_snapshot()
+
+    if snapshot:
+        fixtures = snapshot["fixtures"]
+        player_indexes = snapshot["player_indexes"]
+        print(f"Using fixtures snapshot from {snapshot['generated']}")
+    else:
+        try:
+            fixtures, _, _ = gen.load_all()
+        except Exception as error:
+            print(f"load_all() failed: {error}")
+            return []
+        player_indexes = {}
 
     alerts = []
     rejected = {}
@@ -643,56 +526,25 @@ def scan_props_ev_from_index(root):
         if not props:
             continue
 
-        try:
-            player_index = gen.build_player_index(
-                props,
-                fixture.get("home_team", ""),
-                fixture.get("away_team", ""),
-            )
-        except Exception:
-            reject("player_index_failed")
-            continue
-
-        fixture_candidates = []
-
-        for player_data in player_index.values():
-            player_name = player_data.get("name", "")
-
-            if not player_name:
+        player_index = player_indexes.get(fixture.get("key"))
+
+        if player_index is None:
+            try:
+                player_index = gen.build_player_index(
+                    props,
+                    fixture.get("home_team", ""),
+                    fixture.get("away_team", ""),
+                )
+            except Exception:
+                reject("player_index_failed")
                 continue
 
-            for market_key, market_data in (
-                player_data.get("markets", {}).items()
-            ):
-                if market_key not in SAFE_THRESHOLD_EV_MARKETS:
-                    continue
-
-                player_market_candidates = []
-
-                for line in ("0.5", "1.5", "2.5"):
-                    if line not in market_data:
-                        continue
-
-                    alert, reason = (
-                        _build_safe_threshold_alert(
-                            gen,
-                            fixture,
-                            player_name,
-                            market_key,
-                            market_data,
-                            line,
-                        )
-                    )
-
-                    if alert:
-                        player_market_candidates.append(alert)
-                    elif reason:
-                        reject(reason)
-
-                # Keep all thresholds that have EV so users can filter by odds range.
-                # e.g. Maeda 2+ shots and 3+ shots both show if both have edge.
-                if player_market_candidates:
-                    fixture_candidates.extend(player_market_candidates)
+        fixture_candidates = _threshold_candidates(
+            gen,
+            fixture,
+            player_index,
+            reject,
+        )
 
         fixture_candidates.sort(
             key=lambda row: row["ev_percent"],
@@ -724,9 +576,23 @@ def scan_props_ev_from_index(root):
     return alerts
 
 def main():
+    parser = argparse.ArgumentParser(description="Build football EV alerts")
+    parser.add_argument(
+        "--devig",
+        choices=DEVIG_METHODS,
+        default="multiplicative",
+        help="how each bookmaker's 1X2 margin is removed",
+    )
+    parser.add_argument(
+        "--consensus",
+        choices=("all", "leave-one-out"),
+        default="all",
+        help="average every book, or every other book, for an offer's fair price",
+    )
+    args = parser.parse_args()
+
     fixtures = {}
-    strict_index = {}
-    loose_index = {}
+    resolver = FixtureResolver()
 
     bookmaker_summary = {}
 
@@ -753,29 +619,28 @@ def main():
             if not home or not away or not odds:
                 continue
 
-            strict_key = fixture_key(home, away)
-            loose_key = loose_fixture_key(home, away)
-
-            target_key = None
-
-            if strict_key in strict_index:
-                target_key = strict_index[strict_key]
-            elif loose_key in loose_index:
-                target_key = loose_index[loose_key]
-
-            if not target_key:
-                target_key = strict_key
-
+            target_key, reversed_teams = resolver.resolve(
+                home,
+                away,
+                kickoff_date(row.get("date_label"), row.get("time")),
+            )
+            match_name = row.get("match") or f"{home} v {away}"
+            if reversed_teams:
+                # This book lists the fixture the other way round.
+                home, away = away, home
+                match_name = f"{home} v {away}"
+                odds = {**odds, "home": odds.get("away"), "away": odds.get("home")}
+
+            if target_key not in fixtures:
                 fixtures[target_key] = {
                     "sport": "Football",
                     "competition": row.get("competition") or "FIFA World Cup",
-                    "match": row.get("match") or f"{home} v {away}",
+                    "match": match_name,
                     "home_team": home,
                     "away_team": away,
                     "date_label": row.get("date_label") or "",
                     "time": row.get("time") or "",
-                    "strict_key": strict_key,
-                    "loose_key": loose_key,
+                    "fixture_id": target_key,
                     "selections": {
                         "home": [],
                         "draw": [],
@@ -784,9 +649,6 @@ def main():
                     "bookmakers_seen": set(),
                 }
 
-                strict_index[strict_key] = target_key
-                loose_index[loose_key] = target_key
-
             fixtures[target_key]["bookmakers_seen"].add(bookmaker)
 
             add_offer(fixtures, target_key, "home", bookmaker, odds.get("home"), row)
@@ -803,10 +665,14 @@ def main():
 
         print(f"{bookmaker}: loaded {loaded} matches")
 
+    resolver.save()
+
     alerts = []
     skipped_fixtures = 0
     compared_fixtures = 0
 
+    candidates = []
+
     for key, fixture in fixtures.items():
         selections = fixture["selections"]
         bookmaker_count = len(fixture["bookmakers_seen"])
@@ -819,55 +685,68 @@ def main():
             skipped_fixtures += 1
             continue
 
-        fair_probs = remove_bookmaker_vig(selections)
+        candidates.append(fixture)
+
+    fair_probabilities = moneyline_fair_probabilities(
+        candidates,
+        args.devig,
+        args.consensus == "leave-one-out",
+    )
 
-        if not all(fair_probs.get(side) for side in ["home", "draw", "away"]):
+    offers = []
+
+    for fixture, fair_probs in zip(candidates, fair_probabilities):
+        if not fair_probs:
             skipped_fixtures += 1
             continue
 
         compared_fixtures += 1
 
-        for side in ["home", "draw", "away"]:
-            fair_prob = fair_probs[side]
-            fair_decimal = 1 / fair_prob
-            fair_fractional = decimal_to_fractional(fair_decimal)
-
-            for offer in selections[side]:
-                market_decimal = offer["decimal_odds"]
-
-                ev_decimal = (market_decimal * fair_prob) - 1
-                ev_percent = ev_decimal * 100
-
-                if ev_percent >= MIN_EV_PERCENT:
-                    if side == "home":
-                        selection_name = fixture["home_team"]
-                    elif side == "away":
-                        selection_name = fixture["away_team"]
-                    else:
-                        selection_name = "Draw"
-
-                    alerts.append({
-                        "sport": "Football",
-                        "competition": fixture["competition"],
-                        "market": "Match Odds",
-                        "type": "moneyline_1x2",
-                        "match": fixture["match"],
-                        "home_team": fixture["home_team"],
-                        "away_team": fixture["away_team"],
-                        "date_label": fixture["date_label"],
-                        "time": fixture["time"],
-                        "selection": selection_name,
-                        "selection_side": side,
-                        "bookmaker": offer["bookmaker"],
-                        "bookmaker_odds": offer["odds"],
-                        "bookmaker_decimal_odds": round(market_decimal, 6),
-                        "fair_decimal_odds": round(fair_decimal, 6),
-                        "fair_fractional_odds": fair_fractional,
-                        "fair_probability": round(fair_prob, 6),
-                        "ev_percent": round(ev_percent, 3),
-                        "bookmaker_count": bookmaker_count,
-                        "source_url": offer.get("source_url") or "",
-                    })
+        for side in SIDES:
+            for offer, fair_prob in zip(fixture["selections"][side], fair_probs[side]):
+                offers.append((fixture, side, offer, fair_prob))
+
+    offer_ev = ev_percent(
+        [offer["decimal_odds"] for _, _, offer, _ in offers],
+        [fair_prob for _, _, _, fair_prob in offers],
+    )
+
+    for (fixture, side, offer, fair_prob), ev in zip(offers, offer_ev):
+        # NaN (a leave-one-out book with no other full book) never passes.
+        if not ev >= MIN_EV_PERCENT:
+            continue
+
+        fair_decimal = 1 / fair_prob
+
+        if side == "home":
+            selection_name = fixture["home_team"]
+        elif side == "away":
+            selection_name = fixture["away_team"]
+        else:
+            selection_name = "Draw"
+
+        alerts.append({
+            "sport": "Football",
+            "competition": fixture["competition"],
+            "market": "Match Odds",
+            "type": "moneyline_1x2",
+            "match": fixture["match"],
+            "home_team": fixture["home_team"],
+            "away_team": fixture["away_team"],
+            "date_label": fixture["date_label"],
+            "time": fixture["time"],
+            "selection": selection_name,
+            "selection_side": side,
+            "bookmaker": offer["bookmaker"],
+            "bookmaker_odds": offer["odds"],
+            "bookmaker_decimal_odds": round(offer["decimal_odds"], 6),
+            "fair_decimal_odds": round(fair_decimal, 6),
+            "fair_fractional_odds": nearest_fractional(fair_decimal),
+            "fair_probability": round(fair_prob, 6),
+            "ev_percent": round(float(ev), 3),
+            "bookmaker_count": len(fixture["bookmakers_seen"]),
+            "source_url": offer.get("source_url") or "",
+        })
 
     # Props EV alerts
     props_alerts = scan_props_ev_from_index(ROOT)
@@ -887,6 +766,10 @@ def main():
         "competition": "FIFA World Cup",
         "min_ev_percent": MIN_EV_PERCENT,
         "min_bookmakers_for_fair_price": MIN_BOOKMAKERS_FOR_FAIR_PRICE,
+        "moneyline_fair_price": {
+            "devig": args.devig,
+            "consensus": args.consensus,
+        },
         "bookmaker_summary": bookmaker_summary,
         "fixture_count": len(fixtures),
         "compared_fixtures": compared_fixtures,
@@ -21,6 +21,9 @@ SNAPSHOT_PATH = (
 )
 OUT_DIR = ROOT / "football" / "world-cup"
 
+# Shared directories written by generate_worldcup_page.py, not fixtures.
+SHARED_DIRS = {"player"}
+
 
 def clean(value: Any) -> str:
     return re.sub(r"\s+", " ", str(value or "")).strip()
@@ -68,7 +71,7 @@ def main() -> None:
     for path in OUT_DIR.iterdir():
         if not path.is_dir():
             continue
-        if path.name not in allowed:
+        if path.name not in allowed and path.name not in SHARED_DIRS:
             shutil.rmtree(path)
             removed.append(path.name)
 
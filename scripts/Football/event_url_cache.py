@@ -0,0 +1,491 @@
+#!/usr/bin/env python3
+"""
+event_url_cache.py
+
+Shared on-disk cache of bookmaker event URLs.
+
+Fixture discovery (opening the competition or coupon page, scrolling until
+every link has rendered, matching rows to fixtures) is a fixed cost every
+scraper pays on every run. Event URLs hardly ever change between runs, so
+this module keeps them in data/event_url_cache.json:
+
+    {
+      "version": 1,
+      "books": {
+        "LiveScoreBet": {
+          "mexico_v_south_africa": {
+            "url": "...",
+            "name": "Mexico v South Africa",
+            "position": 0,
+            "discovered_at": "...",   (TTL runs from here)
+            "validated_at": "...",    (last successful HEAD check)
+            "kickoff": "...",         (optional)
+            "listed": 7               (fixtures in that discovery)
+          }
+        }
+      }
+    }
+
+An entry is served only while it is fresh: younger than the TTL and, when a
+kickoff is known, before kickoff. On a hit the URL can also be checked
+cheaply with a HEAD request. 404/410 means the entry is dropped. Other
+statuses, including bot-protection 403s, leave the entry alone. Scrapers call
+invalidate_url() when a page returns 404 or loads the wrong fixture, so a bad
+entry is dropped.
+
+remember_fixtures() treats a fresh discovery as the whole list for that
+book and records its length as "listed". cached_or_discovered() skips
+discovery while every cached fixture has a known kickoff still ahead:
+fixtures drop out as they kick off, and listed_count() tells it whether the
+coupon it last saw was already short (nothing more to find) or was cut at
+its limit (crawl again to pick up the next fixture). An invalidated fixture
+forgets listed for its book, so the next run crawls again, and the TTL
+bounds how long a short coupon is trusted. Kickoffs come from the
+LiveScoreBet moneylines, the one coupon that prints full dates; a fixture
+it does not list has no kickoff, so its book keeps crawling.
+
+Who uses it:
+
+    LiveScoreBet, 888Sport, Ladbrokes, PaddyPower, Unibet
+        (both props scrapers)       whole coupon, via cached_or_discovered()
+    William Hill, BetVictor         per fixture, via get() and put() when
+                                    the event URL has to be found on a list
+    Bwin                            not needed: event URLs come from its
+                                    moneylines JSON
+
+BoyleSports and the UFC fetch_*_fight_urls.py scripts still discover every
+run.
+
+Book scrapers run in parallel, so save() re-reads the file under a lock
+(file_lock.py) and applies only the entries this process wrote or dropped.
+
+TTL defaults to 24 hours. Set EVENT_URL_CACHE_TTL_HOURS to change it, or set
+it to 0 to turn the cache off.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+CACHE_PATH = ROOT / "data" / "event_url_cache.json"
+
+if str(ROOT / "scripts") not in sys.path:
+    sys.path.insert(0, str(ROOT / "scripts"))
+
+from file_lock import locked  # noqa: E402
+from odds_common import loose_fixture_key  # noqa: E402
+
+# fetch_livescorebet_worldcup_moneylines.py keeps each fixture's date and
+# time, which no book's event links carry.
+KICKOFFS_PATH = ROOT / "football" / "data" / "livescorebet_worldcup_moneylines.json"
+
+try:
+    DEFAULT_TTL_HOURS = float(os.environ.get("EVENT_URL_CACHE_TTL_HOURS", "24"))
+except ValueError:
+    DEFAULT_TTL_HOURS = 24.0
+
+VALIDATION_TIMEOUT_SECONDS = 6
+GONE_STATUSES = {404, 410}
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/149.0.0.0 Safari/537.36"
+)
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _parse_time(value) -> datetime | None:
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _norm(value: str) -> str:
+    value = str(value or "").lower().replace("&", "and")
+    return re.sub(r"[^a-z0-9]+", "_", value).strip("_")
+
+
+def fixture_key(name: str, away: str = "") -> str:
+    """Cache key for a fixture, from "Home v Away" or (home, away)."""
+    if away:
+        return f"{_norm(name)}_v_{_norm(away)}"
+
+    parts = re.split(r"\s+(?:v|vs|vs\.)\s+", str(name or ""), maxsplit=1, flags=re.I)
+    if len(parts) == 2:
+        return f"{_norm(parts[0])}_v_{_norm(parts[1])}"
+    return _norm(name)
+
+
+def check_url(url: str) -> bool | None:
+    """Return False if the URL is gone, True if it answers, None if unknown."""
+    try:
+        import requests
+    except ImportError:
+        return None
+
+    headers = {"User-Agent": USER_AGENT}
+    try:
+        response = requests.head(
+            url,
+            headers=headers,
+            allow_redirects=True,
+            timeout=VALIDATION_TIMEOUT_SECONDS,
+        )
+        if response.status_code == 405:
+            response = requests.get(
+                url,
+                headers=headers,
+                allow_redirects=True,
+                timeout=VALIDATION_TIMEOUT_SECONDS,
+                stream=True,
+            )
+            response.close()
+    except Exception:
+        return None
+
+    if response.status_code in GONE_STATUSES:
+        return False
+    if 200 <= response.status_code < 300:
+        return True
+    return None
+
+
+class EventUrlCache:
+    """Thread-safe view of the shared event URL cache file."""
+
+    def __init__(self, path: Path = CACHE_PATH, ttl_hours: float = DEFAULT_TTL_HOURS):
+        self.path = Path(path)
+        self.ttl = timedelta(hours=ttl_hours)
+        self.enabled = ttl_hours > 0
+        self._lock = threading.RLock()
+        # (book, key) -> entry this process wrote, or None if it dropped it.
+        self._changes: dict[tuple[str, str], dict | None] = {}
+        self._books: dict[str, dict] = self._read()
+
+    def _read(self) -> dict[str, dict]:
+        if not self.path.exists():
+            return {}
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except Exception as exc:
+            print(f"  event URL cache unreadable ({self.path.name}): {exc}")
+            return {}
+        books = data.get("books") if isinstance(data, dict) else None
+        if not isinstance(books, dict):
+            return {}
+        return {
+            book: entries
+            for book, entries in books.items()
+            if isinstance(entries, dict)
+        }
+
+    def is_fresh(self, entry: dict, now: datetime | None = None) -> bool:
+        now = now or _now()
+        discovered = _parse_time(entry.get("discovered_at"))
+        if discovered is None or now - discovered > self.ttl:
+            return False
+        kickoff = _parse_time(entry.get("kickoff"))
+        return kickoff is None or kickoff > now
+
+    def get(self, book: str, name: str, away: str = "") -> str:
+        """Return a fresh cached URL for the fixture, or ""."""
+        if not self.enabled:
+            return ""
+        with self._lock:
+            entry = self._books.get(book, {}).get(fixture_key(name, away))
+            return entry["url"] if entry and self.is_fresh(entry) else ""
+
+    def put(
+        self,
+        book: str,
+        name: str,
+        url: str,
+        *,
+        away: str = "",
+        kickoff: str = "",
+        position: int | None = None,
+        listed: int | None = None,
+    ) -> None:
+        if not url:
+            return
+        key = fixture_key(name, away)
+        stamp = _now().isoformat()
+
+        with self._lock:
+            entries = self._books.setdefault(book, {})
+            entry = entries.get(key, {})
+            if entry.get("url") != url:
+                entry = {}
+            # Discovery confirms the URL, so it restarts the TTL.
+            entry.update(
+                {
+                    "url": url,
+                    "name": name if not away else f"{name} v {away}",
+                    "discovered_at": stamp,
+                }
+            )
+            if kickoff:
+                entry["kickoff"] = kickoff
+            if position is not None:
+                entry["position"] = position
+            if listed is not None:
+                entry["listed"] = listed
+            entries[key] = entry
+            self._changes[(book, key)] = entry
+
+    def invalidate_url(self, book: str, url: str, reason: str = "") -> bool:
+        """Drop every entry for this book pointing at url."""
+        base = str(url or "").split("?", 1)[0]
+        with self._lock:
+            entries = self._books.get(book, {})
+            stale = [
+                key for key, entry in entries.items()
+                if str(entry.get("url", "")).split("?", 1)[0] == base
+            ]
+            for key in stale:
+                entries.pop(key, None)
+                self._changes[(book, key)] = None
+            if stale:
+                # The cached list now has a hole only discovery can fill.
+                for key, entry in entries.items():
+                    if entry.pop("listed", None) is not None:
+                        self._changes[(book, key)] = entry
+                print(f"  event URL cache: dropped {book} {base} ({reason or 'invalid'})")
+            return bool(stale)
+
+    def fixtures(
+        self,
+        book: str,
+        limit: int | None = None,
+        validate: bool = True,
+    ) -> list[dict]:
+        """Fresh cached fixtures for a book, in their last discovered order.
+
+        With validate=True each URL gets one HEAD request (in parallel), and
+        URLs that are gone are dropped.
+        """
+        if not self.enabled:
+            return []
+
+        with self._lock:
+            entries = [
+                dict(entry)
+                for entry in self._books.get(book, {}).values()
+                if self.is_fresh(entry)
+            ]
+        entries.sort(key=lambda entry: (entry.get("position", 10**6), entry.get("name", "")))
+        if limit is not None:
+            entries = entries[:limit]
+
+        if validate and entries:
+            with ThreadPoolExecutor(max_workers=min(8, len(entries))) as executor:
+                states = list(executor.map(check_url, [entry["url"] for entry in entries]))
+            kept = []
+            stamp = _now().isoformat()
+            for entry, state in zip(entries, states):
+                if state is False:
+                    self.invalidate_url(book, entry["url"], "HTTP 404/410 on validation")
+                    continue
+                if state:
+                    self._mark_validated(book, entry["url"], stamp)
+                kept.append(entry)
+            entries = kept
+
+        return [
+            {
+                "url": entry["url"],
+                "name": entry.get("name", ""),
+                "kickoff": entry.get("kickoff", ""),
+                "url_source": "url_cache",
+            }
+            for entry in entries
+        ]
+
+    def listed_count(self, book: str) -> int | None:
+        """Fixtures in the book's last discovery, or None if not known.
+
+        None when nothing fresh is cached, or when an entry was invalidated
+        since that discovery.
+        """
+        with self._lock:
+            counts = [
+                entry.get("listed")
+                for entry in self._books.get(book, {}).values()
+                if self.is_fresh(entry)
+            ]
+        if not counts or None in counts:
+            return None
+        return min(counts)
+
+    def _mark_validated(self, book: str, url: str, stamp: str) -> None:
+        with self._lock:
+            for key, entry in self._books.get(book, {}).items():
+                if entry.get("url") == url:
+                    entry["validated_at"] = stamp
+                    self._changes[(book, key)] = entry
+
+    def remember_fixtures(self, book: str, fixtures: list[dict]) -> None:
+        """Store a freshly discovered fixture list, keeping its order.
+
+        The list replaces the book's fixtures: entries it no longer has are
+        dropped, so they cannot be served in its place later.
+        """
+        keys = set()
+        for position, fixture in enumerate(fixtures):
+            name = fixture.get("name") or fixture.get("match") or ""
+            keys.add(fixture_key(name))
+            self.put(
+                book,
+                name,
+                fixture.get("url", ""),
+                kickoff=str(fixture.get("kickoff") or ""),
+                position=position,
+                listed=len(fixtures),
+            )
+        with self._lock:
+            entries = self._books.get(book, {})
+            for key in [key for key in entries if key not in keys]:
+                entries.pop(key)
+                self._changes[(book, key)] = None
+
+    def save(self) -> None:
+        """Merge this process's changes into the file on disk, atomically.
+
+        Book scrapers run in parallel, so the file is re-read under the lock
+        and only the entries this process wrote or dropped are applied.
+        """
+        with self._lock:
+            if not self._changes:
+                return
+            with locked(self.path.with_suffix(".lock")):
+                books = self._read()
+                for (book, key), entry in self._changes.items():
+                    entries = books.setdefault(book, {})
+                    if entry is None:
+                        entries.pop(key, None)
+                    else:
+                        entries[key] = dict(entry)
+                now = _now()
+                # Prune anything that can no longer be served.
+                books = {
+                    book: {key: entry for key, entry in entries.items() if self.is_fresh(entry, now)}
+                    for book, entries in books.items()
+                }
+                payload = {"version": 1, "updated_at": now.isoformat(), "books": books}
+                tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+                tmp.write_text(json.dumps(payload, indent=2, ensure_ascii=False), encoding="utf-8")
+                os.replace(tmp, self.path)
+            self._books = books
+            self._changes = {}
+
+
+_SHARED: EventUrlCache | None = None
+_SHARED_LOCK = threading.Lock()
+
+
+def shared_cache() -> EventUrlCache:
+    """Process-wide cache instance, so pool workers share one view."""
+    global _SHARED
+    with _SHARED_LOCK:
+        if _SHARED is None:
+            _SHARED = EventUrlCache()
+        return _SHARED
+
+
+def coupon_kickoffs(path: Path = KICKOFFS_PATH) -> dict[str, str]:
+    """Kickoff timestamps by loose fixture key, from a moneylines file.
+
+    Its date_label/time are in the scraping machine's local time. Rows
+    without a full "1/7/2026" date are skipped.
+    """
+    try:
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+
+    kickoffs = {}
+    for row in data.get("matches") or []:
+        try:
+            local = datetime.strptime(
+                f"{row.get('date_label')} {row.get('time')}",
+                "%d/%m/%Y %H:%M",
+            )
+        except (TypeError, ValueError):
+            continue
+        key = loose_fixture_key(row.get("home_team") or "", row.get("away_team") or "")
+        kickoffs[key] = local.astimezone().isoformat()
+    return kickoffs
+
+
+def attach_kickoffs(fixtures: list[dict]) -> list[dict]:
+    """Set each discovered fixture's kickoff, "" when the moneylines lack it."""
+    kickoffs = coupon_kickoffs()
+    for fixture in fixtures:
+        name = fixture.get("name") or fixture.get("match") or ""
+        teams = re.split(r"\s+(?:v|vs|vs\.)\s+", name, maxsplit=1, flags=re.I)
+        key = loose_fixture_key(*teams) if len(teams) == 2 else ""
+        fixture["kickoff"] = kickoffs.get(key, "")
+    return fixtures
+
+
+def _complete(cached: list[dict], listed: int | None, limit: int | None) -> bool:
+    # Fixtures that kicked off are no longer fresh, so a list that had
+    # nothing cut off at limit can be served short; the TTL bounds that.
+    return bool(
+        cached
+        and listed is not None
+        and all(fixture["kickoff"] for fixture in cached)
+        and (limit is None or len(cached) >= limit or listed < limit)
+    )
+
+
+def cached_or_discovered(book: str, discover, limit: int | None = None) -> list[dict]:
+    """A book's fixtures: its cached list while it is complete, else discover().
+
+    discover() returns [{"url", "name"}, ...] from the book's coupon; a
+    non-empty result replaces the cached list. When it finds nothing the
+    cached fixtures are used instead. Errors from discover() propagate, so a
+    scraper that used to stop on them still does. Fixtures served from the
+    cache carry url_source "url_cache" and no book-specific keys.
+    """
+    cache = shared_cache()
+    started = time.perf_counter()
+
+    # Only a list that could be served is worth a HEAD request per URL.
+    cached = cache.fixtures(book, limit=limit, validate=False)
+    if _complete(cached, cache.listed_count(book), limit):
+        cached = cache.fixtures(book, limit=limit)
+        if _complete(cached, cache.listed_count(book), limit):
+            print(
+                f"Fixture discovery skipped: {len(cached)} cached {book} event URLs "
+                f"({round(time.perf_counter() - started, 2)}s)"
+            )
+            return cached
+
+    fixtures = discover()
+    print(f"Fixture discovery: {round(time.perf_counter() - started, 2)}s")
+
+    if fixtures:
+        cache.remember_fixtures(book, attach_kickoffs(fixtures))
+        return fixtures
+
+    if cached:
+        print(f"Falling back to {len(cached)} cached event URLs")
+    return cached
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+fair_prices.py
+
+De-vig and consensus fair prices for the football EV scans.
+
+A bookmaker's prices for one complete market (1X2, Yes/No, Over/Under) imply
+probabilities that add up to more than 1. The excess is the bookmaker's
+margin. devig() removes it with one of four methods:
+
+    multiplicative  scale every probability by 1 / overround (the default)
+    additive        take an equal share of the margin off every outcome
+    power           raise every probability to the power k that makes the
+                    book sum to 1, which takes more margin off longshots
+    shin            Shin's insider-trading model, solved for each book
+
+Each book's market is one row of an (n_books, n_outcomes) array, so every
+book of every fixture is de-vigged in a single call. consensus() then
+averages the fair probabilities per fixture. It also returns, for every row,
+the leave-one-out average of the other books in that fixture, so a book's
+own price need not count towards the fair price it is compared with.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+METHODS = ("multiplicative", "additive", "power", "shin")
+
+# Bisection steps for the power and Shin solvers. Each step halves the
+# bracket, so 64 steps is well past float precision.
+SOLVER_STEPS = 64
+POWER_BRACKET = (1e-3, 64.0)
+SHIN_BRACKET = (0.0, 0.5)
+
+
+def implied_probabilities(decimal_rows):
+    """1 / decimal odds for every price, as an array."""
+    return 1 / np.asarray(decimal_rows, dtype=np.float64)
+
+
+def _normalise_rows(probs):
+    total = probs.sum(axis=1, keepdims=True)
+    return np.divide(probs, total, out=probs.copy(), where=total > 0)
+
+
+def _bisect_rows(f, lo, hi, n_rows):
+    """Per-row root of a row-wise decreasing f, for every row at once."""
+    lo = np.full(n_rows, lo)
+    hi = np.full(n_rows, hi)
+    for _ in range(SOLVER_STEPS):
+        mid = (lo + hi) / 2
+        above = f(mid) > 1
+        lo = np.where(above, mid, lo)
+        hi = np.where(above, hi, mid)
+    return (lo + hi) / 2
+
+
+def _shin_rows(probs, z):
+    total = probs.sum(axis=1, keepdims=True)
+    z = z[:, None]
+    return (np.sqrt(z * z + 4 * (1 - z) * probs * probs / total) - z) / (2 * (1 - z))
+
+
+def devig(implied, method="multiplicative"):
+    """
+    Fair probabilities for each row of implied probabilities.
+
+    Every row must be one bookmaker's complete market. Rows come back in the
+    same order and each sums to 1.
+    """
+    if method not in METHODS:
+        raise ValueError(f"unknown de-vig method {method!r}, expected one of {METHODS}")
+
+    probs = np.asarray(implied, dtype=np.float64)
+    if probs.size == 0 or method == "multiplicative":
+        return _normalise_rows(probs)
+
+    total = probs.sum(axis=1)
+    margin = total > 1
+    fair = _normalise_rows(probs)
+    if not margin.any():
+        return fair
+
+    rows = probs[margin]
+    if method == "additive":
+        share = (total[margin] - 1)[:, None] / rows.shape[1]
+        fair[margin] = _normalise_rows(np.maximum(rows - share, 0.0))
+    elif method == "power":
+        k = _bisect_rows(
+            lambda k: (rows ** k[:, None]).sum(axis=1), *POWER_BRACKET, len(rows)
+        )
+        fair[margin] = _normalise_rows(rows ** k[:, None])
+    else:
+        z = _bisect_rows(
+            lambda z: _shin_rows(rows, z).sum(axis=1), *SHIN_BRACKET, len(rows)
+        )
+        fair[margin] = _normalise_rows(_shin_rows(rows, z))
+    return fair
+
+
+def consensus(fair, groups, n_groups):
+    """
+    Average fair probabilities per group, plus each row's leave-one-out average.
+
+    groups[i] is the group (fixture) index of row i. Returns (mean, loo):
+    mean[g] averages every row of group g and is NaN for a group without rows.
+    loo[i] averages the other rows of row i's group and is NaN for a group's
+    only row. Rows are summed in order.
+    """
+    fair = np.asarray(fair, dtype=np.float64)
+    groups = np.asarray(groups, dtype=np.int64)
+    width = fair.shape[1] if fair.ndim == 2 else 0
+
+    counts = np.bincount(groups, minlength=n_groups).astype(np.float64)
+    sums = np.zeros((n_groups, width))
+    np.add.at(sums, groups, fair)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = sums / counts[:, None]
+        loo = (sums[groups] - fair) / (counts[groups] - 1)[:, None]
+    mean[counts == 0] = np.nan
+    loo[counts[groups] <= 1] = np.nan
+    return mean, loo
+
+
+def ev_percent(decimals, fair_probabilities):
+    """(decimal x fair probability - 1) x 100 for every offer."""
+    decimals = np.asarray(decimals, dtype=np.float64)
+    return (decimals * np.asarray(fair_probabilities, dtype=np.float64) - 1) * 100
@@ -25,7 +25,10 @@ import json
 import re
 from pathlib import Path
 from datetime import datetime, timezone
-from playwright.sync_api import sync_playwright
+
+from browser_pool import scrape_fixtures
+from event_url_cache import GONE_STATUSES, cached_or_discovered, shared_cache
+from page_waits import text_signature, wait_for_text_stable
 
 ROOT = Path(__file__).resolve().parents[2]
 
@@ -34,6 +37,8 @@ DEBUG_DIR = ROOT / "football" / "debug" / "888sport_worldcup_props"
 
 COMPETITION_URL = "https://www.888sport.com/football/world-cup/"
 MAX_MATCHES     = 7
+# Concurrent fixture pages, see browser_pool.BOOK_MAX_WORKERS for the cap.
+WORKERS         = 2
 ODDS_RE = re.compile(r"^(?:\d+/\d+|EVS|EVENS|EVEN|Evens)$", re.I)
 
 # ── Helpers ────────────────────────────────────────────────────────────────────
@@ -472,8 +477,10 @@ def accept_cookies(page):
         try:
             btn = page.get_by_role("button", name=re.compile(label, re.I))
             if btn.count():
+                before = text_signature(page)
                 btn.first.click(timeout=3000)
-                page.wait_for_timeout(1000)
+                wait_for_text_stable(page, timeout_ms=1000, label="accept_cookies",
+                                     changed_from=before)
                 return
         except Exception:
             pass
@@ -485,8 +492,10 @@ def click_tab(page, tab_name):
         if not btn.count():
             btn = page.get_by_text(tab_name, exact=True)
         if btn.count():
+            before = text_signature(page)
             btn.first.click(timeout=3000)
-            page.wait_for_timeout(2000)
+            wait_for_text_stable(page, timeout_ms=2000, quiet_ms=400, min_prices=1,
+                                 label="click_tab", changed_from=before)
             return True
     except Exception:
         pass
@@ -495,8 +504,10 @@ def click_tab(page, tab_name):
 
 def scroll_page(page, steps=12):
     for _ in range(steps):
+        before = text_signature(page)
         page.mouse.wheel(0, 600)
-        page.wait_for_timeout(300)
+        wait_for_text_stable(page, timeout_ms=300, quiet_ms=120, label="scroll_page",
+                             changed_from=before)
 
 
 def expand_player_accordions(page):
@@ -544,8 +555,10 @@ def expand_player_accordions(page):
                 return null;
             }}""")
             if coords:
+                before = text_signature(page)
                 page.mouse.click(coords['x'], coords['y'])
-                page.wait_for_timeout(700)
+                wait_for_text_stable(page, timeout_ms=700, quiet_ms=200,
+                                     label="expand_player_accordion", changed_from=before)
                 print(f"      clicked {heading[:30]} at ({coords['x']:.0f},{coords['y']:.0f}) w={coords.get('w',0):.0f}")
             else:
                 print(f"      no coords for: {heading[:40]}")
@@ -559,8 +572,10 @@ def expand_player_accordions(page):
             sm = page.get_by_text("See more", exact=True)
             if sm.count() > 0:
                 sm.first.scroll_into_view_if_needed(timeout=1000)
+                before = text_signature(page)
                 sm.first.click(timeout=1000)
-                page.wait_for_timeout(300)
+                wait_for_text_stable(page, timeout_ms=300, quiet_ms=150,
+                                     label="see_more", changed_from=before)
             else:
                 break
         except Exception:
@@ -630,7 +645,9 @@ def scrape_match(page, fixture):
     print(f"  Scraping: {name}")
     print(f"  URL: {url}")
 
-    page.goto(url, wait_until="domcontentloaded", timeout=60000)
+    response = page.goto(url, wait_until="domcontentloaded", timeout=60000)
+    if response is not None and response.status in GONE_STATUSES:
+        shared_cache().invalidate_url("888Sport", url, f"HTTP {response.status}")
     page.wait_for_timeout(5000)
     accept_cookies(page)
 
@@ -706,6 +723,9 @@ def scrape_match(page, fixture):
 
 
 def main():
+    # Imported here so replay_parsers.py can load the parsers without Playwright.
+    from playwright.sync_api import sync_playwright
+
     OUT_PATH.parent.mkdir(parents=True, exist_ok=True)
     DEBUG_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -713,26 +733,35 @@ def main():
     print("888Sport World Cup Props Scraper")
     print("=" * 60)
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=False)
-        page = browser.new_page(viewport={"width": 1700, "height": 1000})
-
-        fixtures = get_match_links(page)
-
-        results = []
-        for i, fixture in enumerate(fixtures):
-            print(f"\n[{i+1}/{len(fixtures)}]")
+    def discover():
+        with sync_playwright() as p:
+            browser = p.chromium.launch(headless=False)
             try:
-                result = scrape_match(page, fixture)
-                results.append(result)
-            except Exception as e:
-                print(f"  ⚠ Error: {e}")
-                results.append({
-                    "match": fixture["name"], "home_team": "", "away_team": "",
-                    "url": fixture["url"], "markets": []
-                })
-
-        browser.close()
+                page = browser.new_page(viewport={"width": 1700, "height": 1000})
+                return get_match_links(page)
+            finally:
+                browser.close()
+
+    fixtures = cached_or_discovered("888Sport", discover, limit=MAX_MATCHES)
+
+    results, errors = scrape_fixtures(
+        "888Sport",
+        fixtures,
+        scrape_match,
+        workers=WORKERS,
+        headless=False,
+        route_handler=None,
+    )
+    shared_cache().save()
+
+    # Error rows go back in their fixture's position.
+    for error in sorted(errors, key=lambda error: error["position"]):
+        fixture = fixtures[error["position"]]
+        print(f"  ⚠ Error: {error['match']}: {error['error']}")
+        results.insert(error["position"], {
+            "match": fixture["name"], "home_team": "", "away_team": "",
+            "url": fixture["url"], "markets": []
+        })
 
     output = {
         "sport":        "football",
@@ -51,7 +51,10 @@ import time
 from pathlib import Path
 from datetime import datetime, timezone, timedelta
 from zoneinfo import ZoneInfo
-from playwright.sync_api import sync_playwright
+
+from browser_pool import scrape_fixtures
+from event_url_cache import GONE_STATUSES, shared_cache
+from page_waits import text_signature, wait_for_text_stable
 
 ROOT = Path(__file__).resolve().parents[2]
 
@@ -63,6 +66,8 @@ LIST_URL = "https://www.betvictor.com/en-ie/sports/240/sections/custom-list/7199
 
 MAX_MATCHES = 7
 HEADLESS = False
+# Concurrent fixture pages, see browser_pool.BOOK_MAX_WORKERS for the cap.
+WORKERS = 2
 LOCAL_TIMEZONE = ZoneInfo("Europe/Dublin")
 UPCOMING_BUFFER_MINUTES = 15
 
@@ -416,23 +421,13 @@ def load_next_7_fixtures():
     return upcoming[:MAX_MATCHES]
 
 
-def block_heavy_resources(route):
-    """Keep JS/XHR/HTML but skip assets that do not affect market parsing."""
-    if route.request.resource_type in {"image", "media", "font"}:
-        route.abort()
-    else:
-        route.continue_()
-
+def new_fast_page(context):
+    """Open a page in the pool worker's context.
 
-def new_fast_page(browser):
-    page = browser.new_page(
-        viewport={"width": 1700, "height": 1000}
-    )
-    try:
-        page.route("**/*", block_heavy_resources)
-    except Exception:
-        pass
-    return page
+    The pool sets the 1700x1000 viewport and blocks images, media and fonts
+    for the whole context, so JS/XHR/HTML still load.
+    """
+    return context.new_page()
 
 
 def accept_cookies(page):
@@ -440,8 +435,10 @@ def accept_cookies(page):
         try:
             btn = page.get_by_role("button", name=re.compile(label, re.I))
             if btn.count():
+                before = text_signature(page)
                 btn.first.click(timeout=1500)
-                page.wait_for_timeout(500)
+                wait_for_text_stable(page, timeout_ms=500, quiet_ms=150, label="accept_cookies",
+                                     changed_from=before)
                 return
         except Exception:
             pass
@@ -449,6 +446,7 @@ def accept_cookies(page):
 
 def scroll_all(page, passes=4):
     for _ in range(passes):
+        before = text_signature(page)
         try:
             page.evaluate(
                 """() => {
@@ -464,7 +462,8 @@ def scroll_all(page, passes=4):
             )
         except Exception:
             page.mouse.wheel(0, 850)
-        page.wait_for_timeout(250)
+        wait_for_text_stable(page, timeout_ms=250, quiet_ms=120, label="scroll_all",
+                             changed_from=before)
 
 
 def click_show_more(page):
@@ -474,8 +473,10 @@ def click_show_more(page):
             for i in range(min(loc.count(), 10)):
                 try:
                     loc.nth(i).scroll_into_view_if_needed(timeout=1000)
+                    before = text_signature(page)
                     loc.nth(i).click(timeout=1000)
-                    page.wait_for_timeout(350)
+                    wait_for_text_stable(page, timeout_ms=350, quiet_ms=150,
+                                         label="click_show_more", changed_from=before)
                 except Exception:
                     pass
         except Exception:
@@ -488,8 +489,10 @@ def click_exact_text(page, label):
         if loc.count():
             loc.first.scroll_into_view_if_needed(timeout=1500)
             page.wait_for_timeout(150)
+            before = text_signature(page)
             loc.first.click(timeout=1500)
-            page.wait_for_timeout(900)
+            wait_for_text_stable(page, timeout_ms=900, quiet_ms=250,
+                                 label="click_exact_text", changed_from=before)
             return True
     except Exception:
         pass
@@ -614,8 +617,10 @@ def open_date_header(page, date_label):
         if loc.count():
             loc.first.scroll_into_view_if_needed(timeout=2500)
             page.wait_for_timeout(200)
+            before = text_signature(page)
             loc.first.click(timeout=2500)
-            page.wait_for_timeout(900)
+            wait_for_text_stable(page, timeout_ms=900, quiet_ms=250,
+                                 label="open_date_header", changed_from=before)
             return True
     except Exception:
         pass
@@ -770,9 +775,9 @@ def verify_event(page, fixture):
 
     return False
 
-def open_event_from_list(browser, fixture):
+def open_event_from_list(context, fixture):
     """Fallback only when the moneyline JSON has no usable event URL."""
-    page = new_fast_page(browser)
+    page = new_fast_page(context)
 
     try:
         page.goto(
@@ -828,17 +833,18 @@ def open_event_from_list(browser, fixture):
         raise
 
 
-def open_event_fast(browser, fixture):
+def open_event_fast(context, fixture):
     """
     Use the event URL saved by the BetVictor moneyline scraper.
 
-    Falling back to the competition list remains available for old JSON files.
+    Without one, a URL cached by an earlier list crawl is tried before
+    falling back to the competition list, which stays for old JSON files.
     """
     source_url = clean(fixture.get("source_url"))
     direct_url = source_url.split("?", 1)[0]
 
     if "/events/" in direct_url:
-        page = new_fast_page(browser)
+        page = new_fast_page(context)
 
         try:
             page.goto(
@@ -864,7 +870,53 @@ def open_event_fast(browser, fixture):
         except Exception:
             pass
 
-    return open_event_from_list(browser, fixture)
+    # The list crawl is the slow path, so the event URL it finds is cached.
+    event_urls = shared_cache()
+    cached_url = event_urls.get("BetVictor", fixture["home"], fixture["away"])
+
+    if cached_url and cached_url != direct_url:
+        page = new_fast_page(context)
+
+        try:
+            response = page.goto(
+                cached_url,
+                wait_until="domcontentloaded",
+                timeout=45000,
+            )
+            accept_cookies(page)
+
+            if verify_event(page, fixture):
+                print("    opened from the event URL cache")
+                return page, page.url
+
+            if response is not None and response.status in GONE_STATUSES:
+                reason = f"HTTP {response.status}"
+            else:
+                reason = "wrong fixture loaded"
+            event_urls.invalidate_url("BetVictor", cached_url, reason)
+        except Exception as error:
+            print(
+                "    cached event load failed; using list fallback: "
+                f"{type(error).__name__}"
+            )
+
+        try:
+            page.close()
+        except Exception:
+            pass
+
+    page, event_url = open_event_from_list(context, fixture)
+
+    if event_url:
+        event_urls.put(
+            "BetVictor",
+            fixture["home"],
+            base_event_url(event_url),
+            away=fixture["away"],
+            kickoff=fixture["kickoff"].isoformat(),
+        )
+
+    return page, event_url
 
 def base_event_url(url):
     return str(url).split("?", 1)[0]
@@ -1110,13 +1162,20 @@ def safe_core_exact_click(
         page,
         locator,
     )
+    before = text_signature(page)
 
     try:
         locator.click(
             timeout=2200,
             force=False,
         )
-        page.wait_for_timeout(wait_ms)
+        wait_for_text_stable(
+            page,
+            timeout_ms=wait_ms,
+            quiet_ms=150,
+            label="safe_core_exact_click",
+            changed_from=before,
+        )
         return True, preparation
     except Exception:
         pass
@@ -1156,7 +1215,13 @@ def safe_core_exact_click(
         )
 
         if clicked:
-            page.wait_for_timeout(wait_ms)
+            wait_for_text_stable(
+                page,
+                timeout_ms=wait_ms,
+                quiet_ms=150,
+                label="safe_core_exact_click",
+                changed_from=before,
+            )
             return True, preparation
     except Exception:
         pass
@@ -4184,10 +4249,10 @@ def write_hits(text, debug_dir, home, away):
     (debug_dir / "HITS.txt").write_text("\n".join(hits), encoding="utf-8")
 
 
-def scrape_fixture(browser, fixture):
+def scrape_fixture(context, fixture):
     fixture_started = time.perf_counter()
     print(f"\n{fixture['match']} | {fixture['date']} {fixture['time']}")
-    page, event_url = open_event_fast(browser, fixture)
+    page, event_url = open_event_fast(context, fixture)
 
     if not page or not event_url:
         print("    could not open exact event")
@@ -4330,35 +4395,31 @@ def main():
     for i, f in enumerate(fixtures, 1):
         print(f"  {i:02d}. {f['date']} {f['time']} | {f['match']}")
 
-    results = []
-
-    with sync_playwright() as p:
-        browser = p.chromium.launch(
-            headless=HEADLESS,
-            args=["--mute-audio"],
-        )
-
-        for i, fixture in enumerate(fixtures, 1):
-            print("\n" + "=" * 70)
-            print(f"[{i}/{len(fixtures)}]")
-            try:
-                results.append(scrape_fixture(browser, fixture))
-            except KeyboardInterrupt:
-                raise
-            except Exception as e:
-                print(f"    ERROR: {type(e).__name__}: {e}")
-                results.append({
-                    "match": fixture["match"],
-                    "home_team": fixture["home"],
-                    "away_team": fixture["away"],
-                    "kickoff": fixture["kickoff"].isoformat(),
-                    "source_url": LIST_URL,
-                    "market_count": 0,
-                    "markets": [],
-                    "error": str(e),
-                })
+    # scrape_fixture opens its own pages, so it is handed the pool worker's
+    # context rather than the worker's page.
+    results, errors = scrape_fixtures(
+        "BetVictor",
+        fixtures,
+        lambda page, fixture: scrape_fixture(page.context, fixture),
+        workers=WORKERS,
+        headless=HEADLESS,
+    )
+    shared_cache().save()
 
-        browser.close()
+    # Error rows go back in their fixture's position.
+    for error in sorted(errors, key=lambda error: error["position"]):
+        fixture = fixtures[error["position"]]
+        print(f"    ERROR: {error['match']}: {error['error']}")
+        results.insert(error["position"], {
+            "match": fixture["match"],
+            "home_team": fixture["home"],
+            "away_team": fixture["away"],
+            "kickoff": fixture["kickoff"].isoformat(),
+            "source_url": LIST_URL,
+            "market_count": 0,
+            "markets": [],
+            "error": error["error"],
+        })
 
     output = {
         "sport": "football",
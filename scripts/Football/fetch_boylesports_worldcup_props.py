@@ -25,7 +25,6 @@ from pathlib import Path
 from zoneinfo import ZoneInfo
 
 from bs4 import BeautifulSoup
-from curl_cffi import requests
 
 ROOT = Path(__file__).resolve().parents[2]
 MONEYLINES_PATH = ROOT / "football" / "data" / "boylesports_worldcup_moneylines.json"
@@ -689,6 +688,9 @@ def load_moneyline_kickoffs() -> dict[tuple[str, str], datetime]:
 
 
 def discover_fixture_urls() -> tuple[list[dict], dict]:
+    # Imported here so replay_parsers.py can load the parsers without curl_cffi.
+    from curl_cffi import requests
+
     started = time.perf_counter()
     session = requests.Session(impersonate="chrome124")
     response = session.get(COMPETITION_URL, timeout=30)
@@ -776,6 +778,8 @@ def discover_fixture_urls() -> tuple[list[dict], dict]:
 
 
 def fetch_fixture(index: int, fixture: dict) -> tuple[int, dict, dict]:
+    from curl_cffi import requests
+
     started = time.perf_counter()
     session = requests.Session(impersonate="chrome124")
     headers = {
@@ -40,8 +40,15 @@ from fractions import Fraction
 from pathlib import Path
 from typing import Iterable
 
+from page_waits import text_signature, wait_for_text_stable
+
 ROOT = Path(__file__).resolve().parents[2]
 
+if str(ROOT / "scripts") not in sys.path:
+    sys.path.insert(0, str(ROOT / "scripts"))
+
+import telemetry  # noqa: E402
+
 MONEYLINES_PATH = (
     ROOT / "football" / "data" / "bwin_worldcup_moneylines.json"
 )
@@ -53,6 +60,8 @@ DEBUG_DIR = ROOT / "football" / "debug" / "bwin_worldcup_props"
 
 MAX_MATCHES = 7
 HEADLESS = False
+# Concurrent fixture pages, see browser_pool.BOOK_MAX_WORKERS for the cap.
+WORKERS = 3
 SKIP_STARTED_MATCHES = True
 KICKOFF_BUFFER_MINUTES = 15
 LOCAL_TIMEZONE = ZoneInfo("Europe/Dublin")
@@ -62,12 +71,6 @@ FAST_CARD_SWEEPS = 3
 FAST_STABLE_ROUNDS = 1
 FAST_SCROLL_WAIT_MS = 90
 
-USER_AGENT = (
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-    "AppleWebKit/537.36 (KHTML, like Gecko) "
-    "Chrome/149.0.0.0 Safari/537.36"
-)
-
 TARGET_HEADINGS = [
     "Match Result",
     "Match Betting",
@@ -829,6 +832,7 @@ def load_matches() -> list[dict]:
 
 
 def dismiss_cookies(page) -> None:
+    before = text_signature(page)
     try:
         clicked = page.evaluate(
             r"""
@@ -874,17 +878,16 @@ def dismiss_cookies(page) -> None:
         )
 
         if clicked:
-            page.wait_for_timeout(180)
+            wait_for_text_stable(
+                page,
+                timeout_ms=180,
+                quiet_ms=100,
+                label="dismiss_cookies",
+                changed_from=before,
+            )
     except Exception:
         pass
 
-def block_heavy_resources(route) -> None:
-    if route.request.resource_type in {"image", "media", "font"}:
-        route.abort()
-    else:
-        route.continue_()
-
-
 def click_visible_text(page, label: str) -> bool:
     try:
         result = page.evaluate(
@@ -978,12 +981,19 @@ def click_visible_text(page, label: str) -> bool:
     if not result:
         return False
 
+    before = text_signature(page)
     try:
         page.mouse.click(
             float(result["x"]),
             float(result["y"]),
         )
-        page.wait_for_timeout(220)
+        wait_for_text_stable(
+            page,
+            timeout_ms=220,
+            quiet_ms=100,
+            label="click_visible_text",
+            changed_from=before,
+        )
         return True
     except Exception:
         try:
@@ -992,7 +1002,13 @@ def click_visible_text(page, label: str) -> bool:
             ).first.evaluate(
                 "element => element.click()"
             )
-            page.wait_for_timeout(220)
+            wait_for_text_stable(
+                page,
+                timeout_ms=220,
+                quiet_ms=100,
+                label="click_visible_text",
+                changed_from=before,
+            )
             return True
         except Exception:
             return False
@@ -1571,11 +1587,18 @@ def click_market_view_once(
 
             # Click the row once. The diagnostic probe already established
             # that this action opens the market view.
+            before = text_signature(page)
             row.click(
                 timeout=1800,
                 force=True,
             )
-            page.wait_for_timeout(350)
+            wait_for_text_stable(
+                page,
+                timeout_ms=350,
+                quiet_ms=150,
+                label="click_market_view_once",
+                changed_from=before,
+            )
 
             return clean(candidate.get("heading"))
         except Exception:
@@ -1631,8 +1654,15 @@ def open_market_accordion(page, aliases: list[str]) -> str:
 
                 # Try the exact text node first.
                 try:
+                    before = text_signature(page)
                     item.click(timeout=2500)
-                    page.wait_for_timeout(220)
+                    wait_for_text_stable(
+                        page,
+                        timeout_ms=220,
+                        quiet_ms=100,
+                        label="open_market_accordion",
+                        changed_from=before,
+                    )
                     opened = market_card_visible(page, aliases)
                     if opened:
                         expand_visible_markets(page, max_clicks=14)
@@ -1685,8 +1715,15 @@ def open_market_accordion(page, aliases: list[str]) -> str:
                         for x in click_xs:
                             page.mouse.move(x, y)
                             page.wait_for_timeout(70)
+                            before = text_signature(page)
                             page.mouse.click(x, y)
-                            page.wait_for_timeout(220)
+                            wait_for_text_stable(
+                                page,
+                                timeout_ms=220,
+                                quiet_ms=100,
+                                label="open_market_accordion",
+                                changed_from=before,
+                            )
 
                             opened = market_card_visible(page, aliases)
                             if opened:
@@ -1709,6 +1746,7 @@ def expand_visible_markets(
     maximum = min(max_clicks, 8)
 
     for _ in range(maximum):
+        before = text_signature(page)
         try:
             result = page.evaluate(
                 r"""
@@ -1790,7 +1828,13 @@ def expand_visible_markets(
             break
 
         clicked += 1
-        page.wait_for_timeout(120)
+        wait_for_text_stable(
+            page,
+            timeout_ms=120,
+            quiet_ms=60,
+            label="expand_visible_markets",
+            changed_from=before,
+        )
 
     return clicked
 
@@ -3548,73 +3592,31 @@ def scrape_one(page, match: dict) -> dict:
     }
 
 def main() -> int:
+    from browser_pool import scrape_fixtures
+
     script_started = time.perf_counter()
-    try:
-        from playwright.sync_api import sync_playwright
-    except ImportError:
-        print("Playwright is not installed.")
-        return 1
 
     matches = load_matches()
     print("Scraper mode:             PROD15 simple headful")
     print(f"Configured MAX_MATCHES:    {MAX_MATCHES}")
     print(f"Configured HEADLESS:       {HEADLESS}")
+    print(f"Configured WORKERS:        {WORKERS}")
     if not matches:
         print("No usable Bwin event URLs found in the moneyline JSON.")
         return 1
 
     DEBUG_DIR.mkdir(parents=True, exist_ok=True)
-    results = []
-    errors = []
-
-    with sync_playwright() as playwright:
-        browser = None
-        context = None
-
-        try:
-            browser = playwright.chromium.launch(
-                headless=HEADLESS,
-                args=[
-                    "--disable-background-networking",
-                    "--disable-background-timer-throttling",
-                    "--disable-backgrounding-occluded-windows",
-                    "--disable-breakpad",
-                    "--disable-extensions",
-                    "--disable-renderer-backgrounding",
-                    "--mute-audio",
-                    "--no-first-run",
-                ],
-            )
 
-            context = browser.new_context(
-                viewport={"width": 1700, "height": 1000},
-                user_agent=USER_AGENT,
-                locale="en-GB",
-            )
-            context.route("**/*", block_heavy_resources)
-            page = context.new_page()
-
-            for index, match in enumerate(matches, start=1):
-                print(
-                    f"\n[{index}/{len(matches)}] "
-                    f"{match['match']}"
-                )
+    results, errors = scrape_fixtures(
+        "Bwin",
+        matches,
+        scrape_one,
+        workers=WORKERS,
+        headless=HEADLESS,
+    )
 
-                try:
-                    results.append(scrape_one(page, match))
-                except Exception as error:
-                    errors.append(
-                        {
-                            "match": match["match"],
-                            "error": str(error),
-                        }
-                    )
-                    print(f"ERROR: {error}")
-        finally:
-            if context is not None:
-                context.close()
-            if browser is not None:
-                browser.close()
+    for error in errors:
+        print(f"ERROR: {error['match']}: {error['error']}")
 
     payload = {
         "sport": "football",
@@ -3635,6 +3637,7 @@ def main() -> int:
         encoding="utf-8",
     )
     temp_path.replace(OUT_PATH)
+    telemetry.count_output(payload)
 
     print("")
     print("Bwin World Cup props PROD15 SIMPLE HEADFUL completed")
@@ -18,7 +18,10 @@ import re
 import time
 from pathlib import Path
 from datetime import datetime, timezone
-from playwright.sync_api import sync_playwright
+
+from browser_pool import scrape_fixtures
+from event_url_cache import GONE_STATUSES, cached_or_discovered, shared_cache
+from page_waits import text_signature, wait_for_text_stable
 
 ROOT      = Path(__file__).resolve().parents[2]
 OUT_PATH  = ROOT / "football" / "data" / "ladbrokes_worldcup_props.json"
@@ -28,6 +31,8 @@ COMPETITION_URL = "https://www.ladbrokes.com/en/sports/competitions/football/int
 MAX_MATCHES = 7
 PRODUCTION_MARKER = "LADBROKES_PROPS_PROD15_COMPLETE_V1"
 HEADLESS = False
+# Concurrent fixture pages, see browser_pool.BOOK_MAX_WORKERS for the cap.
+WORKERS = 3
 SAVE_DEBUG_ARTIFACTS = False
 
 ODDS_RE = re.compile(r"^(?:\d+/\d+|EVS|EVENS|EVEN|Evens)$", re.I)
@@ -626,16 +631,20 @@ def accept_cookies(page):
         try:
             btn = page.get_by_role("button", name=re.compile(label, re.I))
             if btn.count():
+                before = text_signature(page)
                 btn.first.click(timeout=3000)
-                page.wait_for_timeout(350)
+                wait_for_text_stable(page, timeout_ms=350, quiet_ms=150, label="accept_cookies",
+                                     changed_from=before)
                 return
         except: pass
 
 def scroll_page(page, steps=12):
     """Trigger Ladbrokes lazy loading with larger, shorter scroll steps."""
     for _ in range(steps):
+        before = text_signature(page)
         page.mouse.wheel(0, 1000)
-        page.wait_for_timeout(180)
+        wait_for_text_stable(page, timeout_ms=180, quiet_ms=100, label="scroll_page",
+                             changed_from=before)
 
 def get_body(page):
     try:
@@ -665,16 +674,20 @@ def expand_show_all(page):
     try:
         btn = page.get_by_text("Show All", exact=True)
         if btn.count():
+            before = text_signature(page)
             btn.first.click(timeout=3000)
-            page.wait_for_timeout(450)
+            wait_for_text_stable(page, timeout_ms=450, quiet_ms=150, label="expand_show_all",
+                                 changed_from=before)
     except: pass
 
 def click_filter(page, name):
     try:
         loc = page.get_by_text(name, exact=True)
         if loc.count():
+            before = text_signature(page)
             loc.first.click(timeout=3000)
-            page.wait_for_timeout(650)
+            wait_for_text_stable(page, timeout_ms=650, quiet_ms=200, min_prices=1,
+                                 label="click_filter", changed_from=before)
             return True
     except: pass
     return False
@@ -906,6 +919,7 @@ def click_card_label(page, marker, label):
     Click an exact visible label inside one marked card only.
     This avoids accidentally clicking identically named controls elsewhere.
     """
+    before = text_signature(page)
     try:
         clicked = page.evaluate(
             r"""
@@ -982,7 +996,8 @@ def click_card_label(page, marker, label):
         )
 
         if clicked:
-            page.wait_for_timeout(650)
+            wait_for_text_stable(page, timeout_ms=650, quiet_ms=200,
+                                 label="click_card_label", changed_from=before)
 
         return bool(clicked)
     except Exception:
@@ -997,6 +1012,7 @@ def expand_show_all_in_card(page, marker):
     clicked_total = 0
 
     for _ in range(3):
+        before = text_signature(page)
         try:
             clicked = page.evaluate(
                 r"""
@@ -1075,7 +1091,8 @@ def expand_show_all_in_card(page, marker):
             break
 
         clicked_total += 1
-        page.wait_for_timeout(500)
+        wait_for_text_stable(page, timeout_ms=500, quiet_ms=150,
+                             label="expand_show_all_in_card", changed_from=before)
 
     return clicked_total
 
@@ -1242,6 +1259,7 @@ def expand_market_component(
     """
     Expand one exact markets-group-component and optionally click its Show All.
     """
+    before = text_signature(page)
     try:
         result = page.evaluate(
             r"""
@@ -1323,14 +1341,19 @@ def expand_market_component(
     if not result.get("found"):
         return result
 
-    page.wait_for_timeout(
-        650 if result.get("clicked") else 250
+    wait_for_text_stable(
+        page,
+        timeout_ms=650 if result.get("clicked") else 250,
+        quiet_ms=200,
+        label="expand_market_component",
+        changed_from=before,
     )
 
     show_all_clicks = 0
 
     if show_all:
         for _ in range(4):
+            before = text_signature(page)
             try:
                 clicked_show_all = page.evaluate(
                     r"""
@@ -1425,7 +1448,13 @@ def expand_market_component(
                 break
 
             show_all_clicks += 1
-            page.wait_for_timeout(550)
+            wait_for_text_stable(
+                page,
+                timeout_ms=550,
+                quiet_ms=150,
+                label="expand_market_component:show_all",
+                changed_from=before,
+            )
 
     result["showAllClicks"] = show_all_clicks
     return result
@@ -1436,6 +1465,7 @@ def click_market_switcher(
     title,
     label,
 ):
+    before = text_signature(page)
     try:
         clicked = page.evaluate(
             r"""
@@ -1501,7 +1531,8 @@ def click_market_switcher(
         clicked = False
 
     if clicked:
-        page.wait_for_timeout(650)
+        wait_for_text_stable(page, timeout_ms=650, quiet_ms=200,
+                             label="click_market_switcher", changed_from=before)
 
     return bool(clicked)
 
@@ -2533,11 +2564,17 @@ def scrape_match(page, fixture):
     # Main
     # ------------------------------------------------------------------
     stage_started = time.perf_counter()
-    page.goto(
+    response = page.goto(
         url,
         wait_until="domcontentloaded",
         timeout=60000,
     )
+    if response is not None and response.status in GONE_STATUSES:
+        shared_cache().invalidate_url(
+            "Ladbrokes",
+            url,
+            f"HTTP {response.status}",
+        )
     page.wait_for_timeout(2500)
     accept_cookies(page)
     wait_for_any_text(
@@ -3488,50 +3525,57 @@ def main():
     print(f"Marker: {PRODUCTION_MARKER}")
     print("=" * 64)
 
-    with sync_playwright() as playwright:
-        browser = playwright.chromium.launch(
-            headless=HEADLESS
-        )
-        page = browser.new_page(
-            viewport={
-                "width": 1700,
-                "height": 1000,
-            }
-        )
-
-        fixtures = get_match_links(page)
-        results = []
-        attempted = 0
+    from playwright.sync_api import sync_playwright
 
-        for fixture in fixtures:
-            if len(results) >= MAX_MATCHES:
-                break
-
-            attempted += 1
-            print(
-                f"\n[usable {len(results) + 1}/"
-                f"{MAX_MATCHES} | "
-                f"candidate {attempted}/"
-                f"{len(fixtures)}]"
+    def discover():
+        with sync_playwright() as playwright:
+            browser = playwright.chromium.launch(
+                headless=HEADLESS
             )
-
             try:
-                result = scrape_match(
-                    page,
-                    fixture,
+                page = browser.new_page(
+                    viewport={
+                        "width": 1700,
+                        "height": 1000,
+                    }
                 )
+                return get_match_links(page)
+            finally:
+                browser.close()
 
-                if result is None:
-                    continue
+    # Every listed fixture is a candidate, so the whole list is cached.
+    fixtures = cached_or_discovered(
+        "Ladbrokes",
+        discover,
+    )
 
-                results.append(result)
+    # scrape_match returns None for a candidate that is not usable, so
+    # candidates are scraped in batches sized to the remaining shortfall
+    # until MAX_MATCHES are usable or the candidates run out.
+    results = []
+    candidates = list(fixtures)
 
-            except Exception as error:
-                print(
-                    f"  ERROR: {error}"
-                )
+    while candidates and len(results) < MAX_MATCHES:
+        batch = candidates[:MAX_MATCHES - len(results)]
+        candidates = candidates[len(batch):]
+
+        batch_results, errors = scrape_fixtures(
+            "Ladbrokes",
+            batch,
+            scrape_match,
+            workers=WORKERS,
+            headless=HEADLESS,
+            route_handler=None,
+        )
+
+        for error in errors:
+            print(
+                f"  ERROR: {error['match']}: {error['error']}"
+            )
+
+        results.extend(batch_results)
 
-        browser.close()
+    shared_cache().save()
 
     output = {
         "sport": "football",
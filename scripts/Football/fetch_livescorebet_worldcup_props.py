@@ -5,12 +5,22 @@ import re
 import sys
 import shutil
 import time
+from contextlib import nullcontext
 from pathlib import Path
 from datetime import datetime, timezone
-from playwright.sync_api import sync_playwright
+
+from browser_pool import block_heavy_resources, scrape_fixtures
+from event_url_cache import GONE_STATUSES, cached_or_discovered, shared_cache
+from page_waits import text_signature, wait_for_text_stable, write_wait_report
+from response_capture import CAPTURE_MODE, ResponseCapture
 
 ROOT = Path(__file__).resolve().parents[2]
 
+if str(ROOT / "scripts") not in sys.path:
+    sys.path.insert(0, str(ROOT / "scripts"))
+
+import telemetry  # noqa: E402
+
 LIVE_OUT_PATH = ROOT / "football" / "data" / "livescorebet_worldcup_props.json"
 LEGACY_STAGING_PATH = ROOT / "football" / "data" / "livescorebet_worldcup_props_PRODUCTION_V3_STAGING.json"
 STAGING_OUT_PATH = ROOT / "football" / "data" / "livescorebet_worldcup_props_PRODUCTION_V4_STAGING.json"
@@ -25,6 +35,12 @@ MIN_ACTIVE_FIXTURES = 3
 COUPON_URL     = "https://www.livescorebet.com/ie/coupon/21127/"
 PLAYER_GRP_ID  = "757"
 MAX_MATCHES = 7
+# Concurrent fixture pages, see browser_pool.BOOK_MAX_WORKERS for the cap.
+WORKERS = 3
+# Capture mode (PROPS_CAPTURE_MODE=json or --capture-json) stores the JSON
+# responses the standard market page loads, building a payload corpus for a
+# future structured parser. Prices still come from the DOM text.
+MARKET_RESPONSE_PATTERN = r"livescorebet\.com/.*(?:api|event|market)"
 ODDS_RE = re.compile(r"^(?:\d+/\d+|EVS|EVENS|EVEN|Evens)$", re.I)
 SCOPE_MARKER = "__LSB_SCOPE__"
 
@@ -659,8 +675,10 @@ def accept_cookies(page):
         try:
             btn = page.get_by_role("button", name=re.compile(label, re.I))
             if btn.count():
+                before = text_signature(page)
                 btn.first.click(timeout=3000)
-                page.wait_for_timeout(1000)
+                wait_for_text_stable(page, timeout_ms=1000, label="accept_cookies",
+                                     changed_from=before)
                 return
         except Exception:
             pass
@@ -674,8 +692,10 @@ def expand_view_more(page):
             for i in range(count):
                 try:
                     buttons.nth(i).scroll_into_view_if_needed(timeout=2000)
+                    before = text_signature(page)
                     buttons.nth(i).click(timeout=3000)
-                    page.wait_for_timeout(500)
+                    wait_for_text_stable(page, timeout_ms=500, quiet_ms=150,
+                                         label="expand_view_more", changed_from=before)
                 except Exception:
                     pass
     except Exception:
@@ -746,12 +766,16 @@ def collect_loaded_page_text(
     scroll_started = time.perf_counter()
 
     for _ in range(scroll_steps):
+        before = text_signature(page)
         page.mouse.wheel(0, 650)
-        page.wait_for_timeout(250)
+        wait_for_text_stable(page, timeout_ms=250, quiet_ms=120, label="scroll_page",
+                             changed_from=before)
 
     expand_view_more(page)
+    before = text_signature(page)
     page.keyboard.press("Control+Home")
-    page.wait_for_timeout(400)
+    wait_for_text_stable(page, timeout_ms=400, quiet_ms=150, label="scroll_top",
+                         changed_from=before)
 
     text = page.locator("body").inner_text(timeout=30000)
 
@@ -1115,6 +1139,7 @@ def capture_scope_market_text(page, heading, scope, all_scopes):
         # One retry if the first click was swallowed by a rerender.
         retry_item = _visible_exact_text(container, scope)
         if retry_item is not None:
+            telemetry.count("retries")
             try:
                 retry_item.click(timeout=3000, force=True)
                 page.wait_for_timeout(1200)
@@ -1557,25 +1582,34 @@ def scrape_match(page, fixture):
     print("    Pass 1: standard markets")
     standard_nav_started = time.perf_counter()
 
-    page.goto(
-        url,
-        wait_until="domcontentloaded",
-        timeout=60000,
-    )
-    standard_dom_seconds = round(
-        time.perf_counter() - standard_nav_started,
-        2,
-    )
+    capture = ResponseCapture(page, MARKET_RESPONSE_PATTERN) if CAPTURE_MODE else None
+    with capture or nullcontext():
+        response = page.goto(
+            url,
+            wait_until="domcontentloaded",
+            timeout=60000,
+        )
+        if response is not None and response.status in GONE_STATUSES:
+            shared_cache().invalidate_url(
+                "LiveScoreBet", url, f"HTTP {response.status}"
+            )
+            raise RuntimeError(f"Event page returned HTTP {response.status}")
+        standard_dom_seconds = round(
+            time.perf_counter() - standard_nav_started,
+            2,
+        )
 
-    standard_ready_seconds = wait_for_market_content(
-        page,
-        ready_markers=[
-            "Full Time",
-            "Both Teams to Score",
-            "Total Goals",
-        ],
-        timeout_ms=4500,
-    )
+        standard_ready_seconds = wait_for_market_content(
+            page,
+            ready_markers=[
+                "Full Time",
+                "Both Teams to Score",
+                "Total Goals",
+            ],
+            timeout_ms=4500,
+        )
+        if capture is not None:
+            capture.wait_quiet(timeout_ms=2500, label="lsb capture standard")
     accept_cookies(page)
 
     # Start the player page now. The browser continues loading it in the
@@ -1624,6 +1658,10 @@ def scrape_match(page, fixture):
         2,
     )
 
+    if capture is not None:
+        capture.save(DEBUG_DIR / f"{slugify(name)}_responses.json")
+        print(f"    capture: recorded {len(capture.payloads)} JSON response(s)")
+
     standard_markets = [
         market
         for market in standard_markets
@@ -2091,6 +2129,7 @@ def atomic_promote_staging():
 
 def print_validation_and_promote(output, source_label):
     sanitization_warnings = sanitize_incomplete_scoped_sot_sets(output)
+    telemetry.count_output(output)
 
     STAGING_OUT_PATH.write_text(
         json.dumps(output, indent=2, ensure_ascii=False),
@@ -2198,6 +2237,9 @@ def promote_existing_v3_staging():
 
 
 def main():
+    # Imported here so replay_parsers.py can load the parsers without Playwright.
+    from playwright.sync_api import sync_playwright
+
     STAGING_OUT_PATH.parent.mkdir(parents=True, exist_ok=True)
     DEBUG_DIR.mkdir(parents=True, exist_ok=True)
     BACKUP_DIR.mkdir(parents=True, exist_ok=True)
@@ -2212,69 +2254,60 @@ def main():
 
     run_started = time.perf_counter()
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=False)
-        context = browser.new_context(
-            viewport={"width": 1700, "height": 1000}
-        )
-
-        def block_heavy_resources(route):
-            if route.request.resource_type in {
-                "image",
-                "media",
-                "font",
-            }:
-                route.abort()
-            else:
-                route.continue_()
-
-        context.route("**/*", block_heavy_resources)
-        page = context.new_page()
+    def discover():
+        try:
+            with sync_playwright() as p:
+                browser = p.chromium.launch(headless=False)
+                page = browser.new_page(
+                    viewport={"width": 1700, "height": 1000}
+                )
+                telemetry.watch_page(page)
+                page.route("**/*", block_heavy_resources)
 
-        fixtures_started = time.perf_counter()
-        fixtures = get_match_links(page)
-        print(
-            f"Fixture discovery: "
-            f"{round(time.perf_counter() - fixtures_started, 2)}s"
-        )
+                try:
+                    return get_match_links(page)
+                finally:
+                    browser.close()
+        except Exception as e:
+            print(f"  ⚠ Fixture discovery failed: {e}")
+            return []
+
+    # A failed crawl falls back to the cached coupon rather than stopping.
+    fixtures = cached_or_discovered(
+        "LiveScoreBet",
+        discover,
+        limit=MAX_MATCHES,
+    )
 
-        results = []
+    # Each pool worker owns a warmed context, so the player-page prefetch in
+    # scrape_match still opens beside its own fixture page.
+    results, errors = scrape_fixtures(
+        "LiveScoreBet",
+        fixtures,
+        scrape_match,
+        workers=WORKERS,
+        headless=False,
+    )
 
-        for index, fixture in enumerate(fixtures, 1):
-            print(f"\n[{index}/{len(fixtures)}]")
-            try:
-                result = scrape_match(page, fixture)
-                results.append(result)
-            except KeyboardInterrupt:
-                browser.close()
-                raise
-            except Exception as exc:
-                print(
-                    f"  ⚠ Error: {type(exc).__name__}: {exc}"
-                )
-                for extra_page in list(context.pages):
-                    if extra_page is page:
-                        continue
-                    try:
-                        extra_page.close()
-                    except Exception:
-                        pass
-
-                results.append({
-                    "match": fixture.get("name", ""),
-                    "home_team": "",
-                    "away_team": "",
-                    "url": fixture.get("url", ""),
-                    "market_count": 0,
-                    "quality_status": "FAIL",
-                    "missing_required_markets": [],
-                    "elapsed_seconds": 0,
-                    "timing": {},
-                    "markets": [],
-                    "error": f"{type(exc).__name__}: {exc}",
-                })
-
-        browser.close()
+    shared_cache().save()
+
+    # Error rows go back in their fixture's position. Inserting in position
+    # order lands each one exactly, since every other fixture has a result.
+    for error in sorted(errors, key=lambda error: error["position"]):
+        print(f"  ⚠ Error: {error['match']}: {error['error']}")
+        results.insert(error["position"], {
+            "match": error.get("match", ""),
+            "home_team": "",
+            "away_team": "",
+            "url": error.get("url", ""),
+            "market_count": 0,
+            "quality_status": "FAIL",
+            "missing_required_markets": [],
+            "elapsed_seconds": 0,
+            "timing": {},
+            "markets": [],
+            "error": error["error"],
+        })
 
     runtime_seconds = round(
         time.perf_counter() - run_started,
@@ -2309,6 +2342,10 @@ def main():
         output,
         source_label="fresh browser scrape",
     )
+    write_wait_report(
+        DEBUG_DIR / "wait_report.jsonl",
+        run_label=output["generated_at"],
+    )
 
     print("\n── Summary ───────────────────────────────────────────")
     for row in results:
@@ -14,7 +14,11 @@ import json
 import re
 from pathlib import Path
 from datetime import datetime, timezone
-from playwright.sync_api import sync_playwright, TimeoutError as PWTimeout
+from playwright.sync_api import TimeoutError as PWTimeout
+
+from browser_pool import scrape_fixtures
+from event_url_cache import GONE_STATUSES, cached_or_discovered, shared_cache
+from page_waits import text_signature, wait_for_text_stable
 
 ROOT = Path(__file__).resolve().parents[2]
 OUT_PATH = ROOT / "football" / "data" / "paddypower_worldcup_props.json"
@@ -22,6 +26,8 @@ DBG_DIR = ROOT / "football" / "debug" / "paddypower_worldcup_props"
 
 LIST_URL = "https://www.paddypower.com/fifa-world-cup"
 MAX_MATCHES = 7  # scrape first 7 real PaddyPower match URLs
+# Concurrent fixture pages, see browser_pool.BOOK_MAX_WORKERS for the cap.
+WORKERS = 3
 
 TABS = {
     "": ["Double Chance", "Half Time"],
@@ -796,8 +802,10 @@ def accept_cookies(page) -> None:
         try:
             btn = page.get_by_role("button", name=re.compile(label, re.I))
             if btn.count():
+                before = text_signature(page)
                 btn.first.click(timeout=2500)
-                page.wait_for_timeout(600)
+                wait_for_text_stable(page, timeout_ms=600, label="accept_cookies",
+                                     changed_from=before)
                 return
         except Exception:
             pass
@@ -809,8 +817,10 @@ def click_show_all(page) -> None:
             buttons = page.get_by_text(text, exact=True)
             for i in range(min(buttons.count(), 5)):
                 try:
+                    before = text_signature(page)
                     buttons.nth(i).click(timeout=600)
-                    page.wait_for_timeout(180)
+                    wait_for_text_stable(page, timeout_ms=180, quiet_ms=100,
+                                         label="click_show_all", changed_from=before)
                 except Exception:
                     pass
         except Exception:
@@ -849,8 +859,10 @@ def expand_section(page, heading) -> None:
         except Exception:
             pass
 
+        before = text_signature(page)
         el.click(timeout=1500)
-        page.wait_for_timeout(450)
+        wait_for_text_stable(page, timeout_ms=450, quiet_ms=150,
+                             label="expand_section", changed_from=before)
 
     except Exception:
         pass
@@ -865,6 +877,7 @@ def force_expand_market(page, heading) -> None:
     This clicks the nearest row/button/accordion ancestor and also tries JS.
     """
     try:
+        before = text_signature(page)
         page.evaluate(
             """(heading) => {
                 const norm = s => (s || '').replace(/\s+/g, ' ').trim();
@@ -897,7 +910,8 @@ def force_expand_market(page, heading) -> None:
             }""",
             heading,
         )
-        page.wait_for_timeout(800)
+        wait_for_text_stable(page, timeout_ms=800, quiet_ms=200,
+                             label="force_expand_market", changed_from=before)
     except Exception:
         pass
 
@@ -991,7 +1005,7 @@ def collect_match_links(page) -> list:
             continue
 
         seen.add(href)
-        out.append({"url": href, "text": text})
+        out.append({"url": href, "name": match_name_from_url(href), "text": text})
 
     print(f"Found {len(out)} real match URLs")
     for i, item in enumerate(out[:MAX_MATCHES], 1):
@@ -1063,7 +1077,9 @@ def scrape_match(page, url, fallback_text="") -> dict:
         try:
             print(f"    tab={label}", end=" ... ", flush=True)
 
-            page.goto(base_url + tab_param, wait_until="domcontentloaded", timeout=30000)
+            response = page.goto(base_url + tab_param, wait_until="domcontentloaded", timeout=30000)
+            if response is not None and response.status in GONE_STATUSES:
+                shared_cache().invalidate_url("PaddyPower", base_url, f"HTTP {response.status}")
             wait_ms = 3000 if tab_param in ("?tab=goals", "?tab=shots", "?tab=popular") else 2200
             page.wait_for_timeout(wait_ms)
 
@@ -1134,50 +1150,61 @@ def scrape_match(page, url, fallback_text="") -> dict:
 # MAIN
 # ---------------------------------------------------------------------------
 
-def main() -> None:
-    OUT_PATH.parent.mkdir(parents=True, exist_ok=True)
-    DBG_DIR.mkdir(parents=True, exist_ok=True)
-
-    matches, errors = [], []
+def scrape_listed_match(page, item) -> dict:
+    """Scrape one listed fixture on a fresh page in the pool worker's context.
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=False)
-
-        # Use one page only for collecting fixture URLs.
-        list_page = browser.new_page(viewport={"width": 1280, "height": 900})
-        links = collect_match_links(list_page)[:MAX_MATCHES]
+    Faster than the stable retry build, but a fresh page per match prevents
+    one dead/live fixture from poisoning the next fixture.
+    """
+    match_page = page.context.new_page()
+    try:
+        result = scrape_match(match_page, item["url"], item.get("text", ""))
+    finally:
         try:
-            list_page.close()
+            match_page.close()
         except Exception:
             pass
 
-        for idx, item in enumerate(links, 1):
-            print(f"\n=== [{idx}/{len(links)}] {item.get('text') or item['url']} ===")
-            print(f"    url={item['url']}")
+    print(f"  → {result['match']} | {result['market_count']} markets")
+    for m in result["markets"]:
+        print(f"      {m['market']:50s} {m['selection_count']} selections")
+    return result
 
-            # Fresh page per match, same browser.
-            # Faster than the stable retry build, but prevents one dead/live
-            # fixture from poisoning the next fixture.
-            page = browser.new_page(viewport={"width": 1280, "height": 900})
-            try:
-                result = scrape_match(page, item["url"], item.get("text", ""))
-                matches.append(result)
 
-                print(f"  → {result['match']} | {result['market_count']} markets")
-                for m in result["markets"]:
-                    print(f"      {m['market']:50s} {m['selection_count']} selections")
+def main() -> None:
+    from playwright.sync_api import sync_playwright
 
-            except Exception as e:
-                print(f"  ERROR: {e}")
-                errors.append({"url": item["url"], "error": str(e)})
+    OUT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    DBG_DIR.mkdir(parents=True, exist_ok=True)
 
+    def discover():
+        with sync_playwright() as p:
+            browser = p.chromium.launch(headless=False)
+
+            # Use one page only for collecting fixture URLs.
+            try:
+                list_page = browser.new_page(viewport={"width": 1280, "height": 900})
+                return collect_match_links(list_page)[:MAX_MATCHES]
             finally:
-                try:
-                    page.close()
-                except Exception:
-                    pass
+                browser.close()
+
+    links = cached_or_discovered("PaddyPower", discover, limit=MAX_MATCHES)
+
+    matches, pool_errors = scrape_fixtures(
+        "PaddyPower",
+        links,
+        scrape_listed_match,
+        workers=WORKERS,
+        headless=False,
+        context_options={"viewport": {"width": 1280, "height": 900}},
+        route_handler=None,
+    )
+    shared_cache().save()
 
-        browser.close()
+    errors = []
+    for error in pool_errors:
+        print(f"  ERROR: {error['match']}: {error['error']}")
+        errors.append({"url": error.get("url", ""), "error": error["error"]})
 
     good = [m for m in matches if m.get("market_count", 0) > 0]
 
@@ -42,7 +42,11 @@ import re
 import sys
 from datetime import datetime, timezone
 from pathlib import Path
-from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+from browser_pool import scrape_fixtures
+from event_url_cache import GONE_STATUSES, cached_or_discovered, shared_cache
+from page_waits import text_signature, wait_for_text_stable
 
 ROOT = Path(__file__).resolve().parents[2]
 OUT_PATH = ROOT / "football" / "data" / "unibet_worldcup_props.json"
@@ -51,6 +55,8 @@ LIST_URL = "https://www.unibet.ie/betting/odds/football/fifa-world-cup/group-mat
 
 MAX_MATCHES = 15
 HEADLESS = False
+# Concurrent fixture pages, see browser_pool.BOOK_MAX_WORKERS for the cap.
+WORKERS = 3
 
 PARSER_VERSION = "MULTI_OCCURRENCE_MATCH_MARKETS_V2"
 
@@ -199,8 +205,10 @@ def accept_cookies(page):
         try:
             btn = page.get_by_role("button", name=re.compile(label, re.I))
             if btn.count():
+                before = text_signature(page)
                 btn.first.click(timeout=2500)
-                page.wait_for_timeout(800)
+                wait_for_text_stable(page, timeout_ms=800, label="accept_cookies",
+                                     changed_from=before)
                 return
         except Exception:
             pass
@@ -214,8 +222,10 @@ def collect_match_links(page):
 
     for i in range(14):
         print(f"Scrolling list page {i + 1}/14...")
+        before = text_signature(page)
         page.mouse.wheel(0, 900)
-        page.wait_for_timeout(600)
+        wait_for_text_stable(page, timeout_ms=600, quiet_ms=150, label="scroll_list",
+                             changed_from=before)
 
     links = page.evaluate("""
         () => Array.from(document.querySelectorAll('a'))
@@ -234,7 +244,7 @@ def collect_match_links(page):
         if not href or href in seen:
             continue
         seen.add(href)
-        out.append({"url": href, "text": text})
+        out.append({"url": href, "name": title_from_slug(href), "text": text})
 
     print(f"Found {len(out)} possible Unibet match links")
     return out[:MAX_MATCHES]
@@ -278,8 +288,10 @@ def click_main_markets(page):
         try:
             loc = page.get_by_text(label, exact=True)
             if loc.count():
+                before = text_signature(page)
                 loc.first.click(timeout=4000)
-                page.wait_for_timeout(1500)
+                wait_for_text_stable(page, timeout_ms=1500, quiet_ms=400, min_prices=1,
+                                     label="click_main_markets", changed_from=before)
                 return True
         except Exception:
             pass
@@ -301,16 +313,20 @@ def expand_all_view_more(page, max_clicks=80):
                     if target.is_visible(timeout=500):
                         target.scroll_into_view_if_needed(timeout=1500)
                         page.wait_for_timeout(150)
+                        before = text_signature(page)
                         target.click(timeout=2000)
-                        page.wait_for_timeout(650)
+                        wait_for_text_stable(page, timeout_ms=650, quiet_ms=150,
+                                             label="expand_view_more", changed_from=before)
                         clicks += 1
                         clicked = True
                         break
                 except Exception:
                     continue
             if not clicked:
+                before = text_signature(page)
                 page.mouse.wheel(0, 800)
-                page.wait_for_timeout(350)
+                wait_for_text_stable(page, timeout_ms=350, quiet_ms=120, label="scroll_page",
+                                     changed_from=before)
         except Exception:
             break
     print(f"Clicked View more {clicks} times")
@@ -1073,7 +1089,9 @@ def dedupe_markets(markets):
 
 def scrape_match(page, url, fallback_text=""):
     print(f"\nOpening Unibet match page: {url}")
-    page.goto(url, wait_until="domcontentloaded", timeout=60000)
+    response = page.goto(url, wait_until="domcontentloaded", timeout=60000)
+    if response is not None and response.status in GONE_STATUSES:
+        shared_cache().invalidate_url("Unibet", url, f"HTTP {response.status}")
     page.wait_for_timeout(5500)
     accept_cookies(page)
     click_main_markets(page)
@@ -1114,36 +1132,48 @@ def scrape_match(page, url, fallback_text=""):
     }
 
 
+def scrape_listed_match(page, item):
+    match = scrape_match(page, item["url"], fallback_text=item.get("text") or "")
+    print(f"Saved match: {match['match']} | markets: {match['market_count']}")
+    return match
+
+
 def main():
+    from playwright.sync_api import sync_playwright
+
     OUT_PATH.parent.mkdir(parents=True, exist_ok=True)
     DEBUG_DIR.mkdir(parents=True, exist_ok=True)
 
-    matches, errors = [], []
+    def discover():
+        with sync_playwright() as p:
+            browser = p.chromium.launch(headless=HEADLESS)
+            try:
+                page = browser.new_page(viewport={"width": 1700, "height": 1000})
+                return collect_match_links(page)
+            finally:
+                browser.close()
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=HEADLESS)
-        page = browser.new_page(viewport={"width": 1700, "height": 1000})
+    links = cached_or_discovered("Unibet", discover, limit=MAX_MATCHES)
 
-        links = collect_match_links(page)
-        print()
-        print("==============================")
-        print(f"Limiting Unibet props scrape to first {len(links)} matches")
-        print("==============================")
+    print()
+    print("==============================")
+    print(f"Limiting Unibet props scrape to first {len(links)} matches")
+    print("==============================")
 
-        for index, item in enumerate(links, start=1):
-            print()
-            print("==============================")
-            print(f"Unibet props {index}/{len(links)}")
-            print("==============================")
-            try:
-                match = scrape_match(page, item["url"], fallback_text=item.get("text") or "")
-                matches.append(match)
-                print(f"Saved match: {match['match']} | markets: {match['market_count']}")
-            except Exception as e:
-                print(f"ERROR scraping {item['url']}: {e}")
-                errors.append({"url": item["url"], "error": str(e)})
-
-        browser.close()
+    matches, pool_errors = scrape_fixtures(
+        "Unibet",
+        links,
+        scrape_listed_match,
+        workers=WORKERS,
+        headless=HEADLESS,
+        route_handler=None,
+    )
+    shared_cache().save()
+
+    errors = []
+    for error in pool_errors:
+        print(f"ERROR scraping {error.get('url', '')}: {error['error']}")
+        errors.append({"url": error.get("url", ""), "error": error["error"]})
 
     good_matches = [m for m in matches if m.get("market_count", 0) > 0]
     output = {
@@ -30,6 +30,10 @@ treated as scraper failures.
 
 Creates a timestamped backup, validates a temporary JSON, then atomically
 replaces football/data/unibet_worldcup_props.json.
+
+Capture mode (PROPS_CAPTURE_MODE=json or --capture-json) also saves the
+Kambi betoffer JSON each fixture page loads as <match>_responses.json in
+the debug folder. Prices still come from the rendered page.
 """
 
 import importlib.util
@@ -38,11 +42,15 @@ import os
 import re
 import shutil
 import time
+from contextlib import nullcontext
 from datetime import datetime, timezone
 from pathlib import Path
 
 from playwright.sync_api import sync_playwright
 
+from event_url_cache import GONE_STATUSES, cached_or_discovered, shared_cache
+from response_capture import CAPTURE_MODE, ResponseCapture
+
 
 ROOT = Path(__file__).resolve().parents[2]
 
@@ -92,6 +100,10 @@ MAX_MATCHES = 7
 CANDIDATE_LIMIT = 15
 HEADLESS = False
 
+# Capture mode stores the Kambi offering responses the fixture page loads,
+# building a payload corpus for a future structured parser.
+MARKET_RESPONSE_PATTERN = r"/offering/v\d+/\w+/betoffer/"
+
 CORRECTED_MARKETS = {
     "Player Shots On Target",
     "Player Shots",
@@ -342,8 +354,13 @@ def collect_links(
     main_module.MAX_MATCHES = CANDIDATE_LIMIT
     dom_module.MAX_MATCHES = CANDIDATE_LIMIT
 
-    links = main_module.collect_match_links(
-        page
+    # Shared with fetch_unibet_worldcup_props.py, which lists as many.
+    links = cached_or_discovered(
+        "Unibet",
+        lambda: main_module.collect_match_links(
+            page
+        ),
+        limit=CANDIDATE_LIMIT,
     )
 
     if links:
@@ -503,45 +520,78 @@ def scrape_match(
         f"\nOpening Unibet match page: {url}"
     )
 
-    page.goto(
-        url,
-        wait_until="domcontentloaded",
-        timeout=60000,
+    capture = (
+        ResponseCapture(page, MARKET_RESPONSE_PATTERN)
+        if CAPTURE_MODE
+        else None
     )
 
-    ready = wait_for_match_ready(page)
-    main_module.accept_cookies(page)
-    main_module.click_main_markets(page)
-    wait_for_match_ready(
-        page,
-        timeout_ms=7000,
-    )
+    # The capture stays open through the expansion, which loads more offers.
+    with capture or nullcontext():
+        response = page.goto(
+            url,
+            wait_until="domcontentloaded",
+            timeout=60000,
+        )
+        if (
+            response is not None
+            and response.status in GONE_STATUSES
+        ):
+            shared_cache().invalidate_url(
+                "Unibet",
+                url,
+                f"HTTP {response.status}",
+            )
 
-    initial_text = page.locator(
-        "body"
-    ).inner_text(timeout=30000)
+        ready = wait_for_match_ready(page)
+        main_module.accept_cookies(page)
+        main_module.click_main_markets(page)
+        wait_for_match_ready(
+            page,
+            timeout_ms=7000,
+        )
 
-    match_name = (
-        main_module.get_match_name_from_page(
-            initial_text,
-            url,
-            fallback_text=fallback_text,
+        initial_text = page.locator(
+            "body"
+        ).inner_text(timeout=30000)
+
+        match_name = (
+            main_module.get_match_name_from_page(
+                initial_text,
+                url,
+                fallback_text=fallback_text,
+            )
+        )
+        home, away = main_module.split_teams(
+            match_name
         )
-    )
-    home, away = main_module.split_teams(
-        match_name
-    )
 
-    clicks = expand_all_view_more_fast(
-        page,
-        max_clicks=80,
-    )
-    page.wait_for_timeout(650)
+        clicks = expand_all_view_more_fast(
+            page,
+            max_clicks=80,
+        )
+        page.wait_for_timeout(650)
 
-    text = page.locator(
-        "body"
-    ).inner_text(timeout=30000)
-    rows = dom_module.collect_rows(page)
+        text = page.locator(
+            "body"
+        ).inner_text(timeout=30000)
+        rows = dom_module.collect_rows(page)
+
+        if capture is not None:
+            capture.wait_quiet(
+                timeout_ms=2500,
+                label="unibet capture",
+            )
+
+    if capture is not None:
+        capture.save(
+            DEBUG_DIR
+            / f"{slugify(match_name)}_responses.json"
+        )
+        print(
+            "    capture: recorded "
+            f"{len(capture.payloads)} JSON response(s)"
+        )
 
     main_markets = []
 
@@ -911,6 +961,8 @@ def main():
 
         browser.close()
 
+    shared_cache().save()
+
     if errors:
         raise RuntimeError(
             "Unibet scrape completed with "
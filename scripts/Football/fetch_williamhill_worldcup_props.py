@@ -42,14 +42,24 @@ Debug:
 
 import json
 import re
+import sys
 import time
 from pathlib import Path
 from datetime import datetime, timezone
 
-from playwright.sync_api import sync_playwright
+
+from browser_pool import scrape_fixtures
+from event_url_cache import GONE_STATUSES, shared_cache
+from page_waits import text_signature, wait_for_text_stable, write_wait_report
+from response_capture import CAPTURE_MODE, ResponseCapture
 
 ROOT = Path(__file__).resolve().parents[2]
 
+if str(ROOT / "scripts") not in sys.path:
+    sys.path.insert(0, str(ROOT / "scripts"))
+
+import telemetry  # noqa: E402
+
 OUT_PATH  = ROOT / "football" / "data" / "williamhill_worldcup_props_V23_STAGING.json"
 LIVE_OUT_PATH = ROOT / "football" / "data" / "williamhill_worldcup_props.json"
 BACKUP_DIR = ROOT / "football" / "data" / "backups"
@@ -70,6 +80,13 @@ COMPETITION_URL = "https://sports.williamhill.com/betting/en-gb/football/competi
 
 MAX_MATCHES = 7
 HEADLESS = False
+# Concurrent fixture pages, see browser_pool.BOOK_MAX_WORKERS for the cap.
+WORKERS = 3
+
+# Capture mode (PROPS_CAPTURE_MODE=json or --capture-json) stores the JSON
+# responses the event page loads, building a payload corpus for a future
+# structured parser. Prices still come from the DOM text.
+MARKET_RESPONSE_PATTERN = r"williamhill\.com/.*(?:api|event|market)"
 
 ODDS_RE = re.compile(r"^(?:\d+/\d+|EVS|EVENS|EVEN|Evens)$", re.I)
 THRESHOLD_RE = re.compile(r"^(?:\d+\+|Over\s+\d+(?:\.\d+)?|Under\s+\d+(?:\.\d+)?|\d+(?:\.\d+)?)$", re.I)
@@ -1607,26 +1624,32 @@ def accept_cookies(page):
         try:
             btn = page.get_by_role("button", name=re.compile(label, re.I))
             if btn.count():
+                before = text_signature(page)
                 btn.first.click(timeout=3000)
-                page.wait_for_timeout(900)
+                wait_for_text_stable(page, timeout_ms=900, label="accept_cookies",
+                                     changed_from=before)
                 return
         except Exception:
             pass
 
 
 def click_tab(page, tab_name):
+    before = text_signature(page)
     try:
         page.evaluate("window.scrollTo(0, 0)")
     except Exception:
         pass
-    page.wait_for_timeout(350)
+    wait_for_text_stable(page, timeout_ms=350, quiet_ms=150, label="click_tab:scroll_top",
+                         changed_from=before)
 
     for role in ["link", "button", "tab"]:
         try:
             loc = page.get_by_role(role, name=re.compile(f"^{re.escape(tab_name)}$", re.I))
             if loc.count():
+                before = text_signature(page)
                 loc.first.click(timeout=4000)
-                page.wait_for_timeout(2200)
+                wait_for_text_stable(page, timeout_ms=2200, quiet_ms=400, min_prices=1,
+                                     label="click_tab", changed_from=before)
                 return True
         except Exception:
             pass
@@ -1640,8 +1663,10 @@ def click_tab(page, tab_name):
                 box = item.bounding_box()
                 if not box or box["width"] <= 4 or box["height"] <= 4 or box["width"] > 260:
                     continue
+                before = text_signature(page)
                 page.mouse.click(box["x"] + box["width"] / 2, box["y"] + box["height"] / 2)
-                page.wait_for_timeout(2200)
+                wait_for_text_stable(page, timeout_ms=2200, quiet_ms=400, min_prices=1,
+                                     label="click_tab", changed_from=before)
                 return True
             except Exception:
                 pass
@@ -1653,11 +1678,13 @@ def click_tab(page, tab_name):
 
 def scroll_page(page, steps=10):
     for _ in range(steps):
+        before = text_signature(page)
         try:
             page.mouse.wheel(0, 650)
         except Exception:
             pass
-        page.wait_for_timeout(250)
+        wait_for_text_stable(page, timeout_ms=250, quiet_ms=120, label="scroll_page",
+                             changed_from=before)
 
 
 def click_all_see_more(page, max_clicks=30):
@@ -1669,8 +1696,10 @@ def click_all_see_more(page, max_clicks=30):
                 if loc.count() > 0:
                     item = loc.first
                     item.scroll_into_view_if_needed(timeout=1200)
+                    before = text_signature(page)
                     item.click(timeout=1200)
-                    page.wait_for_timeout(350)
+                    wait_for_text_stable(page, timeout_ms=350, quiet_ms=150,
+                                         label="click_all_see_more", changed_from=before)
                     clicked = True
                     break
             except Exception:
@@ -1701,8 +1730,10 @@ def click_heading(page, text):
                     # Click in the same row but more to the right to hit accordion area.
                     x = min(max(box["x"] + 350, box["x"] + box["width"] / 2), 1250)
                     y = box["y"] + box["height"] / 2
+                    before = text_signature(page)
                     page.mouse.click(x, y)
-                    page.wait_for_timeout(650)
+                    wait_for_text_stable(page, timeout_ms=650, quiet_ms=200,
+                                         label="click_heading", changed_from=before)
                     return True
                 except Exception:
                     pass
@@ -2122,6 +2153,7 @@ def get_match_links(page):
     cached_urls = load_cached_event_urls()
     print(f"  exact cached event URLs available: {len(cached_urls)}")
 
+    event_urls = shared_cache()
     fixtures = []
     seen_urls = set()
 
@@ -2130,26 +2162,36 @@ def get_match_links(page):
             break
 
         key = normalize(target["name"])
-        url = cached_urls.get(key, "")
+        url = event_urls.get("WilliamHill", target["home"], target["away"])
+        url_source = "url_cache"
 
         if url:
+            print(f"  ✓ url cache {target['name']}: {url}")
+        elif cached_urls.get(key):
+            url = cached_urls[key]
+            url_source = "cache"
             print(f"  ✓ cached {target['name']}: {url}")
         else:
             print(f"  - no cached URL for {target['name']}; using exact row discovery")
             url = discover_event_url_for_target(page, target)
+            url_source = "row_discovery"
 
         if not url or url in seen_urls:
             continue
 
+        if url_source != "url_cache":
+            event_urls.put("WilliamHill", target["home"], url, away=target["away"])
+
         seen_urls.add(url)
         fixtures.append({
             "url": url,
             "name": target["name"],
             "home": target["home"],
             "away": target["away"],
-            "url_source": "cache" if key in cached_urls else "row_discovery",
+            "url_source": url_source,
         })
 
+    event_urls.save()
     print(f"Found {len(fixtures)} TEST3 fixtures")
     return fixtures[:MAX_MATCHES]
 
@@ -2827,7 +2869,10 @@ SCORER_MARKET_NAMES = {
 
 
 def fresh_event_page(page, url):
-    page.goto(url, wait_until="domcontentloaded", timeout=70000)
+    response = page.goto(url, wait_until="domcontentloaded", timeout=70000)
+    if response is not None and response.status in GONE_STATUSES:
+        shared_cache().invalidate_url("WilliamHill", url, f"HTTP {response.status}")
+        raise RuntimeError(f"Event page returned HTTP {response.status}: {url}")
     page.wait_for_timeout(4200)
     accept_cookies(page)
     try:
@@ -5476,8 +5521,15 @@ def scrape_match(page, fixture):
         hint_home, hint_away = [canonical_team(clean(x)) for x in name.split(" v ", 1)]
 
     started = time.perf_counter()
-    fresh_event_page(page, url)
+    capture = ResponseCapture(page, MARKET_RESPONSE_PATTERN) if CAPTURE_MODE else None
+    if capture is not None:
+        with capture:
+            fresh_event_page(page, url)
+            capture.wait_quiet(timeout_ms=3000, label="wh capture popular")
+    else:
+        fresh_event_page(page, url)
     if hint_home and hint_away and not page_has_fixture(page, hint_home, hint_away):
+        shared_cache().invalidate_url("WilliamHill", url, "wrong fixture loaded")
         raise RuntimeError(f"Cached URL did not load expected fixture: {name}")
 
     # Keep the quick no-click default capture for core match markets only.
@@ -5496,6 +5548,9 @@ def scrape_match(page, fixture):
             key = normalize(market.get("normalized_market") or market.get("market"))
             if key not in player_and_scorer_keys and market.get("selection_count", 0):
                 markets.append(market)
+    if capture is not None:
+        capture.save(DEBUG_DIR / f"{slugify(name)}_responses.json")
+        print(f"    capture: recorded {len(capture.payloads)} JSON response(s)")
     print("    ✓ Popular/Default captured with 0 market clicks")
 
     tab_ok, tab_diag = click_top_impact_sub_tab(page)
@@ -5745,26 +5800,33 @@ def _fixture_for_retry(row):
     }
 
 
-def _scrape_with_retries(browser, fixture, max_attempts=3):
+def _scrape_with_retries(page, fixture, max_attempts=3):
+    """Scrape one fixture on a pool page, retrying on a fresh page.
+
+    Retries open their page in the worker's context, so they keep its
+    cookies, and close it afterwards.
+    """
     last_error = ""
     best_result = None
 
     for attempt in range(1, max_attempts + 1):
         print(f"    repair attempt {attempt}/{max_attempts}")
+        attempt_page = page
+        if attempt > 1:
+            telemetry.count("retries")
+            attempt_page = page.context.new_page()
 
-        page = browser.new_page(viewport={"width": 1700, "height": 1000})
         try:
-            result = scrape_match(page, fixture)
+            result = scrape_match(attempt_page, fixture)
         except KeyboardInterrupt:
-            page.close()
             raise
         except Exception as exc:
             last_error = f"{type(exc).__name__}: {exc}"
             print(f"    repair attempt failed: {last_error}")
-            page.close()
             continue
-
-        page.close()
+        finally:
+            if attempt_page is not page:
+                attempt_page.close()
 
         reason = _repair_reason(result)
         if not reason:
@@ -5781,6 +5843,10 @@ def _scrape_with_retries(browser, fixture, max_attempts=3):
         )
         return best_result
 
+    return _failed_result(fixture, last_error or "All repair attempts failed")
+
+
+def _failed_result(fixture, error):
     return {
         "match": fixture["name"],
         "home_team": fixture.get("home", ""),
@@ -5792,7 +5858,7 @@ def _scrape_with_retries(browser, fixture, max_attempts=3):
         "player_selection_count": 0,
         "elapsed_seconds": 0,
         "markets": [],
-        "error": last_error or "All repair attempts failed",
+        "error": error,
     }
 
 
@@ -5990,6 +6056,9 @@ def _validate_v23(output):
     )
 
 def main():
+    # Imported here so replay_parsers.py can load the parsers without Playwright.
+    from playwright.sync_api import sync_playwright
+
     OUT_PATH.parent.mkdir(parents=True, exist_ok=True)
     DEBUG_DIR.mkdir(parents=True, exist_ok=True)
     BACKUP_DIR.mkdir(parents=True, exist_ok=True)
@@ -6001,46 +6070,56 @@ def main():
     print("=" * 72)
 
     run_started = time.perf_counter()
-    results = []
 
     with sync_playwright() as p:
         browser = p.chromium.launch(headless=HEADLESS)
-
-        discovery_page = browser.new_page(
-            viewport={"width": 1700, "height": 1000}
-        )
         try:
+            discovery_page = browser.new_page(
+                viewport={"width": 1700, "height": 1000}
+            )
+            telemetry.watch_page(discovery_page)
             fixtures = get_match_links(discovery_page)
         finally:
-            discovery_page.close()
-
-        if len(fixtures) < 3:
             browser.close()
-            raise RuntimeError(
-                f"Only {len(fixtures)} eligible fixtures found; "
-                "minimum safety threshold is 3"
-            )
 
-        if len(fixtures) < MAX_MATCHES:
-            print(
-                f"William Hill availability: "
-                f"{len(fixtures)}/{MAX_MATCHES} eligible fixtures. "
-                "Continuing with every currently available fixture."
-            )
+    if len(fixtures) < 3:
+        raise RuntimeError(
+            f"Only {len(fixtures)} eligible fixtures found; "
+            "minimum safety threshold is 3"
+        )
 
-        for index, fixture in enumerate(fixtures, start=1):
-            print()
-            print("=" * 72)
-            print(f"[{index}/{len(fixtures)}] {fixture['name']}")
+    if len(fixtures) < MAX_MATCHES:
+        print(
+            f"William Hill availability: "
+            f"{len(fixtures)}/{MAX_MATCHES} eligible fixtures. "
+            "Continuing with every currently available fixture."
+        )
 
-            result = _scrape_with_retries(
-                browser,
-                fixture,
-                max_attempts=2,
-            )
-            results.append(result)
+    # _scrape_with_retries never raises, so pool errors are fixtures no
+    # browser picked up. They go back in fixture position as failed rows,
+    # which validation then rejects.
+    results, errors = scrape_fixtures(
+        "WilliamHill",
+        fixtures,
+        lambda page, fixture: _scrape_with_retries(
+            page,
+            fixture,
+            max_attempts=2,
+        ),
+        workers=WORKERS,
+        headless=HEADLESS,
+        route_handler=None,
+    )
+
+    for error in sorted(errors, key=lambda error: error["position"]):
+        print(f"  ⚠ Error: {error['match']}: {error['error']}")
+        results.insert(
+            error["position"],
+            _failed_result(fixtures[error["position"]], error["error"]),
+        )
 
-        browser.close()
+    # Persist URL invalidations made while scraping.
+    shared_cache().save()
 
     elapsed = round(time.perf_counter() - run_started, 1)
 
@@ -6074,6 +6153,7 @@ def main():
         encoding="utf-8",
     )
     staging_temp.replace(OUT_PATH)
+    telemetry.count_output(output)
 
     print()
     print("── V23 production summary ─────────────────────────────────────")
@@ -6106,6 +6186,10 @@ def main():
 
     print(f"Total runtime: {elapsed}s")
     print(f"Staging JSON: {OUT_PATH}")
+    write_wait_report(
+        DEBUG_DIR / "wait_report.jsonl",
+        run_label=output["generated_at"],
+    )
 
     print()
     print("=" * 72)
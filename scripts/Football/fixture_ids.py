@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+"""
+fixture_ids.py
+
+Stable fixture ids for football, backed by a persisted alias index.
+
+Analyzers and the page generator used to join bookmaker rows by rebuilding
+strict/loose fixture-key dicts on every run. A fixture was silently dropped
+whenever a book spelled a team differently ("Korea Republic" /
+"South Korea"), and a rematch between the same two teams collided with the
+first meeting. This module resolves any bookmaker's (home, away, kickoff) to
+one fixture id with a few dict lookups. It keeps its state in
+data/fixture_index.json:
+
+    {
+      "version": 1,
+      "aliases": {"korea republic": "south korea", ...},
+      "pending_aliases": {
+        "korea rep": {"canonical": "south korea", "fixture": "...", "kickoff": "..."}
+      },
+      "fixtures": {
+        "mexico__south africa": {
+          "home": "mexico",
+          "away": "south africa",
+          "kickoff": "2026-06-11",     (date only, "" when no book gave one)
+          "last_seen": "2026-06-10"
+        }
+      }
+    }
+
+Team names go through odds_common.normalize_team and then the alias table.
+The table starts from DEFAULT_ALIASES. It also suggests new spellings. When
+a row's pair is unknown but one of its teams already has exactly one
+fixture near the row's kickoff date, the other name may be that fixture's
+opponent spelled another way, or a different team altogether (Scotland v
+Brazil on the 13th, Scotland v Haiti on the 16th). A guess is applied only
+when the fixture kicks off on the same day, the two names look alike (see
+_similar) and this run has not already resolved that fixture under its own
+spelling. Any other guess goes into pending_aliases and the row gets a
+fixture of its own. Pending aliases are never applied. Every guess is
+printed.
+
+The file is per-machine build state and is not committed, since last_seen
+and pending_aliases change on every build. To accept an alias, add it to
+DEFAULT_ALIASES.
+
+A fixture id is "<home>__<away>" in the orientation first seen, so in the
+usual case it equals odds_common.fixture_key. A rematch gets its kickoff
+date appended. resolve() also says whether the row lists the teams the other
+way round, so callers can swap home/away selections before joining.
+
+Fixtures not seen for PRUNE_AFTER_DAYS are dropped on save. Aliases and
+pending aliases are kept.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import sys
+from datetime import date, datetime, timedelta, timezone
+from difflib import SequenceMatcher
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+INDEX_PATH = ROOT / "data" / "fixture_index.json"
+
+if str(ROOT / "scripts") not in sys.path:
+    sys.path.insert(0, str(ROOT / "scripts"))
+
+from file_lock import locked  # noqa: E402
+from odds_common import normalize_team  # noqa: E402
+
+PRUNE_AFTER_DAYS = 30
+# Books disagree about the date of late kick-offs and some omit the year, so
+# dates are compared loosely.
+# Two meetings of the same teams in one tournament are weeks apart.
+KICKOFF_TOLERANCE = timedelta(days=3)
+# Two spellings of one team that share no word ("czech rep" / "czechia")
+# still have to be at least this alike before a guess is applied.
+SIMILAR_NAME_RATIO = 0.6
+
+# Spellings normalize_team leaves apart. Keys and values are normalised on
+# load, so they can be written as the books write them.
+DEFAULT_ALIASES = {
+    "United States": "USA",
+    "United States of America": "USA",
+    "Korea Republic": "South Korea",
+    "Republic of Korea": "South Korea",
+    "Korea DPR": "North Korea",
+    "IR Iran": "Iran",
+    "Côte d'Ivoire": "Ivory Coast",
+    "Cote d'Ivoire": "Ivory Coast",
+    "Democratic Republic of Congo": "DR Congo",
+    "Czech Rep": "Czechia",
+    "Holland": "Netherlands",
+}
+
+_MONTHS = {
+    name: number
+    for number, names in enumerate(
+        (
+            ("jan", "january"), ("feb", "february"), ("mar", "march"),
+            ("apr", "april"), ("may",), ("jun", "june"), ("jul", "july"),
+            ("aug", "august"), ("sep", "sept", "september"),
+            ("oct", "october"), ("nov", "november"), ("dec", "december"),
+        ),
+        start=1,
+    )
+    for name in names
+}
+_NUMERIC_DATE = re.compile(r"^(\d{1,2})/(\d{1,2})/(\d{4})$")
+_TEXT_DATE = re.compile(r"(\d{1,2})(?:st|nd|rd|th)?\s+([a-z]+)\.?(?:\s+(\d{4}))?")
+
+
+def _today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+def kickoff_date(*labels, today: date | None = None) -> date | None:
+    """Best-effort kickoff date from a bookmaker's date/time labels.
+
+    Understands ISO timestamps, "1/7/2026" (day first) and
+    "Wed 01 Jul 2026" / "Fri 3 July" / "Wed, 1 Jul". Anything else gives
+    None, including "67 MORE" and relative labels such as "Today 21:00",
+    which depend on when the book was scraped.
+    """
+    today = today or _today()
+    for label in labels:
+        text = re.sub(r"\s+", " ", str(label or "")).strip().lower()
+        if not text:
+            continue
+
+        try:
+            parsed = datetime.fromisoformat(text.upper().replace("Z", "+00:00"))
+        except ValueError:
+            pass
+        else:
+            if parsed.tzinfo:
+                parsed = parsed.astimezone(timezone.utc)
+            return parsed.date()
+
+        match = _NUMERIC_DATE.match(text)
+        if match:
+            day, month, year = (int(part) for part in match.groups())
+            try:
+                return date(year, month, day)
+            except ValueError:
+                continue
+
+        match = _TEXT_DATE.search(text)
+        if match and match.group(2) in _MONTHS:
+            day, month = int(match.group(1)), _MONTHS[match.group(2)]
+            years = [int(match.group(3))] if match.group(3) else [
+                today.year - 1, today.year, today.year + 1
+            ]
+            candidates = []
+            for year in years:
+                try:
+                    candidates.append(date(year, month, day))
+                except ValueError:
+                    pass
+            if candidates:
+                return min(candidates, key=lambda value: abs(value - today))
+    return None
+
+
+def _parse_day(value) -> date | None:
+    try:
+        return date.fromisoformat(value) if value else None
+    except ValueError:
+        return None
+
+
+def _pair(home: str, away: str) -> str:
+    return "__".join(sorted((home, away)))
+
+
+def _similar(first: str, second: str) -> bool:
+    """Whether two normalised team names could be one team spelled two ways."""
+    if set(first.split()) & set(second.split()):
+        return True
+    return SequenceMatcher(None, first, second).ratio() >= SIMILAR_NAME_RATIO
+
+
+class FixtureResolver:
+    """Resolve bookmaker fixtures to stable ids, see the module docstring."""
+
+    def __init__(self, path: Path = INDEX_PATH, today: date | None = None):
+        self.path = Path(path)
+        self.today = today or _today()
+        self.aliases: dict[str, str] = {}
+        self.pending_aliases: dict[str, dict] = {}
+        self.fixtures: dict[str, dict] = {}
+        self._by_pair: dict[str, list[str]] = {}
+        self._by_team: dict[str, list[str]] = {}
+        self._teams: dict[str, str] = {}
+        self._seen: set[str] = set()
+        self._dirty = False
+
+        aliases, pending, fixtures = self._read()
+        for alias, canonical in {**DEFAULT_ALIASES, **aliases}.items():
+            self.aliases[normalize_team(alias)] = normalize_team(canonical)
+        self.pending_aliases = pending
+        for fid, entry in fixtures.items():
+            self._index(fid, entry)
+
+    def _read(self) -> tuple[dict, dict, dict]:
+        if not self.path.exists():
+            return {}, {}, {}
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except Exception as exc:
+            print(f"  fixture index unreadable ({self.path.name}): {exc}")
+            return {}, {}, {}
+        if not isinstance(data, dict):
+            return {}, {}, {}
+        aliases = data.get("aliases") if isinstance(data.get("aliases"), dict) else {}
+        pending = (
+            data.get("pending_aliases")
+            if isinstance(data.get("pending_aliases"), dict)
+            else {}
+        )
+        fixtures = data.get("fixtures") if isinstance(data.get("fixtures"), dict) else {}
+        fixtures = {
+            fid: entry
+            for fid, entry in fixtures.items()
+            if isinstance(entry, dict) and entry.get("home") and entry.get("away")
+        }
+        return aliases, pending, fixtures
+
+    def _index(self, fid: str, entry: dict) -> None:
+        self.fixtures[fid] = entry
+        self._by_pair.setdefault(_pair(entry["home"], entry["away"]), []).append(fid)
+        for team in (entry["home"], entry["away"]):
+            self._by_team.setdefault(team, []).append(fid)
+
+    # ── Lookups ───────────────────────────────────────────────────────────────
+
+    def team(self, name) -> str:
+        """Canonical team key: normalize_team, then the alias table."""
+        cached = self._teams.get(name)
+        if cached is None:
+            key = normalize_team(name)
+            cached = self.aliases.get(key, key)
+            self._teams[name] = cached
+        return cached
+
+    def _near(self, fid: str, day: date | None) -> bool:
+        known = _parse_day(self.fixtures[fid].get("kickoff"))
+        return day is None or known is None or abs(known - day) <= KICKOFF_TOLERANCE
+
+    def resolve(self, home, away, kickoff: date | None = None) -> tuple[str, bool]:
+        """Return (fixture id, reversed) for a bookmaker's fixture.
+
+        reversed is True when the row lists the fixture's away team first.
+        kickoff is a date (see kickoff_date). Without one, the pair's fixture
+        already resolved in this run is used, else the most recent one.
+        """
+        h, a = self.team(home), self.team(away)
+        fid = None
+        ids = self._by_pair.get(_pair(h, a))
+        if ids:
+            if kickoff is None:
+                fid = next((fid for fid in reversed(ids) if fid in self._seen), ids[-1])
+            else:
+                fid = next((fid for fid in ids if self._near(fid, kickoff)), None)
+        elif kickoff is not None:
+            fid = self._learn(h, a, kickoff)
+            if fid:
+                h, a = self.team(home), self.team(away)
+
+        if fid is None:
+            fid = self._create(h, a, kickoff)
+        else:
+            self._touch(fid, kickoff)
+
+        return fid, self.fixtures[fid]["home"] != h
+
+    def _learn(self, home: str, away: str, day: date) -> str | None:
+        """Join an unknown spelling via its opponent's only fixture that day.
+
+        Guesses that fail the checks in the module docstring are recorded
+        in pending_aliases instead, and None is returned.
+        """
+        for known, unknown in ((home, away), (away, home)):
+            if unknown in self._by_team:
+                continue
+            candidates = [
+                fid for fid in self._by_team.get(known, ())
+                if _parse_day(self.fixtures[fid].get("kickoff"))
+                and self._near(fid, day)
+            ]
+            if len(candidates) != 1:
+                continue
+            fid = candidates[0]
+            entry = self.fixtures[fid]
+            canonical = entry["away"] if entry["home"] == known else entry["home"]
+
+            if (
+                _parse_day(entry.get("kickoff")) != day
+                or not _similar(unknown, canonical)
+                or fid in self._seen
+            ):
+                if unknown not in self.pending_aliases:
+                    self.pending_aliases[unknown] = {
+                        "canonical": canonical,
+                        "fixture": fid,
+                        "kickoff": day.isoformat(),
+                    }
+                    self._dirty = True
+                    print(
+                        f"  fixture index: pending alias {unknown!r} -> "
+                        f"{canonical!r} ({fid}), not applied"
+                    )
+                return None
+
+            self.aliases[unknown] = canonical
+            self._teams = {
+                name: canonical if key == unknown else key
+                for name, key in self._teams.items()
+            }
+            self._dirty = True
+            print(f"  fixture index: learned alias {unknown!r} -> {canonical!r} ({fid})")
+            return fid
+        return None
+
+    def _create(self, home: str, away: str, day: date | None) -> str:
+        fid = f"{home}__{away}"
+        if fid in self.fixtures:
+            fid = f"{fid}__{day.isoformat() if day else len(self.fixtures)}"
+        self._index(fid, {
+            "home": home,
+            "away": away,
+            "kickoff": day.isoformat() if day else "",
+            "last_seen": self.today.isoformat(),
+        })
+        self._seen.add(fid)
+        self._dirty = True
+        return fid
+
+    def _touch(self, fid: str, day: date | None) -> None:
+        self._seen.add(fid)
+        entry = self.fixtures[fid]
+        if day and not entry.get("kickoff"):
+            entry["kickoff"] = day.isoformat()
+            self._dirty = True
+        if entry.get("last_seen") != self.today.isoformat():
+            entry["last_seen"] = self.today.isoformat()
+            self._dirty = True
+
+    # ── Persistence ───────────────────────────────────────────────────────────
+
+    def _expired(self, entry: dict) -> bool:
+        seen = _parse_day(entry.get("last_seen")) or self.today
+        return seen < self.today - timedelta(days=PRUNE_AFTER_DAYS)
+
+    def save(self) -> None:
+        """Merge into the file on disk and write it atomically.
+
+        Build steps run in parallel, so entries another process saved first
+        win: aliases it already had are kept, and a fixture we created is
+        dropped if the file already has one for the same pair and day.
+        """
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with locked(self.path.with_suffix(".lock")):
+            aliases, pending, fixtures = self._read()
+            merged_aliases = {**self.aliases, **aliases}
+            merged_pending = {
+                alias: entry
+                for alias, entry in {**self.pending_aliases, **pending}.items()
+                if alias not in merged_aliases
+            }
+
+            pairs: dict[str, list[dict]] = {}
+            for entry in fixtures.values():
+                pairs.setdefault(_pair(entry["home"], entry["away"]), []).append(entry)
+            for fid, entry in self.fixtures.items():
+                if fid in fixtures:
+                    stored = fixtures[fid]
+                    stored["last_seen"] = max(stored.get("last_seen", ""), entry["last_seen"])
+                    stored["kickoff"] = stored.get("kickoff") or entry.get("kickoff", "")
+                    continue
+                day = _parse_day(entry.get("kickoff"))
+                if any(
+                    day is None
+                    or _parse_day(other.get("kickoff")) is None
+                    or abs(_parse_day(other.get("kickoff")) - day) <= KICKOFF_TOLERANCE
+                    for other in pairs.get(_pair(entry["home"], entry["away"]), ())
+                ):
+                    continue
+                fixtures[fid] = entry
+
+            fixtures = {
+                fid: entry for fid, entry in sorted(fixtures.items())
+                if not self._expired(entry)
+            }
+            payload = {
+                "version": 1,
+                "updated_at": datetime.now(timezone.utc).isoformat(),
+                "aliases": dict(sorted(merged_aliases.items())),
+                "pending_aliases": dict(sorted(merged_pending.items())),
+                "fixtures": fixtures,
+            }
+            tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(payload, indent=2, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp, self.path)
+        self._dirty = False
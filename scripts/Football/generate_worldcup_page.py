@@ -1,12 +1,29 @@
 #!/usr/bin/env python3
 # BWIN_PROPS_AND_STATS_GENERATOR_V1
+import argparse
+import hashlib
 import json
+import os
+import pickle
 import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parents[2]
 
+if str(ROOT / "scripts") not in sys.path:
+    sys.path.insert(0, str(ROOT / "scripts"))
+
+import fixture_ids
+import odds_common
+import telemetry
+from odds_common import (decimal_to_fractional, display_team, fixture_key, fractional_to_decimal,
+                         normalize_team, slugify)
+from fixture_ids import FixtureResolver, kickoff_date
+from odds_store import OddsStore
+
 PADDY_PATH          = ROOT / "football" / "data" / "paddypower_worldcup_moneylines.json"
 BOYLE_PATH          = ROOT / "football" / "data" / "boylesports_worldcup_moneylines.json"
 BETVICTOR_PATH      = ROOT / "football" / "data" / "betvictor_worldcup_moneylines.json"
@@ -36,6 +53,14 @@ OUT_PATH = OUT_DIR / "index.html"
 HUB_PATH = ROOT / "football" / "index.html"
 BASE     = "/odds-board"
 
+# Per-page input digests from the last run, so unchanged pages are not
+# re-rendered or rewritten. See PageWriter.
+PAGE_DIGESTS_PATH = ROOT / "data" / "worldcup_page_digests.json"
+
+# Merged fixtures and player indexes from the last run, so the EV builder
+# does not parse every bookmaker file again. See load_fixtures_snapshot.
+FIXTURES_SNAPSHOT_PATH = ROOT / "data" / "worldcup_fixtures.pickle"
+
 # ── Helpers ────────────────────────────────────────────────────────────────────
 
 def clean(s):
@@ -44,61 +69,10 @@ def clean(s):
 def esc(s):
     return str(s or "").replace("&","&amp;").replace("<","&lt;").replace(">","&gt;").replace('"',"&quot;").replace("'","&#39;")
 
-def slugify(s):
-    s = str(s or "").lower().replace("&","and")
-    return re.sub(r"[^a-z0-9]+","-",s).strip("-")
-
 def load_json(path):
     try: return json.loads(path.read_text(encoding="utf-8"))
     except: return {}
 
-def decimal_to_fractional(value):
-    """Convert decimal odds to fractional string. e.g. 1.364 -> 4/11, 2.5 -> 3/2"""
-    from fractions import Fraction
-    try:
-        s = str(value or "").strip()
-        # Already fractional
-        if "/" in s or s.upper() in {"EVS","EVENS","EVEN"}:
-            return s
-        dec = float(s)
-        if dec <= 1:
-            return s
-        frac = Fraction(dec - 1).limit_denominator(100)
-        return f"{frac.numerator}/{frac.denominator}"
-    except:
-        return str(value or "")
-
-
-def fractional_to_decimal(value):
-    value = str(value or "").strip().upper()
-    if value in {"EVS","EVENS","EVEN"}: return 2.0
-    if "/" in value:
-        try:
-            a,b = value.split("/",1)
-            return (float(a)/float(b))+1
-        except: return 0
-    try:
-        v = float(value)
-        if v > 1: return v
-    except: pass
-    return 0
-
-def display_team(s):
-    s = str(s or "").strip()
-    return {"Bosnia & Herzegovina":"Bosnia & Herzegovina","Bosnia and Herzegovina":"Bosnia & Herzegovina",
-            "Czech Republic":"Czechia","Turkey":"Türkiye","Turkiye":"Türkiye","Curaçao":"Curacao"}.get(s,s)
-
-def key_team(s):
-    s = display_team(s).lower()
-    for f,t in [("&","and"),("herzegovina",""),("türkiye","turkiye"),("turkey","turkiye"),("curaçao","curacao")]:
-        s = s.replace(f,t)
-    s = re.sub(r"[^a-z0-9]+"," ",s).strip()
-    return {"bosnia and":"bosnia","czech republic":"czechia","ivory coast":"ivory coast",
-            "curacao":"curacao","turkiye":"turkiye","dr congo":"dr congo","usa":"usa"}.get(s,s)
-
-def fixture_key(home,away):   return f"{key_team(home)}__{key_team(away)}"
-def loose_fixture_key(h,a):   return "__".join(sorted([key_team(h),key_team(a)]))
-
 def normalize_text_key(value):
     value = clean(value).lower().replace("&","and").replace("/","_").replace("?","")
     return re.sub(r"[^a-z0-9]+","_",value).strip("_")
@@ -348,9 +322,11 @@ def pretty_selection_label(market_name, selection_name):
 
 # ── Data loading ───────────────────────────────────────────────────────────────
 
-def load_book(bookmaker, path):
-    data = load_json(path)
-    rows, generated = [], data.get("generated_at","")
+# Moneyline and props parsers take the loaded JSON of one bookmaker file.
+# load_all() reads them through the odds store, see page_entries().
+
+def book_rows(bookmaker, data):
+    rows = []
     for m in data.get("matches") or []:
         home = display_team(m.get("home_team"))
         away = display_team(m.get("away_team"))
@@ -363,13 +339,10 @@ def load_book(bookmaker, path):
             "home_team": home, "away_team": away,
             "odds": m.get("odds") or {},
             "source_url": m.get("source_url",""),
-            "strict_key": fixture_key(home,away),
-            "loose_key": loose_fixture_key(home,away),
         })
-    return rows, generated
+    return rows
 
-def load_midnite_moneylines():
-    data = load_json(MIDNITE_PATH)
+def midnite_rows(bookmaker, data):
     rows = []
     for m in data.get("matches") or []:
         home = display_team(m.get("home",""))
@@ -391,15 +364,11 @@ def load_midnite_moneylines():
                 "away": dec_str(m.get("away_odds")),
             },
             "source_url": m.get("url",""),
-            "strict_key": fixture_key(home,away),
-            "loose_key": loose_fixture_key(home,away),
         })
     return rows
 
-def load_bwin_moneylines():
-    data = load_json(BWIN_PATH)
+def bwin_rows(bookmaker, data):
     rows = []
-    generated = data.get("generated_at", "") if isinstance(data, dict) else ""
 
     for m in data.get("matches") or []:
         home = display_team(m.get("home_team"))
@@ -431,11 +400,9 @@ def load_bwin_moneylines():
             "away_team": away,
             "odds": odds,
             "source_url": m.get("source_url", ""),
-            "strict_key": fixture_key(home, away),
-            "loose_key": loose_fixture_key(home, away),
         })
 
-    return rows, generated
+    return rows
 
 def _dec_to_str(v):
     """Convert Midnite decimal odds to fractional string for consistent display."""
@@ -460,8 +427,7 @@ def _is_valid_midnite_player(name):
     if len(n) < 4: return False
     return True
 
-def load_midnite_props():
-    data = load_json(MIDNITE_PROPS_PATH)
+def midnite_props(bookmaker, data):
     out  = {}
     for m in data.get("matches") or []:
         home = display_team(m.get("home",""))
@@ -750,11 +716,12 @@ def repair_markets(bookmaker, markets):
         fixed.append(market)
     return fixed
 
-def load_props_file(bookmaker, path):
-    data = load_json(path)
-    raw  = data.get("matches") or data.get("results") or (data if isinstance(data,list) else [])
-    generated = data.get("generated_at","") if isinstance(data,dict) else ""
-    source_url = data.get("source_url","") if isinstance(data,dict) else ""
+def book_props(bookmaker, data):
+    if isinstance(data,list):
+        raw, source_url = data, ""
+    else:
+        raw = data.get("matches") or data.get("results") or []
+        source_url = data.get("source_url","")
     out = {}
     for m in raw:
         if not isinstance(m,dict): continue
@@ -774,7 +741,7 @@ def load_props_file(bookmaker, path):
             "market_count": len(markets),
             "markets": markets,
         }
-    return out, generated
+    return out
 
 
 def merge_props_maps(primary, extra):
@@ -844,10 +811,29 @@ def merge_props_maps(primary, extra):
 
     return merged
 
-def add_book_rows(fixtures, si, li, rows, bookmaker):
+def new_fixture(key, row, bookmaker):
+    return {
+        "key":key,
+        "slug":slugify(f"{row['home_team']}-v-{row['away_team']}"),
+        "date_label":row["date_label"],"time":row["time"],
+        "match":row["match"],"home_team":row["home_team"],"away_team":row["away_team"],
+        "bookmakers":{bookmaker:{"bookmaker":bookmaker,"odds":row["odds"],"source_url":row["source_url"]}},
+        "props":{},
+    }
+
+def reversed_row(row):
+    """A row from a book that lists the fixture the other way round, turned back."""
+    odds = dict(row["odds"])
+    odds["home"], odds["away"] = odds.get("away"), odds.get("home")
+    return {**row, "home_team":row["away_team"], "away_team":row["home_team"],
+            "match":f"{row['away_team']} v {row['home_team']}", "odds":odds}
+
+def add_book_rows(fixtures, resolver, rows, bookmaker):
     for row in rows:
-        tk = si.get(row["strict_key"]) or li.get(row["loose_key"])
-        if tk:
+        tk, reversed_teams = resolver.resolve(row["home_team"], row["away_team"],
+                                              kickoff_date(row.get("date_label"), row.get("time")))
+        if reversed_teams: row = reversed_row(row)
+        if tk in fixtures:
             # WORLD_CUP_DATE_GROUPING_V1
             fixture = fixtures[tk]
             fixture["bookmakers"][bookmaker] = {
@@ -867,16 +853,7 @@ def add_book_rows(fixtures, si, li, rows, bookmaker):
             if not current_time and incoming_time:
                 fixture["time"] = incoming_time
         else:
-            k = row["strict_key"]
-            fixtures[k] = {
-                "key":k,"loose_key":row["loose_key"],
-                "slug":slugify(f"{row['home_team']}-v-{row['away_team']}"),
-                "date_label":row["date_label"],"time":row["time"],
-                "match":row["match"],"home_team":row["home_team"],"away_team":row["away_team"],
-                "bookmakers":{bookmaker:{"bookmaker":bookmaker,"odds":row["odds"],"source_url":row["source_url"]}},
-                "props":{},
-            }
-            si[k]=k; li[row["loose_key"]]=k
+            fixtures[tk] = new_fixture(tk, row, bookmaker)
 
 def format_fixture_date_heading(value):
     raw = clean(value)
@@ -922,8 +899,8 @@ def date_sort_key(label):
     num   = next((int(p) for p in parts if p.isdigit()),999)
     return (num, day, label)
 
-def load_upcoming_snapshot_pair_keys():
-    """Canonical fixture pairs that are allowed onto the live World Cup site."""
+def load_upcoming_snapshot_fixture_ids(resolver):
+    """Fixture ids that are allowed onto the live World Cup site."""
     payload = load_json(UPCOMING_SNAPSHOT_PATH)
     rows = payload.get("matches") or []
     keys = set()
@@ -932,72 +909,89 @@ def load_upcoming_snapshot_pair_keys():
         home = clean(row.get("home") or row.get("home_team"))
         away = clean(row.get("away") or row.get("away_team"))
         if home and away:
-            keys.add(loose_fixture_key(home, away))
+            keys.add(resolver.resolve(home, away, kickoff_date(row.get("kickoff")))[0])
 
     return keys
 
-def load_all():
-    paddy_rows,   paddy_gen    = load_book("PaddyPower",   PADDY_PATH)
-    boyle_rows,   boyle_gen    = load_book("BoyleSports",  BOYLE_PATH)
-    betv_rows,    betv_gen     = load_book("BetVictor",    BETVICTOR_PATH)
-    unibet_rows,  unibet_gen   = load_book("Unibet",       UNIBET_PATH)
-    lsb_rows,     lsb_gen      = load_book("LiveScoreBet", LIVESCOREBET_PATH)
-    wh_rows,      wh_gen       = load_book("WilliamHill",  WILLIAMHILL_PATH)
-    eee_rows,     eee_gen      = load_book("888Sport",     EIGHTEIGHTEIGHT_PATH)
-    ladb_rows,    ladb_gen     = load_book("Ladbrokes",    LADBROKES_PATH)
-    midnite_rows               = load_midnite_moneylines()
-
-    bwin_rows,    bwin_gen      = load_bwin_moneylines()
-    paddy_props,  paddy_p_gen  = load_props_file("PaddyPower",   PADDY_PROPS_PATH)
-    boyle_props,  boyle_p_gen  = load_props_file("BoyleSports",  BOYLE_PROPS_PATH)
-    unibet_props, unibet_p_gen = load_props_file("Unibet",       UNIBET_PROPS_PATH)
-    lsb_props,    lsb_p_gen    = load_props_file("LiveScoreBet", LIVESCORE_PROPS_PATH)
-    eee_props,    eee_p_gen    = load_props_file("888Sport",     EIGHTSPORT_PROPS_PATH)
-    wh_props,     wh_p_gen     = load_props_file("WilliamHill",  WILLIAMHILL_PROPS_PATH)
-    betv_props,   betv_p_gen   = load_props_file("BetVictor",    BETVICTOR_PROPS_PATH)
-    ladb_props,   ladb_p_gen   = load_props_file("Ladbrokes",    LADBROKES_PROPS_PATH)
-    midnite_props              = load_midnite_props()
-    bwin_props,   bwin_p_gen   = load_props_file("Bwin",         BWIN_PROPS_PATH)
-    bwin_stats,   bwin_s_gen   = load_props_file("Bwin",         BWIN_MATCH_STATS_PATH)
-    bwin_props                 = merge_props_maps(bwin_props, bwin_stats)
-
-    fixtures = {}
-    for row in paddy_rows:
-        k = row["strict_key"]
-        fixtures[k] = {
-            "key":k,"loose_key":row["loose_key"],
-            "slug":slugify(f"{row['home_team']}-v-{row['away_team']}"),
-            "date_label":row["date_label"],"time":row["time"],
-            "match":row["match"],"home_team":row["home_team"],"away_team":row["away_team"],
-            "bookmakers":{"PaddyPower":{"bookmaker":"PaddyPower","odds":row["odds"],"source_url":row["source_url"]}},
-            "props":{},
-        }
+# (bookmaker, path, parser) in the order load_all() merges them.
+MONEYLINE_SOURCES = (
+    ("PaddyPower",   PADDY_PATH,           book_rows),
+    ("BoyleSports",  BOYLE_PATH,           book_rows),
+    ("BetVictor",    BETVICTOR_PATH,       book_rows),
+    ("Unibet",       UNIBET_PATH,          book_rows),
+    ("LiveScoreBet", LIVESCOREBET_PATH,    book_rows),
+    ("WilliamHill",  WILLIAMHILL_PATH,     book_rows),
+    ("888Sport",     EIGHTEIGHTEIGHT_PATH, book_rows),
+    ("Ladbrokes",    LADBROKES_PATH,       book_rows),
+    ("Midnite",      MIDNITE_PATH,         midnite_rows),
+    ("Bwin",         BWIN_PATH,            bwin_rows),
+)
+PROPS_SOURCES = (
+    ("PaddyPower",   PADDY_PROPS_PATH,       book_props),
+    ("BoyleSports",  BOYLE_PROPS_PATH,       book_props),
+    ("Unibet",       UNIBET_PROPS_PATH,      book_props),
+    ("LiveScoreBet", LIVESCORE_PROPS_PATH,   book_props),
+    ("888Sport",     EIGHTSPORT_PROPS_PATH,  book_props),
+    ("WilliamHill",  WILLIAMHILL_PROPS_PATH, book_props),
+    ("BetVictor",    BETVICTOR_PROPS_PATH,   book_props),
+    ("Ladbrokes",    LADBROKES_PROPS_PATH,   book_props),
+    ("Midnite",      MIDNITE_PROPS_PATH,     midnite_props),
+    ("Bwin",         BWIN_PROPS_PATH,        book_props),
+    # Bwin match stats join Bwin's props, see merge_props_maps.
+    ("Bwin",         BWIN_MATCH_STATS_PATH,  book_props),
+)
+
+def page_entries(parse):
+    """Odds store normaliser: one entry per moneyline row or props fixture."""
+    def normalise(bookmaker, data):
+        parsed = parse(bookmaker, data)
+        if isinstance(parsed, dict):
+            for fk, payload in parsed.items():
+                yield fk, "props", "", "", payload
+        else:
+            for row in parsed:
+                yield fixture_key(row["home_team"], row["away_team"]), "moneyline", "", "", row
+    return normalise
 
-    si = {f["key"]:k for k,f in fixtures.items()}
-    li = {f["loose_key"]:k for k,f in fixtures.items()}
+def load_stored(store, bookmaker, path, parse):
+    """Entries of one file, re-parsed only when it or this loader changed."""
+    store.refresh([(bookmaker, path)], page_entries(parse), LOADER_DIGEST, kind="page")
+    return [(fk, payload) for fk, _, _, _, payload in store.offers([path], kind="page")]
 
-    for rows,bk in [(boyle_rows,"BoyleSports"),(betv_rows,"BetVictor"),(unibet_rows,"Unibet"),
-                    (lsb_rows,"LiveScoreBet"),(wh_rows,"WilliamHill"),(eee_rows,"888Sport"),
-                    (ladb_rows,"Ladbrokes"),(midnite_rows,"Midnite"),(bwin_rows,"Bwin")]:
-        add_book_rows(fixtures,si,li,rows,bk)
+def load_all():
+    with OddsStore() as store:
+        book_rows_by_source = [
+            (bk, [row for _, row in load_stored(store, bk, path, parse)])
+            for bk, path, parse in MONEYLINE_SOURCES
+        ]
+        props_by_source = [
+            (bk, dict(load_stored(store, bk, path, parse)))
+            for bk, path, parse in PROPS_SOURCES
+        ]
+
+    props_by_book = {}
+    for bk, props in props_by_source:
+        props_by_book[bk] = merge_props_maps(props_by_book[bk], props) if bk in props_by_book else props
+
+    # Rows and props join on stable fixture ids, see fixture_ids.py.
+    resolver = FixtureResolver()
+    fixtures = {}
+    for bk,rows in book_rows_by_source:
+        add_book_rows(fixtures,resolver,rows,bk)
 
-    for bk,bk_props in [("PaddyPower",paddy_props),("BoyleSports",boyle_props),
-                         ("Unibet",unibet_props),("LiveScoreBet",lsb_props),
-                         ("888Sport",eee_props),("WilliamHill",wh_props),
-                         ("BetVictor",betv_props),("Ladbrokes",ladb_props),
-                         ("Midnite",midnite_props),("Bwin",bwin_props)]:
+    for bk,bk_props in props_by_book.items():
         for pk,pd in bk_props.items():
-            lk = loose_fixture_key(pd.get("home_team",""),pd.get("away_team",""))
-            tk = si.get(pk) or li.get(lk)
-            if tk and tk in fixtures:
+            tk, _ = resolver.resolve(pd.get("home_team",""),pd.get("away_team",""))
+            if tk in fixtures:
                 fixtures[tk].setdefault("props",{})
                 fixtures[tk]["props"][bk] = pd
 
-    allowed_snapshot_pairs = load_upcoming_snapshot_pair_keys()
+    allowed_snapshot_ids = load_upcoming_snapshot_fixture_ids(resolver)
+    resolver.save()
 
     fixture_values = list(fixtures.values())
 
-    if allowed_snapshot_pairs:
+    if allowed_snapshot_ids:
 
      fixture_values = [
 
@@ -1005,13 +999,7 @@ def load_all():
 
       for fixture in fixture_values
 
-      if loose_fixture_key(
-
-       fixture.get("home_team", ""),
-
-       fixture.get("away_team", ""),
-
-      ) in allowed_snapshot_pairs
+      if fixture["key"] in allowed_snapshot_ids
 
      ]
 
@@ -1040,7 +1028,7 @@ def best_price(fixture, side):
     best = None
     for bk,info in fixture.get("bookmakers",{}).items():
         raw = (info.get("odds") or {}).get(side)
-        dec = fractional_to_decimal(raw)
+        dec = fractional_to_decimal(raw, 0)
         if raw and dec > 1 and (not best or dec > best["decimal"]):
             best = {"bookmaker":bk,"odds":raw,"decimal":dec}
     return best
@@ -1049,7 +1037,7 @@ def all_prices(fixture, side):
     rows = []
     for bk,info in sorted(fixture.get("bookmakers",{}).items()):
         raw = (info.get("odds") or {}).get(side)
-        dec = fractional_to_decimal(raw)
+        dec = fractional_to_decimal(raw, 0)
         if raw and dec > 1: rows.append({"bookmaker":bk,"odds":raw,"decimal":dec})
     best = best_price(fixture,side)
     bk   = (best["bookmaker"],best["odds"]) if best else None
@@ -1066,7 +1054,7 @@ def build_comparison_data(props):
             for sel in market.get("selections") or []:
                 sn   = sel.get("selection","")
                 odds = sel.get("odds","")
-                dec  = fractional_to_decimal(odds)
+                dec  = fractional_to_decimal(odds, 0)
                 if not sn or not odds or dec <= 1: continue
                 sk  = normalize_prop_selection_key(mn,sn)
                 key = (mk,sk)
@@ -1411,7 +1399,7 @@ def build_player_index(props, home="", away=""):
             for sel in market.get("selections") or []:
                 sn   = sel.get("selection", "")
                 odds = sel.get("odds", "")
-                dec  = fractional_to_decimal(odds)
+                dec  = fractional_to_decimal(odds, 0)
                 if not sn or not odds or dec <= 1:
                     continue
 
@@ -1526,8 +1514,8 @@ def build_player_index(props, home="", away=""):
                 if re.match(r"^(?:u|o)[\s\-]*\d", player_low): continue
                 if re.match(r"^(?:over|under|both|draw|yes|no|home|away)\b", player_low): continue
                 if any(p in player_low for p in invalid_player_phrases): continue
-                if home and key_team(player_name) == key_team(home): continue
-                if away and key_team(player_name) == key_team(away): continue
+                if home and normalize_team(player_name) == normalize_team(home): continue
+                if away and normalize_team(player_name) == normalize_team(away): continue
                 if re.search(
                     r"\b(?:corners?|cards?|win\s+or\s+draw|"
                     r"win\s+either\s+half|total\s+goals?)\b",
@@ -1606,10 +1594,11 @@ def build_player_index(props, home="", away=""):
 
 # ── Player Props overview ──────────────────────────────────────────────────────
 
-def render_player_props_page(fixture):
+def render_player_props_page(fixture, player_index=None, client_render=False):
     home, away, slug = fixture["home_team"], fixture["away_team"], fixture["slug"]
     props = fixture.get("props") or {}
-    player_index = build_player_index(props, home, away)
+    if player_index is None:
+        player_index = build_player_index(props, home, away)
 
     subnav = f'<nav class="sub-nav"><a href="../index.html">Odds</a>'
     has_match = any(any(normalize_prop_market_key(m["market"]) in MATCH_MARKET_KEYS
@@ -1648,7 +1637,7 @@ def render_player_props_page(fixture):
             preview += f"""
             <div style="display:flex;justify-content:space-between;align-items:center;padding:8px 0;border-bottom:1px solid #1a2535">
               <div>
-                <a href="players/{esc(p['key'])}/index.html" style="color:#e2e8f0;font-weight:600;font-size:14px">{esc(p['name'])}</a>
+                <a href="{esc(player_app_href(slug, player_key=p['key']) if client_render else f"players/{p['key']}/index.html")}" style="color:#e2e8f0;font-weight:600;font-size:14px">{esc(p['name'])}</a>
                 {"<div style='color:#91a0b5;font-size:11px'>" + threshold_label + "</div>" if threshold_label else ""}
               </div>
               <div style="text-align:right">
@@ -1661,7 +1650,7 @@ def render_player_props_page(fixture):
         <div style="border:1px solid #223047;border-radius:20px;padding:20px;background:rgba(17,24,39,0.72)">
           <div style="display:flex;justify-content:space-between;align-items:center;margin-bottom:14px">
             <h3 style="font-size:18px">{icon} {esc(label)}</h3>
-            <a href="{mk}/index.html" style="border:1px solid rgba(96,165,250,0.45);background:rgba(96,165,250,0.08);color:#bfdbfe;border-radius:999px;padding:6px 12px;font-size:12px;font-weight:900;text-transform:uppercase">View all →</a>
+            <a href="{esc(player_app_href(slug, market_key=mk) if client_render else f"{mk}/index.html")}" style="border:1px solid rgba(96,165,250,0.45);background:rgba(96,165,250,0.08);color:#bfdbfe;border-radius:999px;padding:6px 12px;font-size:12px;font-weight:900;text-transform:uppercase">View all →</a>
           </div>
           {preview}
         </div>"""
@@ -1687,10 +1676,11 @@ def render_player_props_page(fixture):
 
 # ── Player market sub-page ─────────────────────────────────────────────────────
 
-def render_player_market_page(fixture, mk, label, icon):
+def render_player_market_page(fixture, mk, label, icon, player_index=None):
     home, away, slug = fixture["home_team"], fixture["away_team"], fixture["slug"]
     props = fixture.get("props") or {}
-    player_index = build_player_index(props, home, away)
+    if player_index is None:
+        player_index = build_player_index(props, home, away)
     players_in_mkt = {pk: pd for pk, pd in player_index.items() if mk in pd["markets"]}
 
     subnav = (f'<nav class="sub-nav"><a href="../../index.html">Odds</a>'
@@ -1905,6 +1895,159 @@ def render_player_detail_page(fixture, player_key, player_data):
   <p class="footer-note">Odds may change. Always verify with the bookmaker before placing a bet.</p>
 </main></body></html>"""
 
+# ── Client-rendered player pages ───────────────────────────────────────────────
+
+PLAYER_APP_DIR = "player"
+PLAYER_DATA_FILE = "players.json"
+
+def player_app_href(slug, player_key=None, market_key=None):
+    """Link from a fixture's player-props page to the shared player page."""
+    query = f"p={player_key}" if player_key else f"m={market_key}"
+    return f"../../{PLAYER_APP_DIR}/?f={slug}&{query}"
+
+def render_player_data(fixture, player_index):
+    """Compact per-fixture JSON read by the shared player page."""
+    return json.dumps({
+        "fixture": fixture_header(fixture),
+        "players": player_index,
+    }, ensure_ascii=False, separators=(",", ":"))
+
+def render_player_app_page():
+    """One page for every player and player-market view, rendered in the browser.
+
+    /football/world-cup/player/?f=<fixture slug>&p=<player key>
+    /football/world-cup/player/?f=<fixture slug>&m=<market key>
+
+    It reads <fixture slug>/player-props/players.json and mirrors the markup of
+    render_player_detail_page and render_player_market_page.
+    """
+    config = json.dumps({
+        "base": BASE,
+        "data": PLAYER_DATA_FILE,
+        "markets": PLAYER_MARKET_PAGES,
+        "threshold": sorted(THRESHOLD_MARKETS),
+        "lineLabels": LINE_LABELS,
+    }, ensure_ascii=False)
+
+    return f"""<!doctype html><html lang="en"><head>
+<meta charset="utf-8"/><meta name="viewport" content="width=device-width,initial-scale=1"/>
+<title>Player Props — BeatTheBooks</title>
+<style>{SHARED_CSS}</style></head><body>
+<main class="page" id="app"><p style="color:#91a0b5">Loading…</p></main>
+<script>
+const CFG = {config};
+const q = new URLSearchParams(location.search);
+const slug = q.get("f") || "", playerKey = q.get("p"), marketKey = q.get("m");
+const esc = s => String(s ?? "").replace(/[&<>"']/g, c => ({{"&":"&amp;","<":"&lt;",">":"&gt;",'"':"&quot;","'":"&#39;"}})[c]);
+const isThreshold = mk => CFG.threshold.includes(mk);
+const wantedLines = mk => mk === "shots" ? ["0.5","1.5","2.5","3.5"] : ["0.5","1.5","2.5"];
+const lineLabel = l => CFG.lineLabels[l] || l + "+";
+const plus = x => /^(\\d+)\\+/.exec(String(x));
+const lineSort = x => /^-?\\d+(\\.\\d+)?$/.test(x) ? parseFloat(x) : (plus(x) ? plus(x)[1] - 0.5 : 999);
+const normLine = x => /^-?\\d+(\\.\\d+)?$/.test(x) ? x : (plus(x) ? String(plus(x)[1] - 0.5) : x);
+const byLine = (a, b) => lineSort(a) - lineSort(b);
+const best = offers => {{
+  let top = null;
+  for (const [bk, o] of Object.entries(offers)) if (!top || o.decimal > top[1].decimal) top = [bk, o];
+  return top;
+}};
+const coverage = n => `<td style="color:#91a0b5;font-size:12px">${{n}} bk${{n !== 1 ? "s" : ""}}</td>`;
+const playerLink = p => `<a href="?f=${{encodeURIComponent(slug)}}&p=${{encodeURIComponent(p.key)}}" style="color:#e2e8f0;font-weight:600">${{esc(p.name)}}</a>`;
+
+function shell(fx, crumbs, eyebrow, title, meta, subnavExtra, content) {{
+  const fix = `${{CFG.base}}/football/world-cup/${{esc(fx.slug)}}/`;
+  return `<nav class="nav"><a href="${{CFG.base}}/football/">Football</a><span>›</span><a href="${{CFG.base}}/football/world-cup/">World Cup</a><span>›</span><a href="${{fix}}">${{esc(fx.home_team)}} v ${{esc(fx.away_team)}}</a><span>›</span><a href="${{fix}}player-props/">Player Props</a><span>›</span><span>${{esc(crumbs)}}</span></nav>
+  <section class="hero"><div class="eyebrow">${{eyebrow}}</div><h1>${{esc(title)}}</h1><p class="meta">${{esc(meta)}}</p></section>
+  <nav class="sub-nav"><a href="${{fix}}">Odds</a><a href="${{fix}}match-props/">Match Props</a><a href="${{fix}}player-props/">Player Props</a>${{subnavExtra}}</nav>
+  ${{content}}
+  <p class="footer-note">Odds may change. Always verify with the bookmaker before placing a bet.</p>`;
+}}
+
+function renderMarket(fx, players, mk, label, icon) {{
+  const inMarket = Object.values(players).filter(p => p.markets[mk]);
+  let content;
+  if (!inMarket.length) {{
+    content = '<p style="color:#91a0b5">No data available yet.</p>';
+  }} else if (isThreshold(mk)) {{
+    const all = [...new Set(inMarket.flatMap(p => Object.keys(p.markets[mk])))].sort(byLine);
+    const wanted = wantedLines(mk);
+    let show = all.filter(l => wanted.includes(normLine(l)));
+    if (!show.length) show = all.slice(0, wanted.length);
+    const stat = mk === "shots_on_target" ? "SOT" : mk === "shots" ? "Shots" : mk === "player_tackles_completed" ? "Tackles" : "Fouls";
+    const heads = show.map(l => `<th style="text-align:center">${{lineLabel(l)}} ${{stat}}</th>`).join("");
+    const sortKey = p => {{
+      const ld = p.markets[mk]["0.5"] || p.markets[mk][show[0]] || {{}};
+      return Math.min(999, ...Object.values(ld).map(o => o.decimal));
+    }};
+    const rows = inMarket.sort((a, b) => sortKey(a) - sortKey(b)).map(p => {{
+      const books = new Set();
+      const cells = show.map(line => {{
+        const ld = p.markets[mk][line] || {{}};
+        Object.keys(ld).forEach(bk => books.add(bk));
+        const top = best(ld);
+        if (!top) return '<td style="text-align:center;color:#4b5563">—</td>';
+        return `<td style="text-align:center"><strong style="color:#22c55e;font-size:17px">${{esc(top[1].odds)}}</strong><div style="color:#91a0b5;font-size:11px">${{esc(top[0])}}</div></td>`;
+      }}).join("");
+      return `<tr><td>${{playerLink(p)}}</td>${{cells}}${{coverage(books.size)}}</tr>`;
+    }}).join("");
+    content = `<div class="panel"><table><thead><tr><th>Player</th>${{heads}}<th>Coverage</th></tr></thead><tbody>${{rows}}</tbody></table></div>`;
+  }} else {{
+    const rows = inMarket
+      .map(p => [p, best(p.markets[mk])])
+      .sort((a, b) => b[1][1].decimal - a[1][1].decimal)
+      .map(([p, top]) => `<tr><td>${{playerLink(p)}}</td><td><strong style="color:#22c55e;font-size:18px">${{esc(top[1].odds)}}</strong></td><td style="color:#91a0b5">${{esc(top[0])}}</td>${{coverage(Object.keys(p.markets[mk]).length)}}</tr>`)
+      .join("");
+    content = `<div class="panel"><table><thead><tr><th>Player</th><th>Best Price</th><th>Bookmaker</th><th>Coverage</th></tr></thead><tbody>${{rows}}</tbody></table></div>`;
+  }}
+  document.title = `${{fx.home_team}} v ${{fx.away_team}} — ${{label}} — BeatTheBooks`;
+  return shell(fx, label, `⚽ ${{esc(icon)}} ${{esc(label)}}`, `${{fx.home_team}} v ${{fx.away_team}}`,
+    `${{fx.date_label}} · ${{fx.time}}`, `<a href="" class="active">${{esc(label)}}</a>`, content);
+}}
+
+function renderPlayer(fx, p) {{
+  let html = "";
+  for (const [mk, label, icon] of CFG.markets) {{
+    const data = p.markets[mk];
+    if (!data) continue;
+    if (isThreshold(mk)) {{
+      const all = Object.keys(data).sort(byLine);
+      const wanted = wantedLines(mk);
+      let show = all.filter(l => wanted.includes(l));
+      if (!show.length) show = all.slice(0, wanted.length);
+      const heads = show.map(l => `<th style="text-align:center">${{lineLabel(l)}}</th>`).join("");
+      const books = [...new Set(Object.values(data).flatMap(ld => Object.keys(ld)))].sort();
+      const rows = books.map(bk => `<tr><td style="color:#91a0b5">${{esc(bk)}}</td>` + show.map(line => {{
+        const o = (data[line] || {{}})[bk];
+        return o ? `<td style="text-align:center;color:#22c55e;font-weight:900">${{esc(o.odds)}}</td>` : '<td style="text-align:center;color:#4b5563">—</td>';
+      }}).join("") + "</tr>").join("");
+      html += `<div class="panel" style="margin-bottom:16px"><h3 style="margin-bottom:12px">${{esc(icon)}} ${{esc(label)}}</h3><table><thead><tr><th>Bookmaker</th>${{heads}}</tr></thead><tbody>${{rows}}</tbody></table></div>`;
+    }} else {{
+      const bestDec = Math.max(...Object.values(data).map(o => o.decimal));
+      const cells = Object.keys(data).sort().map(bk => {{
+        const o = data[bk], isBest = o.decimal === bestDec;
+        return `<div style="border:1px solid ${{isBest ? "#22c55e" : "#223047"}};border-radius:12px;padding:12px;background:${{isBest ? "rgba(34,197,94,0.08)" : "rgba(255,255,255,0.02)"}};text-align:center"><div style="color:#91a0b5;font-size:11px;margin-bottom:6px">${{esc(bk)}}</div><div style="color:${{isBest ? "#22c55e" : "#e2e8f0"}};font-size:${{isBest ? "22px" : "18px"}};font-weight:900">${{esc(o.odds)}}</div>${{isBest ? '<div style="color:#86efac;font-size:10px;font-weight:800;margin-top:4px">BEST</div>' : ""}}</div>`;
+      }}).join("");
+      html += `<div class="panel" style="margin-bottom:16px"><h3 style="margin-bottom:12px">${{esc(icon)}} ${{esc(label)}}</h3><div style="display:grid;grid-template-columns:repeat(auto-fill,minmax(130px,1fr));gap:10px">${{cells}}</div></div>`;
+    }}
+  }}
+  document.title = `${{p.name}} Props — ${{fx.home_team}} v ${{fx.away_team}} — BeatTheBooks`;
+  return shell(fx, p.name, "⚽ Player Props", p.name, `${{fx.home_team}} v ${{fx.away_team}} · ${{fx.date_label}} · ${{fx.time}}`, "",
+    html || '<p style="color:#91a0b5">No props available for this player.</p>');
+}}
+
+const app = document.getElementById("app");
+fetch(`../${{encodeURIComponent(slug)}}/player-props/${{CFG.data}}`)
+  .then(r => {{ if (!r.ok) throw new Error(r.status); return r.json(); }})
+  .then(({{fixture, players}}) => {{
+    const market = CFG.markets.find(([mk]) => mk === marketKey);
+    if (market) app.innerHTML = renderMarket(fixture, players, ...market);
+    else if (players[playerKey]) app.innerHTML = renderPlayer(fixture, players[playerKey]);
+    else app.innerHTML = '<p style="color:#91a0b5">Player not found.</p>';
+  }})
+  .catch(() => {{ app.innerHTML = '<p style="color:#91a0b5">No data available yet.</p>'; }});
+</script>
+</body></html>"""
+
 # ── Football hub ───────────────────────────────────────────────────────────────
 
 def render_hub(fixtures, bk_count, generated):
@@ -1937,49 +2080,271 @@ def render_hub(fixtures, bk_count, generated):
 
 # ── Main ───────────────────────────────────────────────────────────────────────
 
+# ── Incremental output ─────────────────────────────────────────────────────────
+
+# Any change to this file (templates, CSS, helpers) or to the shared odds/name
+# helpers re-renders every page.
+RENDERER_DIGEST = hashlib.sha256(
+    Path(__file__).read_bytes() + Path(odds_common.__file__).read_bytes()
+).hexdigest()
+
+def page_digest(*inputs):
+    payload = json.dumps(inputs, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(f"{RENDERER_DIGEST}\n{payload}".encode("utf-8")).hexdigest()
+
+def fixture_header(f):
+    return {k: f.get(k, "") for k in ("home_team", "away_team", "slug", "date_label", "time")}
+
+class PageWriter:
+    """Write pages whose input digest changed and drop pages no longer built."""
+
+    def __init__(self, full=False):
+        self.previous = {}
+        self.digests = {}
+        self.written = self.skipped = self.removed = 0
+        if not full and PAGE_DIGESTS_PATH.exists():
+            try:
+                self.previous = json.loads(PAGE_DIGESTS_PATH.read_text(encoding="utf-8")).get("pages", {})
+            except Exception as e:
+                print(f"Page digests unreadable, rendering everything: {e}")
+
+    def is_current(self, rel, digest):
+        return self.previous.get(rel) == digest and (ROOT / rel).exists()
+
+    def store(self, rel, digest, html):
+        """Record a page; html is None when the existing file is current."""
+        self.digests[rel] = digest
+        if html is None:
+            self.skipped += 1
+            return
+        path = ROOT / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(html, encoding="utf-8")
+        os.replace(tmp, path)
+        self.written += 1
+
+    def remove_stale(self):
+        """Delete fixture pages not produced by this run, then empty directories."""
+        for fixture_dir in [d for d in OUT_DIR.iterdir() if d.is_dir()]:
+            for page in [p for p in fixture_dir.rglob("*") if p.name in ("index.html", PLAYER_DATA_FILE)]:
+                if page.relative_to(ROOT).as_posix() not in self.digests:
+                    page.unlink()
+                    self.removed += 1
+            for d in sorted((d for d in fixture_dir.rglob("*") if d.is_dir()), key=lambda d: len(d.parts), reverse=True):
+                if not any(d.iterdir()): d.rmdir()
+            if not any(fixture_dir.iterdir()): fixture_dir.rmdir()
+
+    def save(self):
+        PAGE_DIGESTS_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp = PAGE_DIGESTS_PATH.with_name(f"{PAGE_DIGESTS_PATH.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({"version": 1, "pages": self.digests}, indent=1, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, PAGE_DIGESTS_PATH)
+
+def render_fixture_pages(f, pages, client_render=False):
+    """Digest every page of one fixture and render the ones that changed.
+
+    Returns (has_match, has_player, [(relative path, digest, html or None)],
+    player index or None). The player index is built once and shared by all
+    player pages. With
+    client_render, per-market and per-player pages are replaced by one
+    players.json read by the shared player page.
+    """
+    d = (OUT_DIR / f["slug"]).relative_to(ROOT).as_posix()
+    out = []
+
+    def page(rel, digest, render):
+        out.append((rel, digest, None if pages.is_current(rel, digest) else render()))
+
+    fixture_digest = page_digest(f)
+    page(f"{d}/index.html", fixture_digest, lambda: render_match_page(f))
+
+    props = f.get("props") or {}
+    has_match  = any(any(normalize_prop_market_key(m["market"]) in MATCH_MARKET_KEYS  for m in pd.get("markets",[])) for pd in props.values())
+    has_player = any(any(is_player_market(m["market"]) for m in pd.get("markets",[])) for pd in props.values())
+
+    if has_match:
+        page(f"{d}/match-props/index.html", fixture_digest, lambda: render_match_props_page(f))
+
+    if has_player:
+        header = fixture_header(f)
+        player_index = build_player_index(props, f["home_team"], f["away_team"])
+        if client_render:
+            page(f"{d}/player-props/index.html", page_digest(f, "client"),
+                 lambda: render_player_props_page(f, player_index, client_render=True))
+            page(f"{d}/player-props/{PLAYER_DATA_FILE}", page_digest(header, player_index),
+                 lambda: render_player_data(f, player_index))
+            return has_match, has_player, out, player_index
+
+        page(f"{d}/player-props/index.html", fixture_digest, lambda: render_player_props_page(f, player_index))
+
+        for mk, label, icon in PLAYER_MARKET_PAGES:
+            players_in_mkt = {pk: pd for pk, pd in player_index.items() if mk in pd["markets"]}
+            if not players_in_mkt: continue
+            page(f"{d}/player-props/{mk}/index.html",
+                 page_digest(header, mk, label, icon, players_in_mkt),
+                 lambda: render_player_market_page(f, mk, label, icon, player_index))
+
+        for pk, pd in player_index.items():
+            page(f"{d}/player-props/players/{pk}/index.html",
+                 page_digest(header, pk, pd),
+                 lambda: render_player_detail_page(f, pk, pd))
+
+        return has_match, has_player, out, player_index
+
+    return has_match, has_player, out, None
+
+# ── Fixtures snapshot ──────────────────────────────────────────────────────────
+
+# Every file load_all() reads. The snapshot is only reused while none of them
+# changed, so a scraper finishing after the page build is never missed.
+LOAD_ALL_INPUTS = (
+    PADDY_PATH, BOYLE_PATH, BETVICTOR_PATH, UNIBET_PATH, LIVESCOREBET_PATH,
+    WILLIAMHILL_PATH, EIGHTEIGHTEIGHT_PATH, LADBROKES_PATH, MIDNITE_PATH, BWIN_PATH,
+    PADDY_PROPS_PATH, BOYLE_PROPS_PATH, UNIBET_PROPS_PATH, LIVESCORE_PROPS_PATH,
+    EIGHTSPORT_PROPS_PATH, WILLIAMHILL_PROPS_PATH, BETVICTOR_PROPS_PATH,
+    LADBROKES_PROPS_PATH, MIDNITE_PROPS_PATH, BWIN_PROPS_PATH, BWIN_MATCH_STATS_PATH,
+    UPCOMING_SNAPSHOT_PATH,
+)
+
+SNAPSHOT_VERSION = 1
+
+# Parsing and merging live in this file and the shared helpers, so a change
+# to any of them invalidates the snapshot.
+LOADER_DIGEST = hashlib.sha256(
+    Path(__file__).read_bytes()
+    + Path(odds_common.__file__).read_bytes()
+    + Path(fixture_ids.__file__).read_bytes()
+).hexdigest()
+
+def input_signatures():
+    """(size, mtime) of every load_all() input; None for a missing file."""
+    signatures = {}
+    for path in LOAD_ALL_INPUTS:
+        try:
+            stat = path.stat()
+            signatures[path.relative_to(ROOT).as_posix()] = (stat.st_size, stat.st_mtime_ns)
+        except OSError:
+            signatures[path.relative_to(ROOT).as_posix()] = None
+    return signatures
+
+def save_fixtures_snapshot(inputs, fixtures, bk_count, generated, player_indexes):
+    """Pickle load_all()'s result and the player index of every fixture.
+
+    inputs must be the input_signatures() taken before load_all() ran, so a
+    file replaced while loading makes the snapshot stale rather than wrong.
+    """
+    payload = {
+        "version": SNAPSHOT_VERSION,
+        "code": LOADER_DIGEST,
+        "inputs": inputs,
+        "fixtures": fixtures,
+        "bk_count": bk_count,
+        "generated": generated,
+        "player_indexes": player_indexes,
+    }
+    FIXTURES_SNAPSHOT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp = FIXTURES_SNAPSHOT_PATH.with_suffix(".tmp")
+    with tmp.open("wb") as handle:
+        pickle.dump(payload, handle, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, FIXTURES_SNAPSHOT_PATH)
+
+def load_fixtures_snapshot():
+    """The last run's snapshot, or None when missing, unreadable or stale.
+
+    Returns {"fixtures", "bk_count", "generated", "player_indexes"}, where
+    player_indexes maps fixture key to build_player_index() output for every
+    fixture with player markets. The file is only ever written by this
+    script, so it is trusted like the rest of data/.
+    """
+    try:
+        with FIXTURES_SNAPSHOT_PATH.open("rb") as handle:
+            payload = pickle.load(handle)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"Fixtures snapshot unreadable, loading from source: {e}")
+        return None
+
+    if (
+        not isinstance(payload, dict)
+        or payload.get("version") != SNAPSHOT_VERSION
+        or payload.get("code") != LOADER_DIGEST
+        or payload.get("inputs") != input_signatures()
+    ):
+        return None
+    return payload
+
+# Worker-process state for --workers > 1.
+_WORKER_PAGES = None
+_WORKER_CLIENT_RENDER = False
+
+def _init_worker(full, client_render):
+    global _WORKER_PAGES, _WORKER_CLIENT_RENDER
+    _WORKER_PAGES = PageWriter(full=full)
+    _WORKER_CLIENT_RENDER = client_render
+
+def _render_fixture_in_worker(f):
+    return render_fixture_pages(f, _WORKER_PAGES, _WORKER_CLIENT_RENDER)
+
+# ── Main ───────────────────────────────────────────────────────────────────────
+
 def main():
+    parser = argparse.ArgumentParser(description="Generate the World Cup odds pages")
+    parser.add_argument("--full", action="store_true", help="re-render every page, ignoring stored digests")
+    parser.add_argument("--workers", type=int, default=1, help="render fixtures in this many processes")
+    parser.add_argument("--client-render", action="store_true",
+                        help="write players.json per fixture and one shared player page instead of a page per player and market")
+    args = parser.parse_args()
+
+    inputs = input_signatures()
     fixtures, bk_count, generated = load_all()
+    telemetry.count("fixtures", len(fixtures))
 
     OUT_DIR.mkdir(parents=True, exist_ok=True)
     HUB_PATH.parent.mkdir(parents=True, exist_ok=True)
 
+    # The index and hub carry the run timestamp, so they always change.
     OUT_PATH.write_text(render_index(fixtures, bk_count, generated), encoding="utf-8")
     HUB_PATH.write_text(render_hub(fixtures, bk_count, generated), encoding="utf-8")
 
+    pages = PageWriter(full=args.full)
     match_pages = player_pages = 0
+    player_indexes = {}
 
-    for f in fixtures:
-        d = OUT_DIR / f["slug"]
-        d.mkdir(parents=True, exist_ok=True)
-        (d / "index.html").write_text(render_match_page(f), encoding="utf-8")
-
-        props = f.get("props") or {}
-        has_match  = any(any(normalize_prop_market_key(m["market"]) in MATCH_MARKET_KEYS  for m in pd.get("markets",[])) for pd in props.values())
-        has_player = any(any(is_player_market(m["market"]) for m in pd.get("markets",[])) for pd in props.values())
-
-        if has_match:
-            mp = d / "match-props"; mp.mkdir(parents=True, exist_ok=True)
-            (mp / "index.html").write_text(render_match_props_page(f), encoding="utf-8")
-            match_pages += 1
-
-        if has_player:
-            pp = d / "player-props"; pp.mkdir(parents=True, exist_ok=True)
-            (pp / "index.html").write_text(render_player_props_page(f), encoding="utf-8")
-            player_pages += 1
-
-            player_index = build_player_index(props, f["home_team"], f["away_team"])
-            for mk, label, icon in PLAYER_MARKET_PAGES:
-                players_in_mkt = {pk: pd for pk, pd in player_index.items() if mk in pd["markets"]}
-                if not players_in_mkt: continue
-                mkt_dir = pp / mk; mkt_dir.mkdir(parents=True, exist_ok=True)
-                (mkt_dir / "index.html").write_text(
-                    render_player_market_page(f, mk, label, icon), encoding="utf-8")
-
-            players_dir = pp / "players"; players_dir.mkdir(parents=True, exist_ok=True)
-            for pk, pd in player_index.items():
-                player_dir = players_dir / pk; player_dir.mkdir(parents=True, exist_ok=True)
-                (player_dir / "index.html").write_text(
-                    render_player_detail_page(f, pk, pd), encoding="utf-8")
+    if args.workers > 1 and len(fixtures) > 1:
+        executor = ProcessPoolExecutor(
+            max_workers=min(args.workers, len(fixtures)),
+            initializer=_init_worker,
+            initargs=(args.full, args.client_render),
+        )
+        results = executor.map(_render_fixture_in_worker, fixtures)
+    else:
+        executor = None
+        results = (render_fixture_pages(f, pages, args.client_render) for f in fixtures)
+
+    try:
+        for f, (has_match, has_player, rendered, player_index) in zip(fixtures, results):
+            match_pages += has_match
+            player_pages += has_player
+            if player_index is not None:
+                player_indexes[f["key"]] = player_index
+            for rel, digest, html in rendered:
+                pages.store(rel, digest, html)
+    finally:
+        if executor:
+            executor.shutdown()
+
+    if args.client_render:
+        app = OUT_DIR / PLAYER_APP_DIR / "index.html"
+        html = render_player_app_page()
+        rel = app.relative_to(ROOT).as_posix()
+        digest = page_digest("player-app")
+        pages.store(rel, digest, None if pages.is_current(rel, digest) else html)
+
+    pages.remove_stale()
+    pages.save()
+    save_fixtures_snapshot(inputs, fixtures, bk_count, generated, player_indexes)
 
     print(f"World Cup index:    {OUT_PATH}")
     print(f"Football hub:       {HUB_PATH}")
@@ -1987,6 +2352,8 @@ def main():
     print(f"Match props pages:  {match_pages}")
     print(f"Player props pages: {player_pages}")
     print(f"Bookmakers:         {bk_count}")
+    print(f"Pages written:      {pages.written} (unchanged {pages.skipped}, removed {pages.removed})")
+    print(f"Fixtures snapshot:  {FIXTURES_SNAPSHOT_PATH}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+odds_store.py
+
+Normalised SQLite store for football odds.
+
+Every scraper writes its own JSON shape (matches[] with markets dicts,
+Midnite's home/away schema, Bwin match stats), and every build script used to
+re-parse and re-normalise all of it on every run. The store keeps one row per
+normalised entry, tagged with the source file it came from:
+
+    sources  path, bookmaker, size, mtime_ns, normaliser, ingested_at
+    entries  source, seq, bookmaker, fixture, canonical_market, line, side,
+             reject_reason, offer (JSON)
+
+Indexes cover fixture, (canonical_market, line) and bookmaker, so consumers
+query only what they need.
+
+A source file is ingested once and re-ingested only when its size or mtime
+changes, or when the normaliser that produced its rows changes. The caller
+passes the normaliser in, together with an id. The id is usually a hash of the
+module that defines it, so editing the normalisation rules rebuilds the
+affected rows on the next run.
+
+One file can feed several normalisers (a props file holds both O/U ladders and
+named markets). Each normaliser passes its own kind, and the file is stored
+once per kind as "<path>#<kind>". Current kinds:
+
+    ""       O/U props offers     analyze_football_arbitrage.scan_props_arbitrage
+    named    BTTS, DC, HT result  analyze_football_arbitrage.scan_named_prop_arbitrage
+    page     moneyline rows and   generate_worldcup_page.load_all, which also
+             props per fixture    feeds build_football_ev_alerts
+
+The database lives in data/football_odds.sqlite and is a build cache, not
+published output. Delete it, or run with --rebuild, to start over:
+
+    python scripts/Football/odds_store.py            (list sources)
+    python scripts/Football/odds_store.py --rebuild
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+
+ROOT = Path(__file__).resolve().parents[2]
+STORE_PATH = ROOT / "data" / "football_odds.sqlite"
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sources (
+    path TEXT PRIMARY KEY,
+    bookmaker TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    normaliser TEXT NOT NULL,
+    ingested_at TEXT NOT NULL,
+    entries INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    source TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    bookmaker TEXT NOT NULL,
+    fixture TEXT,
+    canonical_market TEXT,
+    line TEXT,
+    side TEXT,
+    reject_reason TEXT,
+    offer TEXT,
+    PRIMARY KEY (source, seq)
+);
+CREATE INDEX IF NOT EXISTS entries_fixture ON entries (fixture);
+CREATE INDEX IF NOT EXISTS entries_market_line ON entries (canonical_market, line);
+CREATE INDEX IF NOT EXISTS entries_bookmaker ON entries (bookmaker);
+"""
+
+# (fixture, canonical_market, line, side, offer) for an offer, or
+# (None, None, None, None, reason) for a rejected one.
+Entry = tuple
+Normaliser = Callable[[str, object], Iterable[Entry]]
+
+
+def module_digest(*paths) -> str:
+    """Normaliser id for code defined in the given module files."""
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(Path(path).read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def load_json(path: Path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return None
+
+
+class OddsStore:
+    def __init__(self, path: Path = STORE_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(self.path, timeout=60)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+
+        version = self.db.execute("PRAGMA user_version").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            self.db.executescript(
+                "DROP TABLE IF EXISTS entries; DROP TABLE IF EXISTS sources;"
+            )
+            self.db.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        self.db.executescript(SCHEMA)
+        self.db.commit()
+
+    def close(self) -> None:
+        self.db.close()
+
+    def __enter__(self) -> "OddsStore":
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        self.close()
+
+    def _key(self, path: Path, kind: str = "") -> str:
+        path = Path(path).resolve()
+        try:
+            key = path.relative_to(ROOT).as_posix()
+        except ValueError:
+            key = path.as_posix()
+        return f"{key}#{kind}" if kind else key
+
+    def refresh(
+        self,
+        sources: Iterable[tuple[str, Path]],
+        normalise: Normaliser,
+        normaliser_id: str,
+        kind: str = "",
+    ) -> dict[str, int]:
+        """Ingest any (bookmaker, path) source whose file or normaliser changed.
+
+        Returns {source key: number of entries} for every source.
+        """
+        counts = {}
+        for bookmaker, path in sources:
+            path = Path(path)
+            key = self._key(path, kind)
+            try:
+                stat = path.stat()
+                size, mtime_ns = stat.st_size, stat.st_mtime_ns
+            except OSError:
+                size, mtime_ns = -1, -1
+
+            row = self.db.execute(
+                "SELECT bookmaker, size, mtime_ns, normaliser, entries "
+                "FROM sources WHERE path = ?",
+                (key,),
+            ).fetchone()
+            if row and row[:4] == (bookmaker, size, mtime_ns, normaliser_id):
+                counts[key] = row[4]
+                continue
+
+            raw = load_json(path) if size >= 0 else None
+            entries = list(normalise(bookmaker, raw)) if raw else []
+            self._replace(key, bookmaker, size, mtime_ns, normaliser_id, entries)
+            counts[key] = len(entries)
+            print(f"  odds store: ingested {key} ({len(entries)} entries)")
+        return counts
+
+    def _replace(self, key, bookmaker, size, mtime_ns, normaliser_id, entries) -> None:
+        with self.db:
+            self.db.execute("DELETE FROM entries WHERE source = ?", (key,))
+            self.db.executemany(
+                "INSERT INTO entries (source, seq, bookmaker, fixture, "
+                "canonical_market, line, side, reject_reason, offer) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    (
+                        key,
+                        seq,
+                        bookmaker,
+                        fixture,
+                        canonical_market,
+                        line,
+                        side,
+                        None if fixture else offer,
+                        json.dumps(offer, ensure_ascii=False) if fixture else None,
+                    )
+                    for seq, (fixture, canonical_market, line, side, offer)
+                    in enumerate(entries)
+                ),
+            )
+            self.db.execute(
+                "INSERT OR REPLACE INTO sources "
+                "(path, bookmaker, size, mtime_ns, normaliser, ingested_at, entries) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    bookmaker,
+                    size,
+                    mtime_ns,
+                    normaliser_id,
+                    datetime.now(timezone.utc).isoformat(),
+                    len(entries),
+                ),
+            )
+
+    def offers(
+        self,
+        sources: Iterable[Path],
+        *,
+        kind: str = "",
+        fixture: str | None = None,
+        canonical_market: str | None = None,
+        line: str | None = None,
+        bookmaker: str | None = None,
+    ) -> Iterator[tuple[str, str, str, str, dict]]:
+        """Yield (fixture, canonical_market, line, side, offer) in source order."""
+        filters, params = ["reject_reason IS NULL"], []
+        for column, value in (
+            ("fixture", fixture),
+            ("canonical_market", canonical_market),
+            ("line", line),
+            ("bookmaker", bookmaker),
+        ):
+            if value is not None:
+                filters.append(f"{column} = ?")
+                params.append(value)
+
+        query = (
+            "SELECT fixture, canonical_market, line, side, offer FROM entries "
+            f"WHERE source = ? AND {' AND '.join(filters)} ORDER BY seq"
+        )
+        for path in sources:
+            for fk, market, row_line, side, offer in self.db.execute(
+                query, (self._key(path, kind), *params)
+            ):
+                yield fk, market, row_line, side, json.loads(offer)
+
+    def reject_counts(self, sources: Iterable[Path], kind: str = "") -> dict[str, int]:
+        counts: dict[str, int] = {}
+        for path in sources:
+            for reason, count in self.db.execute(
+                "SELECT reject_reason, COUNT(*) FROM entries "
+                "WHERE source = ? AND reject_reason IS NOT NULL "
+                "GROUP BY reject_reason",
+                (self._key(path, kind),),
+            ):
+                counts[reason] = counts.get(reason, 0) + count
+        return counts
+
+    def stats(self) -> list[tuple]:
+        return self.db.execute(
+            "SELECT path, bookmaker, entries, ingested_at FROM sources ORDER BY path"
+        ).fetchall()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Inspect the football odds store")
+    parser.add_argument("--rebuild", action="store_true", help="delete the store")
+    args = parser.parse_args()
+
+    if args.rebuild:
+        for suffix in ("", "-wal", "-shm"):
+            target = Path(f"{STORE_PATH}{suffix}")
+            if target.exists():
+                target.unlink()
+        print(f"Deleted {STORE_PATH}; it is rebuilt on the next build run.")
+        return 0
+
+    with OddsStore() as store:
+        rows = store.stats()
+    if not rows:
+        print("Odds store is empty.")
+    for path, bookmaker, entries, ingested_at in rows:
+        print(f"{bookmaker:<13} {entries:>7} entries  {ingested_at}  {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
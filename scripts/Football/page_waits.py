@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+"""
+page_waits.py
+
+Event-driven waits for the Playwright scrapers.
+
+The scrapers historically follow every click, scroll and tab change with a
+fixed page.wait_for_timeout(...). Those sleeps are sized for the slowest
+observed case, so on a normal page most of each sleep is wasted. The helpers
+here wait for an actual signal instead and treat the old sleep as the hard
+timeout:
+
+    wait_for_dom(page, predicate_js)      a JS predicate becomes truthy
+    wait_for_selector_count(page, sel, n) at least n elements match
+    wait_for_text_stable(page)            visible text and price count stop
+                                          changing for quiet_ms
+    text_signature(page)                  the text before a click, so the
+                                          stable wait needs a change first
+    ResponseWatcher(page, pattern)        matching XHR/fetch traffic has gone
+                                          quiet (network idle for one API)
+
+Every wait returns the seconds it actually used. The timeout equals the
+previous fixed sleep, so a page is never captured later than before. A wait
+can only end early on the signal it watches. Text stability alone is
+satisfied by the old content while a clicked tab is still fetching or a
+scrolled list is still lazy-loading rows, so every wait after a click,
+scroll or cookie dismissal passes changed_from (see wait_for_text_stable)
+or uses ResponseWatcher. Sleeps that only let a scroll_into_view settle
+before a click stay fixed.
+
+Reporting mode:
+
+    set WAIT_REPORT=1
+
+records one entry per wait (label, kind, budget, elapsed, timed out). Call
+write_wait_report(path) at the end of a run to save the entries as JSONL and
+print a per-label summary showing where the budget actually goes.
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Iterable
+
+WAIT_REPORT = os.environ.get("WAIT_REPORT", "").strip().lower() in {
+    "1",
+    "true",
+    "yes",
+}
+
+DEFAULT_POLL_MS = 100
+DEFAULT_QUIET_MS = 300
+
+_RECORDS: list[dict] = []
+_RECORDS_LOCK = threading.Lock()
+_STABLE_KEYS = itertools.count(1)
+
+# The signature is the text length, the price count and a hash of the text,
+# so a tab that replaces its content with the same amount of text still
+# reads as a change.
+SIGNATURE_JS = r"""
+(root) => {
+    const text = root ? (root.innerText || "") : "";
+    const prices = text.match(
+        /(?:^|\s)(?:\d+\/\d+|EVS|EVENS|EVEN|\d{1,3}\.\d{1,3})(?=\s|$)/gmi
+    ) || [];
+    let hash = 0;
+    for (let i = 0; i < text.length; i++) {
+        hash = (Math.imul(hash, 31) + text.charCodeAt(i)) | 0;
+    }
+    return { signature: text.length + ":" + prices.length + ":" + hash, prices: prices.length };
+}
+"""
+
+TEXT_SIGNATURE_JS = r"""
+(args) => {
+    const root = args.selector
+        ? document.querySelector(args.selector)
+        : document.body;
+    const { signature, prices } = (""" + SIGNATURE_JS.strip() + r""")(root);
+    const now = performance.now();
+    const store = window.__btbStableText || (window.__btbStableText = {});
+    const previous = store[args.key];
+
+    // Text still showing what was there before the click does not count:
+    // the quiet period only starts once it has changed.
+    if (args.changedFrom !== null && signature === args.changedFrom) {
+        return false;
+    }
+
+    if (!previous || previous.signature !== signature) {
+        store[args.key] = { signature, since: now };
+        return false;
+    }
+
+    return (
+        prices >= args.minPrices
+        && now - previous.since >= args.quietMs
+    );
+}
+"""
+
+CURRENT_SIGNATURE_JS = r"""
+(selector) => {
+    const root = selector ? document.querySelector(selector) : document.body;
+    return (""" + SIGNATURE_JS.strip() + r""")(root).signature;
+}
+"""
+
+
+def _record(
+    label: str,
+    kind: str,
+    budget_ms: int,
+    started: float,
+    timed_out: bool,
+) -> float:
+    elapsed = time.perf_counter() - started
+
+    if WAIT_REPORT:
+        with _RECORDS_LOCK:
+            _RECORDS.append(
+                {
+                    "label": label or kind,
+                    "kind": kind,
+                    "budget_ms": int(budget_ms),
+                    "elapsed_ms": round(elapsed * 1000, 1),
+                    "timed_out": bool(timed_out),
+                }
+            )
+
+    return elapsed
+
+
+def wait_for_dom(
+    page,
+    predicate_js: str,
+    arg=None,
+    timeout_ms: int = 5000,
+    label: str = "",
+    poll_ms: int = DEFAULT_POLL_MS,
+) -> float:
+    """Wait until a JS predicate is truthy, or timeout_ms passes."""
+    started = time.perf_counter()
+    timed_out = False
+
+    try:
+        page.wait_for_function(
+            predicate_js,
+            arg=arg,
+            timeout=timeout_ms,
+            polling=poll_ms,
+        )
+    except Exception:
+        timed_out = True
+
+    return _record(label, "dom", timeout_ms, started, timed_out)
+
+
+def wait_for_selector_count(
+    page,
+    selector: str,
+    minimum: int = 1,
+    timeout_ms: int = 5000,
+    label: str = "",
+) -> float:
+    return wait_for_dom(
+        page,
+        "(args) => document.querySelectorAll(args.selector).length "
+        ">= args.minimum",
+        arg={"selector": selector, "minimum": minimum},
+        timeout_ms=timeout_ms,
+        label=label or f"selector:{selector}",
+    )
+
+
+def text_signature(page, selector: str = "") -> str | None:
+    """Signature of the visible text now; take it before a click.
+
+    Pass it to wait_for_text_stable(changed_from=...) so the wait cannot
+    settle on the text the click is about to replace.
+    """
+    try:
+        return page.evaluate(CURRENT_SIGNATURE_JS, selector)
+    except Exception:
+        return None
+
+
+def wait_for_text_stable(
+    page,
+    timeout_ms: int = 2000,
+    quiet_ms: int = DEFAULT_QUIET_MS,
+    selector: str = "",
+    min_prices: int = 0,
+    label: str = "",
+    poll_ms: int = DEFAULT_POLL_MS,
+    changed_from: str | None = None,
+) -> float:
+    """Wait until visible text and the price count stop changing.
+
+    A click that expands an accordion or switches a tab is considered done
+    once the rendered text has been unchanged for quiet_ms. timeout_ms is the
+    hard ceiling and is normally the fixed sleep this call replaces.
+
+    On its own this cannot tell a finished click from one whose content is
+    still loading by XHR: the old text is stable too. After a click, pass
+    changed_from=text_signature(page) taken before it. The quiet period then
+    only starts once the text differs from that, and a click that changes
+    nothing waits the full timeout, as the fixed sleep did.
+    """
+    started = time.perf_counter()
+    timed_out = False
+
+    try:
+        page.wait_for_function(
+            TEXT_SIGNATURE_JS,
+            arg={
+                "key": f"k{next(_STABLE_KEYS)}",
+                "selector": selector,
+                "quietMs": quiet_ms,
+                "minPrices": min_prices,
+                "changedFrom": changed_from,
+            },
+            timeout=timeout_ms,
+            polling=poll_ms,
+        )
+    except Exception:
+        timed_out = True
+
+    return _record(label, "text_stable", timeout_ms, started, timed_out)
+
+
+class ResponseWatcher:
+    """Track in-flight requests whose URL matches a pattern.
+
+    Attach before the action that triggers the traffic:
+
+        with ResponseWatcher(page, r"/api/markets") as watcher:
+            button.click()
+            watcher.wait_quiet(timeout_ms=2200)
+
+    wait_quiet returns once at least one matching request has finished and
+    none has been in flight for quiet_ms, or when timeout_ms passes.
+    """
+
+    def __init__(self, page, pattern: str, resource_types: Iterable[str] = ("xhr", "fetch")):
+        self.page = page
+        self.pattern = re.compile(pattern, re.I)
+        self.resource_types = set(resource_types)
+        self.in_flight: set = set()
+        self.finished = 0
+        self.last_activity = time.perf_counter()
+
+    def _matches(self, request) -> bool:
+        try:
+            if self.resource_types and request.resource_type not in self.resource_types:
+                return False
+            return bool(self.pattern.search(request.url))
+        except Exception:
+            return False
+
+    def _on_request(self, request) -> None:
+        if self._matches(request):
+            self.in_flight.add(request)
+            self.last_activity = time.perf_counter()
+
+    def _on_done(self, request) -> None:
+        if request in self.in_flight:
+            self.in_flight.discard(request)
+            self.finished += 1
+            self.last_activity = time.perf_counter()
+
+    def __enter__(self) -> "ResponseWatcher":
+        self.page.on("request", self._on_request)
+        self.page.on("requestfinished", self._on_done)
+        self.page.on("requestfailed", self._on_done)
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        for event, handler in (
+            ("request", self._on_request),
+            ("requestfinished", self._on_done),
+            ("requestfailed", self._on_done),
+        ):
+            try:
+                self.page.remove_listener(event, handler)
+            except Exception:
+                pass
+
+    def wait_quiet(
+        self,
+        timeout_ms: int = 5000,
+        quiet_ms: int = DEFAULT_QUIET_MS,
+        label: str = "",
+        poll_ms: int = 50,
+    ) -> float:
+        started = time.perf_counter()
+        deadline = started + timeout_ms / 1000
+        timed_out = True
+
+        while time.perf_counter() < deadline:
+            idle_ms = (time.perf_counter() - self.last_activity) * 1000
+            if self.finished and not self.in_flight and idle_ms >= quiet_ms:
+                timed_out = False
+                break
+            # wait_for_timeout pumps Playwright events, so the listeners run.
+            self.page.wait_for_timeout(poll_ms)
+
+        return _record(
+            label or f"network:{self.pattern.pattern}",
+            "network_quiet",
+            timeout_ms,
+            started,
+            timed_out,
+        )
+
+
+def wait_records() -> list[dict]:
+    with _RECORDS_LOCK:
+        return list(_RECORDS)
+
+
+def summarise_waits(records: list[dict] | None = None) -> list[dict]:
+    records = wait_records() if records is None else records
+    by_label: dict[str, list[dict]] = {}
+
+    for record in records:
+        by_label.setdefault(record["label"], []).append(record)
+
+    summary = []
+    for label, rows in by_label.items():
+        elapsed = sorted(row["elapsed_ms"] for row in rows)
+        budget = sum(row["budget_ms"] for row in rows)
+        p95 = elapsed[min(len(elapsed) - 1, int(len(elapsed) * 0.95))]
+        summary.append(
+            {
+                "label": label,
+                "count": len(rows),
+                "timeouts": sum(row["timed_out"] for row in rows),
+                "mean_ms": round(sum(elapsed) / len(elapsed), 1),
+                "p95_ms": p95,
+                "max_ms": elapsed[-1],
+                "budget_ms": budget,
+                "saved_ms": round(budget - sum(elapsed), 1),
+            }
+        )
+
+    summary.sort(key=lambda row: row["budget_ms"], reverse=True)
+    return summary
+
+
+def write_wait_report(path: Path, run_label: str = "") -> None:
+    """Append this run's wait records as JSONL and print a summary."""
+    records = wait_records()
+    if not WAIT_REPORT or not records:
+        return
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    with path.open("a", encoding="utf-8") as handle:
+        for record in records:
+            handle.write(
+                json.dumps({"run": run_label, **record}, ensure_ascii=False)
+                + "\n"
+            )
+
+    print("")
+    print("── Wait report ──────────────────────────────────────────────")
+    for row in summarise_waits(records)[:25]:
+        print(
+            f"  {row['label'][:38]:<38} "
+            f"n={row['count']:>4} "
+            f"mean={row['mean_ms']:>7.0f}ms "
+            f"p95={row['p95_ms']:>7.0f}ms "
+            f"timeouts={row['timeouts']:>3} "
+            f"saved={row['saved_ms'] / 1000:>6.1f}s"
+        )
+    print(f"Wait records: {path}")
@@ -0,0 +1,456 @@
+#!/usr/bin/env python3
+"""
+replay_parsers.py
+
+Offline replay harness and benchmark for the props parsers.
+
+The scrapers already write the raw text they parsed to football/debug. This
+tool feeds that recorded corpus back through each bookmaker's pure parse
+functions without a browser or network, and reports:
+
+    - throughput per parser (files, MB, ms per file, MB/s)
+    - per-market fixture and selection counts
+    - differences against a stored golden output
+
+Typical use:
+
+    python scripts/Football/replay_parsers.py --update-golden
+    ... edit a parser ...
+    python scripts/Football/replay_parsers.py
+
+The second run exits with status 1 if any parser output changed. Options:
+
+    --only williamhill      run targets whose name contains this text
+    --repeat 5              time 5 passes over the corpus (best pass reported)
+    --markets               print the per-market count table
+    --profile               cProfile one pass and print the top functions
+    --corpus-root PATH      replay a copied debug tree instead of football/debug
+
+The scrapers import Playwright and curl_cffi inside the functions that
+drive a browser or the network, so the harness itself needs only the
+standard library. BoyleSports parses HTML with BeautifulSoup, so its target
+also needs beautifulsoup4 and lxml from requirements.txt.
+
+Targets whose corpus directory is empty, or whose module cannot be imported
+here (missing dependency), are reported and skipped.
+"""
+
+from __future__ import annotations
+
+import argparse
+import cProfile
+import importlib
+import io
+import json
+import pstats
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+ROOT = Path(__file__).resolve().parents[2]
+SCRIPT_DIR = Path(__file__).resolve().parent
+
+if str(SCRIPT_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPT_DIR))
+
+DEBUG_ROOT = ROOT / "football" / "debug"
+# Golden outputs live beside the corpus they were produced from.
+GOLDEN_DIRNAME = "replay_golden"
+
+NON_CORPUS_SUFFIXES = (
+    "_hits.txt",
+    "_responses.json",
+    "_diagnostics.json",
+    "_audit.json",
+    "_report.json",
+    "wait_report.jsonl",
+)
+
+
+def teams_from_slug(slug: str) -> tuple[str, str]:
+    slug = re.sub(r"_cards$", "", slug)
+    parts = re.split(r"-(?:v|vs)-", slug, maxsplit=1)
+    if len(parts) != 2:
+        return "", ""
+    return tuple(part.replace("-", " ").title() for part in parts)
+
+
+def _teams(module, text: str, slug: str) -> tuple[str, str]:
+    home, away = "", ""
+    detect = getattr(module, "detect_teams", None)
+
+    if detect is not None:
+        try:
+            home, away = detect(text, slug)
+        except TypeError:
+            home, away = detect(text)
+        except Exception:
+            pass
+
+    if not home or not away:
+        home, away = teams_from_slug(slug)
+    return home or "", away or ""
+
+
+# Input builders: (module, path) -> positional args for the parser, or None
+# when the file does not carry input for that parser.
+
+def text_with_teams(module, path: Path):
+    text = path.read_text(encoding="utf-8", errors="replace")
+    home, away = _teams(module, text, path.stem)
+    return (text, home, away) if home and away else None
+
+
+def html_with_teams(module, path: Path):
+    html = path.read_text(encoding="utf-8", errors="replace")
+    home, away = teams_from_slug(path.stem)
+    return (html, home, away) if home and away else None
+
+
+def lsb_standard_text(module, path: Path):
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    text = payload.get("standard_text") if isinstance(payload, dict) else None
+    if not text:
+        return None
+    home, away = _teams(module, text, path.stem)
+    return (text, home, away) if home and away else None
+
+
+def lsb_player_text(module, path: Path):
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    text = payload.get("player_text") if isinstance(payload, dict) else None
+    return (text,) if text else None
+
+
+def betvictor_groups(module, path: Path):
+    # path is ALL_GROUPS.txt; the per-group files sit beside it.
+    group_texts = {
+        group: (path.parent / f"{group}.txt").read_text(
+            encoding="utf-8", errors="replace"
+        )
+        for group in module.GROUPS
+        if (path.parent / f"{group}.txt").exists()
+    }
+    home, away = teams_from_slug(path.parent.name)
+    return (group_texts, home, away) if group_texts and home else None
+
+
+REPLAY_TARGETS = [
+    {
+        "name": "williamhill.parse_all",
+        "module": "fetch_williamhill_worldcup_props",
+        "function": "parse_all",
+        "corpus": "williamhill_worldcup_props_V23_STAGING",
+        "pattern": "*.txt",
+        "inputs": text_with_teams,
+    },
+    {
+        "name": "livescorebet.parse_standard_props",
+        "module": "fetch_livescorebet_worldcup_props",
+        "function": "parse_standard_props",
+        "corpus": "livescorebet_worldcup_props_PRODUCTION_V4",
+        "pattern": "*.json",
+        "inputs": lsb_standard_text,
+    },
+    {
+        "name": "livescorebet.parse_player_props",
+        "module": "fetch_livescorebet_worldcup_props",
+        "function": "parse_player_props",
+        "corpus": "livescorebet_worldcup_props_PRODUCTION_V4",
+        "pattern": "*.json",
+        "inputs": lsb_player_text,
+    },
+    {
+        "name": "888sport.parse_all_markets",
+        "module": "fetch_888sport_worldcup_props",
+        "function": "parse_all_markets",
+        "corpus": "888sport_worldcup_props",
+        "pattern": "*.txt",
+        "inputs": text_with_teams,
+    },
+    {
+        "name": "betvictor.parse_all",
+        "module": "fetch_betvictor_worldcup_props",
+        "function": "parse_all",
+        "corpus": "betvictor_worldcup_props",
+        "pattern": "*/ALL_GROUPS.txt",
+        "inputs": betvictor_groups,
+    },
+    {
+        "name": "boylesports.parse_markets",
+        "module": "fetch_boylesports_worldcup_props",
+        "function": "parse_markets",
+        "corpus": "boylesports_props_fast",
+        "pattern": "*.html",
+        "inputs": html_with_teams,
+    },
+]
+
+
+def corpus_files(corpus_dir: Path, pattern: str) -> list[Path]:
+    if not corpus_dir.exists():
+        return []
+
+    return sorted(
+        path
+        for path in corpus_dir.glob(pattern)
+        if path.is_file()
+        and not any(path.name.endswith(suffix) for suffix in NON_CORPUS_SUFFIXES)
+    )
+
+
+def load_cases(target: dict, module, corpus_root: Path) -> list[dict]:
+    cases = []
+
+    for path in corpus_files(corpus_root / target["corpus"], target["pattern"]):
+        try:
+            args = target["inputs"](module, path)
+        except Exception as error:
+            print(f"    skip {path.name}: {type(error).__name__}: {error}")
+            continue
+        if args is None:
+            continue
+
+        cases.append(
+            {
+                "file": path.relative_to(corpus_root).as_posix(),
+                "bytes": path.stat().st_size,
+                "args": args,
+            }
+        )
+
+    return cases
+
+
+def _market_list(result: Any) -> list[dict]:
+    if isinstance(result, tuple):
+        result = result[0]
+    if isinstance(result, dict):
+        return [
+            {"market": key, **value} if isinstance(value, dict) else {"market": key}
+            for key, value in result.items()
+        ]
+    return [market for market in result or [] if isinstance(market, dict)]
+
+
+def _selection_key(selection: dict) -> str:
+    parts = [
+        str(selection.get(key))
+        for key in ("player", "normalized_selection", "selection", "name", "label")
+        if selection.get(key) not in (None, "")
+    ][:2]
+    for key in ("line", "threshold", "side"):
+        if selection.get(key) not in (None, ""):
+            parts.append(f"{key}={selection[key]}")
+    return " | ".join(parts)
+
+
+def snapshot(result: Any) -> dict:
+    """Reduce parser output to {market: {selection key: odds}}."""
+    out: dict[str, dict] = {}
+
+    for market in _market_list(result):
+        name = str(
+            market.get("normalized_market")
+            or market.get("market")
+            or market.get("label")
+            or ""
+        )
+        selections = market.get("selections") or []
+        bucket = out.setdefault(name, {})
+
+        for selection in selections if isinstance(selections, list) else []:
+            if isinstance(selection, dict):
+                bucket[_selection_key(selection)] = str(
+                    selection.get("odds") or selection.get("price") or ""
+                )
+
+    return out
+
+
+def run_pass(function: Callable, cases: list[dict]) -> tuple[float, dict]:
+    outputs = {}
+    started = time.perf_counter()
+
+    for case in cases:
+        try:
+            outputs[case["file"]] = snapshot(function(*case["args"]))
+        except Exception as error:
+            outputs[case["file"]] = {"__error__": {type(error).__name__: str(error)}}
+
+    return time.perf_counter() - started, outputs
+
+
+def market_counts(outputs: dict) -> list[dict]:
+    counts: dict[str, dict] = {}
+
+    for markets in outputs.values():
+        for market, selections in markets.items():
+            row = counts.setdefault(
+                market,
+                {"market": market, "fixtures": 0, "selections": 0},
+            )
+            row["fixtures"] += 1
+            row["selections"] += len(selections)
+
+    return sorted(counts.values(), key=lambda row: (-row["fixtures"], row["market"]))
+
+
+def diff_outputs(golden: dict, current: dict) -> Iterator[str]:
+    for file in sorted(set(golden) | set(current)):
+        if file not in current:
+            yield f"{file}: missing from corpus"
+            continue
+        if file not in golden:
+            yield f"{file}: new file (not in golden)"
+            continue
+
+        old, new = golden[file], current[file]
+        for market in sorted(set(old) | set(new)):
+            if market not in new:
+                yield f"{file}: - {market} ({len(old[market])} selections)"
+            elif market not in old:
+                yield f"{file}: + {market} ({len(new[market])} selections)"
+            elif old[market] != new[market]:
+                before, after = old[market], new[market]
+                removed = sorted(set(before) - set(after))
+                added = sorted(set(after) - set(before))
+                changed = sorted(
+                    key for key in set(before) & set(after)
+                    if before[key] != after[key]
+                )
+                yield (
+                    f"{file}: ~ {market} "
+                    f"-{len(removed)} +{len(added)} odds~{len(changed)}"
+                )
+                for key in changed[:3]:
+                    yield f"      {key}: {before[key]} -> {after[key]}"
+
+
+def golden_path(target: dict, corpus_root: Path) -> Path:
+    return corpus_root / GOLDEN_DIRNAME / f"{target['name']}.json"
+
+
+def replay_target(target: dict, args) -> int:
+    """Replay one target. Returns the number of golden differences."""
+    print("")
+    print(f"── {target['name']} " + "─" * max(4, 58 - len(target["name"])))
+
+    try:
+        module = importlib.import_module(target["module"])
+        function = getattr(module, target["function"])
+    except Exception as error:
+        print(f"  unavailable: {type(error).__name__}: {error}")
+        return 0
+
+    cases = load_cases(target, module, args.corpus_root)
+    if not cases:
+        print(f"  no recorded input under {args.corpus_root / target['corpus']}")
+        return 0
+
+    timings = []
+    outputs = {}
+    for _ in range(max(1, args.repeat)):
+        seconds, outputs = run_pass(function, cases)
+        timings.append(seconds)
+
+    best = min(timings)
+    total_bytes = sum(case["bytes"] for case in cases)
+    errors = sum("__error__" in markets for markets in outputs.values())
+
+    print(
+        f"  files={len(cases)} "
+        f"size={total_bytes / 1_000_000:.2f}MB "
+        f"best={best * 1000:.1f}ms "
+        f"per_file={best * 1000 / len(cases):.2f}ms "
+        f"throughput={total_bytes / 1_000_000 / best if best else 0:.1f}MB/s "
+        f"errors={errors}"
+    )
+
+    if args.markets:
+        for row in market_counts(outputs):
+            print(
+                f"    {row['market'][:44]:<44} "
+                f"fixtures={row['fixtures']:>3} "
+                f"selections={row['selections']:>5}"
+            )
+
+    if args.profile:
+        profiler = cProfile.Profile()
+        profiler.enable()
+        run_pass(function, cases)
+        profiler.disable()
+        stream = io.StringIO()
+        pstats.Stats(profiler, stream=stream).sort_stats("cumulative").print_stats(20)
+        print(stream.getvalue())
+
+    path = golden_path(target, args.corpus_root)
+    if args.update_golden:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(
+            json.dumps(outputs, indent=2, ensure_ascii=False, sort_keys=True),
+            encoding="utf-8",
+        )
+        tmp.replace(path)
+        print(f"  golden updated: {path}")
+        return 0
+
+    if not path.exists():
+        print("  no golden yet (run with --update-golden)")
+        return 0
+
+    golden = json.loads(path.read_text(encoding="utf-8"))
+    lines = list(diff_outputs(golden, outputs))
+    # Indented lines are odds details under the difference above them.
+    differences = sum(not line.startswith(" ") for line in lines)
+    if differences:
+        print(f"  ✗ {differences} difference(s) against golden")
+        for line in lines[:40]:
+            print(f"    {line}")
+        if len(lines) > 40:
+            print(f"    ... {len(lines) - 40} more line(s)")
+    else:
+        print("  ✓ matches golden")
+
+    return differences
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--only", default="")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--markets", action="store_true")
+    parser.add_argument("--profile", action="store_true")
+    parser.add_argument("--update-golden", action="store_true")
+    parser.add_argument("--corpus-root", type=Path, default=DEBUG_ROOT)
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    targets = [
+        target
+        for target in REPLAY_TARGETS
+        if args.only.lower() in target["name"].lower()
+    ]
+
+    if not targets:
+        print(f"No replay target matches {args.only!r}")
+        return 1
+
+    print(f"Corpus root: {args.corpus_root}")
+    differences = sum(replay_target(target, args) for target in targets)
+
+    print("")
+    if args.update_golden:
+        print("Golden outputs updated.")
+        return 0
+    print(f"Total differences against golden: {differences}")
+    return 1 if differences else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
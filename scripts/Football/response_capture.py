@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+response_capture.py
+
+Optional network-response recorder for the props scrapers.
+
+The DOM scrapers scroll, click every "See more" and then regex-parse the
+rendered inner_text. The page has already downloaded the bookmaker's own
+market JSON to render that text. In capture mode the scraper also listens
+for those responses and saves them next to the debug text as
+<match>_responses.json, building a payload corpus per book.
+
+Enable per run with:
+
+    set PROPS_CAPTURE_MODE=json
+
+or pass --capture-json to a scraper that supports it. The DOM text stays
+the price source in both modes. A structured parser for these payloads
+belongs here once a book has a recorded corpus and a reviewed replay golden
+to check it against.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+from pathlib import Path
+
+from page_waits import ResponseWatcher
+
+CAPTURE_MODE = (
+    os.environ.get("PROPS_CAPTURE_MODE", "").strip().lower() == "json"
+    or "--capture-json" in sys.argv
+)
+
+MAX_PAYLOAD_BYTES = 8_000_000
+
+
+class ResponseCapture(ResponseWatcher):
+    """Store JSON bodies of matching responses while tracking quiet time.
+
+        with ResponseCapture(page, r"api|market") as capture:
+            page.goto(url)
+            capture.wait_quiet(timeout_ms=4500, label="capture")
+        capture.save(DEBUG_DIR / "match_responses.json")
+    """
+
+    def __init__(self, page, pattern: str) -> None:
+        super().__init__(page, pattern)
+        self.payloads: list[dict] = []
+
+    def _on_finished(self, request) -> None:
+        if request in self.in_flight:
+            try:
+                response = request.response()
+                content_type = (
+                    response.headers.get("content-type", "")
+                    if response
+                    else ""
+                )
+                if response and "json" in content_type.lower():
+                    body = response.body()
+                    if len(body) <= MAX_PAYLOAD_BYTES:
+                        self.payloads.append(
+                            {
+                                "url": request.url,
+                                "status": response.status,
+                                "data": json.loads(body),
+                            }
+                        )
+            except Exception:
+                pass
+
+        self._on_done(request)
+
+    def __enter__(self) -> "ResponseCapture":
+        self.page.on("request", self._on_request)
+        self.page.on("requestfinished", self._on_finished)
+        self.page.on("requestfailed", self._on_done)
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        for event, handler in (
+            ("request", self._on_request),
+            ("requestfinished", self._on_finished),
+            ("requestfailed", self._on_done),
+        ):
+            try:
+                self.page.remove_listener(event, handler)
+            except Exception:
+                pass
+
+    def save(self, path: Path) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(
+            json.dumps(self.payloads, indent=2, ensure_ascii=False),
+            encoding="utf-8",
+        )
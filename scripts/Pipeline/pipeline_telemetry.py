@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+pipeline_telemetry.py
+
+Run log and summary page for pipeline telemetry.
+
+run_pipeline.py appends one JSON line per step to data/pipeline_runs.jsonl
+at the end of every run:
+
+    {"run_id": "20260712_0615", "stage": "williamhill_props", "status": "ok",
+     "wall_seconds": 412.3, "cpu_seconds": 388.0, "peak_rss_mb": 612.4,
+     "pages": 41, "navigations": 96, "clicks": 1840, "bytes": 91234567,
+     "fixtures": 24, "markets": 910, "selections": 15202, "retries": 2, ...}
+
+Wall time, CPU time and peak RSS are measured by the runner for every step.
+On POSIX these cover the step's process and the browsers it waited for; on
+Windows they fall back to what the script itself reported. The other
+counters come from scripts that import scripts/telemetry.py; scripts that
+don't report leave them out.
+
+The log keeps the last KEEP_RUNS runs. pipeline/index.html shows the latest
+run and flags every stage that took SLOW_FACTOR times its median over the
+previous runs, e.g. a bookmaker that suddenly takes 3x longer.
+
+    python scripts/Pipeline/pipeline_telemetry.py      # rebuild the page
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import statistics
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+RUN_LOG_PATH = ROOT / "data" / "pipeline_runs.jsonl"
+PAGE_PATH = ROOT / "pipeline" / "index.html"
+BASE = "/odds-board"
+
+KEEP_RUNS = 100
+
+# A stage is flagged when it took SLOW_FACTOR x its median wall time over the
+# last HISTORY_RUNS successful runs, and at least SLOW_MIN_SECONDS longer.
+SLOW_FACTOR = 3.0
+SLOW_MIN_SECONDS = 30.0
+HISTORY_RUNS = 10
+
+COLUMNS = (
+    ("wall_seconds", "Wall s"),
+    ("cpu_seconds", "CPU s"),
+    ("peak_rss_mb", "Peak MB"),
+    ("pages", "Pages"),
+    ("navigations", "Navs"),
+    ("clicks", "Clicks"),
+    ("bytes", "MB down"),
+    ("fixtures", "Fixtures"),
+    ("markets", "Markets"),
+    ("selections", "Selections"),
+    ("retries", "Retries"),
+)
+
+
+# ── Child processes ────────────────────────────────────────────────────────────
+
+def reap(process) -> tuple[int | None, dict | None]:
+    """Non-blocking poll that also returns the child's resource usage.
+
+    Returns (exit code or None while running, usage or None). Usage comes
+    from os.wait4, so it includes every descendant the child waited for,
+    such as its browsers. Where wait4 does not exist the usage is None.
+    """
+    if not hasattr(os, "wait4"):
+        return process.poll(), None
+
+    try:
+        pid, status, usage = os.wait4(process.pid, os.WNOHANG)
+    except ChildProcessError:
+        return process.poll(), None
+    if pid == 0:
+        return None, None
+
+    process.returncode = os.waitstatus_to_exitcode(status)
+    return process.returncode, {
+        "cpu_seconds": round(usage.ru_utime + usage.ru_stime, 1),
+        # Kilobytes on Linux; wait4 does not exist on Windows.
+        "peak_rss_mb": round(usage.ru_maxrss / 1024, 1),
+    }
+
+
+def read_counters(path: Path) -> dict:
+    """What a step's scripts/telemetry.py wrote at exit, or {}."""
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+# ── Run log ────────────────────────────────────────────────────────────────────
+
+def load_runs(path: Path = RUN_LOG_PATH) -> list[dict]:
+    records = []
+    try:
+        lines = path.read_text(encoding="utf-8").splitlines()
+    except OSError:
+        return records
+    for line in lines:
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            continue
+    return records
+
+
+def append_run(records: list[dict], path: Path = RUN_LOG_PATH) -> list[dict]:
+    """Append one run's records, dropping runs older than the last KEEP_RUNS.
+
+    Returns every record now in the log.
+    """
+    log = load_runs(path) + records
+    run_ids = list(dict.fromkeys(record.get("run_id") for record in log))
+    keep = set(run_ids[-KEEP_RUNS:])
+    log = [record for record in log if record.get("run_id") in keep]
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text("".join(json.dumps(record) + "\n" for record in log), encoding="utf-8")
+    os.replace(tmp, path)
+    return log
+
+
+def slow_stages(log: list[dict], run_id: str) -> list[dict]:
+    """Stages of run_id that took SLOW_FACTOR x their usual wall time."""
+    history: dict[str, list[float]] = {}
+    for record in log:
+        if record.get("run_id") == run_id or record.get("status") != "ok":
+            continue
+        history.setdefault(record["stage"], []).append(record.get("wall_seconds") or 0.0)
+
+    slow = []
+    for record in log:
+        if record.get("run_id") != run_id or record.get("status") != "ok":
+            continue
+        previous = history.get(record["stage"], [])[-HISTORY_RUNS:]
+        if not previous:
+            continue
+        median = statistics.median(previous)
+        seconds = record.get("wall_seconds") or 0.0
+        if median > 0 and seconds >= SLOW_FACTOR * median and seconds - median >= SLOW_MIN_SECONDS:
+            slow.append({
+                "stage": record["stage"],
+                "wall_seconds": seconds,
+                "median_seconds": round(median, 1),
+                "factor": round(seconds / median, 1),
+            })
+    return slow
+
+
+# ── Page ───────────────────────────────────────────────────────────────────────
+
+def esc(s):
+    return str(s if s is not None else "").replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;").replace('"', "&quot;")
+
+
+def cell(key, value):
+    if value is None:
+        return "—"
+    if key == "bytes":
+        return f"{value / 2**20:,.1f}"
+    if isinstance(value, float):
+        return f"{value:,.1f}"
+    return f"{value:,}"
+
+
+def render_page(log: list[dict]) -> str:
+    generated = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
+    run_ids = list(dict.fromkeys(record.get("run_id") for record in log))
+    latest = run_ids[-1] if run_ids else ""
+    stages = [record for record in log if record.get("run_id") == latest]
+    slow = {row["stage"]: row for row in slow_stages(log, latest)}
+
+    header = "".join(f"<th>{esc(label)}</th>" for _, label in COLUMNS)
+    rows = ""
+    for record in sorted(stages, key=lambda r: r.get("wall_seconds") or 0.0, reverse=True):
+        flag = slow.get(record["stage"])
+        note = f'<span class="slow">{flag["factor"]}× median {flag["median_seconds"]}s</span>' if flag else ""
+        values = "".join(f"<td>{cell(key, record.get(key))}</td>" for key, _ in COLUMNS)
+        rows += (
+            f'<tr class="{"slow-row" if flag else ""}"><td>{esc(record["stage"])} {note}</td>'
+            f'<td class="status-{esc(record.get("status"))}">{esc(record.get("status"))}</td>{values}</tr>'
+        )
+
+    runs = ""
+    for run_id in reversed(run_ids[-20:]):
+        records = [record for record in log if record.get("run_id") == run_id]
+        failed = sum(record.get("status") in {"failed", "blocked"} for record in records)
+        serial = sum(record.get("wall_seconds") or 0.0 for record in records)
+        wall = next((r.get("run_wall_seconds") for r in records if r.get("run_wall_seconds")), None)
+        runs += (
+            f"<tr><td>{esc(run_id)}</td><td>{len(records)}</td><td>{failed}</td>"
+            f"<td>{cell('wall_seconds', wall)}</td><td>{serial:,.1f}</td></tr>"
+        )
+
+    empty = "" if stages else '<p class="meta">No pipeline runs logged yet.</p>'
+
+    return f"""<!doctype html>
+<html lang="en">
+<head>
+  <meta charset="utf-8" />
+  <meta name="viewport" content="width=device-width, initial-scale=1" />
+  <title>Pipeline Runs — BeatTheBooks</title>
+  <style>
+    * {{ box-sizing: border-box; margin: 0; padding: 0; }}
+    body {{
+      background: #0f1621;
+      color: #fff;
+      font-family: Inter, ui-sans-serif, system-ui, -apple-system, BlinkMacSystemFont, "Segoe UI", sans-serif;
+      min-height: 100vh;
+    }}
+    a {{ color: #60a5fa; text-decoration: none; }}
+    .page {{ max-width: 1500px; margin: 0 auto; padding: 34px 24px 70px; }}
+    .nav {{ color: #91a0b5; margin-bottom: 28px; display: flex; gap: 10px; font-size: 14px; }}
+    .hero {{ border: 1px solid #223047; border-radius: 28px; padding: 32px; background: rgba(17,24,39,0.86); margin-bottom: 28px; }}
+    h1 {{ font-size: clamp(34px,5vw,56px); letter-spacing: -0.05em; line-height: .95; margin-bottom: 10px; }}
+    h2 {{ font-size: 22px; margin-bottom: 14px; }}
+    .meta {{ color: #91a0b5; font-size: 14px; }}
+    .panel {{ border: 1px solid #223047; border-radius: 20px; padding: 18px; background: rgba(17,24,39,0.72); margin-bottom: 18px; overflow-x: auto; }}
+    table {{ width: 100%; border-collapse: collapse; }}
+    th, td {{ text-align: right; padding: 8px; border-bottom: 1px solid #223047; color: #c7d2fe; font-size: 13px; white-space: nowrap; }}
+    th:first-child, td:first-child, th:nth-child(2), td:nth-child(2) {{ text-align: left; }}
+    th {{ color: #91a0b5; font-size: 11px; text-transform: uppercase; letter-spacing: .08em; }}
+    .slow-row {{ background: rgba(239,68,68,0.1); }}
+    .slow {{ color: #fca5a5; font-weight: 900; font-size: 11px; margin-left: 6px; }}
+    .status-ok, .status-unchanged {{ color: #86efac; }}
+    .status-failed, .status-blocked {{ color: #fca5a5; }}
+  </style>
+</head>
+<body>
+  <main class="page">
+    <nav class="nav"><a href="{BASE}/">Home</a><span>›</span><span>Pipeline Runs</span></nav>
+    <section class="hero">
+      <h1>Pipeline Runs</h1>
+      <p class="meta">Latest run {esc(latest) or "—"} · {len(slow)} stage(s) at {SLOW_FACTOR:g}× their usual time · Updated {esc(generated)}</p>
+    </section>
+    <section class="panel">
+      <h2>Stages in the latest run</h2>
+      {empty}
+      <table>
+        <tr><th>Stage</th><th>Status</th>{header}</tr>
+        {rows}
+      </table>
+    </section>
+    <section class="panel">
+      <h2>Recent runs</h2>
+      <table>
+        <tr><th>Run</th><th>Stages</th><th>Failed</th><th>Wall s</th><th>Serial s</th></tr>
+        {runs}
+      </table>
+    </section>
+  </main>
+</body>
+</html>
+"""
+
+
+def write_page(log: list[dict], path: Path = PAGE_PATH) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(render_page(log), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def main() -> int:
+    log = load_runs()
+    write_page(log)
+    print(f"Pipeline runs page: {PAGE_PATH} ({len(log)} stage records)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
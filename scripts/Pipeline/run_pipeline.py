@@ -0,0 +1,711 @@
+#!/usr/bin/env python3
+"""
+run_pipeline.py
+
+Dependency-graph runner for the World Cup update pipeline.
+
+run_big_auto_update_PARALLEL_PROPS.bat and its part scripts run fixed groups
+in a fixed order: wait for Bwin, wait for BetVictor, then start four more
+parts, then build. This runner declares the same steps as a graph instead.
+Each step starts as soon as every step it needs has succeeded, up to a worker
+budget, so the run takes roughly as long as its critical path rather than the
+sum of the slowest group at each stage.
+
+The batch files stop at the first failing part. Here a failed step blocks
+only the steps that depend on it, and every unrelated branch still runs to
+completion. As before, publishing (--git) happens only when every selected
+step succeeded.
+
+    python scripts/Pipeline/run_pipeline.py --list
+    python scripts/Pipeline/run_pipeline.py --dry-run
+    python scripts/Pipeline/run_pipeline.py --workers 6
+    python scripts/Pipeline/run_pipeline.py --only williamhill --workers 2
+    python scripts/Pipeline/run_pipeline.py --git
+
+Build steps that declare inputs are skipped when their inputs, script and
+arguments hash the same as on the last successful run, see stage_cache.py.
+--force (or PIPELINE_NO_SKIP=1) runs them anyway.
+
+--tolerate-props-failures lets the build steps run when a props branch
+failed, using that book's last promoted JSON. Every props scraper stages and
+validates before promoting, so its previous good file stays in place.
+
+Each step writes its output to <temp>/beatthebooks_pipeline_<run>/<step>.log.
+A failed step prints the tail of its log.
+
+Every step's wall time, CPU time, peak RSS and the counters its scripts
+report through scripts/telemetry.py are appended to data/pipeline_runs.jsonl,
+and pipeline/index.html summarises them, see pipeline_telemetry.py.
+
+To refresh arbitrage and EV alerts as each scraper finishes, rather than at
+the end of the run, keep watch_alerts.py running alongside.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable
+
+from pipeline_telemetry import PAGE_PATH, append_run, read_counters, reap, slow_stages, write_page
+from stage_cache import NO_SKIP, StageCache, fingerprint
+
+ROOT = Path(__file__).resolve().parents[2]
+FOOTBALL = "scripts/Football"
+
+DEFAULT_WORKERS = 4
+LOG_TAIL_LINES = 40
+
+GIT_ADD_PATHS = ["football", "data", "ev-alerts", "arbitrage", "pipeline"]
+COMMIT_MESSAGE = "Auto update World Cup odds, props, EV alerts and arbitrage"
+
+# Everything the football build steps read from football/data.
+FOOTBALL_DATA_INPUTS = (
+    "football/data/*_worldcup_moneylines.json",
+    "football/data/*_worldcup_props*.json",
+    "football/data/*_worldcup_match_stats.json",
+)
+
+# Shared odds/name helpers and the fixture resolver every football build step
+# imports.
+SHARED_CODE = ("scripts/odds_common.py", f"{FOOTBALL}/fixture_ids.py")
+
+MALFORMED_PLAYER_DIR_RE = re.compile(
+    r"(^u-[0-9]|-(over|under)-[0-9]|corners|win-or-draw|win-either-half|yes-and-|no-and-)"
+)
+
+
+def step(
+    name: str,
+    script: str = "",
+    *args: str,
+    needs: tuple = (),
+    props: bool = False,
+    run: Callable[[], int] | None = None,
+    inputs: tuple = (),
+    outputs: tuple = (),
+    code: tuple = (),
+) -> dict:
+    """Declare one pipeline step.
+
+    needs   steps that must succeed first
+    props   marks the final step of a props branch, see --tolerate-props-failures
+    run     in-process callable returning an exit code, instead of a script
+    inputs  glob patterns; when given, the step is skipped if unchanged
+    outputs paths that must still exist for a skip to reuse them
+    code    extra modules the script imports, hashed with the script
+    """
+    return {
+        "name": name,
+        "command": [sys.executable, script, *args] if script else [],
+        "needs": list(needs),
+        "props": props,
+        "run": run,
+        "inputs": list(inputs),
+        "outputs": list(outputs),
+        "code": [script, *code] if script else list(code),
+    }
+
+
+def check_player_folders() -> int:
+    """Port of the batch file's malformed player-folder check."""
+    root = ROOT / "football" / "world-cup"
+    bad = [
+        path
+        for path in root.glob("**/player-props/players/*")
+        if path.is_dir() and MALFORMED_PLAYER_DIR_RE.search(path.name)
+    ]
+    if bad:
+        print(f"Found {len(bad)} malformed generated player folders.")
+        for path in bad:
+            print(f"  {path}")
+        return 1
+    print("Generated player folders OK.")
+    return 0
+
+
+MONEYLINE_BOOKS = [
+    "paddypower",
+    "boylesports",
+    "unibet",
+    "livescorebet",
+    "williamhill",
+    "888sport",
+    "ladbrokes",
+    "midnite",
+    "bwin",
+    "betvictor",
+]
+
+
+def build_steps() -> list[dict]:
+    steps = [
+        step(f"{book}_moneylines", f"{FOOTBALL}/fetch_{book}_worldcup_moneylines.py")
+        for book in MONEYLINE_BOOKS
+    ]
+
+    steps += [
+        # Bwin branch.
+        step("bwin_props", f"{FOOTBALL}/fetch_bwin_worldcup_props.py",
+             needs=("bwin_moneylines",)),
+        step("bwin_match_stats", f"{FOOTBALL}/fetch_bwin_worldcup_match_stats.py",
+             needs=("bwin_props",), props=True),
+
+        # BetVictor branch. Each merge rewrites the main props JSON, so the
+        # chain stays strictly ordered.
+        step("betvictor_props", f"{FOOTBALL}/fetch_betvictor_worldcup_props.py",
+             needs=("betvictor_moneylines",)),
+        step("betvictor_player_stats", f"{FOOTBALL}/fetch_betvictor_player_stats_exact.py",
+             needs=("betvictor_props",)),
+        step("betvictor_player_stats_merge", f"{FOOTBALL}/merge_betvictor_player_stats_exact.py",
+             needs=("betvictor_player_stats",)),
+        step("betvictor_tackles", f"{FOOTBALL}/fetch_betvictor_player_tackles.py",
+             needs=("betvictor_player_stats_merge",)),
+        step("betvictor_tackles_merge", f"{FOOTBALL}/merge_betvictor_player_tackles.py",
+             needs=("betvictor_tackles",)),
+        step("betvictor_betbuilder", f"{FOOTBALL}/fetch_betvictor_betbuilder_match_stats.py",
+             needs=("betvictor_tackles_merge",)),
+        step("betvictor_betbuilder_merge", f"{FOOTBALL}/merge_betvictor_betbuilder_stats.py",
+             needs=("betvictor_betbuilder",), props=True),
+
+        # BoyleSports.
+        step("boylesports_props", f"{FOOTBALL}/fetch_boylesports_worldcup_props.py",
+             needs=("boylesports_moneylines",)),
+        step("boylesports_stats", f"{FOOTBALL}/fetch_boylesports_stats_props.py",
+             needs=("boylesports_props",)),
+        step("boylesports_merge", f"{FOOTBALL}/merge_boylesports_props.py",
+             needs=("boylesports_stats",), props=True),
+
+        # Paddy Power and LiveScoreBet.
+        step("paddypower_props", f"{FOOTBALL}/fetch_paddypower_worldcup_props.py",
+             needs=("paddypower_moneylines",), props=True),
+        step("livescorebet_props", f"{FOOTBALL}/fetch_livescorebet_worldcup_props.py",
+             needs=("livescorebet_moneylines",), props=True),
+
+        # Midnite: main props and team stats run side by side, then merge.
+        step("midnite_prepare", f"{FOOTBALL}/prepare_midnite_worldcup_props_fixtures.py",
+             needs=("midnite_moneylines",)),
+        step("midnite_props", f"{FOOTBALL}/fetch_midnite_worldcup_props_PROD15.py",
+             needs=("midnite_prepare",)),
+        step("midnite_team_stats", f"{FOOTBALL}/fetch_midnite_worldcup_team_stats_PROD15.py",
+             needs=("midnite_prepare",)),
+        step("midnite_merge", f"{FOOTBALL}/merge_midnite_worldcup_props_PROD15.py",
+             needs=("midnite_props", "midnite_team_stats")),
+        step("midnite_validate", f"{FOOTBALL}/validate_midnite_worldcup_props_PROD15.py",
+             needs=("midnite_merge",), props=True),
+
+        # Unibet and Ladbrokes.
+        step("unibet_props", f"{FOOTBALL}/fetch_unibet_worldcup_props_UNIFIED_PROD15_CLEAN.py",
+             needs=("unibet_moneylines",), props=True),
+        step("ladbrokes_props", f"{FOOTBALL}/fetch_ladbrokes_worldcup_props.py",
+             needs=("ladbrokes_moneylines",)),
+        step("ladbrokes_goalscorer_repair",
+             f"{FOOTBALL}/repair_ladbrokes_goals_goalscorer_PROD15_V2_LINEUP_AWARE.py",
+             needs=("ladbrokes_props",)),
+        step("ladbrokes_shots", f"{FOOTBALL}/fetch_ladbrokes_shots_props.py",
+             needs=("ladbrokes_goalscorer_repair",)),
+        step("ladbrokes_shots_validate", f"{FOOTBALL}/validate_ladbrokes_aggregate_shots.py",
+             needs=("ladbrokes_shots",), props=True),
+
+        # William Hill.
+        step("williamhill_snapshot", f"{FOOTBALL}/filter_worldcup_production_to_snapshot.py",
+             "--file", "williamhill_worldcup_moneylines.json",
+             needs=("williamhill_moneylines",)),
+        step("williamhill_props", f"{FOOTBALL}/fetch_williamhill_worldcup_props.py",
+             needs=("williamhill_snapshot",)),
+        step("williamhill_fix_shot_lines", f"{FOOTBALL}/fix_williamhill_player_shot_lines.py",
+             needs=("williamhill_props",)),
+        step("williamhill_fix_market_keys", f"{FOOTBALL}/fix_williamhill_player_market_keys.py",
+             needs=("williamhill_fix_shot_lines",)),
+        step("williamhill_match_stats", f"{FOOTBALL}/fetch_williamhill_worldcup_match_stats.py",
+             needs=("williamhill_fix_market_keys",)),
+        step("williamhill_match_stats_merge", f"{FOOTBALL}/merge_williamhill_match_stats.py",
+             needs=("williamhill_match_stats",)),
+        step("williamhill_cards_corners", f"{FOOTBALL}/fetch_williamhill_worldcup_cards_corners.py",
+             needs=("williamhill_match_stats_merge",)),
+        step("williamhill_cards_corners_merge", f"{FOOTBALL}/merge_williamhill_cards_corners.py",
+             needs=("williamhill_cards_corners",), props=True),
+    ]
+
+    moneylines = tuple(f"{book}_moneylines" for book in MONEYLINE_BOOKS)
+    props_leaves = tuple(s["name"] for s in steps if s["props"])
+
+    steps += [
+        step("snapshot_filter", f"{FOOTBALL}/filter_worldcup_production_to_snapshot.py",
+             "--all-production", needs=moneylines + props_leaves),
+        step("validate_moneylines", "validate_worldcup_moneylines.py",
+             needs=("snapshot_filter",)),
+
+        # Pages.
+        step("clean_generated", f"{FOOTBALL}/clean_worldcup_generated_output.py",
+             needs=("validate_moneylines",), inputs=FOOTBALL_DATA_INPUTS),
+        step("generate_pages", f"{FOOTBALL}/generate_worldcup_page.py",
+             needs=("clean_generated",), inputs=FOOTBALL_DATA_INPUTS,
+             outputs=("football/world-cup", "data/worldcup_fixtures.pickle"),
+             code=SHARED_CODE),
+        step("check_player_folders", run=check_player_folders,
+             needs=("generate_pages",)),
+
+        # Arbitrage reads football/data only, so it runs alongside page
+        # generation. EV alerts wait for the pages so they can reuse the
+        # fixtures snapshot instead of parsing every bookmaker file again.
+        step("football_arbitrage", f"{FOOTBALL}/analyze_football_arbitrage.py",
+             needs=("validate_moneylines",), inputs=FOOTBALL_DATA_INPUTS,
+             outputs=("football/data/arbitrage.json",), code=SHARED_CODE),
+        step("football_ev_alerts", f"{FOOTBALL}/build_football_ev_alerts.py",
+             needs=("generate_pages",), inputs=FOOTBALL_DATA_INPUTS,
+             outputs=("football/data/ev_alerts.json",),
+             code=(f"{FOOTBALL}/generate_worldcup_page.py", f"{FOOTBALL}/fair_prices.py",
+                   *SHARED_CODE)),
+        # Expiry depends on the clock, so it always runs.
+        step("football_ev_alerts_expire", f"{FOOTBALL}/filter_expired_football_ev_alerts.py",
+             needs=("football_ev_alerts",)),
+        step("ev_alerts_all", "scripts/build_ev_alerts_all.py",
+             needs=("football_ev_alerts_expire",),
+             # events.json dates the UFC card the UFC alerts must match.
+             inputs=("football/data/ev_alerts.json", "ufc/data/ev_alerts.json",
+                     "ufc/data/events.json"),
+             outputs=("data/ev_alerts_all.json", "ev-alerts/index.html")),
+        step("arbitrage_all", "scripts/build_arbitrage_all.py",
+             needs=("football_arbitrage",),
+             inputs=(
+                 "football/data/arbitrage.json",
+                 "ufc/data/arbitrage.json",
+                 "darts/data/arbitrage.json",
+             ),
+             outputs=("data/arbitrage_all.json", "arbitrage/index.html")),
+    ]
+
+    return steps
+
+
+def validate_graph(steps: list[dict]) -> None:
+    names = {s["name"] for s in steps}
+    for s in steps:
+        missing = [need for need in s["needs"] if need not in names]
+        if missing:
+            raise SystemExit(f"Step {s['name']} needs unknown step(s): {missing}")
+
+    # Kahn's algorithm, only to reject cycles up front.
+    remaining = {s["name"]: set(s["needs"]) for s in steps}
+    while remaining:
+        ready = [name for name, needs in remaining.items() if not needs]
+        if not ready:
+            raise SystemExit(f"Dependency cycle among: {sorted(remaining)}")
+        for name in ready:
+            del remaining[name]
+        for needs in remaining.values():
+            needs.difference_update(ready)
+
+
+def select_steps(steps: list[dict], only: str, skip: str) -> list[dict]:
+    """Keep steps matching --only (plus everything downstream), minus --skip.
+
+    Needs on steps that were not selected count as already satisfied.
+    """
+    selected = {s["name"] for s in steps}
+
+    if only:
+        patterns = [p.strip() for p in only.split(",") if p.strip()]
+        selected = {s["name"] for s in steps if any(p in s["name"] for p in patterns)}
+        changed = True
+        while changed:
+            changed = False
+            for s in steps:
+                if s["name"] not in selected and selected.intersection(s["needs"]):
+                    selected.add(s["name"])
+                    changed = True
+
+    if skip:
+        patterns = [p.strip() for p in skip.split(",") if p.strip()]
+        selected = {name for name in selected if not any(p in name for p in patterns)}
+
+    chosen = []
+    for s in steps:
+        if s["name"] in selected:
+            chosen.append({**s, "needs": [n for n in s["needs"] if n in selected]})
+    return chosen
+
+
+def tail(path: Path, lines: int = LOG_TAIL_LINES) -> str:
+    try:
+        text = path.read_text(encoding="utf-8", errors="replace")
+    except OSError:
+        return ""
+    return "\n".join(text.splitlines()[-lines:])
+
+
+class PipelineRun:
+    def __init__(
+        self,
+        steps: list[dict],
+        workers: int,
+        log_dir: Path,
+        tolerate_props: bool,
+        force: bool = False,
+        run_id: str = "",
+    ):
+        self.steps = {s["name"]: s for s in steps}
+        self.order = [s["name"] for s in steps]
+        self.workers = max(1, workers)
+        self.log_dir = log_dir
+        self.tolerate_props = tolerate_props
+        self.force = force or NO_SKIP
+        self.run_id = run_id or log_dir.name
+
+        self.stage_cache = StageCache()
+        self.fingerprints: dict[str, tuple[str, int]] = {}
+
+        self.status = {name: "pending" for name in self.order}
+        self.started: dict[str, float] = {}
+        self.durations: dict[str, float] = {}
+        self.running: dict[str, tuple] = {}
+        self.usage: dict[str, dict] = {}
+
+        self.env = dict(os.environ)
+        self.env.update(
+            {
+                "PYTHONUTF8": "1",
+                "PYTHONIOENCODING": "utf-8",
+                "PYTHONUNBUFFERED": "1",
+            }
+        )
+
+    def _need_state(self, need: str, dependent: str) -> str:
+        """Return "ok", "wait" or "blocked" for one dependency edge."""
+        state = self.status[need]
+        if state in {"ok", "unchanged"}:
+            return "ok"
+        if state in {"pending", "running"}:
+            return "wait"
+        if (
+            self.tolerate_props
+            and self.steps[need]["props"]
+            and not self.steps[dependent]["props"]
+        ):
+            return "ok"
+        return "blocked"
+
+    def _ready(self) -> list[str]:
+        ready = []
+        for name in self.order:
+            if self.status[name] != "pending":
+                continue
+            states = {self._need_state(need, name) for need in self.steps[name]["needs"]}
+            if "blocked" in states:
+                self.status[name] = "blocked"
+                blockers = [
+                    need for need in self.steps[name]["needs"]
+                    if self.status[need] in {"failed", "blocked"}
+                ]
+                print(f"  ⊘ {name} blocked by {', '.join(blockers)}")
+            elif "wait" not in states:
+                ready.append(name)
+        return ready
+
+    def _unchanged(self, name: str) -> bool:
+        """Fingerprint a step with declared inputs; True if it can be skipped."""
+        s = self.steps[name]
+        if not s["inputs"]:
+            return False
+
+        digest, files = fingerprint(s["command"], s["code"], s["inputs"])
+        self.fingerprints[name] = (digest, files)
+        if self.force or not self.stage_cache.is_fresh(name, digest, s["outputs"]):
+            return False
+
+        self.status[name] = "unchanged"
+        self.durations[name] = 0.0
+        print(f"  = {name} unchanged ({files} files hashed), reusing outputs")
+        return True
+
+    def _start(self, name: str) -> None:
+        s = self.steps[name]
+        if self._unchanged(name):
+            return
+
+        self.status[name] = "running"
+        self.started[name] = time.perf_counter()
+        print(f"  ▶ {name}")
+
+        if s["run"] is not None:
+            # In-process checks are quick; run them inline.
+            try:
+                code = int(s["run"]() or 0)
+            except Exception as error:
+                print(f"    {type(error).__name__}: {error}")
+                code = 1
+            self._finish(name, code)
+            return
+
+        log_path = self.log_dir / f"{name}.log"
+        handle = log_path.open("w", encoding="utf-8")
+        env = dict(self.env)
+        env.update(
+            {
+                "TELEMETRY_COUNTERS": str(self._counters_path(name)),
+                "TELEMETRY_RUN": self.run_id,
+                "TELEMETRY_STAGE": name,
+            }
+        )
+        process = subprocess.Popen(
+            s["command"],
+            cwd=ROOT,
+            env=env,
+            stdout=handle,
+            stderr=subprocess.STDOUT,
+        )
+        self.running[name] = (process, handle, log_path)
+
+    def _finish(self, name: str, code: int) -> None:
+        self.durations[name] = round(time.perf_counter() - self.started[name], 1)
+        self.status[name] = "ok" if code == 0 else "failed"
+
+        if name in self.fingerprints:
+            if code == 0:
+                self.stage_cache.record(name, *self.fingerprints[name])
+            else:
+                self.stage_cache.forget(name)
+            self.stage_cache.save()
+
+        if code == 0:
+            print(f"  ✓ {name} ({self.durations[name]}s)")
+            return
+
+        print(f"  ✗ {name} failed with exit code {code} ({self.durations[name]}s)")
+        log_path = self.log_dir / f"{name}.log"
+        if log_path.exists():
+            print("    ── log tail ──")
+            for line in tail(log_path).splitlines():
+                print(f"    {line}")
+
+    def _poll(self) -> None:
+        for name, (process, handle, _log_path) in list(self.running.items()):
+            code, usage = reap(process)
+            if code is None:
+                continue
+            handle.close()
+            del self.running[name]
+            if usage:
+                self.usage[name] = usage
+            self._finish(name, code)
+
+    def run(self) -> bool:
+        try:
+            while True:
+                self._poll()
+                for name in self._ready():
+                    if len(self.running) >= self.workers:
+                        break
+                    self._start(name)
+
+                if not self.running and not any(
+                    state == "pending" for state in self.status.values()
+                ):
+                    break
+                time.sleep(0.5)
+        except KeyboardInterrupt:
+            print("\nInterrupted; stopping running steps...")
+            for process, handle, _ in self.running.values():
+                process.terminate()
+                handle.close()
+            raise
+
+        return all(state in {"ok", "unchanged"} for state in self.status.values())
+
+    def critical_path(self) -> tuple[float, list[str]]:
+        """Longest chain of measured durations through the graph."""
+        best: dict[str, tuple[float, list[str]]] = {}
+        for name in self.order:
+            own = self.durations.get(name, 0.0)
+            prior = max(
+                (best[need] for need in self.steps[name]["needs"] if need in best),
+                default=(0.0, []),
+                key=lambda item: item[0],
+            )
+            best[name] = (prior[0] + own, prior[1] + [name])
+        return max(best.values(), default=(0.0, []), key=lambda item: item[0])
+
+    def _counters_path(self, name: str) -> Path:
+        return self.log_dir / f"{name}.telemetry.json"
+
+    def telemetry_records(self, wall_seconds: float) -> list[dict]:
+        """One run-log record per step, see pipeline_telemetry.py.
+
+        The runner's wall time wins over the script's own. CPU and peak RSS
+        from wait4 win too, since they include the step's browsers.
+        """
+        finished = datetime.now(timezone.utc).isoformat()
+        records = []
+        for name in self.order:
+            record = {
+                "run_id": self.run_id,
+                "stage": name,
+                "status": self.status[name],
+                "finished_at": finished,
+                "run_wall_seconds": wall_seconds,
+            }
+            record.update(read_counters(self._counters_path(name)))
+            record.update(self.usage.get(name, {}))
+            record["wall_seconds"] = self.durations.get(name)
+            records.append(record)
+        return records
+
+    def summary(self) -> dict:
+        total, path = self.critical_path()
+        return {
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "workers": self.workers,
+            "log_dir": str(self.log_dir),
+            "serial_seconds": round(sum(self.durations.values()), 1),
+            "critical_path_seconds": round(total, 1),
+            "critical_path": path,
+            "steps": [
+                {
+                    "name": name,
+                    "status": self.status[name],
+                    "seconds": self.durations.get(name),
+                }
+                for name in self.order
+            ],
+        }
+
+
+def git(*args: str) -> int:
+    print(f"  $ git {' '.join(args)}")
+    return subprocess.call(["git", *args], cwd=ROOT)
+
+
+def git_prepare() -> bool:
+    status = subprocess.run(
+        ["git", "status", "--porcelain"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if status.stdout.strip():
+        print("Working tree is not clean. Stopping before pull or scraping.")
+        print("Commit, stash, or discard the existing changes first.")
+        return False
+    if git("pull", "--rebase", "origin", "main") != 0:
+        print("Git pull failed. Stopping update.")
+        return False
+    return True
+
+
+def git_publish() -> bool:
+    if git("add", *GIT_ADD_PATHS) != 0:
+        return False
+    if subprocess.call(["git", "diff", "--cached", "--quiet"], cwd=ROOT) == 0:
+        print("No generated changes to commit.")
+    elif git("commit", "-m", COMMIT_MESSAGE) != 0:
+        return False
+    if git("pull", "--rebase", "origin", "main") != 0:
+        print("Final Git pull/rebase failed. Nothing was pushed.")
+        return False
+    return git("push", "origin", "main") == 0
+
+
+def print_graph(steps: list[dict]) -> None:
+    for s in steps:
+        target = " ".join(s["command"][1:]) if s["command"] else "(in-process)"
+        needs = ", ".join(s["needs"]) or "-"
+        marker = " [props]" if s["props"] else ""
+        print(f"{s['name']:<32} {target}{marker}")
+        print(f"{'':<32}   needs: {needs}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="World Cup update pipeline")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--only", default="", help="comma-separated step name filters")
+    parser.add_argument("--skip", default="", help="comma-separated step name filters")
+    parser.add_argument("--list", action="store_true")
+    parser.add_argument("--dry-run", action="store_true")
+    parser.add_argument("--git", action="store_true", help="pull first, commit and push on success")
+    parser.add_argument("--tolerate-props-failures", action="store_true")
+    parser.add_argument("--force", action="store_true", help="never skip unchanged steps")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+
+    steps = build_steps()
+    validate_graph(steps)
+    steps = select_steps(steps, args.only, args.skip)
+
+    if args.list or args.dry_run:
+        print_graph(steps)
+        return 0
+
+    if not steps:
+        print("No steps selected.")
+        return 1
+
+    print("=" * 68)
+    print("BeatTheBooks pipeline")
+    print(f"{len(steps)} steps | workers={args.workers}")
+    print("=" * 68)
+
+    if args.git and not git_prepare():
+        return 1
+
+    run_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+    log_dir = Path(tempfile.gettempdir()) / f"beatthebooks_pipeline_{run_id}"
+    log_dir.mkdir(parents=True, exist_ok=True)
+    print(f"Logs: {log_dir}")
+
+    started = time.perf_counter()
+    pipeline = PipelineRun(
+        steps,
+        args.workers,
+        log_dir,
+        args.tolerate_props_failures,
+        force=args.force,
+        run_id=run_id,
+    )
+    ok = pipeline.run()
+    summary = pipeline.summary()
+    summary["wall_seconds"] = round(time.perf_counter() - started, 1)
+    (log_dir / "summary.json").write_text(json.dumps(summary, indent=2), encoding="utf-8")
+
+    print("")
+    print("── Pipeline summary ─────────────────────────────────────────")
+    counts: dict[str, int] = {}
+    for row in summary["steps"]:
+        counts[row["status"]] = counts.get(row["status"], 0) + 1
+    print("  " + " | ".join(f"{state}={count}" for state, count in sorted(counts.items())))
+    print(f"  wall={summary['wall_seconds']}s serial={summary['serial_seconds']}s "
+          f"critical_path={summary['critical_path_seconds']}s")
+    print(f"  critical path: {' → '.join(summary['critical_path'])}")
+
+    run_log = append_run(pipeline.telemetry_records(summary["wall_seconds"]))
+    write_page(run_log)
+    for row in slow_stages(run_log, run_id):
+        print(f"  slow: {row['stage']} took {row['wall_seconds']}s, "
+              f"{row['factor']}x its median of {row['median_seconds']}s")
+    print(f"  telemetry: {PAGE_PATH}")
+
+    if not ok:
+        print("Update failed. Generated working files were not pushed.")
+        return 1
+
+    if args.git and not git_publish():
+        print("Update failed during publish.")
+        return 1
+
+    print("Pipeline finished.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
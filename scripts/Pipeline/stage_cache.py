@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+stage_cache.py
+
+Content-hash memoisation for pipeline stages.
+
+Build stages such as generate_worldcup_page.py or build_arbitrage_all.py
+re-render everything even when none of the JSON they read has changed since
+the last run. A stage that declares its inputs and outputs is fingerprinted
+here. The fingerprint is a SHA-256 over:
+
+    - the stage's command line
+    - the content of each code file (the script plus modules it imports)
+    - the relative path and content of each input file matched by the
+      stage's glob patterns
+
+If the fingerprint matches the last successful run and every declared output
+still exists, the stage is skipped and its previous outputs are reused.
+Fingerprints are stored in data/pipeline_stage_cache.json, which is
+published with the rest of data/ so the tree stays clean between runs.
+
+run_pipeline.py uses this for steps declared with inputs=... It can also
+wrap a single command:
+
+    python scripts/Pipeline/stage_cache.py --name ufc_fights \\
+        --inputs "ufc/data/*.json" --outputs ufc/fights \\
+        -- python scripts/generate_ufc_fights.py
+
+Set PIPELINE_NO_SKIP=1, or pass --force, to run everything regardless.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+CACHE_PATH = ROOT / "data" / "pipeline_stage_cache.json"
+
+NO_SKIP = os.environ.get("PIPELINE_NO_SKIP", "").strip().lower() in {"1", "true", "yes"}
+
+_CHUNK = 1 << 20
+
+
+def _hash_file(digest, path: Path) -> None:
+    with path.open("rb") as handle:
+        while True:
+            chunk = handle.read(_CHUNK)
+            if not chunk:
+                break
+            digest.update(chunk)
+
+
+def expand(patterns) -> list[Path]:
+    """Resolve glob patterns (relative to the repo root) to sorted files."""
+    files = set()
+    for pattern in patterns:
+        matches = ROOT.glob(pattern) if any(ch in pattern for ch in "*?[") else [ROOT / pattern]
+        for path in matches:
+            if path.is_file():
+                files.add(path)
+            elif path.is_dir():
+                files.update(child for child in path.rglob("*") if child.is_file())
+    return sorted(files)
+
+
+def fingerprint(command, code=(), inputs=()) -> tuple[str, int]:
+    """Return (hex digest, number of files hashed)."""
+    digest = hashlib.sha256()
+    digest.update(json.dumps([str(part) for part in command[1:]]).encode("utf-8"))
+
+    files = expand(code) + [None] + expand(inputs)
+    for path in files:
+        if path is None:
+            # Separator so a file cannot move between code and inputs unseen.
+            digest.update(b"\0inputs\0")
+            continue
+        digest.update(path.relative_to(ROOT).as_posix().encode("utf-8") + b"\0")
+        _hash_file(digest, path)
+
+    return digest.hexdigest(), len(files) - 1
+
+
+def outputs_exist(outputs) -> bool:
+    return all((ROOT / output).exists() for output in outputs)
+
+
+class StageCache:
+    def __init__(self, path: Path = CACHE_PATH):
+        self.path = Path(path)
+        self.entries: dict[str, dict] = {}
+        if self.path.exists():
+            try:
+                self.entries = json.loads(self.path.read_text(encoding="utf-8")).get("stages", {})
+            except Exception as exc:
+                print(f"  stage cache unreadable ({self.path.name}): {exc}")
+
+    def is_fresh(self, name: str, digest: str, outputs) -> bool:
+        entry = self.entries.get(name)
+        return bool(entry) and entry.get("fingerprint") == digest and outputs_exist(outputs)
+
+    def record(self, name: str, digest: str, files: int) -> None:
+        self.entries[name] = {
+            "fingerprint": digest,
+            "files": files,
+            "recorded_at": datetime.now(timezone.utc).isoformat(),
+        }
+
+    def forget(self, name: str) -> None:
+        self.entries.pop(name, None)
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(
+            json.dumps({"version": 1, "stages": self.entries}, indent=2, sort_keys=True),
+            encoding="utf-8",
+        )
+        os.replace(tmp, self.path)
+
+
+def main() -> int:
+    if "--" not in sys.argv:
+        print("Usage: stage_cache.py --name NAME --inputs GLOB... [--outputs PATH...] -- COMMAND...")
+        return 2
+
+    split = sys.argv.index("--")
+    command = sys.argv[split + 1:]
+
+    parser = argparse.ArgumentParser(description="Run a command unless its inputs are unchanged")
+    parser.add_argument("--name", required=True)
+    parser.add_argument("--inputs", nargs="+", required=True)
+    parser.add_argument("--outputs", nargs="*", default=[])
+    parser.add_argument("--code", nargs="*", default=[])
+    parser.add_argument("--force", action="store_true")
+    args = parser.parse_args(sys.argv[1:split])
+
+    if not command:
+        print("No command given after --")
+        return 2
+
+    code = list(args.code)
+    if len(command) > 1 and command[1].endswith(".py"):
+        code.insert(0, command[1])
+
+    cache = StageCache()
+    digest, files = fingerprint(command, code, args.inputs)
+
+    if not (args.force or NO_SKIP) and cache.is_fresh(args.name, digest, args.outputs):
+        print(f"{args.name}: unchanged ({files} files), skipped")
+        return 0
+
+    returncode = subprocess.call(command, cwd=ROOT)
+    if returncode == 0:
+        cache.record(args.name, digest, files)
+    else:
+        cache.forget(args.name)
+    cache.save()
+    return returncode
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+watch_alerts.py
+
+Long-running watcher that keeps arbitrage and EV alerts current while the
+scrapers are still running.
+
+run_pipeline.py rebuilds data/arbitrage_all.json and data/ev_alerts_all.json
+once, after every scraper has finished. Arbs often close before that. This
+watcher polls football/data and ufc/data instead. Every scraper promotes its
+JSON with a .tmp write and os.replace. When that happens, the watcher re-runs
+only the analysis steps that read the file, then the combined builders they
+feed:
+
+    football odds/props -> football_arbitrage -> arbitrage_all
+                        -> football_ev_alerts -> ev_alerts_all
+    ufc odds/props      -> ufc_arbitrage      -> arbitrage_all
+                        -> ufc_ev_alerts      -> ev_alerts_all
+
+The World Cup and UFC pages are not regenerated here; the batch run still
+does that. The football arbitrage scan rescans only fixtures whose offers
+changed (see ArbState in analyze_football_arbitrage.py), so one book
+finishing costs seconds.
+
+Files are polled by (size, mtime, inode). That needs no extra dependency and
+sees an os.replace on every platform. Changes are acted on once nothing has
+changed for --settle seconds, so a scraper that promotes several files in a
+row triggers one rebuild.
+
+    python scripts/Pipeline/watch_alerts.py
+    python scripts/Pipeline/watch_alerts.py --interval 1 --settle 5
+    python scripts/Pipeline/watch_alerts.py --once
+
+--once rebuilds every alert step one time and exits.
+
+Each step writes its output to <temp>/beatthebooks_watch/<step>.log. A failed
+step prints the tail of its log and the watcher keeps going.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+from fnmatch import fnmatch
+from pathlib import Path
+
+from run_pipeline import FOOTBALL, FOOTBALL_DATA_INPUTS, ROOT, SHARED_CODE, step, tail
+from stage_cache import expand
+
+DEFAULT_INTERVAL = 2.0
+DEFAULT_SETTLE = 3.0
+
+LOG_DIR = Path(tempfile.gettempdir()) / "beatthebooks_watch"
+
+# Everything the UFC alert steps read from ufc/data. Debug dumps and URL
+# lists written by the scrapers are left out.
+UFC_DATA_INPUTS = (
+    "ufc/data/odds.json",
+    "ufc/data/events.json",
+    "ufc/data/props*.json",
+    "ufc/data/*_props*.json",
+    "ufc/data/*_moneylines.json",
+)
+
+# Both UFC alert steps read their prices through the shared odds table.
+UFC_CODE = ("scripts/ufc_odds_table.py", "scripts/odds_common.py")
+
+
+def build_jobs() -> list[dict]:
+    """Alert steps in dependency order.
+
+    A step runs when one of its inputs changed, including outputs written by
+    an earlier step in the same rebuild.
+    """
+    return [
+        step("football_arbitrage", f"{FOOTBALL}/analyze_football_arbitrage.py",
+             inputs=FOOTBALL_DATA_INPUTS,
+             outputs=("football/data/arbitrage.json",), code=SHARED_CODE),
+        step("football_ev_alerts", f"{FOOTBALL}/build_football_ev_alerts.py",
+             inputs=FOOTBALL_DATA_INPUTS,
+             outputs=("football/data/ev_alerts.json",)),
+        step("football_ev_alerts_expire", f"{FOOTBALL}/filter_expired_football_ev_alerts.py",
+             inputs=("football/data/ev_alerts.json",),
+             outputs=("football/data/ev_alerts.json",)),
+        step("ufc_arbitrage", "scripts/analyze_ufc_arbitrage.py",
+             inputs=UFC_DATA_INPUTS,
+             outputs=("ufc/data/arbitrage.json",), code=UFC_CODE),
+        step("ufc_ev_alerts", "scripts/generate_ev_alerts.py",
+             inputs=UFC_DATA_INPUTS,
+             outputs=("ufc/data/ev_alerts.json", "ufc/ev-alerts/index.html"),
+             code=UFC_CODE),
+        step("arbitrage_all", "scripts/build_arbitrage_all.py",
+             inputs=(
+                 "football/data/arbitrage.json",
+                 "ufc/data/arbitrage.json",
+                 "darts/data/arbitrage.json",
+             ),
+             outputs=("data/arbitrage_all.json", "arbitrage/index.html")),
+        step("ev_alerts_all", "scripts/build_ev_alerts_all.py",
+             inputs=("football/data/ev_alerts.json", "ufc/data/ev_alerts.json"),
+             outputs=("data/ev_alerts_all.json", "ev-alerts/index.html")),
+    ]
+
+
+def signature(path: Path) -> tuple[int, int, int] | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns, stat.st_ino
+
+
+def relative(path: Path) -> str:
+    return path.relative_to(ROOT).as_posix()
+
+
+def stamp() -> str:
+    return datetime.now().strftime("%H:%M:%S")
+
+
+class AlertWatcher:
+    def __init__(self, jobs: list[dict], log_dir: Path = LOG_DIR):
+        self.jobs = jobs
+        self.log_dir = log_dir
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        self.patterns = sorted({pattern for job in jobs for pattern in job["inputs"]})
+        self.seen = self._snapshot()
+
+        self.env = dict(os.environ)
+        self.env.update(
+            {
+                "PYTHONUTF8": "1",
+                "PYTHONIOENCODING": "utf-8",
+                "PYTHONUNBUFFERED": "1",
+            }
+        )
+
+    def _snapshot(self) -> dict[str, tuple]:
+        return {relative(path): signature(path) for path in expand(self.patterns)}
+
+    def poll(self) -> set[str]:
+        """Paths added, replaced or removed since the last poll or rebuild."""
+        current = self._snapshot()
+        changed = {
+            path
+            for path in current.keys() | self.seen.keys()
+            if current.get(path) != self.seen.get(path)
+        }
+        self.seen = current
+        return changed
+
+    @staticmethod
+    def triggered(job: dict, changed: set[str]) -> bool:
+        return any(fnmatch(path, pattern) for path in changed for pattern in job["inputs"])
+
+    def _outputs(self, job: dict) -> dict[str, tuple]:
+        return {relative(path): signature(path) for path in expand(job["outputs"])}
+
+    def _run(self, job: dict) -> bool:
+        name = job["name"]
+        log_path = self.log_dir / f"{name}.log"
+        started = time.perf_counter()
+        with log_path.open("w", encoding="utf-8") as handle:
+            code = subprocess.call(
+                job["command"],
+                cwd=ROOT,
+                env=self.env,
+                stdout=handle,
+                stderr=subprocess.STDOUT,
+            )
+        seconds = round(time.perf_counter() - started, 1)
+
+        if code == 0:
+            print(f"  ✓ {name} ({seconds}s)")
+            return True
+
+        print(f"  ✗ {name} failed with exit code {code} ({seconds}s)")
+        print("    ── log tail ──")
+        for line in tail(log_path).splitlines():
+            print(f"    {line}")
+        return False
+
+    def rebuild(self, changed: set[str]) -> None:
+        """Run every step whose inputs changed, in order, chaining outputs.
+
+        Each step runs at most once per rebuild, so a step that rewrites its
+        own input (the expiry filter) does not loop.
+        """
+        changed = set(changed)
+        for job in self.jobs:
+            if not self.triggered(job, changed):
+                continue
+
+            before = self._outputs(job)
+            self._run(job)
+            after = self._outputs(job)
+
+            written = {path for path, sig in after.items() if sig != before.get(path)}
+            changed |= written
+            # Our own writes are not scraper changes; don't report them on
+            # the next poll.
+            for path in written:
+                if any(fnmatch(path, pattern) for pattern in self.patterns):
+                    self.seen[path] = after[path]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Rebuild arbitrage and EV alerts as scraper output lands")
+    parser.add_argument("--interval", type=float, default=DEFAULT_INTERVAL,
+                        help="seconds between polls")
+    parser.add_argument("--settle", type=float, default=DEFAULT_SETTLE,
+                        help="seconds without further changes before rebuilding")
+    parser.add_argument("--once", action="store_true",
+                        help="rebuild every alert step once and exit")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    watcher = AlertWatcher(build_jobs())
+
+    if args.once:
+        watcher.rebuild(set(watcher.seen))
+        return 0
+
+    print(f"[{stamp()}] Watching {len(watcher.seen)} files (Ctrl+C to stop)")
+    print(f"Logs: {watcher.log_dir}")
+
+    pending: set[str] = set()
+    last_change = 0.0
+
+    try:
+        while True:
+            changed = watcher.poll()
+            if changed:
+                pending |= changed
+                last_change = time.monotonic()
+            elif pending and time.monotonic() - last_change >= args.settle:
+                shown = ", ".join(sorted(pending)[:3])
+                more = f" and {len(pending) - 3} more" if len(pending) > 3 else ""
+                print(f"[{stamp()}] Changed: {shown}{more}")
+                watcher.rebuild(pending)
+                pending = set()
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
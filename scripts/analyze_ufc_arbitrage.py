@@ -2,21 +2,18 @@ import json
 import re
 from pathlib import Path
 
+from odds_common import FightMatcher, fight_key
+from ufc_odds_table import load_table
+
 
 ROOT = Path(__file__).resolve().parents[1]
 
 ODDS_JSON = ROOT / "ufc" / "data" / "odds.json"
+EVENTS_JSON = ROOT / "ufc" / "data" / "events.json"
 OUT_PATH = ROOT / "ufc" / "data" / "arbitrage.json"
 
-PROP_FILES = [
-    ("PaddyPower", ROOT / "ufc" / "data" / "props.json"),
-    ("BoyleSports", ROOT / "ufc" / "data" / "boylesports_props_filtered.json"),
-    ("BoyleSports", ROOT / "ufc" / "data" / "boylesports_moneylines.json"),
-    ("BetVictor", ROOT / "ufc" / "data" / "betvictor_props.json"),
-    ("Coral", ROOT / "ufc" / "data" / "coral_props.json"),
-    ("BetMGM", ROOT / "ufc" / "data" / "betmgm_props.json"),
-    ("Bwin", ROOT / "ufc" / "data" / "bwin_props.json"),
-]
+# Two-way prop markets, as ufc_odds_table names them.
+PROP_MARKETS = ("Go The Distance", "Rounds")
 
 def load_json(path, default):
     try:
@@ -35,57 +32,10 @@ def implied_prob(decimal_odds):
         return None
 
 
-def fractional_to_decimal(value):
-    value = str(value or "").strip().upper()
-
-    if not value:
-        return None
-
-    if value == "EVS":
-        return 2.0
-
-    if "/" in value:
-        try:
-            a, b = value.split("/", 1)
-            return round((float(a) / float(b)) + 1, 6)
-        except Exception:
-            return None
-
-    try:
-        val = float(value)
-        if val > 1:
-            return val
-    except Exception:
-        pass
-
-    return None
-
-
 def clean(s):
     return re.sub(r"\s+", " ", str(s or "")).strip()
 
 
-def norm_text(s):
-    s = clean(s).lower()
-    s = s.replace(" vs ", " v ")
-    s = s.replace(" versus ", " v ")
-    s = s.replace("–", "-").replace("—", "-")
-    s = s.replace("-", " ")
-    s = re.sub(r"[^a-z0-9\s]", "", s)
-    s = re.sub(r"\s+", " ", s).strip()
-    return s
-
-
-def fight_key(name):
-    text = norm_text(name)
-
-    if " v " in text:
-        left, right = text.split(" v ", 1)
-        return " v ".join(sorted([left.strip(), right.strip()]))
-
-    return text
-
-
 def get_h2h_outcomes(event):
     prices = {}
 
@@ -167,18 +117,6 @@ def analyze_event(event):
     }
 
 
-def canonical_market(market):
-    m = norm_text(market)
-
-    if "distance" in m:
-        return "Goes The Distance"
-
-    if "round" in m:
-        return "Total Rounds"
-
-    return ""
-
-
 def canonical_selection(selection):
     s = clean(selection)
     low = s.lower()
@@ -217,87 +155,56 @@ def complementary_selection(selection):
     return ""
 
 
-def load_prop_rows():
-    rows = []
+def load_event_fights():
+    """FightMatcher over every fight in events.json."""
+    keys = []
 
-    for default_bookmaker, path in PROP_FILES:
-        data = load_json(path, {"fights": [], "props": []})
+    for event in load_json(EVENTS_JSON, {"events": []}).get("events", []) or []:
+        for fight in event.get("fights", []) or []:
+            red = fight.get("red")
+            blue = fight.get("blue")
 
-        # Flat BetMGM-style format
-        for p in data.get("props", []) or []:
-            fight = clean(p.get("fight") or p.get("fight_name") or p.get("name"))
-            market = canonical_market(p.get("market"))
-            selection = canonical_selection(p.get("selection"))
-            odds_raw = clean(p.get("odds"))
-            decimal = fractional_to_decimal(odds_raw)
-            bookmaker = clean(p.get("bookmaker") or default_bookmaker)
+            if isinstance(red, dict):
+                red = red.get("name", "")
+            if isinstance(blue, dict):
+                blue = blue.get("name", "")
 
-            if not fight or not market or not selection or not decimal:
-                continue
+            if red and blue:
+                keys.append(fight_key(f"{red} v {blue}"))
 
-            rows.append({
-                "fight": fight,
-                "fight_key": fight_key(fight),
-                "bookmaker": bookmaker,
-                "market": market,
-                "selection": selection,
-                "odds": odds_raw,
-                "decimal_odds": decimal,
-                "event_time": clean(p.get("event_time")),
-                "source_file": str(path.relative_to(ROOT)),
-            })
-
-        # Nested bookmaker format
-        for fight_obj in data.get("fights", []) or []:
-            fight = clean(
-                fight_obj.get("fight")
-                or fight_obj.get("fight_name")
-                or fight_obj.get("name")
-            )
-            bookmaker = clean(fight_obj.get("bookmaker") or default_bookmaker)
-
-            if not fight:
-                continue
+    return FightMatcher(keys)
 
-            markets = fight_obj.get("markets") or {}
 
-            possible_blocks = []
+def load_prop_rows(event_fights=None, table=None):
+    """
+    Two-way prop rows from the UFC odds table.
 
-            if isinstance(markets, dict):
-                possible_blocks.append(("Goes The Distance", markets.get("go_the_distance")))
-                possible_blocks.append(("Total Rounds", markets.get("rounds") or markets.get("total_rounds")))
+    Rows are keyed by the events.json fight they match, so books spelling a
+    fighter differently are still compared against each other.
+    """
+    rows = []
+    event_fights = event_fights or FightMatcher([])
+    table = table or load_table()
 
-            possible_blocks.append(("Goes The Distance", fight_obj.get("distance_props")))
-            possible_blocks.append(("Total Rounds", fight_obj.get("round_props")))
+    for row in table.rows():
+        if row["market"] not in PROP_MARKETS:
+            continue
 
-            for market_name, items in possible_blocks:
-                if not items:
-                    continue
+        selection = canonical_selection(row["selection"])
+        if not selection:
+            continue
 
-                for item in items:
-                    if isinstance(item, dict):
-                        selection_raw = item.get("selection")
-                        odds_raw = item.get("odds")
-                    else:
-                        continue
-
-                    selection = canonical_selection(selection_raw)
-                    decimal = fractional_to_decimal(odds_raw)
-
-                    if not selection or not decimal:
-                        continue
-
-                    rows.append({
-                        "fight": fight,
-                        "fight_key": fight_key(fight),
-                        "bookmaker": bookmaker,
-                        "market": market_name,
-                        "selection": selection,
-                        "odds": clean(odds_raw),
-                        "decimal_odds": decimal,
-                        "event_time": clean(fight_obj.get("event_time")),
-                        "source_file": str(path.relative_to(ROOT)),
-                    })
+        fight = clean(row["fight"])
+        rows.append({
+            "fight": fight,
+            "fight_key": event_fights.event_for(fight) or fight_key(fight),
+            "bookmaker": row["bookmaker"],
+            "market": row["market"],
+            "selection": selection,
+            "odds": clean(row["odds"]),
+            "decimal_odds": row["decimal"],
+            "source_file": row["source"],
+        })
 
     return rows
 
@@ -396,7 +303,7 @@ def main():
         if analysis:
             moneyline_results.append(analysis)
 
-    prop_rows = load_prop_rows()
+    prop_rows = load_prop_rows(load_event_fights())
     prop_results = analyze_prop_arbs(prop_rows)
 
     moneyline_arbs = [r for r in moneyline_results if r["is_arbitrage"]]
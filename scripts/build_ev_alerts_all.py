@@ -9,7 +9,8 @@ def url_param(s):
 
 ROOT = Path(__file__).resolve().parents[1]
 
-UFC_PAGE_PATH = ROOT / "ufc" / "ev-alerts" / "index.html"
+UFC_EV_PATH = ROOT / "ufc" / "data" / "ev_alerts.json"
+UFC_EVENTS_PATH = ROOT / "ufc" / "data" / "events.json"
 FOOTBALL_EV_PATH = ROOT / "football" / "data" / "ev_alerts.json"
 
 OUT_JSON = ROOT / "data" / "ev_alerts_all.json"
@@ -57,6 +58,7 @@ def load_football_alerts():
     for row in rows:
         alerts.append({
             "sport": "Football",
+            "metric": "ev",
             "competition": row.get("competition") or "FIFA World Cup",
             "event": row.get("match") or "",
             "market": row.get("market") or "Match Odds",
@@ -77,34 +79,60 @@ def load_football_alerts():
     return alerts, data
 
 
-def extract_ufc_cards_from_existing_page():
+def load_ufc_alerts():
     """
-    Short-term bridge:
-    Your existing UFC EV generator writes HTML directly, not JSON.
-    So for now we keep the combined page Football-first and link users
-    to the UFC EV page. Later we can refactor UFC EV into JSON.
+    UFC value spots from generate_ev_alerts.py.
+
+    A UFC spot is a best price that beats the plain average of every book's
+    price, its own included and margin left in. That is not a no-vig EV, so
+    it is kept as value_percent with the average as average_odds, and is
+    never ranked against football's EV.
+
+    The football pipeline rebuilds this page on every run, so a spots file
+    built against an older events.json card is skipped rather than
+    republished. The check reads the card's generated_at stamp from both
+    files; mtimes are no use after a fresh checkout.
     """
-    if not UFC_PAGE_PATH.exists():
+    data = load_json(UFC_EV_PATH)
+    card_at = load_json(UFC_EVENTS_PATH).get("generated_at")
+
+    if data and card_at and data.get("events_generated_at") != card_at:
+        print(f"Skipping {UFC_EV_PATH.name}: not built against the current {UFC_EVENTS_PATH.name}")
         return []
 
-    return [{
-        "sport": "UFC",
-        "competition": "UFC",
-        "event": "UFC EV Alerts",
-        "market": "Props",
-        "selection": "Open UFC EV page",
-        "bookmaker": "Multiple",
-        "odds": "View",
-        "decimal_odds": "",
-        "fair_odds": "",
-        "fair_decimal_odds": "",
-        "edge_percent": 0,
-        "book_count": "",
-        "time": "",
-        "date_label": "",
-        "source_url": f"{BASE}/ufc/ev-alerts/",
-        "is_link_card": True,
-    }]
+    rows = data.get("alerts") or []
+
+    alerts = []
+
+    for row in rows:
+        alerts.append({
+            "sport": "UFC",
+            "metric": "value",
+            "competition": row.get("competition") or "UFC",
+            "event": row.get("match") or "",
+            "market": row.get("market") or "Props",
+            "selection": row.get("selection") or "",
+            "bookmaker": row.get("bookmaker") or "",
+            "odds": row.get("bookmaker_odds") or "",
+            "decimal_odds": row.get("bookmaker_decimal_odds") or "",
+            "average_odds": row.get("average_fractional_odds") or "",
+            "average_decimal_odds": row.get("average_decimal_odds") or "",
+            "value_percent": pct(row.get("value_percent")),
+            "book_count": row.get("bookmaker_count") or "",
+            "time": "",
+            "date_label": "",
+            "source_url": f"{BASE}/ufc/ev-alerts/",
+            "type": row.get("type") or "props",
+        })
+
+    return alerts
+
+
+def alert_rank(alert):
+    """Sort key: EV alerts by edge, then value-vs-average alerts by value."""
+    if alert.get("metric") == "value":
+        return (1, -pct(alert.get("value_percent")))
+    return (0, -pct(alert.get("edge_percent")))
 
 
 def sport_counts(alerts):
@@ -157,33 +185,40 @@ def player_props_url(alert):
         return None
     match_slug = slugify(match)
     player_slug = slugify(player)
-    return f"../football/world-cup/{match_slug}/player-props/players/{player_slug}/index.html"
+    static_page = f"football/world-cup/{match_slug}/player-props/players/{player_slug}/index.html"
+    if (ROOT / static_page).exists():
+        return f"../{static_page}"
+    # generate_worldcup_page.py --client-render: one shared player page.
+    if (ROOT / "football" / "world-cup" / "player" / "index.html").exists():
+        return f"../football/world-cup/player/?f={url_param(match_slug)}&p={url_param(player_slug)}"
+    return f"../{static_page}"
 
 
 def render_alert_card(alert, index):
     sport = alert.get("sport") or "Other"
-    edge = pct(alert.get("edge_percent"))
-
-    if alert.get("is_link_card"):
-        return f"""
-        <article class="alert-card link-card" data-sport="{esc(sport)}">
-          <div class="card-top">
-            <span class="sport-pill sport-ufc">UFC</span>
-            <span class="rank">#{index}</span>
-          </div>
 
-          <h2>{esc(alert.get("event"))}</h2>
-          <p class="muted">Your existing UFC EV alerts are still available on the UFC page.</p>
-
-          <a class="open-link" href="{esc(alert.get("source_url"))}">Open UFC EV Alerts →</a>
-        </article>
-        """
-
-    badge_class = "hot"
-    if edge >= 10:
-        badge_class = "fire"
-    elif edge < 5:
-        badge_class = "value"
+    if alert.get("metric") == "value":
+        value = pct(alert.get("value_percent"))
+        badge_class = "hot"
+        if value >= 25:
+            badge_class = "fire"
+        elif value < 15:
+            badge_class = "value"
+        badge_text = f"+{value:.2f}% vs avg"
+        price_label = "Average Price"
+        price_odds = alert.get("average_odds")
+        price_decimal = alert.get("average_decimal_odds")
+    else:
+        edge = pct(alert.get("edge_percent"))
+        badge_class = "hot"
+        if edge >= 10:
+            badge_class = "fire"
+        elif edge < 5:
+            badge_class = "value"
+        badge_text = f"+{edge:.2f}% EV"
+        price_label = "Fair Price"
+        price_odds = alert.get("fair_odds")
+        price_decimal = alert.get("fair_decimal_odds")
 
     sport_class = f"sport-{sport.lower().replace(' ', '-')}"
 
@@ -213,7 +248,7 @@ def render_alert_card(alert, index):
       <p class="meta">{esc(meta)}</p>
 
       <div class="edge-badge {badge_class}">
-        ⚡ +{edge:.2f}% EV
+        ⚡ {esc(badge_text)}
       </div>
 
       <div class="card-grid">
@@ -228,9 +263,9 @@ def render_alert_card(alert, index):
           <em>{esc(alert.get("bookmaker"))}</em>
         </div>
         <div>
-          <span>Fair Price</span>
-          <strong>{esc(alert.get("fair_odds"))}</strong>
-          <em>{esc(alert.get("fair_decimal_odds"))}</em>
+          <span>{price_label}</span>
+          <strong>{esc(price_odds)}</strong>
+          <em>{esc(price_decimal)}</em>
         </div>
       </div>
       {f'<a class="player-link" href="{player_props_url(alert)}">View all bookmaker prices →</a>' if player_props_url(alert) else ""}
@@ -247,11 +282,7 @@ def render_page(alerts, football_data):
     generated = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
     counts = sport_counts(alerts)
 
-    sorted_alerts = sorted(
-        alerts,
-        key=lambda x: pct(x.get("edge_percent")),
-        reverse=True,
-    )
+    sorted_alerts = sorted(alerts, key=alert_rank)
 
     cards = ""
 
@@ -266,7 +297,10 @@ def render_page(alerts, football_data):
         </div>
         """
 
-    best_edge = max([pct(a.get("edge_percent")) for a in alerts], default=0)
+    best_edge = max(
+        [pct(a.get("edge_percent")) for a in alerts if a.get("metric") != "value"],
+        default=0,
+    )
     football_count = counts.get("Football", 0)
     ufc_count = counts.get("UFC", 0)
 
@@ -639,13 +673,6 @@ def render_page(alerts, football_data):
       letter-spacing: .08em;
     }}
 
-    .open-link {{
-      display: inline-flex;
-      margin-top: 8px;
-      color: #86efac;
-      font-weight: 900;
-    }}
-
     .empty-state {{
       grid-column: 1 / -1;
       border: 1px dashed var(--border);
@@ -675,8 +702,9 @@ def render_page(alerts, football_data):
       <div class="eyebrow">⚡ EV Alerts</div>
       <h1>EV Alerts</h1>
       <p class="subtitle">
-        Combined value alerts across sports. Football uses a no-vig fair price
-        from tracked bookmakers. UFC alerts currently link through to the UFC EV page.
+        Combined value alerts across sports. Football EV uses a no-vig fair price
+        from tracked bookmakers. UFC alerts show how far the best price beats the
+        average of every book, margin included, and are listed after the EV alerts.
       </p>
       <p class="updated">Updated: {esc(generated)}</p>
 
@@ -691,11 +719,11 @@ def render_page(alerts, football_data):
         </div>
         <div class="summary-card">
           <strong>{ufc_count}</strong>
-          <span>UFC sections</span>
+          <span>UFC alerts</span>
         </div>
         <div class="summary-card">
           <strong>{best_edge:.1f}%</strong>
-          <span>Best edge</span>
+          <span>Best football EV</span>
         </div>
       </div>
     </section>
@@ -783,9 +811,10 @@ def render_page(alerts, football_data):
 
 def main():
     football_alerts, football_data = load_football_alerts()
-    ufc_alerts = extract_ufc_cards_from_existing_page()
+    ufc_alerts = load_ufc_alerts()
 
-    all_alerts = football_alerts + ufc_alerts
+    # UFC value% is not an EV, so the two metrics are ranked separately.
+    all_alerts = sorted(football_alerts + ufc_alerts, key=alert_rank)
 
     OUT_JSON.parent.mkdir(parents=True, exist_ok=True)
     OUT_PAGE.parent.mkdir(parents=True, exist_ok=True)
@@ -796,14 +825,14 @@ def main():
         "sports": sport_counts(all_alerts),
         "alerts": all_alerts,
         "football_source": str(FOOTBALL_EV_PATH),
-        "ufc_source": str(UFC_PAGE_PATH),
+        "ufc_source": str(UFC_EV_PATH),
     }
 
     OUT_JSON.write_text(json.dumps(output, indent=2, ensure_ascii=False), encoding="utf-8")
     OUT_PAGE.write_text(render_page(all_alerts, football_data), encoding="utf-8")
 
     print(f"Football alerts loaded: {len(football_alerts)}")
-    print(f"UFC link cards loaded: {len(ufc_alerts)}")
+    print(f"UFC alerts loaded: {len(ufc_alerts)}")
     print(f"Total combined alerts: {len(all_alerts)}")
     print(f"Wrote JSON: {OUT_JSON}")
     print(f"Wrote page: {OUT_PAGE}")
@@ -105,6 +105,27 @@ def get_fight_event_ids(page):
     return []
 
 
+def get_hub_event_ids(page):
+    print(f"\nLoading hub: {HUB_URL}")
+    try:
+        page.goto(HUB_URL, timeout=60000, wait_until="domcontentloaded")
+        print("  Waiting for hub page...")
+        time.sleep(10)
+        accept_cookies(page)
+        time.sleep(2)
+
+        for _ in range(6):
+            page.mouse.wheel(0, 1200)
+            time.sleep(0.8)
+
+        save_debug(page, "betmgm_hub")
+        return get_fight_event_ids(page)
+
+    except Exception as e:
+        print(f"  Hub page failed: {e}")
+        return []
+
+
 def parse_page_text(page):
     """
     BetMGM text structure (confirmed from debug):
@@ -383,24 +404,7 @@ def main():
 
         page = context.new_page()
 
-        print(f"\nLoading hub: {HUB_URL}")
-        try:
-            page.goto(HUB_URL, timeout=60000, wait_until="domcontentloaded")
-            print("  Waiting for hub page...")
-            time.sleep(10)
-            accept_cookies(page)
-            time.sleep(2)
-
-            for _ in range(6):
-                page.mouse.wheel(0, 1200)
-                time.sleep(0.8)
-
-            save_debug(page, "betmgm_hub")
-            event_ids = get_fight_event_ids(page)
-
-        except Exception as e:
-            print(f"  Hub page failed: {e}")
-            event_ids = []
+        event_ids = get_hub_event_ids(page)
 
         if not event_ids:
             print("  No event IDs found.")
@@ -273,6 +273,19 @@ def get_fight_urls_from_hub(page):
     return fights
 
 
+def save_fight_urls(fight_links):
+    # Save fresh fight URLs so fetch_boylesports_moneylines.py stays current
+    try:
+        URLS_PATH.write_text(
+            json.dumps({"fights": fight_links, "updated_at": datetime.now(timezone.utc).isoformat()},
+                       indent=2, ensure_ascii=False),
+            encoding="utf-8"
+        )
+        print(f"Saved {len(fight_links)} fight URLs to {URLS_PATH}")
+    except Exception as e:
+        print(f"Warning: could not save fight URLs: {e}")
+
+
 def get_body_text(page):
     try:
         return page.locator("body").inner_text(timeout=15000)
@@ -631,16 +644,7 @@ def main():
 
         fight_links = get_fight_urls_from_hub(page)
 
-        # Save fresh fight URLs so fetch_boylesports_moneylines.py stays current
-        try:
-            URLS_PATH.write_text(
-                json.dumps({"fights": fight_links, "updated_at": datetime.now(timezone.utc).isoformat()},
-                           indent=2, ensure_ascii=False),
-                encoding="utf-8"
-            )
-            print(f"Saved {len(fight_links)} fight URLs to {URLS_PATH}")
-        except Exception as e:
-            print(f"Warning: could not save fight URLs: {e}")
+        save_fight_urls(fight_links)
 
         if not fight_links:
             print("No UFC fight URLs found on hub page.")
@@ -151,6 +151,62 @@ def extract_structured_markets(page):
     return markets
 
 
+def scrape_fight(page, fight):
+    fight_name = fight.get("fight_name") or fight.get("fight") or "Unknown fight"
+    url = fight.get("url")
+
+    page.goto(url, wait_until="domcontentloaded", timeout=80000)
+    time.sleep(7)
+
+    accept_cookies(page)
+    time.sleep(2)
+
+    for _ in range(5):
+        page.mouse.wheel(0, 1800)
+        time.sleep(0.8)
+
+    markets = extract_structured_markets(page)
+
+    total = sum(
+        len(markets.get(k, []))
+        for k in [
+            "fight_betting",
+            "go_the_distance",
+            "method_of_victory",
+            "total_rounds",
+        ]
+    )
+
+    print("Fight betting:", len(markets["fight_betting"]))
+    print("GTD:", len(markets["go_the_distance"]))
+    print("Method:", len(markets["method_of_victory"]))
+    print("Total rounds:", len(markets["total_rounds"]))
+    print("Total:", total)
+
+    return {
+        "bookmaker": "Coral",
+        "fight_name": fight_name,
+        "fight": fight_name,
+        "url": url,
+        "market_count": total,
+        "markets": markets,
+    }
+
+
+def save_output(all_fights):
+    output = {
+        "bookmaker": "Coral",
+        "updated_at": datetime.now(timezone.utc).isoformat(),
+        "fight_count": len(all_fights),
+        "fights": all_fights,
+    }
+
+    OUT_PATH.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(OUT_PATH, "w", encoding="utf-8") as f:
+        json.dump(output, f, indent=2, ensure_ascii=False)
+
+
 def main():
     with open(URLS_PATH, "r", encoding="utf-8") as f:
         url_data = json.load(f)
@@ -184,42 +240,7 @@ def main():
             print("==============================")
 
             try:
-                page.goto(url, wait_until="domcontentloaded", timeout=80000)
-                time.sleep(7)
-
-                accept_cookies(page)
-                time.sleep(2)
-
-                for _ in range(5):
-                    page.mouse.wheel(0, 1800)
-                    time.sleep(0.8)
-
-                markets = extract_structured_markets(page)
-
-                total = sum(
-                    len(markets.get(k, []))
-                    for k in [
-                        "fight_betting",
-                        "go_the_distance",
-                        "method_of_victory",
-                        "total_rounds",
-                    ]
-                )
-
-                print("Fight betting:", len(markets["fight_betting"]))
-                print("GTD:", len(markets["go_the_distance"]))
-                print("Method:", len(markets["method_of_victory"]))
-                print("Total rounds:", len(markets["total_rounds"]))
-                print("Total:", total)
-
-                all_fights.append({
-                    "bookmaker": "Coral",
-                    "fight_name": fight_name,
-                    "fight": fight_name,
-                    "url": url,
-                    "market_count": total,
-                    "markets": markets,
-                })
+                all_fights.append(scrape_fight(page, fight))
 
             except Exception as e:
                 print("FAILED:", e)
@@ -249,17 +270,7 @@ def main():
 
         browser.close()
 
-    output = {
-        "bookmaker": "Coral",
-        "updated_at": datetime.now(timezone.utc).isoformat(),
-        "fight_count": len(all_fights),
-        "fights": all_fights,
-    }
-
-    OUT_PATH.parent.mkdir(parents=True, exist_ok=True)
-
-    with open(OUT_PATH, "w", encoding="utf-8") as f:
-        json.dump(output, f, indent=2, ensure_ascii=False)
+    save_output(all_fights)
 
     print("\nDONE")
     print(f"Saved: {OUT_PATH}")
@@ -390,6 +390,22 @@ def scrape_fight(page, fight_info):
     }
 
 
+def save_output(results):
+    output = {
+        "sport":        "ufc",
+        "bookmaker":    "LiveScoreBet",
+        "market_type":  "props",
+        "source_url":   HUB_URL,
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "fight_count":  len(results),
+        "fights":       results,
+    }
+
+    OUT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    OUT_PATH.write_text(json.dumps(output, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"\nSaved → {OUT_PATH}")
+
+
 # ── Main ──────────────────────────────────────────────────────────────────────
 
 def main():
@@ -427,18 +443,7 @@ def main():
 
         browser.close()
 
-    output = {
-        "sport":        "ufc",
-        "bookmaker":    "LiveScoreBet",
-        "market_type":  "props",
-        "source_url":   HUB_URL,
-        "generated_at": datetime.now(timezone.utc).isoformat(),
-        "fight_count":  len(results),
-        "fights":       results,
-    }
-
-    OUT_PATH.write_text(json.dumps(output, indent=2, ensure_ascii=False), encoding="utf-8")
-    print(f"\nSaved → {OUT_PATH}")
+    save_output(results)
 
     print("\n── Summary ─────────────────────────────────────────────")
     for r in results:
@@ -0,0 +1,474 @@
+#!/usr/bin/env python3
+"""
+fetch_ufc_props_all.py
+
+Scrapes UFC props from every bookmaker at once, for the fights on the card.
+
+run_ufc_update.bat used to run the props scrapers one after another. Each
+loaded its own fight URL file and walked its fights on a single page, so a
+fight night card (~13 fights x 9 books) took far too long close to fight
+time. This orchestrator:
+
+  1. Builds the card once from ufc/data/events.json: every fight of an event
+     that is today or later, keyed by fight_key().
+  2. Starts every bookmaker together. Books whose scripts scrape one fight
+     page at a time get their own browser_pool page pool, capped per book
+     (see BOOK_MAX_WORKERS). Their fights are matched to the card with
+     FightMatcher and fights that are not on it are skipped. Books that read
+     one listing page or an API run their own script in a subprocess,
+     alongside the pools.
+  3. Writes each book's usual output file, so the filter and page scripts
+     are unchanged. It also writes one consolidated store,
+     ufc/data/prop_store.json, with every book's markets under each fight.
+
+    python scripts/fetch_ufc_props_all.py
+    python scripts/fetch_ufc_props_all.py --books PaddyPower,Coral
+    python scripts/fetch_ufc_props_all.py --all-fights   # keep off-card fights
+    python scripts/fetch_ufc_props_all.py --workers 2    # pages per pooled book
+
+Subprocess output goes to <temp>/beatthebooks_ufc_props/<book>.log.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import importlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+if str(ROOT / "scripts" / "Football") not in sys.path:
+    sys.path.insert(0, str(ROOT / "scripts" / "Football"))
+
+import telemetry  # noqa: E402
+from browser_pool import PoolWorker, block_heavy_resources, log, scrape_fixtures_async  # noqa: E402
+from odds_common import FightMatcher, fight_key  # noqa: E402
+
+DATA = ROOT / "ufc" / "data"
+EVENTS_PATH = DATA / "events.json"
+STORE_PATH = DATA / "prop_store.json"
+LOG_DIR = Path(tempfile.gettempdir()) / "beatthebooks_ufc_props"
+
+# Events dated up to this many days ago are still on the card; a US evening
+# card finishes on the next day in UTC.
+CARD_GRACE_DAYS = 1
+
+DUBLIN = {"locale": "en-IE", "timezone_id": "Europe/Dublin"}
+LONDON = {"locale": "en-GB", "timezone_id": "Europe/London"}
+
+
+def load_json(path, default):
+    try:
+        return json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return default
+
+
+def write_json(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def entry_fight_name(entry) -> str:
+    """Fight name of one entry in a book's output file, or ""."""
+    name = entry.get("fight") or entry.get("fight_name") or entry.get("name") or ""
+    if not name and entry.get("fighter1") and entry.get("fighter2"):
+        name = f"{entry['fighter1']} v {entry['fighter2']}"
+    return str(name)
+
+
+# ── The card ───────────────────────────────────────────────────────────────────
+
+def load_card() -> list[dict]:
+    """Fights of every event from CARD_GRACE_DAYS ago onwards, in card order."""
+    data = load_json(EVENTS_PATH, {"events": []})
+    cutoff = date.today() - timedelta(days=CARD_GRACE_DAYS)
+    card = []
+
+    for event in data.get("events") or []:
+        try:
+            event_date = date.fromisoformat(str(event.get("date") or "")[:10])
+        except ValueError:
+            continue
+
+        if event_date < cutoff:
+            continue
+
+        for fight in event.get("fights") or []:
+            red = fight.get("red")
+            blue = fight.get("blue")
+
+            if isinstance(red, dict):
+                red = red.get("name", "")
+            if isinstance(blue, dict):
+                blue = blue.get("name", "")
+
+            if red and blue:
+                card.append({
+                    "fight_key": fight_key(f"{red} v {blue}"),
+                    "fight": f"{red} vs {blue}",
+                    "event": event.get("name", ""),
+                    "date": event.get("date", ""),
+                })
+
+    return card
+
+
+# ── Books with per-fight pages ─────────────────────────────────────────────────
+
+class PooledBook:
+    """
+    A bookmaker whose script can scrape one fight on a page it is given.
+
+    discover() lists the book's fights as jobs: {"match": fight name or "",
+    "url": ..., "fight": what the script's scraper takes}. A job without a
+    name (an event ID) cannot be checked against the card until it has been
+    scraped. save() writes the book's usual output file from the (job,
+    result) pairs and returns its fight entries.
+    """
+
+    name = ""
+    module_name = ""
+    needs_browser = True
+    context_options: dict = {}
+
+    def __init__(self):
+        self.module = importlib.import_module(self.module_name)
+
+    def discover(self, page) -> list[dict]:
+        raise NotImplementedError
+
+    def scrape(self, page, job) -> dict | None:
+        raise NotImplementedError
+
+    def save(self, pairs) -> list[dict]:
+        entries = [result for _, result in pairs]
+        output = self.module.empty_output()
+        output["fights"] = entries
+        self.module.save_output(output)
+        return entries
+
+    def scrape_pair(self, page, job):
+        result = self.scrape(page, job)
+        return None if result is None else (job, result)
+
+
+def url_file_jobs(path) -> list[dict]:
+    fights = load_json(path, {}).get("fights") or []
+    return [
+        {"match": entry_fight_name(fight), "url": fight.get("url", ""), "fight": fight}
+        for fight in fights
+        if fight.get("url")
+    ]
+
+
+class PaddyPower(PooledBook):
+    name = "PaddyPower"
+    module_name = "fetch_ufc_props_paddypower"
+    needs_browser = False
+    context_options = DUBLIN
+
+    def discover(self, page):
+        return url_file_jobs(self.module.URLS_PATH)
+
+    def scrape(self, page, job):
+        return self.module.scrape_fight(page, job["fight"])
+
+
+class BoyleSports(PooledBook):
+    name = "BoyleSports"
+    module_name = "fetch_boylesports_props"
+    context_options = DUBLIN
+
+    def discover(self, page):
+        fights = self.module.get_fight_urls_from_hub(page)
+        self.module.save_fight_urls(fights)
+        return [{"match": fight["fight"], "url": fight["url"], "fight": fight} for fight in fights]
+
+    def scrape(self, page, job):
+        return self.module.scrape_fight(page, job["fight"], job["position"])
+
+
+class BetMGM(PooledBook):
+    name = "BetMGM"
+    module_name = "fetch_betmgm_props"
+    context_options = LONDON
+
+    def discover(self, page):
+        return [
+            {"match": "", "url": f"{self.module.HUB_URL}#event/{event_id}", "fight": event_id}
+            for event_id in self.module.get_hub_event_ids(page)
+        ]
+
+    def scrape(self, page, job):
+        return self.module.scrape_fight(page, job["fight"], job["position"])
+
+
+class Coral(PooledBook):
+    name = "Coral"
+    module_name = "fetch_coral_props"
+    needs_browser = False
+
+    def discover(self, page):
+        return url_file_jobs(self.module.URLS_PATH)
+
+    def scrape(self, page, job):
+        return self.module.scrape_fight(page, job["fight"])
+
+    def save(self, pairs):
+        entries = [result for _, result in pairs]
+        self.module.save_output(entries)
+        return entries
+
+
+class LiveScoreBet(PooledBook):
+    name = "LiveScoreBet"
+    module_name = "fetch_livescorebet_ufc_props"
+
+    def discover(self, page):
+        self.module.DEBUG_DIR.mkdir(parents=True, exist_ok=True)
+        return [
+            {"match": fight["name"], "url": fight["url"], "fight": fight}
+            for fight in self.module.get_fight_links(page)
+        ]
+
+    def scrape(self, page, job):
+        return self.module.scrape_fight(page, job["fight"])
+
+    def save(self, pairs):
+        entries = [result for _, result in pairs]
+        self.module.save_output(entries)
+        return entries
+
+
+class WilliamHill(PooledBook):
+    name = "WilliamHill"
+    module_name = "fetch_williamhill_props"
+
+    def discover(self, page):
+        # The list pages carry every moneyline; the fight pages add props.
+        self.list_fights, ob_ev_ids = self.module.discover_fights(page)
+        return [
+            {"match": "", "url": f"{self.module.BASE}/OB_EV{ob_ev_id}", "fight": ob_ev_id}
+            for ob_ev_id in ob_ev_ids
+        ]
+
+    def scrape(self, page, job):
+        return self.module.scrape_fight_page(page, job["fight"])
+
+    def save(self, pairs):
+        for job, result in pairs:
+            self.module.merge_fight_page(self.list_fights, job["fight"], result)
+        return self.module.save_output(self.list_fights)
+
+
+POOLED_BOOKS = (PaddyPower, BoyleSports, BetMGM, Coral, LiveScoreBet, WilliamHill)
+
+
+# ── Books run as their own script ──────────────────────────────────────────────
+
+# (bookmaker, script, output file). These read a single listing page or an
+# API, so there is no per-fight walk to pool.
+SCRIPT_BOOKS = (
+    ("BetVictor", "scripts/fetch_betvictor_props.py", DATA / "betvictor_props.json"),
+    ("888Sport", "scripts/fetch_888sport_props.py", DATA / "888sport_props.json"),
+    ("Betfred", "scripts/fetch_betfred_props.py", DATA / "betfred_props.json"),
+    ("Bwin", "scripts/fetch_bwin_props.py", DATA / "bwin_props.json"),
+    ("Tote", "scripts/fetch_tote_props.py", DATA / "tote_props.json"),
+    ("Unibet", "scripts/fetch_unibet_props.py", DATA / "unibet_props.json"),
+)
+
+
+# ── Orchestration ──────────────────────────────────────────────────────────────
+
+def discover_in_browser(book: PooledBook, headless: bool) -> list[dict]:
+    worker = PoolWorker(book.name, 0, headless, "", book.context_options, block_heavy_resources)
+    worker.start()
+    try:
+        return book.discover(worker.page)
+    finally:
+        worker.stop()
+
+
+async def run_pooled(book_class, card: FightMatcher, args) -> tuple[dict, list[dict]]:
+    book = book_class()
+
+    if book.needs_browser:
+        jobs = await asyncio.to_thread(discover_in_browser, book, args.headless)
+    else:
+        jobs = book.discover(None)
+
+    if card and not args.all_fights:
+        on_card = [job for job in jobs if not job["match"] or card.event_for(job["match"])]
+        skipped = len(jobs) - len(on_card)
+        if skipped:
+            log(f"{book.name}: skipping {skipped} fight(s) not on the card")
+        jobs = on_card
+
+    for position, job in enumerate(jobs, start=1):
+        job["position"] = position
+
+    pairs, errors = await scrape_fixtures_async(
+        book.name,
+        jobs,
+        book.scrape_pair,
+        workers=args.workers,
+        headless=args.headless,
+        context_options=book.context_options,
+    )
+    entries = await asyncio.to_thread(book.save, pairs)
+    return {"fights": len(entries), "errors": errors}, entries
+
+
+async def run_script(name: str, script: str, out_path: Path) -> tuple[dict, list[dict]]:
+    LOG_DIR.mkdir(parents=True, exist_ok=True)
+    log_path = LOG_DIR / f"{name}.log"
+
+    env = dict(os.environ, PYTHONUTF8="1", PYTHONIOENCODING="utf-8", PYTHONUNBUFFERED="1")
+    # The child must not overwrite this process's telemetry sidecar.
+    env.pop("TELEMETRY_COUNTERS", None)
+
+    log(f"{name}: running {script}")
+    with log_path.open("w", encoding="utf-8") as handle:
+        process = await asyncio.create_subprocess_exec(
+            sys.executable,
+            str(ROOT / script),
+            cwd=ROOT,
+            env=env,
+            stdin=subprocess.PIPE,
+            stdout=handle,
+            stderr=subprocess.STDOUT,
+        )
+        # Answer the "Press Enter to close browser" prompts.
+        await process.communicate(b"\n" * 4)
+
+    if process.returncode != 0:
+        raise RuntimeError(f"{script} exited with {process.returncode}, see {log_path}")
+
+    entries = load_json(out_path, {}).get("fights") or []
+    return {"fights": len(entries), "errors": []}, entries
+
+
+async def timed(name: str, run) -> tuple[str, dict, list[dict]]:
+    """Run one book; a failure is reported without stopping the others."""
+    started = time.perf_counter()
+    try:
+        report, entries = await run
+        report["status"] = "ok"
+    except Exception as error:
+        report, entries = {"status": "failed", "error": f"{type(error).__name__}: {error}"}, []
+    report["seconds"] = round(time.perf_counter() - started, 1)
+
+    log(f"{name}: {report['status']} in {report['seconds']}s, {len(entries)} fight(s)")
+    return name, report, entries
+
+
+def build_store(card: list[dict], matcher: FightMatcher, results) -> dict:
+    fights = {
+        fight["fight_key"]: {
+            "fight": fight["fight"],
+            "event": fight["event"],
+            "date": fight["date"],
+            "on_card": True,
+            "books": {},
+        }
+        for fight in card
+    }
+    books = {}
+
+    for bookmaker, report, entries in results:
+        books[bookmaker] = report
+        for entry in entries:
+            if not isinstance(entry, dict):
+                continue
+            name = entry_fight_name(entry)
+            if not name:
+                continue
+            key = matcher.event_for(name) or fight_key(name)
+            fight = fights.setdefault(
+                key,
+                {"fight": name, "event": "", "date": "", "on_card": False, "books": {}},
+            )
+            fight["books"][bookmaker] = entry
+
+    return {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "card_fights": len(card),
+        "books": books,
+        "fights": fights,
+    }
+
+
+async def scrape_all(args, card: list[dict]) -> list:
+    matcher = FightMatcher(fight["fight_key"] for fight in card)
+    wanted = {name.lower() for name in args.books} if args.books else None
+
+    def selected(name):
+        return wanted is None or name.lower() in wanted
+
+    runs = [
+        timed(book.name, run_pooled(book, matcher, args))
+        for book in POOLED_BOOKS
+        if selected(book.name)
+    ]
+    runs += [
+        timed(name, run_script(name, script, out_path))
+        for name, script, out_path in SCRIPT_BOOKS
+        if selected(name)
+    ]
+    return await asyncio.gather(*runs)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Scrape UFC props from every bookmaker concurrently")
+    parser.add_argument("--books", type=lambda value: [b.strip() for b in value.split(",") if b.strip()],
+                        help="comma separated bookmakers, default all")
+    parser.add_argument("--all-fights", action="store_true",
+                        help="also scrape fights that are not on the events.json card")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="pages per pooled bookmaker, capped by browser_pool")
+    parser.add_argument("--headless", action="store_true",
+                        default=os.getenv("GITHUB_ACTIONS") == "true",
+                        help="run the pooled browsers headless")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+
+    card = load_card()
+    if card:
+        print(f"Card: {len(card)} fight(s) from {EVENTS_PATH}")
+    else:
+        print(f"No upcoming fights in {EVENTS_PATH}; scraping every fight each book lists")
+
+    started = time.perf_counter()
+    results = asyncio.run(scrape_all(args, card))
+
+    matcher = FightMatcher(fight["fight_key"] for fight in card)
+    store = build_store(card, matcher, results)
+    write_json(STORE_PATH, store)
+    telemetry.count("fixtures", len(store["fights"]))
+
+    print(f"\nFinished in {time.perf_counter() - started:.1f}s")
+    for bookmaker, report, entries in results:
+        detail = report.get("error") or f"{len(entries)} fight(s), {len(report.get('errors') or [])} error(s)"
+        print(f"  {bookmaker:<14} {report['status']:<7} {report['seconds']:>7.1f}s  {detail}")
+    print(f"Saved {len(store['fights'])} fights to {STORE_PATH}")
+
+    failed = [bookmaker for bookmaker, report, _ in results if report["status"] != "ok"]
+    return 1 if failed and len(failed) == len(results) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,24 +1,83 @@
+"""
+fetch_ufcstats_fighter_stats.py
+
+Fighter profiles for every booked UFC fighter, from UFCStats.
+
+UFCStats pages are static HTML, so they are fetched over one pooled
+requests.Session rather than a browser, a few at a time. Everything parsed
+is kept in ufc/data/ufcstats_fighter_cache.json, keyed by ufcstats_url:
+
+    index     the A-Z fighter index, per letter. A letter is fetched again
+              once it is INDEX_MAX_AGE_DAYS old, or when a booked fighter
+              whose surname starts with it is missing from the index.
+    profiles  each fighter's parsed profile and last_scraped time. A profile
+              is scraped again only when the fighter appears on a UFCStats
+              event completed since last_scraped (a new fight), or once it
+              is PROFILE_MAX_AGE_DAYS old.
+
+Requests carry If-None-Match / If-Modified-Since when the server sent
+validators last time, and a 304 keeps the cached copy. If the completed
+events cannot be read, every booked profile is scraped again, as before.
+
+    python scripts/fetch_ufcstats_fighter_stats.py
+    python scripts/fetch_ufcstats_fighter_stats.py --full   # ignore the cache
+"""
+
+import argparse
 import json
+import os
 import re
 import string
 import time
 import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
+import requests
 from bs4 import BeautifulSoup
-from playwright.sync_api import sync_playwright
+from requests.adapters import HTTPAdapter
+
+import telemetry
 
 ROOT = Path(__file__).resolve().parents[1]
 
 EVENTS_JSON = ROOT / "ufc" / "data" / "events.json"
 MATCHES_OUT_PATH = ROOT / "ufc" / "data" / "ufcstats_fighter_matches.json"
 FIGHTERS_OUT_PATH = ROOT / "ufc" / "data" / "fighters.json"
+CACHE_PATH = ROOT / "ufc" / "data" / "ufcstats_fighter_cache.json"
 
 UPCOMING_EVENTS_URL = "http://ufcstats.com/statistics/events/upcoming"
+COMPLETED_EVENTS_URL = "http://ufcstats.com/statistics/events/completed"
+INDEX_URL = "http://ufcstats.com/statistics/fighters?char={char}&page=all"
 
 MIN_INDEXED_FIGHTERS = 100
 MIN_SAVED_FIGHTERS = 20
 
+CACHE_VERSION = 1
+INDEX_MAX_AGE_DAYS = 7
+PROFILE_MAX_AGE_DAYS = 30
+
+# Concurrent requests to UFCStats; also the session's connection pool size.
+HTTP_WORKERS = 4
+TIMEOUT_SEC = 30
+RETRIES = 3
+
+SESSION = requests.Session()
+SESSION.headers.update(
+    {
+        "User-Agent": (
+            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+            "AppleWebKit/537.36 (KHTML, like Gecko) "
+            "Chrome/124.0.0.0 Safari/537.36"
+        ),
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+        "Accept-Language": "en-US,en;q=0.9",
+    }
+)
+for _scheme in ("http://", "https://"):
+    SESSION.mount(_scheme, HTTPAdapter(pool_connections=1, pool_maxsize=HTTP_WORKERS))
+
 
 def strip_accents(text):
     """Strip accented characters — e.g. Benoît -> Benoit"""
@@ -76,74 +135,262 @@ def classify_method(method):
     return "other"
 
 
-def build_ufcstats_index(page):
-    index = {}
+# ── HTTP ───────────────────────────────────────────────────────────────────────
+
+def fetch(url, cached=None):
+    """GET url over the shared session.
 
-    for char in string.ascii_lowercase:
-        url = f"http://ufcstats.com/statistics/fighters?char={char}&page=all"
-        print(f"Fetching UFCStats index: {char}")
+    Returns (html, validators). html is None when cached carried an ETag or
+    Last-Modified and the server answered 304 Not Modified.
+    """
+    headers = {}
+    if cached and cached.get("etag"):
+        headers["If-None-Match"] = cached["etag"]
+    if cached and cached.get("last_modified"):
+        headers["If-Modified-Since"] = cached["last_modified"]
 
+    last_error = ""
+    for attempt in range(1, RETRIES + 1):
+        if attempt > 1:
+            telemetry.count("retries")
+            time.sleep(2 * (attempt - 1))
         try:
-            page.goto(url, wait_until="networkidle", timeout=30000)
-            html = page.content()
-        except Exception as e:
-            print(f"Warning: failed index {char}: {e}")
+            response = SESSION.get(url, headers=headers, timeout=TIMEOUT_SEC)
+        except requests.RequestException as e:
+            last_error = repr(e)
             continue
 
-        soup = BeautifulSoup(html, "html.parser")
-        rows = soup.select("tr.b-statistics__table-row")
+        if response.status_code == 304 and headers:
+            return None, {k: cached.get(k, "") for k in ("etag", "last_modified")}
+        if response.status_code == 200 and response.text:
+            telemetry.count("bytes", len(response.content))
+            return response.text, {
+                "etag": response.headers.get("ETag", ""),
+                "last_modified": response.headers.get("Last-Modified", ""),
+            }
+        last_error = f"HTTP {response.status_code}"
+
+    raise RuntimeError(f"{url}: {last_error}")
+
+
+def fetch_all(jobs, work):
+    """Run work(job) for every job on HTTP_WORKERS threads, in job order.
+
+    Returns [(job, result or None, error or "")].
+    """
+    def run(job):
+        try:
+            return job, work(job), ""
+        except Exception as e:
+            return job, None, str(e)
+
+    with ThreadPoolExecutor(max_workers=HTTP_WORKERS) as pool:
+        return list(pool.map(run, jobs))
+
+
+# ── Cache ──────────────────────────────────────────────────────────────────────
+
+def utc_now():
+    return datetime.now(timezone.utc)
+
+
+def older_than(iso_time, days, now):
+    try:
+        return now - datetime.fromisoformat(iso_time) > timedelta(days=days)
+    except (TypeError, ValueError):
+        return True
+
+
+def load_cache(full=False):
+    empty = {"version": CACHE_VERSION, "index": {}, "profiles": {}}
+    if full or not CACHE_PATH.exists():
+        return empty
+    try:
+        cache = json.loads(CACHE_PATH.read_text(encoding="utf-8"))
+    except Exception as e:
+        print(f"Warning: UFCStats cache unreadable, starting fresh: {e}")
+        return empty
+    if cache.get("version") != CACHE_VERSION:
+        return empty
+    return cache
 
-        for row in rows:
-            links = row.select("a.b-link")
-            if len(links) >= 2:
-                first = links[0].get_text(strip=True)
-                last = links[1].get_text(strip=True)
-                href = links[0].get("href")
-                full_name = f"{first} {last}".strip()
 
-                if full_name and href and "/fighter-details/" in href:
-                    index[normalize_name(full_name)] = {
-                        "name": full_name,
-                        "ufcstats_url": href,
-                    }
+def save_cache(cache):
+    CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp = CACHE_PATH.with_suffix(".tmp")
+    tmp.write_text(json.dumps(cache, indent=1, sort_keys=True, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, CACHE_PATH)
 
-        time.sleep(0.4)
+
+# ── Fighter index ──────────────────────────────────────────────────────────────
+
+def parse_index_page(html):
+    index = {}
+    soup = BeautifulSoup(html, "html.parser")
+    rows = soup.select("tr.b-statistics__table-row")
+
+    for row in rows:
+        links = row.select("a.b-link")
+        if len(links) >= 2:
+            first = links[0].get_text(strip=True)
+            last = links[1].get_text(strip=True)
+            href = links[0].get("href")
+            full_name = f"{first} {last}".strip()
+
+            if full_name and href and "/fighter-details/" in href:
+                index[normalize_name(full_name)] = {
+                    "name": full_name,
+                    "ufcstats_url": href,
+                }
 
     return index
 
 
-def get_upcoming_event_urls(page):
-    print(f"Fetching UFCStats upcoming events: {UPCOMING_EVENTS_URL}")
-    page.goto(UPCOMING_EVENTS_URL, wait_until="networkidle", timeout=30000)
-    html = page.content()
+def refresh_index_letters(cache, letters, now):
+    """Fetch the index pages for letters and replace their cached entries."""
+    letters = sorted(letters)
+    if not letters:
+        return
+
+    print(f"Fetching UFCStats index: {', '.join(letters)}")
+    cached_letters = cache["index"]
+
+    def work(char):
+        cached = cached_letters.get(char)
+        html, validators = fetch(INDEX_URL.format(char=char), cached)
+        fighters = cached["fighters"] if html is None else parse_index_page(html)
+        return {"fetched_at": now.isoformat(), "fighters": fighters, **validators}
+
+    for char, entry, error in fetch_all(letters, work):
+        if entry is None:
+            print(f"Warning: failed index {char}: {error}")
+        else:
+            cached_letters[char] = entry
+
+
+def merged_index(cache):
+    index = {}
+    for char in sorted(cache["index"]):
+        index.update(cache["index"][char]["fighters"])
+    return index
+
+
+def stale_letters(cache, now):
+    return {
+        char for char in string.ascii_lowercase
+        if char not in cache["index"]
+        or older_than(cache["index"][char].get("fetched_at"), INDEX_MAX_AGE_DAYS, now)
+    }
+
+
+def surname_letters(name):
+    """Index letters a fighter could be listed under (by surname)."""
+    words = normalize_name(name).split()
+    return {word[0] for word in words[1:] if word[0] in string.ascii_lowercase}
+
+
+# ── Events ─────────────────────────────────────────────────────────────────────
+
+def parse_event_list(html):
+    """[(event url, event date or None)] from an UFCStats events table."""
     soup = BeautifulSoup(html, "html.parser")
-    event_urls = []
+    events = []
 
     for link in soup.select("a.b-link.b-link_style_black"):
         href = link.get("href", "")
-        if "/event-details/" in href:
-            event_urls.append(href)
+        if "/event-details/" not in href:
+            continue
+        # The date sits next to the link: <a>name</a><span class="b-statistics__date">
+        date_el = link.parent.select_one(".b-statistics__date") if link.parent else None
+        try:
+            date = datetime.strptime(clean_text(date_el.get_text()), "%B %d, %Y").date()
+        except (AttributeError, ValueError):
+            date = None
+        events.append((href, date))
+
+    return events
 
-    event_urls = sorted(set(event_urls))
+
+def get_upcoming_event_urls():
+    print(f"Fetching UFCStats upcoming events: {UPCOMING_EVENTS_URL}")
+    html, _ = fetch(UPCOMING_EVENTS_URL)
+    event_urls = sorted({url for url, _ in parse_event_list(html)})
     print(f"Found {len(event_urls)} upcoming UFCStats events")
     return event_urls
 
 
-def get_fighter_names_from_event_page(page, event_url):
-    print(f"Fetching UFCStats event page: {event_url}")
-    page.goto(event_url, wait_until="networkidle", timeout=30000)
-    html = page.content()
+def get_fighters_from_event_page(event_url):
+    """{fighter name: ufcstats_url} for every fighter linked on an event page."""
+    html, _ = fetch(event_url)
     soup = BeautifulSoup(html, "html.parser")
-    names = set()
+    fighters = {}
 
     for link in soup.select("a.b-link.b-link_style_black"):
         href = link.get("href", "")
         text = link.get_text(" ", strip=True)
         if "/fighter-details/" in href and text:
-            names.add(text)
+            fighters[text] = href
+
+    return fighters
+
+
+def latest_fights_since(since):
+    """{ufcstats_url: latest event date} for events completed on or after since.
+
+    Returns None when the completed events could not be read.
+    """
+    try:
+        html, _ = fetch(COMPLETED_EVENTS_URL)
+    except Exception as e:
+        print(f"Warning: UFCStats completed events failed: {e}")
+        return None
+
+    today = utc_now().date()
+    events = [(url, date) for url, date in parse_event_list(html) if date and since <= date <= today]
+    print(f"Completed UFCStats events since {since}: {len(events)}")
+
+    latest = {}
+    dates = dict(events)
+    for event_url, fighters, error in fetch_all([url for url, _ in events], get_fighters_from_event_page):
+        if fighters is None:
+            print(f"Warning: failed completed event {event_url}: {error}")
+            return None
+        for url in fighters.values():
+            latest[url] = max(latest.get(url, dates[event_url]), dates[event_url])
+    return latest
+
+
+def profiles_to_scrape(cache, wanted_urls, now, full=False):
+    """The wanted profiles that are missing, too old or have fought since.
+
+    A fight on the day a profile was scraped counts as new, since the
+    profile may have been scraped before the event finished.
+    """
+    profiles = cache["profiles"]
+    if full:
+        return set(wanted_urls)
+
+    scrape = {
+        url for url in wanted_urls
+        if url not in profiles
+        or older_than(profiles[url].get("last_scraped"), PROFILE_MAX_AGE_DAYS, now)
+    }
+    scraped_on = {
+        url: datetime.fromisoformat(profiles[url]["last_scraped"]).date()
+        for url in set(wanted_urls) - scrape
+    }
+    if not scraped_on:
+        return scrape
 
-    print(f"Found {len(names)} fighters on UFCStats event page")
-    return names
+    latest = latest_fights_since(min(scraped_on.values()))
+    if latest is None:
+        print("Re-scraping every booked fighter.")
+        return set(wanted_urls)
+
+    return scrape | {
+        url for url, day in scraped_on.items()
+        if url in latest and latest[url] >= day
+    }
 
 
 def parse_label_value_items(soup):
@@ -205,10 +452,7 @@ def extract_fight_history(soup, fighter_name):
     return recent_fights[:10], methods
 
 
-def scrape_fighter_profile(page, name, url):
-    print(f"Scraping fighter profile: {name}")
-    page.goto(url, wait_until="networkidle", timeout=30000)
-    html = page.content()
+def parse_fighter_profile(html, name, url):
     soup = BeautifulSoup(html, "html.parser")
 
     fighter = {
@@ -253,62 +497,111 @@ def scrape_fighter_profile(page, name, url):
     return fighter
 
 
-def main():
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        context = browser.new_context(
-            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
-        )
-        page = context.new_page()
+def scrape_profiles(cache, wanted, urls, now):
+    """Fetch and parse the profiles at urls into the cache. wanted maps url -> name."""
+    profiles = cache["profiles"]
 
-        ufcstats_index = build_ufcstats_index(page)
-        print(f"Indexed {len(ufcstats_index)} UFCStats fighters")
+    def work(url):
+        print(f"Scraping fighter profile: {wanted[url]}")
+        cached = profiles.get(url)
+        html, validators = fetch(url, cached)
+        fighter = cached["fighter"] if html is None else parse_fighter_profile(html, wanted[url], url)
+        return {"fighter": fighter, "last_scraped": now.isoformat(), **validators}
 
-        if len(ufcstats_index) < MIN_INDEXED_FIGHTERS:
-            print(f"❌ Refusing to continue: UFCStats index only returned {len(ufcstats_index)} fighters")
-            print("Existing fighters.json has NOT been overwritten.")
-            browser.close()
-            raise SystemExit(1)
+    for url, entry, error in fetch_all(sorted(urls, key=wanted.get), work):
+        if entry is None:
+            kept = " (keeping cached profile)" if url in profiles else ""
+            print(f"Warning: failed fighter profile {wanted[url]}: {error}{kept}")
+        else:
+            profiles[url] = entry
 
-        fighter_names = set()
-        fighter_names.update(collect_names_from_events_json())
 
-        try:
-            event_urls = get_upcoming_event_urls(page)
-            for event_url in event_urls:
-                fighter_names.update(get_fighter_names_from_event_page(page, event_url))
-                time.sleep(0.5)
-        except Exception as e:
-            print(f"Warning: UFCStats upcoming scrape failed: {e}")
-
-        fighter_names = sorted(fighter_names)
-        print(f"Found {len(fighter_names)} total booked fighter names")
+def parse_args():
+    parser = argparse.ArgumentParser(description="Fetch UFCStats profiles for booked fighters")
+    parser.add_argument("--full", action="store_true",
+                        help="ignore the cache and fetch the whole index and every profile")
+    return parser.parse_args()
 
-        matches = {}
-        fighters = []
 
-        for name in fighter_names:
-            key = normalize_name(name)
-            info = ufcstats_index.get(key)
-
-            if not info:
-                print(f"Missing UFCStats match: {name}")
+def main():
+    args = parse_args()
+    now = utc_now()
+    cache = load_cache(full=args.full)
+
+    fighter_names = set()
+    fighter_names.update(collect_names_from_events_json())
+
+    event_fighters = {}
+    try:
+        event_urls = get_upcoming_event_urls()
+        for event_url, fighters, error in fetch_all(event_urls, get_fighters_from_event_page):
+            if fighters is None:
+                print(f"Warning: failed UFCStats event page {event_url}: {error}")
                 continue
+            print(f"Found {len(fighters)} fighters on UFCStats event page {event_url}")
+            event_fighters.update(fighters)
+    except Exception as e:
+        print(f"Warning: UFCStats upcoming scrape failed: {e}")
+    fighter_names.update(event_fighters)
+
+    fighter_names = sorted(fighter_names)
+    print(f"Found {len(fighter_names)} total booked fighter names")
+
+    refreshed = stale_letters(cache, now)
+    refresh_index_letters(cache, refreshed, now)
+    ufcstats_index = merged_index(cache)
+
+    # A fighter new to UFCStats since the cached index: refresh their letter.
+    missing = {
+        letter
+        for name in fighter_names
+        if normalize_name(name) not in ufcstats_index and name not in event_fighters
+        for letter in surname_letters(name)
+    } - refreshed
+    if missing:
+        refresh_index_letters(cache, missing, now)
+        ufcstats_index = merged_index(cache)
+
+    print(f"Indexed {len(ufcstats_index)} UFCStats fighters "
+          f"({len(refreshed | missing)} index pages fetched, "
+          f"{len(cache['index']) - len(refreshed | missing)} cached)")
+
+    if len(ufcstats_index) < MIN_INDEXED_FIGHTERS:
+        print(f"❌ Refusing to continue: UFCStats index only returned {len(ufcstats_index)} fighters")
+        print("Existing fighters.json has NOT been overwritten.")
+        raise SystemExit(1)
 
-            matches[name] = {
-                "name": info["name"],
-                "ufcstats_url": info["ufcstats_url"],
-            }
+    matches = {}
+    wanted = {}
 
-            try:
-                fighter = scrape_fighter_profile(page, info["name"], info["ufcstats_url"])
-                fighters.append(fighter)
-            except Exception as e:
-                print(f"Warning: failed fighter profile {name}: {e}")
+    for name in fighter_names:
+        info = ufcstats_index.get(normalize_name(name))
+        if not info and name in event_fighters:
+            info = {"name": name, "ufcstats_url": event_fighters[name]}
 
-            time.sleep(0.5)
+        if not info:
+            print(f"Missing UFCStats match: {name}")
+            continue
 
-        browser.close()
+        matches[name] = {
+            "name": info["name"],
+            "ufcstats_url": info["ufcstats_url"],
+        }
+        wanted.setdefault(info["ufcstats_url"], info["name"])
+
+    to_scrape = profiles_to_scrape(cache, wanted, now, full=args.full)
+    scrape_profiles(cache, wanted, to_scrape, now)
+    print(f"Profiles: {len(to_scrape)} scraped, {len(wanted) - len(to_scrape)} unchanged since last scrape")
+
+    fighters = []
+    seen = set()
+    for name in fighter_names:
+        url = matches.get(name, {}).get("ufcstats_url")
+        if url in cache["profiles"] and url not in seen:
+            seen.add(url)
+            fighters.append(cache["profiles"][url]["fighter"])
+
+    save_cache(cache)
 
     if len(fighters) < MIN_SAVED_FIGHTERS:
         print(f"❌ Refusing to overwrite fighters.json with only {len(fighters)} fighters")
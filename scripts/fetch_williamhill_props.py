@@ -134,104 +134,98 @@ def scrape_fight_page(page, ob_ev_id):
         }
     """)
 
-def main():
+def discover_fights(page):
+    """Moneylines from the list pages, and the OB_EV IDs of every fight page."""
     all_fights = {}
     all_ob_ev_ids = set()
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=is_github_actions())
-        page = browser.new_page(viewport={"width": 1400, "height": 900})
-
-        # Step 1: get moneylines from list pages + competition hub URLs
-        comp_urls = set()
-        for list_url in LIST_URLS:
-            print(f"\nList page: {list_url}")
-            try:
-                page.goto(list_url, wait_until="domcontentloaded", timeout=60000)
-                time.sleep(7)
-            except Exception:
-                continue
-
-            # Moneylines
-            lines = [clean(x) for x in page.locator("body").inner_text().splitlines() if clean(x)]
-            for i in range(len(lines) - 3):
-                f1, f2, o1, o2 = lines[i], lines[i+1], lines[i+2], lines[i+3]
-                if len(f1.split()) >= 2 and len(f2.split()) >= 2 and is_frac(o1) and is_frac(o2):
-                    name = f"{f1} vs {f2}"
-                    if name not in all_fights:
-                        all_fights[name] = {
-                            "bookmaker": "WilliamHill",
-                            "fight_name": name,
-                            "url": list_url,
-                            "markets": {"fight_betting": [
-                                {"selection": f1, "odds": o1},
-                                {"selection": f2, "odds": o2},
-                            ]},
-                        }
-
-            # Competition hub links
-            links = page.evaluate("""
-                () => [...new Set(
-                    Array.from(document.querySelectorAll('a[href*="/ufc/competitions/"]'))
-                    .map(a => a.href)
-                    .filter(h => h.includes('/matches'))
-                )]
-            """)
-            for l in links:
-                comp_urls.add(l)
-
-        print(f"\nCompetition hubs: {len(comp_urls)}")
-
-        # Step 2: get OB_EV IDs from each competition hub
-        for comp_url in comp_urls:
-            print(f"\nCompetition: {comp_url}")
-            ids = get_ob_ev_ids(page, comp_url)
-            all_ob_ev_ids.update(ids)
-
-        print(f"\nTotal fight pages to scrape: {len(all_ob_ev_ids)}")
+    # Step 1: get moneylines from list pages + competition hub URLs
+    comp_urls = set()
+    for list_url in LIST_URLS:
+        print(f"\nList page: {list_url}")
+        try:
+            page.goto(list_url, wait_until="domcontentloaded", timeout=60000)
+            time.sleep(7)
+        except Exception:
+            continue
+
+        # Moneylines
+        lines = [clean(x) for x in page.locator("body").inner_text().splitlines() if clean(x)]
+        for i in range(len(lines) - 3):
+            f1, f2, o1, o2 = lines[i], lines[i+1], lines[i+2], lines[i+3]
+            if len(f1.split()) >= 2 and len(f2.split()) >= 2 and is_frac(o1) and is_frac(o2):
+                name = f"{f1} vs {f2}"
+                if name not in all_fights:
+                    all_fights[name] = {
+                        "bookmaker": "WilliamHill",
+                        "fight_name": name,
+                        "url": list_url,
+                        "markets": {"fight_betting": [
+                            {"selection": f1, "odds": o1},
+                            {"selection": f2, "odds": o2},
+                        ]},
+                    }
 
-        # Step 3: scrape each fight page
-        for i, ob_ev_id in enumerate(all_ob_ev_ids, 1):
-            print(f"\n[{i}/{len(all_ob_ev_ids)}]", end=" ")
-            result = scrape_fight_page(page, ob_ev_id)
-            if not result:
-                continue
-
-            title = result.get("title", "")
-            markets = result.get("markets", {})
-
-            if not title:
-                print(f"No title found")
-                continue
-
-            print(f"{title} | {list(markets.keys())}")
-
-            # Match to existing fight
-            title_norm = title.lower().replace(" v ", " vs ")
-            matched = None
-            for fname in all_fights:
-                parts = [p.strip() for p in fname.lower().split(" vs ")]
-                if all(p in title_norm for p in parts):
-                    matched = fname
-                    break
-
-            entry = all_fights.get(matched) or {
-                "bookmaker": "WilliamHill",
-                "fight_name": title,
-                "url": f"{BASE}/OB_EV{ob_ev_id}",
-                "markets": {},
-            }
-            for mk, rows in markets.items():
-                if mk not in entry["markets"] or not entry["markets"][mk]:
-                    entry["markets"][mk] = rows
+        # Competition hub links
+        links = page.evaluate("""
+            () => [...new Set(
+                Array.from(document.querySelectorAll('a[href*="/ufc/competitions/"]'))
+                .map(a => a.href)
+                .filter(h => h.includes('/matches'))
+            )]
+        """)
+        for l in links:
+            comp_urls.add(l)
+
+    print(f"\nCompetition hubs: {len(comp_urls)}")
+
+    # Step 2: get OB_EV IDs from each competition hub
+    for comp_url in comp_urls:
+        print(f"\nCompetition: {comp_url}")
+        ids = get_ob_ev_ids(page, comp_url)
+        all_ob_ev_ids.update(ids)
+
+    return all_fights, sorted(all_ob_ev_ids)
+
+def merge_fight_page(all_fights, ob_ev_id, result):
+    """Fold one scraped fight page into the fights found on the list pages."""
+    if not result:
+        return
+
+    title = result.get("title", "")
+    markets = result.get("markets", {})
+
+    if not title:
+        print(f"No title found")
+        return
+
+    print(f"{title} | {list(markets.keys())}")
+
+    # Match to existing fight
+    title_norm = title.lower().replace(" v ", " vs ")
+    matched = None
+    for fname in all_fights:
+        parts = [p.strip() for p in fname.lower().split(" vs ")]
+        if all(p in title_norm for p in parts):
+            matched = fname
+            break
+
+    entry = all_fights.get(matched) or {
+        "bookmaker": "WilliamHill",
+        "fight_name": title,
+        "url": f"{BASE}/OB_EV{ob_ev_id}",
+        "markets": {},
+    }
+    for mk, rows in markets.items():
+        if mk not in entry["markets"] or not entry["markets"][mk]:
+            entry["markets"][mk] = rows
 
-            if matched:
-                all_fights[matched] = entry
-            else:
-                all_fights[title] = entry
-
-        browser.close()
+    if matched:
+        all_fights[matched] = entry
+    else:
+        all_fights[title] = entry
 
+def save_output(all_fights):
     fights = list(all_fights.values())
     out = {
         "generated_at": datetime.now(timezone.utc).isoformat(),
@@ -242,6 +236,25 @@ def main():
     }
     OUT_PATH.parent.mkdir(parents=True, exist_ok=True)
     OUT_PATH.write_text(json.dumps(out, indent=2, ensure_ascii=False), encoding="utf-8")
+    return fights
+
+def main():
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=is_github_actions())
+        page = browser.new_page(viewport={"width": 1400, "height": 900})
+
+        all_fights, all_ob_ev_ids = discover_fights(page)
+
+        print(f"\nTotal fight pages to scrape: {len(all_ob_ev_ids)}")
+
+        # Step 3: scrape each fight page
+        for i, ob_ev_id in enumerate(all_ob_ev_ids, 1):
+            print(f"\n[{i}/{len(all_ob_ev_ids)}]", end=" ")
+            merge_fight_page(all_fights, ob_ev_id, scrape_fight_page(page, ob_ev_id))
+
+        browser.close()
+
+    fights = save_output(all_fights)
 
     print(f"\n✅ Saved {len(fights)} fights")
     for f in fights:
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+file_lock.py
+
+Cross-process lock for the small JSON caches that parallel build steps read,
+merge and rewrite (data/event_url_cache.json, data/fixture_index.json).
+
+run_pipeline.py runs independent steps at the same time, so two processes
+can save the same cache together. Each save takes this lock, re-reads the
+file, merges its own changes and replaces the file through a per-process
+temp file. POSIX uses fcntl.flock. Windows, where the .bat files run the
+pipeline, has no fcntl, so msvcrt.locking holds the first byte of the lock
+file instead.
+
+    with locked(CACHE_PATH.with_suffix(".lock")):
+        ...
+"""
+
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+# msvcrt.LK_LOCK gives up after ten one-second tries, so keep retrying.
+WINDOWS_RETRY_SECONDS = 0.1
+
+
+@contextmanager
+def locked(path):
+    """Hold an exclusive lock on path (created if missing) for the block."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a+") as handle:
+        if fcntl is not None:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+        elif msvcrt is not None:
+            handle.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    time.sleep(WINDOWS_RETRY_SECONDS)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+            elif msvcrt is not None:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
@@ -1,42 +1,19 @@
 #!/usr/bin/env python3
 import json
+import os
 import re
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 
-ROOT = Path(__file__).resolve().parents[1]
+from odds_common import FightMatcher, fight_key, nearest_fractional
+from ufc_odds_table import load_table, selection_key
 
-PROP_FILES = [
-    ("PaddyPower", [
-        ROOT / "ufc" / "data" / "props_filtered.json",
-        ROOT / "ufc" / "data" / "props.json",
-    ]),
-    ("BoyleSports", [
-        ROOT / "ufc" / "data" / "boylesports_props_filtered.json",
-        ROOT / "ufc" / "data" / "boylesports_props.json",
-    ]),
-    ("BoyleSports", [
-        ROOT / "ufc" / "data" / "boylesports_moneylines.json",
-    ]),
-    ("BetVictor", [
-        ROOT / "ufc" / "data" / "betvictor_props_filtered.json",
-        ROOT / "ufc" / "data" / "betvictor_props.json",
-    ]),
-    ("Coral", [
-        ROOT / "ufc" / "data" / "coral_props_filtered.json",
-        ROOT / "ufc" / "data" / "coral_props.json",
-    ]),
-    ("BetMGM", [
-        ROOT / "ufc" / "data" / "betmgm_props_filtered.json",
-        ROOT / "ufc" / "data" / "betmgm_props.json",
-    ]),
-    ("Bwin", [
-        ROOT / "ufc" / "data" / "bwin_props.json",
-    ]),
-]
+ROOT = Path(__file__).resolve().parents[1]
 
 EVENTS_PATH = ROOT / "ufc" / "data" / "events.json"
 OUT_PATH = ROOT / "ufc" / "ev-alerts" / "index.html"
+# The spots as data, for build_ev_alerts_all.py.
+ALERTS_JSON_PATH = ROOT / "ufc" / "data" / "ev_alerts.json"
 BASE = "/odds-board"
 
 OUTLIER_THRESHOLD = 5
@@ -71,21 +48,6 @@ def load_json(path):
         return {}
 
 
-def choose_prop_file(paths):
-    for path in paths:
-        data = load_json(path)
-        if not data:
-            continue
-
-        fights = data.get("fights") or []
-        props = data.get("props") or []
-
-        if fights or props:
-            return path, data
-
-    return paths[0], {}
-
-
 def normalize_name(s):
     text = str(s or "").lower()
     text = text.replace("’", "'")
@@ -95,55 +57,11 @@ def normalize_name(s):
     return text
 
 
-def fight_key(name):
-    text = str(name or "").lower()
-    text = text.replace(" versus ", " v ")
-    text = text.replace(" vs. ", " v ")
-    text = text.replace(" vs ", " v ")
-    text = text.replace(" v. ", " v ")
-
-    text = re.sub(r"\([^)]*\)", " ", text)
-    text = re.sub(r"[^a-z0-9\s]", " ", text)
-    text = re.sub(r"\s+", " ", text).strip()
-
-    if " v " in text:
-        left, right = text.split(" v ", 1)
-        parts = sorted([left.strip(), right.strip()])
-        return " v ".join(parts)
-
-    return text
-
-
-def fractional_to_decimal(value):
-    value = str(value or "").strip().upper()
-    if not value:
-        return 0
-
-    if value in {"EVS", "EVENS", "EVEN"}:
-        return 2.0
-
-    if "/" in value:
-        try:
-            a, b = value.split("/", 1)
-            return (float(a) / float(b)) + 1
-        except Exception:
-            return 0
-
-    try:
-        val = float(value)
-        if val > 1:
-            return val
-    except Exception:
-        pass
-
-    return 0
-
-
 def get_upcoming_fight_keys():
     data = load_json(EVENTS_PATH)
     events = data.get("events") or []
     now = datetime.now(timezone.utc)
-    upcoming_keys = set()
+    upcoming_keys = []
 
     for event in events:
         date_str = str(event.get("date") or "").strip()
@@ -173,257 +91,55 @@ def get_upcoming_fight_keys():
                 blue = blue.get("name", "")
 
             if red and blue:
-                upcoming_keys.add(fight_key(f"{red} v {blue}"))
-
-    print(f"Upcoming fight keys from events.json: {len(upcoming_keys)}")
-    return upcoming_keys
-
-
-def canonical_market(label):
-    text = str(label or "").lower()
-
-    if "method" in text or "victory" in text or "winning" in text or "result" in text:
-        return "Method of Victory"
-
-    if "round" in text:
-        return "Rounds"
-
-    if "distance" in text or "go the distance" in text:
-        return "Go The Distance"
-
-    if "fight betting" in text or "bout" in text or "match odds" in text or "moneyline" in text:
-        return "Fight Betting"
-
-    return str(label or "Props").strip() or "Props"
-
-
-def clean_selection(s):
-    return re.sub(r"\s+", " ", str(s or "")).strip()
-
-
-def selection_key(s):
-    text = clean_selection(s).lower()
-
-    # Strip fighter name prefix
-    text = re.sub(r"^[a-z\s\.]+ by ", "", text)
-    text = re.sub(r"^[a-z\s\.]+ via ", "", text)
-    text = re.sub(r"^[a-z\s\.]+\s+-\s+", "", text)
-
-    # Normalise GTD prefix
-    text = re.sub(r"goes?\s+the\s+distance\s*[-\u2013]?\s*", "", text)
-
-    # Normalise rounds
-    text = re.sub(r"\([\d\s\.\-]+\)", "", text)
-    text = re.sub(r"\s+rounds?\b", "", text)
-
-    # Split compound labels on separators
-    text = re.sub(r"[/,]", " ", text)
-    text = re.sub(r"\bor\b", " ", text)
-    text = re.sub(r"\band\b", " ", text)
-
-    # Normalise MOV keywords
-    text = text.replace("knockout", "ko")
-    text = text.replace("tko", "ko")
-    text = text.replace("disqualification", "dq")
-    text = text.replace("submission", "sub")
-    text = text.replace("technical decision", "dec")
-    text = text.replace("technical dec", "dec")
-    text = text.replace("unanimous decision", "dec")
-    text = text.replace("unanimous", "dec")
-    text = text.replace("split decision", "dec")
-    text = text.replace("split", "dec")
-    text = text.replace("majority decision", "dec")
-    text = text.replace("majority", "dec")
-    text = text.replace("decision", "dec")
-    text = text.replace("points", "dec")
+                upcoming_keys.append(fight_key(f"{red} v {blue}"))
 
-    # Canonicalise compound MOV
-    has_ko  = "ko" in text.split()
-    has_sub = "sub" in text.split()
-    has_dec = "dec" in text.split() or "dq" in text.split()
+    upcoming = FightMatcher(upcoming_keys)
+    print(f"Upcoming fight keys from events.json: {len(upcoming)}")
+    return upcoming
 
-    if has_ko or has_sub or has_dec:
-        if not any(x in text for x in ["over", "under", "round", "yes", "no", ".5", ".0"]):
-            if has_ko and has_sub:
-                text = "ko"
-            elif has_ko:
-                text = "ko"
-            elif has_sub:
-                text = "sub"
-            else:
-                text = "dec"
 
-    text = re.sub(r"[^a-z0-9\s\.]", " ", text)
-    text = re.sub(r"\s+", " ", text).strip()
-    return text
-
-
-def extract_rows_from_fight(default_bookmaker, fight, upcoming_keys):
-    rows = []
-
-    bookmaker = fight.get("bookmaker") or default_bookmaker
-    fight_name = (
-        fight.get("fight")
-        or fight.get("fight_name")
-        or fight.get("name")
-        or fight.get("match")
-        or ""
-    )
-
-    if not fight_name:
-        return rows
-
-    fkey = fight_key(fight_name)
-
-    if APPLY_UPCOMING_FILTER and upcoming_keys and fkey not in upcoming_keys:
-        return rows
-
-    def add_rows(market_label, items):
-        if not items:
-            return
-
-        if isinstance(items, dict):
-            possible = []
-            for val in items.values():
-                if isinstance(val, list):
-                    possible.extend(val)
-            items = possible
-
-        if not isinstance(items, list):
-            return
-
-        for item in items:
-            if not isinstance(item, dict):
-                continue
-
-            sel = (
-                item.get("selection")
-                or item.get("name")
-                or item.get("runner")
-                or item.get("outcome")
-                or ""
-            )
-            odds = (
-                item.get("odds")
-                or item.get("price")
-                or item.get("fractional")
-                or item.get("decimal")
-                or ""
-            )
-
-            if not sel or not odds:
-                continue
-
-            dec = fractional_to_decimal(odds)
-            if dec <= 1.0:
-                continue
-
-            # Exclude Draw from UFC markets
-            if clean_selection(sel).lower().strip() in ("draw", "a draw"):
-                continue
-
-            rows.append({
-                "fight": fight_name,
-                "fight_key": fkey,
-                "bookmaker": bookmaker,
-                "market": canonical_market(market_label),
-                "selection": clean_selection(sel),
-                "selection_key": selection_key(sel),
-                "odds": str(odds),
-                "decimal": dec,
-            })
-
-    markets = fight.get("markets") or {}
-
-    if isinstance(markets, dict):
-        for market_label, items in markets.items():
-            add_rows(market_label, items)
+def upcoming_fight_key(fight_name, upcoming):
+    """
+    Key a prop fight by the events.json fight it matches.
 
-        add_rows("Fight Betting", markets.get("fight_betting"))
-        add_rows("Method of Victory", markets.get("method_of_victory"))
-        add_rows("Rounds", markets.get("rounds"))
-        add_rows("Rounds", markets.get("total_rounds"))
-        add_rows("Go The Distance", markets.get("go_the_distance"))
+    Books that spell a fighter differently then land on the same key, so
+    their prices are compared. Unmatched fights keep their own key, or are
+    dropped (None) when the upcoming filter is on.
+    """
+    fkey = upcoming.event_for(fight_name) if upcoming else None
 
-    add_rows("Method of Victory", fight.get("method_props"))
-    add_rows("Rounds", fight.get("round_props"))
-    add_rows("Rounds", fight.get("total_rounds"))
-    add_rows("Go The Distance", fight.get("distance_props"))
-    add_rows("Fight Betting", fight.get("fight_betting"))
+    if fkey is None and not (APPLY_UPCOMING_FILTER and upcoming):
+        fkey = fight_key(fight_name)
 
-    return rows
+    return fkey
 
 
-def collect_all_rows(upcoming_keys):
+def collect_all_rows(upcoming):
+    table = load_table()
     all_rows = []
     seen = set()
 
     print("\nReading UFC prop files:")
 
-    for default_bookmaker, paths in PROP_FILES:
-        path, data = choose_prop_file(paths)
-
-        fights = data.get("fights") or []
-        props = data.get("props") or []
-
+    for source in table.sources:
         before = len(all_rows)
         fight_names = set()
 
-        print(f"\n{default_bookmaker}")
-        print(f"  file: {path}")
-        print(f"  fights in file: {len(fights)}")
-        print(f"  flat props in file: {len(props)}")
-
-        for fight in fights:
-            rows = extract_rows_from_fight(default_bookmaker, fight, upcoming_keys)
-
-            for row in rows:
-                key = (
-                    row["bookmaker"],
-                    row["fight_key"],
-                    row["market"],
-                    row["selection_key"],
-                    row["odds"],
-                )
-                if key in seen:
-                    continue
-                seen.add(key)
-                all_rows.append(row)
-                fight_names.add(row["fight"])
-
-        for prop in props:
-            if not isinstance(prop, dict):
-                continue
+        print(f"\n{source['bookmaker']}")
+        print(f"  file: {ROOT / source['path']}")
+        print(f"  fights in file: {source['fights']}")
+        print(f"  flat props in file: {source['props']}")
 
-            bookmaker = prop.get("bookmaker") or default_bookmaker
-            fight_name = prop.get("fight") or prop.get("fight_name") or prop.get("match") or ""
-            market = prop.get("market") or prop.get("market_name") or "Props"
-            sel = prop.get("selection") or prop.get("name") or prop.get("runner") or ""
-            odds = prop.get("odds") or prop.get("price") or prop.get("fractional") or prop.get("decimal") or ""
+        for row in table.rows(range(*source["rows"])):
+            fkey = upcoming_fight_key(row["fight"], upcoming)
 
-            if not fight_name or not sel or not odds:
+            if fkey is None:
                 continue
 
-            fkey = fight_key(fight_name)
-
-            if APPLY_UPCOMING_FILTER and upcoming_keys and fkey not in upcoming_keys:
-                continue
-
-            dec = fractional_to_decimal(odds)
-            if dec <= 1.0:
-                continue
-
-            row = {
-                "fight": fight_name,
-                "fight_key": fkey,
-                "bookmaker": bookmaker,
-                "market": canonical_market(market),
-                "selection": clean_selection(sel),
-                "selection_key": selection_key(sel),
-                "odds": str(odds),
-                "decimal": dec,
-            }
-
+            if fkey != row["fight_key"]:
+                # Name the fighter as the events.json fight spells it.
+                row["selection_key"] = selection_key(row["selection"], fkey)
+            row["fight_key"] = fkey
             key = (
                 row["bookmaker"],
                 row["fight_key"],
@@ -436,7 +152,7 @@ def collect_all_rows(upcoming_keys):
 
             seen.add(key)
             all_rows.append(row)
-            fight_names.add(fight_name)
+            fight_names.add(row["fight"])
 
         added = len(all_rows) - before
         print(f"  rows collected: {added}")
@@ -514,6 +230,53 @@ def find_value_spots(rows):
     return spots
 
 
+def spot_alert(spot):
+    """One value spot in the shape of football/data/ev_alerts.json alerts.
+
+    value_percent is the best price over the plain average of every price,
+    the best included and margin left in. It is not a no-vig EV, so the
+    fields are not named like football's ev_percent and fair odds.
+    """
+    return {
+        "sport": "UFC",
+        "competition": "UFC",
+        "market": spot["market"],
+        "type": "props",
+        "match": spot["fight"],
+        "fight_key": spot["fight_key"],
+        "selection": spot["selection"],
+        "selection_key": spot["selection_key"],
+        "bookmaker": spot["bookmaker"],
+        "bookmaker_odds": spot["odds"],
+        "bookmaker_decimal_odds": round(spot["decimal"], 3),
+        "average_decimal_odds": round(spot["avg_decimal"], 3),
+        "average_fractional_odds": nearest_fractional(spot["avg_decimal"]),
+        "value_percent": round(spot["value_pct"], 3),
+        "bookmaker_count": spot["book_count"],
+        "all_prices": spot["all_prices"],
+    }
+
+
+def write_alerts_json(spots, row_count):
+    output = {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        # The card these spots were keyed against; build_ev_alerts_all.py
+        # compares it with events.json to spot a stale file.
+        "events_generated_at": load_json(EVENTS_PATH).get("generated_at"),
+        "sport": "UFC",
+        "min_value_percent": OUTLIER_THRESHOLD,
+        "upcoming_filter": APPLY_UPCOMING_FILTER,
+        "prop_row_count": row_count,
+        "alert_count": len(spots),
+        "alerts": [spot_alert(spot) for spot in spots],
+    }
+
+    ALERTS_JSON_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp = ALERTS_JSON_PATH.with_name(ALERTS_JSON_PATH.name + ".tmp")
+    tmp.write_text(json.dumps(output, indent=2, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, ALERTS_JSON_PATH)
+
+
 def render_spot_card(spot, index):
     prices_html = ""
 
@@ -994,7 +757,7 @@ def generate_page(spots):
 
 def main():
     print("Loading upcoming fight keys...")
-    upcoming_keys = get_upcoming_fight_keys()
+    upcoming = get_upcoming_fight_keys()
 
     if APPLY_UPCOMING_FILTER:
         print("Upcoming fight filter: ON")
@@ -1002,7 +765,7 @@ def main():
         print("Upcoming fight filter: OFF - scanning all scraped UFC prop fights")
 
     print("Collecting UFC props from scraped bookmaker files...")
-    rows = collect_all_rows(upcoming_keys)
+    rows = collect_all_rows(upcoming)
 
     print("\nFinding EV/value spots...")
     spots = find_value_spots(rows)
@@ -1021,12 +784,15 @@ def main():
         print("  2. Selection names differ too much between bookmakers")
         print("  3. No best price is above the current threshold")
 
+    write_alerts_json(spots, len(rows))
+    print(f"\nWrote EV Alerts JSON: {ALERTS_JSON_PATH}")
+
     html = generate_page(spots)
 
     OUT_PATH.parent.mkdir(parents=True, exist_ok=True)
     OUT_PATH.write_text(html, encoding="utf-8")
 
-    print(f"\nWrote EV Alerts page: {OUT_PATH}")
+    print(f"Wrote EV Alerts page: {OUT_PATH}")
 
 
 if __name__ == "__main__":
@@ -1,30 +1,31 @@
 #!/usr/bin/env python3
 
+import argparse
+import io
 import json
-import re
-import unicodedata
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
 from pathlib import Path
 from datetime import datetime
 from urllib.parse import quote
 
+from odds_common import (
+    FightMatcher,
+    fight_key,
+    fight_slug,
+    fight_tokens,
+    fractional_to_decimal,
+    normalize_person_name,
+)
+from ufc_odds_table import clean_selection, load_table
+
 ROOT = Path(__file__).resolve().parents[1]
 
 EVENTS_JSON = ROOT / "ufc" / "data" / "events.json"
 FIGHTERS_JSON = ROOT / "ufc" / "data" / "fighters.json"
 ODDS_JSON = ROOT / "ufc" / "data" / "odds.json"
 
-PROP_FILES = [
-    ("PaddyPower", ROOT / "ufc" / "data" / "props.json"),
-    ("BoyleSports", ROOT / "ufc" / "data" / "boylesports_props_filtered.json"),
-    ("BoyleSports", ROOT / "ufc" / "data" / "boylesports_moneylines.json"),
-    ("BetVictor", ROOT / "ufc" / "data" / "betvictor_props_filtered.json"),
-    ("Coral", ROOT / "ufc" / "data" / "coral_props.json"),
-    ("Unibet", ROOT / "ufc" / "data" / "unibet_props.json"),
-    ("WilliamHill", ROOT / "ufc" / "data" / "williamhill_props.json"),
-    ("888Sport", ROOT / "ufc" / "data" / "888sport_props.json"),
-    ("Bwin", ROOT / "ufc" / "data" / "bwin_props.json"),
-]
-
 FIGHTS_DIR = ROOT / "ufc" / "fights"
 BASE_PATH = "/odds-board/ufc"
 
@@ -32,6 +33,9 @@ OUTLIER_THRESHOLD_PERCENT = 10
 MIN_VALID_PRICE = 1.06
 DEBUG_PROP_MATCHING = True
 
+# ufc_odds_table markets compared in Best Prop Odds.
+BEST_PROP_MARKETS = ("Method of Victory", "Rounds", "Go The Distance")
+
 
 def html_escape(s):
     if s is None or s == "":
@@ -70,76 +74,8 @@ def build_tracker_href(sport, event_name, market, selection, bookmaker, odds):
     )
 
 
-def slugify(name):
-    name = str(name or "").strip().lower()
-    name = name.replace(" vs ", " v ")
-    name = re.sub(r"[^a-z0-9\s-]", "", name)
-    name = re.sub(r"\s+", "-", name)
-    name = re.sub(r"-+", "-", name)
-    return name.strip("-")
-
-
-def normalize_person_name(name):
-    text = unicodedata.normalize("NFKD", str(name or ""))
-    text = text.encode("ascii", "ignore").decode("ascii")
-    text = text.lower()
-    text = text.replace("'", "")
-    text = text.replace("’", "")
-    text = text.replace(".", "")
-    text = text.replace("-", " ")
-    text = re.sub(r"\([^)]*\)", " ", text)
-    text = re.sub(r'"[^"]*"', " ", text)
-    text = re.sub(r"[^a-z0-9\s]", " ", text)
-    text = re.sub(r"\s+", " ", text).strip()
-    return text
-
-
-def canonical_person_key(name):
-    """
-    Normalises a fighter name for cross-book matching.
-    This fixes books that reverse first/last name order, e.g.
-    William Hill: "Yadong Song" vs ESPN/site: "Song Yadong".
-    """
-    text = normalize_person_name(name)
-    words = [w for w in text.split() if w]
-
-    if not words:
-        return ""
-
-    # Sort words inside the fighter name so reversed first/last names match.
-    # Example: "song yadong" and "yadong song" both become "song yadong".
-    return " ".join(sorted(words))
-
-
-def fight_key(name):
-    text = unicodedata.normalize("NFKD", str(name or ""))
-    text = text.encode("ascii", "ignore").decode("ascii")
-    text = text.lower()
-
-    text = text.replace(" versus ", " v ")
-    text = text.replace(" vs. ", " v ")
-    text = text.replace(" vs ", " v ")
-    text = text.replace(" v. ", " v ")
-    text = text.replace("–", " ")
-    text = text.replace("—", " ")
-
-    text = re.sub(r"\bversus\b", " v ", text)
-    text = re.sub(r"\bvs\b", " v ", text)
-    text = re.sub(r"\s+", " ", text).strip()
-
-    if " v " in text:
-        left, right = text.split(" v ", 1)
-        left = canonical_person_key(left)
-        right = canonical_person_key(right)
-        fighters = sorted([left, right])
-        return " v ".join([f for f in fighters if f])
-
-    return canonical_person_key(text)
-
-
 def loose_fight_tokens(name):
-    key = fight_key(name)
-    return set(re.findall(r"[a-z0-9]+", key))
+    return set(fight_tokens(name))
 
 
 def keys_probably_match(event_name, prop_name):
@@ -153,110 +89,6 @@ def keys_probably_match(event_name, prop_name):
     return len(shared) >= 3
 
 
-def fractional_to_decimal(value):
-    value = str(value or "").strip().upper()
-
-    if not value:
-        return 0
-
-    if value == "EVS":
-        return 2.0
-
-    if "/" in value:
-        try:
-            a, b = value.split("/", 1)
-            return (float(a) / float(b)) + 1
-        except Exception:
-            return 0
-
-    try:
-        val = float(value)
-        if val > 1:
-            return val
-    except Exception:
-        pass
-
-    return 0
-
-
-def clean_selection(selection):
-    text = str(selection or "").strip()
-    text = re.sub(r"\s+", " ", text)
-    text = text.replace("Over (+", "Over ")
-    text = text.replace("Under (+", "Under ")
-    text = text.replace(")", "")
-    text = text.replace("+", "")
-    return text.strip()
-
-
-def selection_key(selection):
-    text = clean_selection(selection).lower()
-
-    # Strip fighter name prefix first ("Fighter by X" / "Fighter - X" / "Fighter via X")
-    text = re.sub(r"^[a-z\s\.]+ by ", "", text)
-    text = re.sub(r"^[a-z\s\.]+ via ", "", text)
-    text = re.sub(r"^[a-z\s\.]+\s+-\s+", "", text)
-    text = re.sub(r"^[a-z\s\.]+ wins? by ", "", text)
-
-    # Normalise fractions
-    text = text.replace("\u00bd", ".5").replace("\u00bc", ".25").replace("\u00be", ".75")
-
-    # Normalise GTD prefix
-    text = re.sub(r"goes?\s+the\s+distance\s*[-\u2013]?\s*", "", text)
-
-    # Normalise rounds: strip bracket ranges and trailing "rounds"
-    text = re.sub(r"\([\d\s\.\-]+\)", "", text)
-    text = re.sub(r"\s+rounds?\b", "", text)
-
-    # Replace all separators (/, comma, "or", "and") with space so compound
-    # labels like "ko, tko or disqualification" become "ko tko dq"
-    text = re.sub(r"[/,]", " ", text)
-    text = re.sub(r"\bor\b", " ", text)
-    text = re.sub(r"\band\b", " ", text)
-
-    # Normalise MOV keywords AFTER splitting on separators
-    text = text.replace("knockout", "ko")
-    text = text.replace("tko", "ko")         # tko -> ko
-    text = text.replace("ko", "ko")
-    text = text.replace("disqualification", "dq")
-    text = text.replace("submission", "sub")
-    text = text.replace("technical decision", "dec")
-    text = text.replace("technical dec", "dec")
-    text = text.replace("unanimous decision", "dec")
-    text = text.replace("unanimous", "dec")
-    text = text.replace("split decision", "dec")
-    text = text.replace("split", "dec")
-    text = text.replace("majority decision", "dec")
-    text = text.replace("majority", "dec")
-    text = text.replace("decision", "dec")
-    text = text.replace("points", "dec")
-
-    # Now canonicalise compound MOV to a single outcome type:
-    # If text contains "ko" -> canonical is "ko" (KO beats everything)
-    # "sub" alone -> "sub"
-    # "dec" or "dq" alone -> "dec"
-    # "ko" + anything -> "ko"
-    has_ko  = "ko" in text.split()
-    has_sub = "sub" in text.split()
-    has_dec = "dec" in text.split() or "dq" in text.split()
-
-    # Only canonicalise MOV compound labels (not round/over/under/yes/no)
-    if has_ko or has_sub or has_dec:
-        if not any(x in text for x in ["over", "under", "round", "yes", "no", ".5", ".0"]):
-            if has_ko and has_sub:
-                text = "ko"   # "ko or submission" -> ko (rarest joint offer)
-            elif has_ko:
-                text = "ko"
-            elif has_sub:
-                text = "sub"
-            else:
-                text = "dec"
-
-    text = re.sub(r"[^a-z0-9\s\.]", "", text)
-    text = re.sub(r"\s+", " ", text).strip()
-    return text
-
-
 def canonical_market_label(label):
     text = str(label or "").lower()
 
@@ -307,115 +139,33 @@ def load_odds():
 
 
 def load_all_props():
-    props_by_key = {}
+    """
+    Props grouped by fight key, and a FightMatcher over those keys.
+
+    Each book's fight entry comes from the shared UFC odds table and carries
+    that book's priced rows for the fight as "odds_rows".
+    """
+    table = load_table()
+    rows_by_book_fight = {}
 
-    def add_item(name, item):
-        if not name:
-            return
+    for row in table.rows():
+        rows_by_book_fight.setdefault((row["bookmaker"], row["fight_key"]), []).append(row)
 
-        key = fight_key(name)
+    props_by_key = {}
+
+    for item in table.items:
+        key = fight_key(item.get("fight_name"))
         if not key:
-            return
+            continue
 
         item = dict(item)
         item["match_key"] = key
+        item["odds_rows"] = rows_by_book_fight.get((item["bookmaker"], key), [])
         props_by_key.setdefault(key, []).append(item)
 
-    for default_bookmaker, path in PROP_FILES:
-        data = load_json(path, {"fights": [], "props": []})
-
-        for fight in data.get("fights", []) or []:
-            bookmaker = fight.get("bookmaker") or default_bookmaker
-            name = fight.get("fight") or fight.get("fight_name") or fight.get("name") or ""
-
-            if not name:
-                continue
-
-            item = dict(fight)
-            item["bookmaker"] = bookmaker
-            item["fight_name"] = name
-
-            markets = item.get("markets")
-            if not isinstance(markets, dict):
-                markets = {}
-
-            normalized_markets = {}
-
-            if markets.get("fight_betting"):
-                normalized_markets["fight_betting"] = markets.get("fight_betting") or []
-
-            if markets.get("method_of_victory"):
-                normalized_markets["method_of_victory"] = markets.get("method_of_victory") or []
-
-            if markets.get("total_rounds"):
-                normalized_markets["total_rounds"] = markets.get("total_rounds") or []
-
-            if markets.get("rounds"):
-                normalized_markets["rounds"] = markets.get("rounds") or []
-
-            if markets.get("go_the_distance"):
-                normalized_markets["go_the_distance"] = markets.get("go_the_distance") or []
-
-            if normalized_markets:
-                item["markets"] = normalized_markets
-
-            add_item(name, item)
-
-        flat_props = data.get("props", []) or []
-        grouped = {}
-
-        for prop in flat_props:
-            name = prop.get("fight") or prop.get("fight_name") or prop.get("name") or ""
-
-            if not name:
-                continue
-
-            bookmaker = prop.get("bookmaker") or default_bookmaker
-            key = (bookmaker, fight_key(name))
-
-            grouped.setdefault(
-                key,
-                {
-                    "bookmaker": bookmaker,
-                    "fight_name": name,
-                    "url": prop.get("url") or "#",
-                    "markets": {
-                        "fight_betting": [],
-                        "method_of_victory": [],
-                        "total_rounds": [],
-                        "go_the_distance": [],
-                    },
-                    "method_props": [],
-                    "round_props": [],
-                    "distance_props": [],
-                },
-            )
-
-            market = str(prop.get("market") or "").lower()
-            selection = prop.get("selection")
-            odds = prop.get("odds")
-
-            if not selection or not odds:
-                continue
-
-            row = {"selection": selection, "odds": odds}
-
-            if "fight betting" in market or "moneyline" in market or "winner" in market:
-                grouped[key]["markets"]["fight_betting"].append(row)
-            elif "distance" in market:
-                grouped[key]["markets"]["go_the_distance"].append(row)
-                grouped[key]["distance_props"].append(row)
-            elif "round" in market:
-                grouped[key]["markets"]["total_rounds"].append(row)
-                grouped[key]["round_props"].append(row)
-            elif "method" in market:
-                grouped[key]["markets"]["method_of_victory"].append(row)
-                grouped[key]["method_props"].append(row)
-
-        for item in grouped.values():
-            add_item(item.get("fight_name"), item)
-
-    return props_by_key
+    # Built here, once, so fight pages look props up by token instead of
+    # scanning every prop fight.
+    return props_by_key, FightMatcher(props_by_key)
 
 
 def load_fighter_details():
@@ -432,7 +182,7 @@ def load_fighter_details():
 
     for fighter in iterable:
         if isinstance(fighter, dict) and fighter.get("name"):
-            fighters_by_slug[slugify(fighter["name"])] = fighter
+            fighters_by_slug[fight_slug(fighter["name"])] = fighter
 
     return fighters_by_slug
 
@@ -452,7 +202,7 @@ def get_corner_name(corner):
 
 def normalize_corner(corner):
     name = get_corner_name(corner)
-    return {"name": name or "Fighter", "slug": slugify(name)}
+    return {"name": name or "Fighter", "slug": fight_slug(name)}
 
 
 def enrich_fighter(fighter, fighters_by_slug):
@@ -460,18 +210,18 @@ def enrich_fighter(fighter, fighters_by_slug):
         return {}
 
     name = get_corner_name(fighter)
-    slug = fighter.get("slug") or slugify(name)
+    slug = fighter.get("slug") or fight_slug(name)
 
     details = (
         fighters_by_slug.get(slug)
-        or fighters_by_slug.get(slugify(name))
+        or fighters_by_slug.get(fight_slug(name))
         or {}
     )
 
     merged = dict(fighter)
     merged.update(details)
     merged["name"] = name or details.get("name") or fighter.get("name") or ""
-    merged["slug"] = slugify(merged["name"])
+    merged["slug"] = fight_slug(merged["name"])
 
     return merged
 
@@ -520,13 +270,13 @@ def get_finish_rate(methods):
 
 
 def find_odds_event(red_name, blue_name, odds_events):
-    red_slug = slugify(red_name)
-    blue_slug = slugify(blue_name)
+    red_slug = fight_slug(red_name)
+    blue_slug = fight_slug(blue_name)
     target = {red_slug, blue_slug}
 
     for event in odds_events:
-        home_slug = slugify(event.get("home_team"))
-        away_slug = slugify(event.get("away_team"))
+        home_slug = fight_slug(event.get("home_team"))
+        away_slug = fight_slug(event.get("away_team"))
 
         if {home_slug, away_slug} == target:
             return event
@@ -775,7 +525,7 @@ def get_moneyline_odds_from_props(fighter_name, props):
         for entry in fight_betting:
             sel = entry.get("selection", "")
             if normalize_person_name(sel) == norm_name:
-                dec = fractional_to_decimal(entry.get("odds", ""))
+                dec = fractional_to_decimal(entry.get("odds", ""), 0)
                 if dec > MIN_VALID_PRICE:
                     results.append({
                         "bookmaker": bookmaker,
@@ -907,42 +657,23 @@ def collect_prop_rows(prop_items):
     rows = []
 
     for item in prop_items or []:
-        bookmaker = item.get("bookmaker") or "Bookmaker"
-        markets = item.get("markets") or {}
-
-        def add_rows(label, items):
-            for selection, odds in market_rows_from_structured(items):
-                clean = clean_selection(selection)
-                decimal = fractional_to_decimal(odds)
-
-                if not clean or not odds or decimal <= 0:
-                    continue
-                # Exclude Draw from UFC markets
-                if clean.lower().strip() in ("draw", "a draw"):
-                    continue
-
-                rows.append(
-                    {
-                        "bookmaker": bookmaker,
-                        "market": canonical_market_label(label),
-                        "market_key": market_key(label),
-                        "selection": clean,
-                        "selection_key": selection_key(clean),
-                        "odds": odds,
-                        "decimal": decimal,
-                    }
-                )
-
-        if isinstance(markets, dict):
+        for row in item.get("odds_rows") or []:
             # Fight Betting renders in Bookmaker Props, but stays out of Best Prop Odds
             # because OddsAPI remains the main clean moneyline source.
-            add_rows("Method of Victory", markets.get("method_of_victory"))
-            add_rows("Rounds", markets.get("rounds") or markets.get("total_rounds"))
-            add_rows("Go The Distance?", markets.get("go_the_distance"))
+            if row["market"] not in BEST_PROP_MARKETS:
+                continue
 
-        add_rows("Method of Victory", item.get("method_props"))
-        add_rows("Rounds", item.get("round_props"))
-        add_rows("Go The Distance?", item.get("distance_props"))
+            rows.append(
+                {
+                    "bookmaker": row["bookmaker"],
+                    "market": canonical_market_label(row["market"]),
+                    "market_key": market_key(row["market"]),
+                    "selection": row["selection"],
+                    "selection_key": row["selection_key"],
+                    "odds": row["odds"],
+                    "decimal": row["decimal"],
+                }
+            )
 
     return rows
 
@@ -952,16 +683,9 @@ def get_best_prop_rows_with_value(prop_items):
     grouped = {}
 
     for row in rows:
-        # For MOV, include a fighter indicator so McGregor KO and Holloway KO
-        # don't get merged into the same group
-        sel_lower = row["selection"].lower()
-        if row["market_key"] == "method_of_victory":
-            # Extract first word(s) before "by" or "-" as fighter indicator
-            m = re.match(r"^([a-z\s\.]+?)(?:\s+by\s+|\s+-\s+|\s+via\s+)", sel_lower)
-            fighter_indicator = m.group(1).strip().split()[-1] if m else ""
-        else:
-            fighter_indicator = ""
-        key = (row["market_key"], fighter_indicator, row["selection_key"])
+        # selection_key names the fighter, so McGregor KO and Holloway KO
+        # stay apart.
+        key = (row["market_key"], row["selection_key"])
         grouped.setdefault(key, []).append(row)
 
     best_rows = []
@@ -1430,28 +1154,29 @@ def fighter_panel(fighter, odds_event, corner_label, props=None):
     """
 
 
-def get_matched_props(red_name, blue_name, props_by_key):
-    title_a = f"{red_name} v {blue_name}"
-    title_b = f"{blue_name} v {red_name}"
-
-    key_a = fight_key(title_a)
-    key_b = fight_key(title_b)
+def get_matched_props(red_name, blue_name, props_by_key, matcher=None):
+    """
+    Props for one fight, with the keys tried and "exact", "loose" or "none".
 
-    matched = []
+    Exact key matches come first. Because fight_key() sorts name words, this
+    catches cases like Song Yadong vs Yadong Song. The loose fallback is for
+    ESPN/site and bookmaker spelling names slightly differently; see
+    FightMatcher. Pass the matcher from load_all_props() so the token index
+    is built once per run rather than per fight.
+    """
+    if matcher is None:
+        matcher = FightMatcher(props_by_key)
 
-    # Exact key matches first. Because fight_key() now sorts name words,
-    # this catches cases like Song Yadong vs Yadong Song.
-    if key_a in props_by_key:
-        matched.extend(props_by_key[key_a])
+    key_a = fight_key(f"{red_name} v {blue_name}")
+    key_b = fight_key(f"{blue_name} v {red_name}")
 
-    if key_b in props_by_key:
-        matched.extend(props_by_key[key_b])
+    match_type, keys = matcher.props_for(red_name, blue_name)
 
-    def dedupe(items):
-        seen = set()
-        out = []
+    seen = set()
+    matched = []
 
-        for item in items:
+    for key in keys:
+        for item in props_by_key[key]:
             sig = (
                 item.get("bookmaker"),
                 item.get("fight_name") or item.get("fight") or item.get("name"),
@@ -1461,46 +1186,12 @@ def get_matched_props(red_name, blue_name, props_by_key):
                 continue
 
             seen.add(sig)
-            out.append(item)
-
-        return out
-
-    matched = dedupe(matched)
-
-    if matched:
-        return matched, key_a, key_b, "exact"
+            matched.append(item)
 
-    # Loose fallback: useful when ESPN/site and bookmaker spell names slightly differently.
-    loose_matches = []
-    target_tokens = loose_fight_tokens(title_a)
+    return matched, key_a, key_b, match_type
 
-    for key, items in props_by_key.items():
-        prop_tokens = loose_fight_tokens(key)
 
-        if not target_tokens or not prop_tokens:
-            continue
-
-        shared = target_tokens.intersection(prop_tokens)
-
-        # Strong overlap: normally means same two-fighter matchup.
-        if len(shared) >= 3:
-            loose_matches.extend(items)
-            continue
-
-        # For very short names, allow 2 shared tokens when one side is a 2-word fighter
-        # and the other side clearly shares an opponent.
-        if len(shared) >= 2 and len(target_tokens) <= 4:
-            loose_matches.extend(items)
-
-    loose_matches = dedupe(loose_matches)
-
-    if loose_matches:
-        return loose_matches, key_a, key_b, "loose"
-
-    return [], key_a, key_b, "none"
-
-
-def build_fight_page(event, fight, fight_id, fighters_by_slug, odds_events, props_by_key):
+def build_fight_page(event, fight, fight_id, fighters_by_slug, odds_events, props_by_key, prop_matcher=None):
     event_slug = event.get("slug", "")
     event_name = html_escape(event.get("name", "Event"))
 
@@ -1514,7 +1205,9 @@ def build_fight_page(event, fight, fight_id, fighters_by_slug, odds_events, prop
 
     title = f"{red_name} vs {blue_name}"
 
-    props, lookup_a, lookup_b, match_type = get_matched_props(red_name, blue_name, props_by_key)
+    props, lookup_a, lookup_b, match_type = get_matched_props(
+        red_name, blue_name, props_by_key, prop_matcher
+    )
 
     if DEBUG_PROP_MATCHING:
         print("")
@@ -2455,11 +2148,47 @@ def build_fight_page(event, fight, fight_id, fighters_by_slug, odds_events, prop
 """
 
 
+# Shared inputs for worker processes, set once per worker by _init_worker.
+_WORKER_INPUTS = None
+
+
+def _init_worker(fighters_by_slug, odds_events, props_by_key, prop_matcher):
+    global _WORKER_INPUTS
+    _WORKER_INPUTS = (fighters_by_slug, odds_events, props_by_key, prop_matcher)
+
+
+def _build_fight_page_in_worker(task):
+    """Render one fight; return its html and the debug output it printed."""
+    event, fight, fight_id = task
+    log = io.StringIO()
+
+    with redirect_stdout(log):
+        html = build_fight_page(event, fight, fight_id, *_WORKER_INPUTS)
+
+    return html, log.getvalue()
+
+
+def write_page(path, html):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(html, encoding="utf-8")
+    os.replace(tmp, path)
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Generate UFC fight pages")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="render fights in this many processes",
+    )
+    args = parser.parse_args()
+
     events = load_events()
     fighters_by_slug = load_fighter_details()
     odds_events = load_odds()
-    props_by_key = load_all_props()
+    props_by_key, prop_matcher = load_all_props()
 
     print(f"✅ Loaded {len(events)} events")
     print(f"✅ Loaded {len(odds_events)} OddsAPI moneyline events")
@@ -2480,6 +2209,7 @@ def main():
 
     fights_written = 0
     missing_ids = 0
+    tasks = []
 
     for event in events:
         if not event.get("slug"):
@@ -2492,20 +2222,35 @@ def main():
                 missing_ids += 1
                 continue
 
-            out_dir = FIGHTS_DIR / fight_id
-            out_dir.mkdir(parents=True, exist_ok=True)
+            tasks.append((event, fight, fight_id))
 
-            html = build_fight_page(
-                event,
-                fight,
-                fight_id,
-                fighters_by_slug,
-                odds_events,
-                props_by_key,
-            )
+    inputs = (fighters_by_slug, odds_events, props_by_key, prop_matcher)
+
+    if args.workers > 1 and len(tasks) > 1:
+        executor = ProcessPoolExecutor(
+            max_workers=min(args.workers, len(tasks)),
+            initializer=_init_worker,
+            initargs=inputs,
+        )
+        results = executor.map(_build_fight_page_in_worker, tasks, chunksize=4)
+    else:
+        executor = None
+        results = (
+            (build_fight_page(event, fight, fight_id, *inputs), "")
+            for event, fight, fight_id in tasks
+        )
+
+    try:
+        for (_, _, fight_id), (html, log) in zip(tasks, results):
+            # Worker debug output is replayed here so it stays in fight order.
+            if log:
+                print(log, end="")
 
-            (out_dir / "index.html").write_text(html, encoding="utf-8")
+            write_page(FIGHTS_DIR / fight_id / "index.html", html)
             fights_written += 1
+    finally:
+        if executor:
+            executor.shutdown()
 
     print(f"✅ Wrote {fights_written} fight pages to {FIGHTS_DIR}")
 
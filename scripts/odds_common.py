@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+"""
+odds_common.py
+
+Shared odds conversion and name normalisation for the football and UFC
+analyzers and generators.
+
+Every build script used to carry its own copy of fractional_to_decimal,
+normalize_team, fixture_key, slugify and fight_key. The copies had drifted
+apart. Some returned 0 on a bad price and others None. Some rounded fractions
+and others did not. "Bosnia-Herzegovina", "Trinidad & Tobago" and reversed
+fighter names ("Yadong Song" / "Song Yadong") keyed differently depending on
+which script read them, so fixtures failed to join. This module is the single
+copy.
+
+The same few thousand prices and names are converted millions of times per
+build. So the regexes are compiled once, the usual fractional prices are looked
+up in a precomputed table, and every conversion is memoised with an LRU cache.
+
+Football scripts live one level down, so they put scripts/ on sys.path before
+importing this module:
+
+    from odds_common import fractional_to_decimal, fixture_key
+
+FightMatcher joins bookmaker prop fights to events.json fights when the two
+spell a fighter differently, without scanning every fight for every lookup.
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+from difflib import SequenceMatcher
+from fractions import Fraction
+from functools import lru_cache
+
+CACHE_SIZE = 1 << 16
+
+# Two spellings of one fighter ("Khamzat Chimaev" / "Khamzat Chimayev") are
+# at least this alike once put through canonical_person_key.
+SAME_FIGHTER_RATIO = 0.85
+
+EVENS = frozenset({"EVS", "EVENS", "EVEN"})
+
+# Readable fractional ladder, ascending. nearest_fractional() snaps to it.
+COMMON_FRACTIONS = (
+    (1, 20), (1, 16), (1, 14), (1, 12), (1, 10), (1, 8), (1, 7),
+    (1, 6), (1, 5), (2, 9), (1, 4), (2, 7), (3, 10), (1, 3),
+    (4, 11), (2, 5), (4, 9), (1, 2), (8, 15), (4, 7), (8, 13),
+    (4, 6), (8, 11), (4, 5), (5, 6), (10, 11), (1, 1), (11, 10),
+    (6, 5), (5, 4), (11, 8), (6, 4), (13, 8), (7, 4), (15, 8),
+    (2, 1), (21, 10), (11, 5), (9, 4), (12, 5), (5, 2), (13, 5),
+    (11, 4), (3, 1), (10, 3), (7, 2), (4, 1), (9, 2), (5, 1),
+    (11, 2), (6, 1), (7, 1), (8, 1), (9, 1), (10, 1), (11, 1),
+    (12, 1), (14, 1), (16, 1), (20, 1), (25, 1), (28, 1), (33, 1),
+    (40, 1), (50, 1), (60, 1),
+)
+
+
+def _fraction_price(num: float, den: float) -> float:
+    return round((num / den) + 1, 6)
+
+
+# "5/2" -> 3.5 for every price a bookmaker is likely to quote, so the common
+# case is one dict lookup.
+FRACTION_TABLE: dict[str, float] = {value: 2.0 for value in EVENS}
+FRACTION_TABLE.update(
+    (f"{num}/{den}", _fraction_price(num, den))
+    for den in (*range(1, 21), 25, 30, 40, 50, 100)
+    for num in range(1, 101)
+)
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+_NON_ALNUM_SPACE = re.compile(r"[^a-z0-9\s]")
+_NON_SLUG = re.compile(r"[^a-z0-9\s-]")
+_WHITESPACE = re.compile(r"\s+")
+_HYPHENS = re.compile(r"-+")
+_PARENTHESISED = re.compile(r"\([^)]*\)")
+_QUOTED = re.compile(r'"[^"]*"')
+_VERSUS_WORD = re.compile(r"\b(?:versus|vs)\b")
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+# ── Prices ─────────────────────────────────────────────────────────────────────
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _parse_price(value: str) -> float | None:
+    if "/" in value:
+        try:
+            num, den = value.split("/", 1)
+            return _fraction_price(float(num), float(den))
+        except (ValueError, ZeroDivisionError):
+            return None
+    try:
+        decimal = float(value)
+    except ValueError:
+        return None
+    return decimal if decimal > 1 else None
+
+
+def fractional_to_decimal(value, default=None):
+    """Decimal odds for "5/2", "EVS" or "3.5"; default when not a price."""
+    value = str(value or "").strip().upper()
+    price = FRACTION_TABLE.get(value)
+    if price is None:
+        price = _parse_price(value)
+    return default if price is None else price
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _decimal_to_fractional(value: str) -> str:
+    if "/" in value or value.upper() in EVENS:
+        return value
+    try:
+        dec = float(value)
+        if dec <= 1:
+            return value
+        frac = Fraction(dec - 1).limit_denominator(100)
+    except (ValueError, OverflowError):
+        return value
+    return f"{frac.numerator}/{frac.denominator}"
+
+
+def decimal_to_fractional(value) -> str:
+    """Closest fraction with denominator <= 100, e.g. 1.364 -> 4/11.
+
+    Fractional and unparseable values are returned unchanged.
+    """
+    return _decimal_to_fractional(str(value or "").strip())
+
+
+_LADDER = tuple((num / den, "EVS" if num == den else f"{num}/{den}") for num, den in COMMON_FRACTIONS)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def nearest_fractional(decimal_odds) -> str:
+    """Snap decimal odds to the readable COMMON_FRACTIONS ladder."""
+    if not decimal_odds or decimal_odds <= 1:
+        return ""
+    frac = decimal_odds - 1
+    return min(_LADDER, key=lambda step: abs(step[0] - frac))[1]
+
+
+# ── Football teams and fixtures ────────────────────────────────────────────────
+
+TEAM_DISPLAY_NAMES = {
+    "Bosnia and Herzegovina": "Bosnia & Herzegovina",
+    "Czech Republic": "Czechia",
+    "Turkey": "Türkiye",
+    "Turkiye": "Türkiye",
+    "Curaçao": "Curacao",
+}
+
+# Applied in order to the lower-cased name, before punctuation is dropped.
+_TEAM_REPLACEMENTS = (
+    ("&", "and"),
+    ("türkiye", "turkiye"),
+    ("turkey", "turkiye"),
+    ("curaçao", "curacao"),
+    ("czech republic", "czechia"),
+    ("bosnia and herzegovina", "bosnia"),
+    ("cape verde islands", "cape verde"),
+    ("congo dr", "dr congo"),
+)
+
+# Whole-key aliases, for spellings the replacements cannot reach.
+_TEAM_KEYS = {
+    "bosnia herzegovina": "bosnia",
+    "bosnia and": "bosnia",
+}
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def display_team(name) -> str:
+    name = str(name or "").strip()
+    return TEAM_DISPLAY_NAMES.get(name, name)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def normalize_team(name) -> str:
+    """Join key for a team name: "Bosnia-Herzegovina" -> "bosnia"."""
+    name = str(name or "").lower().strip()
+    for old, new in _TEAM_REPLACEMENTS:
+        name = name.replace(old, new)
+    name = _NON_ALNUM.sub(" ", name).strip()
+    return _TEAM_KEYS.get(name, name)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def fixture_key(home, away) -> str:
+    return f"{normalize_team(home)}__{normalize_team(away)}"
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def loose_fixture_key(home, away) -> str:
+    """Fixture key that ignores home/away order."""
+    return "__".join(sorted([normalize_team(home), normalize_team(away)]))
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def slugify(text) -> str:
+    """Football page slug: "Bosnia & Herzegovina" -> "bosnia-and-herzegovina"."""
+    text = str(text or "").lower().replace("&", "and")
+    return _NON_ALNUM.sub("-", text).strip("-")
+
+
+# ── UFC fighters and fights ────────────────────────────────────────────────────
+
+@lru_cache(maxsize=CACHE_SIZE)
+def fight_slug(name) -> str:
+    """UFC page slug: "Max Holloway vs Conor McGregor" -> "max-holloway-v-conor-mcgregor".
+
+    Published fight and fighter URLs are built from this, so it must not
+    change.
+    """
+    name = str(name or "").strip().lower()
+    name = name.replace(" vs ", " v ")
+    name = _NON_SLUG.sub("", name)
+    name = _WHITESPACE.sub("-", name)
+    name = _HYPHENS.sub("-", name)
+    return name.strip("-")
+
+
+def _ascii_lower(text) -> str:
+    text = unicodedata.normalize("NFKD", str(text or ""))
+    return text.encode("ascii", "ignore").decode("ascii").lower()
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def normalize_person_name(name) -> str:
+    """Accent-, nickname- and punctuation-free fighter name."""
+    text = _ascii_lower(name)
+    text = text.replace("'", "").replace("’", "").replace(".", "").replace("-", " ")
+    text = _PARENTHESISED.sub(" ", text)
+    text = _QUOTED.sub(" ", text)
+    text = _NON_ALNUM_SPACE.sub(" ", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def canonical_person_key(name) -> str:
+    """
+    Normalises a fighter name for cross-book matching.
+    This fixes books that reverse first/last name order, e.g.
+    William Hill: "Yadong Song" vs ESPN/site: "Song Yadong".
+    """
+    return " ".join(sorted(normalize_person_name(name).split()))
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def fight_key(name) -> str:
+    """Order-free key for "A v B" / "A vs. B" / "A versus B"."""
+    text = _ascii_lower(name)
+    for old in (" versus ", " vs. ", " vs ", " v. "):
+        text = text.replace(old, " v ")
+    text = text.replace("–", " ").replace("—", " ")
+    text = _VERSUS_WORD.sub(" v ", text)
+    text = _WHITESPACE.sub(" ", text).strip()
+
+    if " v " in text:
+        left, right = text.split(" v ", 1)
+        fighters = sorted([canonical_person_key(left), canonical_person_key(right)])
+        return " v ".join(f for f in fighters if f)
+
+    return canonical_person_key(text)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def fight_tokens(name) -> frozenset:
+    """Words of fight_key(name), including the "v" between the fighters."""
+    return frozenset(_TOKEN.findall(fight_key(name)))
+
+
+def fights_probably_match(shared: int, event_tokens: int) -> bool:
+    """Loose rule for an event fight and a prop fight sharing `shared` tokens.
+
+    Three shared tokens normally means the same matchup. Two are enough when
+    the event title is short (two two-word fighters) and so cannot share more.
+    Both counts include the "v", so one shared fighter can pass. That is fine
+    for listing props on a fight page, but not for keying prices: use
+    same_fight() there.
+    """
+    return shared >= 3 or (shared >= 2 and event_tokens <= 4)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def same_fighter(first, second) -> bool:
+    """Whether two canonical_person_key names are one fighter.
+
+    Equal keys match, as do a name and a longer form of it ("pereira" /
+    "alex pereira") and near spellings (SAME_FIGHTER_RATIO).
+    """
+    if first == second:
+        return True
+    first_tokens, second_tokens = set(first.split()), set(second.split())
+    if first_tokens and second_tokens and (
+        first_tokens <= second_tokens or second_tokens <= first_tokens
+    ):
+        return True
+    return SequenceMatcher(None, first, second).ratio() >= SAME_FIGHTER_RATIO
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def same_fight(first, second) -> bool:
+    """Strict rule: both fighters of one fight match the other's, either way round."""
+    first_sides = fight_key(first).split(" v ")
+    second_sides = fight_key(second).split(" v ")
+    if len(first_sides) != 2 or len(second_sides) != 2:
+        return False
+    (a, b), (c, d) = first_sides, second_sides
+    return (same_fighter(a, c) and same_fighter(b, d)) or (
+        same_fighter(a, d) and same_fighter(b, c)
+    )
+
+
+class FightMatcher:
+    """
+    Inverted index from fight-name tokens to fight keys.
+
+    Built once over either side of the join:
+
+        FightMatcher(props_by_key).props_for("Red", "Blue")
+            -> prop keys for one event fight (the fight pages)
+        FightMatcher(event_keys).event_for("Blue v Red")
+            -> the event key for one prop fight (EV alerts, arbitrage)
+
+    Exact fight_key() matches win. Otherwise candidates are the keys sharing
+    a name token with the query, scored by shared name tokens. props_for()
+    keeps those that pass the loose fights_probably_match(), which only
+    decides what a fight page lists. event_for() keys prices, so it needs
+    same_fight(): both fighters must match. Results are cached per fight.
+    """
+
+    SEPARATOR = "v"
+
+    def __init__(self, keys):
+        self.keys = list(dict.fromkeys(keys))
+        self._position = {key: i for i, key in enumerate(self.keys)}
+        self._tokens = {key: fight_tokens(key) for key in self.keys}
+        self._index: dict[str, list[str]] = {}
+        for key in self.keys:
+            for token in self._tokens[key]:
+                # Every key has the separator, so indexing it would make
+                # every key a candidate again.
+                if token != self.SEPARATOR:
+                    self._index.setdefault(token, []).append(key)
+        self._props: dict[tuple[str, str], tuple[str, list[str]]] = {}
+        self._events: dict[str, str | None] = {}
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __contains__(self, key):
+        return key in self._position
+
+    def ranked(self, name) -> list[tuple[str, int]]:
+        """(key, shared name tokens) for keys sharing a name token, best first.
+
+        The "v" separator is not counted. Ties keep the order the keys were
+        given in.
+        """
+        shared: dict[str, int] = {}
+        for token in fight_tokens(name):
+            for key in self._index.get(token, ()):
+                shared[key] = shared.get(key, 0) + 1
+        return sorted(shared.items(), key=lambda item: (-item[1], self._position[item[0]]))
+
+    def props_for(self, red_name, blue_name) -> tuple[str, list[str]]:
+        """Keys matching one event fight, with "exact", "loose" or "none".
+
+        Keys come back in the order they were given in.
+        """
+        cache_key = (red_name, blue_name)
+        if cache_key not in self._props:
+            title = f"{red_name} v {blue_name}"
+            exact = [
+                key
+                for key in dict.fromkeys((fight_key(title), fight_key(f"{blue_name} v {red_name}")))
+                if key in self._position
+            ]
+            if exact:
+                result = ("exact", exact)
+            else:
+                size = len(fight_tokens(title))
+                # The display rule counts the shared "v" as well.
+                loose = sorted(
+                    (
+                        key
+                        for key, shared in self.ranked(title)
+                        if fights_probably_match(shared + (self.SEPARATOR in self._tokens[key]), size)
+                    ),
+                    key=self._position.__getitem__,
+                )
+                result = ("loose" if loose else "none", loose)
+            self._props[cache_key] = result
+        return self._props[cache_key]
+
+    def event_for(self, name) -> str | None:
+        """The key for one prop fight name, or None.
+
+        Prices are keyed by this, so both fighters must match (same_fight).
+        """
+        key = fight_key(name)
+        if key in self._position:
+            return key
+        if name not in self._events:
+            self._events[name] = next(
+                (event for event, _ in self.ranked(name) if same_fight(name, event)),
+                None,
+            )
+        return self._events[name]
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+telemetry.py
+
+Per-stage counters for the scrapers and build scripts.
+
+A script imports this module and reports what it did:
+
+    import telemetry
+
+    telemetry.watch_context(context)     # pages, navigations, clicks, bytes
+    telemetry.watch_page(page)           # the same, for browser.new_page()
+    telemetry.count("retries")
+    telemetry.count_output(output)       # fixtures, markets, selections
+
+Counting is always on and costs a dict update. The totals only leave the
+process when one of these is set:
+
+    TELEMETRY_COUNTERS=<path>   run_pipeline.py sets this per step. At exit
+                                the counters, CPU time and peak RSS are
+                                written to <path> and the runner folds them
+                                into that step's line in the run log.
+    TELEMETRY_LOG=<path>        for runs outside the pipeline, e.g. from a
+                                .bat file. At exit one stage record is
+                                appended to the JSONL file at <path>.
+                                TELEMETRY_RUN and TELEMETRY_STAGE name the
+                                run and stage (default: today and the script).
+
+Bytes are the Content-Length of every response the browser received, so
+chunked responses without one are not counted. Clicks are counted in the
+page with a capture-phase listener, so scripted element.click() calls count
+as well as Playwright clicks.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+COUNTERS = (
+    "pages",
+    "navigations",
+    "clicks",
+    "bytes",
+    "fixtures",
+    "markets",
+    "selections",
+    "retries",
+)
+
+_COUNTS = {name: 0 for name in COUNTERS}
+_LOCK = threading.Lock()
+_STARTED = time.perf_counter()
+
+CLICK_BINDING = "__btbTelemetryClick"
+CLICK_LISTENER_JS = f"""
+document.addEventListener("click", () => {{
+    try {{ window.{CLICK_BINDING}(); }} catch (error) {{}}
+}}, true);
+"""
+
+
+def count(name: str, amount: int = 1) -> None:
+    """Add amount to one counter. Thread safe; unknown names are kept too."""
+    with _LOCK:
+        _COUNTS[name] = _COUNTS.get(name, 0) + int(amount)
+
+
+def counts() -> dict[str, int]:
+    with _LOCK:
+        return dict(_COUNTS)
+
+
+def count_output(payload) -> None:
+    """Count fixtures, markets and selections in a scraper's output JSON.
+
+    Understands the shapes the scrapers write: a list of fixtures, or a dict
+    with "matches", "fixtures" or "events", each fixture carrying "markets"
+    and each market "selections".
+    """
+    if isinstance(payload, dict):
+        payload = (
+            payload.get("matches")
+            or payload.get("fixtures")
+            or payload.get("events")
+            or []
+        )
+    if not isinstance(payload, list):
+        return
+
+    fixtures = markets = selections = 0
+    for fixture in payload:
+        if not isinstance(fixture, dict):
+            continue
+        fixtures += 1
+        for market in fixture.get("markets") or []:
+            if not isinstance(market, dict):
+                continue
+            markets += 1
+            selections += len(market.get("selections") or [])
+
+    count("fixtures", fixtures)
+    count("markets", markets)
+    count("selections", selections)
+
+
+# ── Playwright ─────────────────────────────────────────────────────────────────
+
+def _on_response(response) -> None:
+    try:
+        length = response.headers.get("content-length")
+    except Exception:
+        return
+    if length and length.isdigit():
+        count("bytes", int(length))
+
+
+def _watch_clicks(target) -> None:
+    """Count clicks in a page or in every page of a context."""
+    try:
+        target.expose_binding(CLICK_BINDING, lambda _source: count("clicks"))
+        target.add_init_script(CLICK_LISTENER_JS)
+    except Exception:
+        # Clicks are best effort; pages and bytes are still counted.
+        pass
+
+
+def watch_page(page, clicks: bool = True) -> None:
+    """Count one page, its main-frame navigations, bytes and clicks.
+
+    Call straight after new_page(), before the first goto().
+    """
+    count("pages")
+    if clicks:
+        _watch_clicks(page)
+    page.on(
+        "framenavigated",
+        lambda frame: frame == page.main_frame and count("navigations"),
+    )
+    page.on("response", _on_response)
+
+
+def watch_context(context) -> None:
+    """Count every page opened in a context, as watch_page() does.
+
+    Call before the context's first new_page().
+    """
+    _watch_clicks(context)
+    context.on("page", lambda page: watch_page(page, clicks=False))
+
+
+# ── Process resources ──────────────────────────────────────────────────────────
+
+def peak_rss_mb() -> float | None:
+    """Peak resident memory of this process or its largest waited-for child."""
+    try:
+        import resource
+    except ImportError:
+        return _windows_peak_rss_mb()
+
+    peak = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS.
+    scale = 1 if sys.platform == "darwin" else 1024
+    return round(peak * scale / 2**20, 1)
+
+
+def _windows_peak_rss_mb() -> float | None:
+    try:
+        import ctypes
+        from ctypes import wintypes
+
+        class Counters(ctypes.Structure):
+            _fields_ = [
+                ("cb", wintypes.DWORD),
+                ("PageFaultCount", wintypes.DWORD),
+                ("PeakWorkingSetSize", ctypes.c_size_t),
+                ("WorkingSetSize", ctypes.c_size_t),
+                ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                ("PagefileUsage", ctypes.c_size_t),
+                ("PeakPagefileUsage", ctypes.c_size_t),
+            ]
+
+        counters = Counters()
+        counters.cb = ctypes.sizeof(Counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if not ctypes.windll.psapi.GetProcessMemoryInfo(
+            process, ctypes.byref(counters), counters.cb
+        ):
+            return None
+        return round(counters.PeakWorkingSetSize / 2**20, 1)
+    except Exception:
+        return None
+
+
+def snapshot() -> dict:
+    """Counters plus this process's CPU time, peak RSS and wall time so far."""
+    return {
+        "wall_seconds": round(time.perf_counter() - _STARTED, 1),
+        "cpu_seconds": round(time.process_time(), 1),
+        "peak_rss_mb": peak_rss_mb(),
+        **counts(),
+    }
+
+
+# ── Reporting at exit ──────────────────────────────────────────────────────────
+
+def _write_counters(path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(snapshot()), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _append_record(path: Path) -> None:
+    now = datetime.now(timezone.utc)
+    record = {
+        "run_id": os.environ.get("TELEMETRY_RUN") or now.strftime("%Y%m%d"),
+        "stage": os.environ.get("TELEMETRY_STAGE") or Path(sys.argv[0]).stem,
+        "finished_at": now.isoformat(),
+        **snapshot(),
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a", encoding="utf-8") as handle:
+        handle.write(json.dumps(record) + "\n")
+
+
+def _report() -> None:
+    try:
+        if os.environ.get("TELEMETRY_COUNTERS"):
+            _write_counters(Path(os.environ["TELEMETRY_COUNTERS"]))
+        elif os.environ.get("TELEMETRY_LOG"):
+            _append_record(Path(os.environ["TELEMETRY_LOG"]))
+    except Exception as error:
+        print(f"Telemetry not written: {error}")
+
+
+atexit.register(_report)
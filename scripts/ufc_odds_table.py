@@ -0,0 +1,590 @@
+#!/usr/bin/env python3
+"""
+ufc_odds_table.py
+
+One normalised table of every scraped UFC price, shared by the arbitrage
+scan, the EV alerts and the fight pages.
+
+analyze_ufc_arbitrage.py, generate_ev_alerts.py and generate_ufc_fights.py
+each used to read the bookmaker prop files themselves. Each had its own
+file list and its own market and selection normalising, so the same price
+could key differently on the arb page and the EV page. This module parses the
+files once. It returns an OddsTable: one column per field, one row per
+price.
+
+    fight          the bookmaker's fight name
+    fight_key      fight_key(fight)
+    bookmaker
+    market         "Fight Betting", "Method of Victory", "Rounds",
+                   "Go The Distance", or the book's own label
+    selection      cleaned selection text
+    selection_key  selection_key(selection, fight), e.g. "over 2.5", "yes",
+                   or "conor mcgregor sub" when it names a fighter
+    odds           the odds as scraped
+    decimal        decimal odds, always > 1
+    source         the file the row came from, relative to the repo
+
+The table also keeps each book's fight entries (table.items), with their
+markets, for pages that show a book's markets as scraped.
+
+The parsed table is pickled to data/ufc_odds_table.pickle. It is reused while
+no prop file and no parsing code has changed, so the three build steps parse
+once per scrape rather than once each.
+
+    from ufc_odds_table import load_table
+
+    table = load_table()
+    for row in table.rows():
+        ...
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pickle
+import re
+from pathlib import Path
+
+import odds_common
+from odds_common import (
+    canonical_person_key,
+    fight_key,
+    fractional_to_decimal,
+    normalize_person_name,
+    same_fighter,
+)
+
+ROOT = Path(__file__).resolve().parents[1]
+DATA = ROOT / "ufc" / "data"
+CACHE_PATH = ROOT / "data" / "ufc_odds_table.pickle"
+
+# (bookmaker, candidate files). The first candidate with any fights or props
+# is read, so a filtered file wins over the raw scrape when it has data.
+PROP_FILES = [
+    ("PaddyPower", [DATA / "props_filtered.json", DATA / "props.json"]),
+    ("BoyleSports", [DATA / "boylesports_props_filtered.json", DATA / "boylesports_props.json"]),
+    ("BoyleSports", [DATA / "boylesports_moneylines.json"]),
+    ("BetVictor", [DATA / "betvictor_props_filtered.json", DATA / "betvictor_props.json"]),
+    ("Coral", [DATA / "coral_props_filtered.json", DATA / "coral_props.json"]),
+    ("BetMGM", [DATA / "betmgm_props_filtered.json", DATA / "betmgm_props.json"]),
+    ("Bwin", [DATA / "bwin_props.json"]),
+    ("Unibet", [DATA / "unibet_props.json"]),
+    ("WilliamHill", [DATA / "williamhill_props.json"]),
+    ("888Sport", [DATA / "888sport_props.json"]),
+]
+
+COLUMNS = (
+    "fight",
+    "fight_key",
+    "bookmaker",
+    "market",
+    "selection",
+    "selection_key",
+    "odds",
+    "decimal",
+    "source",
+)
+
+# Market keys load_all_props() in generate_ufc_fights.py has always kept.
+ITEM_MARKETS = ("fight_betting", "method_of_victory", "total_rounds", "rounds", "go_the_distance")
+
+CACHE_VERSION = 1
+
+# Parsing lives in this file and odds_common, so a change to either
+# invalidates the cache.
+CODE_DIGEST = hashlib.sha256(
+    Path(__file__).read_bytes() + Path(odds_common.__file__).read_bytes()
+).hexdigest()
+
+
+# ── Normalising ────────────────────────────────────────────────────────────────
+
+def canonical_market(label) -> str:
+    text = str(label or "").lower().replace("_", " ")
+
+    if "method" in text or "victory" in text or "winning" in text:
+        return "Method of Victory"
+
+    if "distance" in text:
+        return "Go The Distance"
+
+    if "round" in text:
+        return "Rounds"
+
+    if (
+        "fight betting" in text
+        or "fight result" in text
+        or "moneyline" in text
+        or "match odds" in text
+        or "bout" in text
+        or "winner" in text
+    ):
+        return "Fight Betting"
+
+    return str(label or "Props").strip() or "Props"
+
+
+def clean_selection(selection) -> str:
+    text = str(selection or "").strip()
+    text = re.sub(r"\s+", " ", text)
+    text = text.replace("Over (+", "Over ")
+    text = text.replace("Under (+", "Under ")
+    text = text.replace(")", "")
+    text = text.replace("+", "")
+    return text.strip()
+
+
+# Between a fighter's name and the outcome: "McGregor by Sub", "McGregor - KO",
+# "McGregor to win by Decision".
+_FIGHTER_PREFIX = re.compile(r"\s+(?:by|via|to|wins?|-|–)\s+")
+
+
+def selection_fighter(selection, fight) -> str:
+    """canonical_person_key of the fight's fighter a selection names, or "".
+
+    The fighter is the side sharing more name words with the selection, or,
+    when neither shares one, the only side with a word same_fighter()
+    accepts from the name before "by" / "-" ("Chimayev by KO").
+    """
+    sides = fight_key(fight).split(" v ")
+    if len(sides) != 2:
+        return ""
+
+    words = set(normalize_person_name(selection).split())
+    overlap = [len(words & set(side.split())) for side in sides]
+    if overlap[0] != overlap[1]:
+        return sides[overlap.index(max(overlap))]
+    if overlap[0]:
+        return ""
+
+    name = canonical_person_key(_FIGHTER_PREFIX.split(clean_selection(selection).lower(), 1)[0])
+    matches = [
+        side for side in sides
+        if any(same_fighter(word, part) for word in name.split() for part in side.split())
+    ]
+    return matches[0] if len(matches) == 1 else ""
+
+
+def selection_key(selection, fight="") -> str:
+    """Order-free key for one selection of one fight.
+
+    A selection that names one of the fight's fighters keeps that fighter's
+    canonical_person_key in front, so McGregor and Holloway by submission
+    never share a key.
+    """
+    text = clean_selection(selection).lower()
+    fighter = selection_fighter(selection, fight) if fight else ""
+
+    if fighter:
+        parts = _FIGHTER_PREFIX.split(text, 1)
+        if len(parts) == 2:
+            text = parts[1]
+        else:
+            # "McGregor KO/TKO" or just "Conor McGregor": drop the name words.
+            text = " ".join(
+                word for word in text.split()
+                if not any(
+                    same_fighter(normalize_person_name(word), part)
+                    for part in fighter.split()
+                )
+            )
+
+    # Strip fighter name prefix first ("Fighter by X" / "Fighter - X" / "Fighter via X")
+    text = re.sub(r"^[a-z\s\.]+ by ", "", text)
+    text = re.sub(r"^[a-z\s\.]+ via ", "", text)
+    text = re.sub(r"^[a-z\s\.]+\s+-\s+", "", text)
+    text = re.sub(r"^[a-z\s\.]+ wins? by ", "", text)
+
+    # Normalise fractions
+    text = text.replace("½", ".5").replace("¼", ".25").replace("¾", ".75")
+
+    # Normalise GTD prefix
+    text = re.sub(r"goes?\s+the\s+distance\s*[-–]?\s*", "", text)
+
+    # Normalise rounds: strip bracket ranges and trailing "rounds"
+    text = re.sub(r"\([\d\s\.\-]+\)", "", text)
+    text = re.sub(r"\s+rounds?\b", "", text)
+
+    # Replace all separators (/, comma, "or", "and") with space so compound
+    # labels like "ko, tko or disqualification" become "ko tko dq"
+    text = re.sub(r"[/,]", " ", text)
+    text = re.sub(r"\bor\b", " ", text)
+    text = re.sub(r"\band\b", " ", text)
+
+    # Normalise MOV keywords AFTER splitting on separators
+    text = text.replace("knockout", "ko")
+    text = text.replace("tko", "ko")
+    text = text.replace("disqualification", "dq")
+    text = text.replace("submission", "sub")
+    text = text.replace("technical decision", "dec")
+    text = text.replace("technical dec", "dec")
+    text = text.replace("unanimous decision", "dec")
+    text = text.replace("unanimous", "dec")
+    text = text.replace("split decision", "dec")
+    text = text.replace("split", "dec")
+    text = text.replace("majority decision", "dec")
+    text = text.replace("majority", "dec")
+    text = text.replace("decision", "dec")
+    text = text.replace("points", "dec")
+
+    # Canonicalise compound MOV to a single outcome type: anything with a
+    # KO is "ko", then "sub", then "dec" (decision or DQ).
+    words = text.split()
+    has_ko = "ko" in words
+    has_sub = "sub" in words
+    has_dec = "dec" in words or "dq" in words
+
+    # Only canonicalise MOV compound labels (not round/over/under/yes/no)
+    if has_ko or has_sub or has_dec:
+        if not any(x in text for x in ["over", "under", "round", "yes", "no", ".5", ".0"]):
+            if has_ko:
+                text = "ko"
+            elif has_sub:
+                text = "sub"
+            else:
+                text = "dec"
+
+    text = re.sub(r"[^a-z0-9\s\.]", "", text)
+    text = re.sub(r"\s+", " ", text).strip()
+    return f"{fighter} {text}".strip() if fighter else text
+
+
+# ── Reading the prop files ─────────────────────────────────────────────────────
+
+def load_json(path):
+    try:
+        return json.loads(Path(path).read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        print(f"ERROR loading {path}: {e}")
+        return {}
+
+
+def choose_prop_file(paths):
+    for path in paths:
+        data = load_json(path)
+        if not isinstance(data, dict):
+            continue
+
+        if data.get("fights") or data.get("props"):
+            return path, data
+
+    return paths[0], {}
+
+
+def market_prices(items):
+    """(selection, odds) for every priced selection in one market's items."""
+    if isinstance(items, dict):
+        items = [item for value in items.values() if isinstance(value, list) for item in value]
+
+    if not isinstance(items, list):
+        return
+
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+
+        selection = (
+            item.get("selection")
+            or item.get("name")
+            or item.get("runner")
+            or item.get("outcome")
+            or ""
+        )
+        odds = (
+            item.get("odds")
+            or item.get("price")
+            or item.get("fractional")
+            or item.get("decimal")
+            or ""
+        )
+
+        if selection and odds:
+            yield selection, odds
+
+
+def fight_prices(fight):
+    """(market label, selection, odds) for every price in one fight entry."""
+    markets = fight.get("markets") or {}
+
+    if isinstance(markets, dict):
+        for label, items in markets.items():
+            for selection, odds in market_prices(items):
+                yield label, selection, odds
+
+    for label, key in (
+        ("Method of Victory", "method_props"),
+        ("Rounds", "round_props"),
+        ("Rounds", "total_rounds"),
+        ("Go The Distance", "distance_props"),
+        ("Fight Betting", "fight_betting"),
+    ):
+        for selection, odds in market_prices(fight.get(key)):
+            yield label, selection, odds
+
+
+def fight_item(fight, bookmaker, name):
+    """A book's fight entry as the fight pages render it."""
+    item = dict(fight)
+    item["bookmaker"] = bookmaker
+    item["fight_name"] = name
+
+    markets = item.get("markets")
+    if not isinstance(markets, dict):
+        markets = {}
+
+    normalized_markets = {key: markets[key] for key in ITEM_MARKETS if markets.get(key)}
+    if normalized_markets:
+        item["markets"] = normalized_markets
+
+    return item
+
+
+def flat_prop_items(props, default_bookmaker):
+    """Flat BetMGM-style props grouped into one entry per book and fight."""
+    grouped = {}
+
+    for prop in props:
+        if not isinstance(prop, dict):
+            continue
+
+        name = prop.get("fight") or prop.get("fight_name") or prop.get("name") or ""
+        if not name:
+            continue
+
+        bookmaker = prop.get("bookmaker") or default_bookmaker
+        item = grouped.setdefault(
+            (bookmaker, fight_key(name)),
+            {
+                "bookmaker": bookmaker,
+                "fight_name": name,
+                "url": prop.get("url") or "#",
+                "markets": {
+                    "fight_betting": [],
+                    "method_of_victory": [],
+                    "total_rounds": [],
+                    "go_the_distance": [],
+                },
+                "method_props": [],
+                "round_props": [],
+                "distance_props": [],
+            },
+        )
+
+        selection = prop.get("selection")
+        odds = prop.get("odds")
+        if not selection or not odds:
+            continue
+
+        row = {"selection": selection, "odds": odds}
+        market = canonical_market(prop.get("market"))
+
+        if market == "Fight Betting":
+            item["markets"]["fight_betting"].append(row)
+        elif market == "Go The Distance":
+            item["markets"]["go_the_distance"].append(row)
+            item["distance_props"].append(row)
+        elif market == "Rounds":
+            item["markets"]["total_rounds"].append(row)
+            item["round_props"].append(row)
+        elif market == "Method of Victory":
+            item["markets"]["method_of_victory"].append(row)
+            item["method_props"].append(row)
+
+    return list(grouped.values())
+
+
+# ── The table ──────────────────────────────────────────────────────────────────
+
+class OddsTable:
+    """
+    Columnar UFC prices: table.columns[name][i] is field name of row i.
+
+    sources lists each prop file that was read, with the row range it
+    produced, so callers can report per book.
+    """
+
+    def __init__(self, columns, items, sources):
+        self.columns = columns
+        self.items = items
+        self.sources = sources
+        self._by_fight = None
+
+    def __len__(self):
+        return len(self.columns["fight"])
+
+    def row(self, index) -> dict:
+        return {name: self.columns[name][index] for name in COLUMNS}
+
+    def rows(self, indices=None):
+        for index in range(len(self)) if indices is None else indices:
+            yield self.row(index)
+
+    def fight_indices(self, key) -> list[int]:
+        """Row indices for one fight_key, in table order."""
+        if self._by_fight is None:
+            self._by_fight = {}
+            for index, fkey in enumerate(self.columns["fight_key"]):
+                self._by_fight.setdefault(fkey, []).append(index)
+        return self._by_fight.get(key, [])
+
+    def fight_rows(self, keys) -> list[dict]:
+        """Rows of every fight_key in keys, in table order."""
+        indices = sorted({index for key in keys for index in self.fight_indices(key)})
+        return list(self.rows(indices))
+
+
+def build_table() -> OddsTable:
+    columns = {name: [] for name in COLUMNS}
+    items = []
+    sources = []
+    seen = set()
+
+    def add_row(fight, bookmaker, label, selection, odds, source):
+        decimal = fractional_to_decimal(odds, 0)
+        if decimal <= 1.0:
+            return
+
+        selection = clean_selection(selection)
+        # Exclude Draw from UFC markets
+        if selection.lower() in ("draw", "a draw"):
+            return
+
+        row = (
+            fight,
+            fight_key(fight),
+            bookmaker,
+            canonical_market(label),
+            selection,
+            selection_key(selection, fight),
+            str(odds),
+            decimal,
+            source,
+        )
+        signature = (row[2], row[1], row[3], row[5], row[6])
+        if signature in seen:
+            return
+
+        seen.add(signature)
+        for name, value in zip(COLUMNS, row):
+            columns[name].append(value)
+
+    for default_bookmaker, paths in PROP_FILES:
+        path, data = choose_prop_file(paths)
+        source = path.relative_to(ROOT).as_posix()
+        fights = data.get("fights") or []
+        props = data.get("props") or []
+        start = len(columns["fight"])
+
+        for fight in fights:
+            if not isinstance(fight, dict):
+                continue
+
+            name = fight.get("fight") or fight.get("fight_name") or fight.get("name") or fight.get("match") or ""
+            if not name:
+                continue
+
+            bookmaker = fight.get("bookmaker") or default_bookmaker
+            items.append(fight_item(fight, bookmaker, name))
+
+            for label, selection, odds in fight_prices(fight):
+                add_row(name, bookmaker, label, selection, odds, source)
+
+        for prop in props:
+            if not isinstance(prop, dict):
+                continue
+
+            name = prop.get("fight") or prop.get("fight_name") or prop.get("match") or ""
+            selection = prop.get("selection") or prop.get("name") or prop.get("runner") or ""
+            odds = prop.get("odds") or prop.get("price") or prop.get("fractional") or prop.get("decimal") or ""
+
+            if name and selection and odds:
+                add_row(
+                    name,
+                    prop.get("bookmaker") or default_bookmaker,
+                    prop.get("market") or prop.get("market_name") or "Props",
+                    selection,
+                    odds,
+                    source,
+                )
+
+        items.extend(flat_prop_items(props, default_bookmaker))
+
+        sources.append({
+            "bookmaker": default_bookmaker,
+            "path": source,
+            "fights": len(fights),
+            "props": len(props),
+            "rows": (start, len(columns["fight"])),
+        })
+
+    return OddsTable(columns, items, sources)
+
+
+# ── Cache ──────────────────────────────────────────────────────────────────────
+
+def input_signatures():
+    """(size, mtime) of every candidate prop file; None for a missing file."""
+    signatures = {}
+    for _, paths in PROP_FILES:
+        for path in paths:
+            try:
+                stat = path.stat()
+                signatures[path.relative_to(ROOT).as_posix()] = (stat.st_size, stat.st_mtime_ns)
+            except OSError:
+                signatures[path.relative_to(ROOT).as_posix()] = None
+    return signatures
+
+
+def load_cached_table(inputs):
+    try:
+        with CACHE_PATH.open("rb") as handle:
+            payload = pickle.load(handle)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"UFC odds table cache unreadable, parsing prop files: {e}")
+        return None
+
+    if (
+        not isinstance(payload, dict)
+        or payload.get("version") != CACHE_VERSION
+        or payload.get("code") != CODE_DIGEST
+        or payload.get("inputs") != inputs
+    ):
+        return None
+
+    return OddsTable(payload["columns"], payload["items"], payload["sources"])
+
+
+def save_table(inputs, table):
+    """Pickle the table. inputs must be taken before the files were parsed."""
+    payload = {
+        "version": CACHE_VERSION,
+        "code": CODE_DIGEST,
+        "inputs": inputs,
+        "columns": table.columns,
+        "items": table.items,
+        "sources": table.sources,
+    }
+    CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    # Build steps may run side by side; each writes its own temp file.
+    tmp = CACHE_PATH.with_name(f"{CACHE_PATH.name}.{os.getpid()}.tmp")
+    with tmp.open("wb") as handle:
+        pickle.dump(payload, handle, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, CACHE_PATH)
+
+
+def load_table() -> OddsTable:
+    """The cached table while the prop files are unchanged, else a fresh parse."""
+    inputs = input_signatures()
+    table = load_cached_table(inputs)
+
+    if table is None:
+        table = build_table()
+        save_table(inputs, table)
+
+    return table
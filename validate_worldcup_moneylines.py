@@ -23,6 +23,11 @@ from pathlib import Path
 
 ROOT = Path(__file__).resolve().parent
 
+if str(ROOT / "scripts") not in sys.path:
+    sys.path.insert(0, str(ROOT / "scripts"))
+
+from odds_common import loose_fixture_key  # noqa: E402
+
 FILES = {
     "PaddyPower":  ROOT / "football" / "data" / "paddypower_worldcup_moneylines.json",
     "BoyleSports": ROOT / "football" / "data" / "boylesports_worldcup_moneylines.json",
@@ -44,15 +49,6 @@ def clean(s):
     return re.sub(r"\s+", " ", str(s or "")).strip()
 
 
-def norm_team(s):
-    s = clean(s).lower().replace("&", "and")
-    s = s.replace("bosnia and herzegovina", "bosnia")
-    s = s.replace("czech republic", "czechia")
-    s = s.replace("turkey", "turkiye").replace("türkiye", "turkiye")
-    s = s.replace("curaçao", "curacao")
-    return re.sub(r"[^a-z0-9]+", " ", s).strip()
-
-
 def split_match_name(name):
     name = clean(name)
     if " v " in name:
@@ -108,7 +104,7 @@ def get_matches(data):
         if not has_odds:
             continue
 
-        key = "__".join(sorted([norm_team(home), norm_team(away)]))
+        key = loose_fixture_key(home, away)
         out.append(key)
 
     return out